@@ -6,7 +6,7 @@ from typing import Tuple
 
 
 def get_daily_wisdom_prompt(
-    chart: dict,
+    profile,
     daily_data: dict,
     language: str = "en",
 ) -> Tuple[str, str]:
@@ -14,17 +14,17 @@ def get_daily_wisdom_prompt(
     Build (system_message, user_prompt) for a tiny AI call (~100 tokens).
 
     Args:
-        chart: result of calculate_bazi()
+        profile: ForecastProfile of the natal chart (bazi_engine.daily_forecast)
         daily_data: result of calculate_daily_forecast()
         language: en / zh-TW / zh-CN / ko
     """
-    dm_element = chart.get("day_master", {}).get("element", "Wood")
+    dm_element = profile.dm_element
     daily_elem = daily_data.get("daily_pillar", {}).get("stem", {}).get("element", "Wood")
     score = daily_data.get("overall_score", 50)
     mood = daily_data.get("mood", "")
     domains = daily_data.get("domains", {})
     top_domain = max(domains, key=domains.get) if domains else "career"
-    use_god = chart.get("use_god", {}).get("use_god", dm_element)
+    use_god = profile.use_god
 
     lang_label = {
         "en": "English",
@@ -6,7 +6,7 @@ All concrete providers (mock, supabase, etc.) must implement AuthProvider.
 from abc import ABC, abstractmethod
 from enum import Enum
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class SubscriptionTier(str, Enum):
@@ -30,6 +30,9 @@ class User(BaseModel):
     gender: Optional[str] = None           # "male" / "female"
     calendar_type: Optional[str] = None    # "solar" / "lunar"
     is_leap_month: Optional[bool] = None
+    # Natal forecast profile computed from the birth data when it is saved
+    # (bazi_engine.daily_forecast.ForecastProfile.to_dict)
+    forecast_profile: Optional[Dict[str, Any]] = None
 
 
 class AuthProvider(ABC):
@@ -87,6 +90,46 @@ class AuthProvider(ABC):
         gender: str,
         calendar_type: str = "solar",
         is_leap_month: bool = False,
+        forecast_profile: Optional[Dict[str, Any]] = None,
     ) -> User:
-        """Persist the user's birth details for auto-loading forecasts."""
+        """Persist the user's birth details (and their forecast profile) for auto-loading forecasts."""
+        ...
+
+    @abstractmethod
+    async def update_forecast_profile(self, user_id: str, forecast_profile: Dict[str, Any]) -> None:
+        """
+        Replace the stored forecast profile of unchanged birth data (one
+        recomputed after a profile version change); precomputed forecasts are kept.
+        """
+        ...
+
+    @abstractmethod
+    async def list_users_with_birth_data(self, offset: int = 0, limit: int = 1000) -> List[User]:
+        """One page of the users with saved birth data (birth hour included), in id order."""
+        ...
+
+    # ── Precomputed daily forecasts ────────────────────────────
+
+    @abstractmethod
+    async def save_daily_forecasts(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Store precomputed forecasts, replacing any existing ones.
+        Each record is {"user_id", "forecast_date" (YYYY-MM-DD), "language",
+        "profile_key" (ForecastProfile.fingerprint), "forecast"}.
+        """
+        ...
+
+    @abstractmethod
+    async def get_daily_forecast(
+        self, user_id: str, forecast_date: str, language: str, profile_key: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        The stored forecast of a user for a date and language, or None if
+        there is none computed from the profile with `profile_key`.
+        """
+        ...
+
+    @abstractmethod
+    async def delete_daily_forecasts_before(self, forecast_date: str) -> None:
+        """Drop stored forecasts for dates before forecast_date (YYYY-MM-DD)."""
         ...
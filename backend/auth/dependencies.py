@@ -24,6 +24,21 @@ def get_auth_provider():
     return _auth_provider
 
 
+def create_auth_provider(settings):
+    """Construct the provider named by settings.auth_provider ("mock" | "supabase")."""
+    provider_name = settings.auth_provider
+    if provider_name == "mock":
+        from .mock_provider import MockAuthProvider
+        return MockAuthProvider()
+    if provider_name == "supabase":
+        from .supabase_provider import SupabaseAuthProvider
+        return SupabaseAuthProvider(
+            url=settings.supabase_url,
+            key=settings.supabase_service_key,
+        )
+    raise ValueError(f"Unknown auth provider: {provider_name}")
+
+
 async def get_optional_user(request: Request) -> Optional[User]:
     """
     Extract user from Authorization header if present.
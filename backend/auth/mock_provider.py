@@ -3,10 +3,11 @@ Mock auth provider backed by SQLite.
 Good for local development; swap to Supabase for production.
 """
 
+import json
 import uuid
 import os
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import aiosqlite
 import bcrypt
@@ -48,6 +49,7 @@ class MockAuthProvider(AuthProvider):
                 ("calendar_type", "TEXT"),
                 ("is_leap_month", "INTEGER"),
                 ("premium_until", "TEXT"),
+                ("forecast_profile", "TEXT"),  # JSON
             ]:
                 try:
                     await db.execute(f"ALTER TABLE users ADD COLUMN {col} {col_type}")
@@ -55,6 +57,24 @@ class MockAuthProvider(AuthProvider):
                 except Exception:
                     pass  # column already exists
 
+            # Precomputed daily forecasts, one row per (user, date, language)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS daily_forecasts (
+                    user_id TEXT NOT NULL,
+                    forecast_date TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    profile_key TEXT,
+                    forecast TEXT NOT NULL,
+                    PRIMARY KEY (user_id, forecast_date, language)
+                )
+            """)
+            await db.commit()
+            try:
+                await db.execute("ALTER TABLE daily_forecasts ADD COLUMN profile_key TEXT")
+                await db.commit()
+            except Exception:
+                pass  # column already exists
+
     # ── helpers ────────────────────────────────────────────────
 
     @staticmethod
@@ -67,10 +87,11 @@ class MockAuthProvider(AuthProvider):
 
     # Column order for all SELECT queries:
     # 0:id, 1:email, 2:password_hash, 3:name, 4:tier, 5:stripe_customer_id,
-    # 6:created_at, 7:birth_date, 8:birth_hour, 9:gender, 10:calendar_type, 11:is_leap_month, 12:premium_until
+    # 6:created_at, 7:birth_date, 8:birth_hour, 9:gender, 10:calendar_type, 11:is_leap_month, 12:premium_until,
+    # 13:forecast_profile
     _SELECT_COLS = (
         "id, email, password_hash, name, tier, stripe_customer_id, created_at, "
-        "birth_date, birth_hour, gender, calendar_type, is_leap_month, premium_until"
+        "birth_date, birth_hour, gender, calendar_type, is_leap_month, premium_until, forecast_profile"
     )
 
     @staticmethod
@@ -88,6 +109,7 @@ class MockAuthProvider(AuthProvider):
             calendar_type=row[10] if len(row) > 10 else None,
             is_leap_month=bool(row[11]) if len(row) > 11 and row[11] is not None else None,
             premium_until=row[12] if len(row) > 12 and row[12] else None,
+            forecast_profile=json.loads(row[13]) if len(row) > 13 and row[13] else None,
         )
 
     # ── AuthProvider interface ─────────────────────────────────
@@ -179,14 +201,72 @@ class MockAuthProvider(AuthProvider):
         gender: str,
         calendar_type: str = "solar",
         is_leap_month: bool = False,
+        forecast_profile: Optional[Dict[str, Any]] = None,
     ) -> User:
+        profile_json = json.dumps(forecast_profile) if forecast_profile else None
         async with aiosqlite.connect(self.db_path) as db:
             await db.execute(
-                "UPDATE users SET birth_date=?, birth_hour=?, gender=?, calendar_type=?, is_leap_month=? WHERE id=?",
-                (birth_date, birth_hour, gender, calendar_type, int(is_leap_month), user_id),
+                "UPDATE users SET birth_date=?, birth_hour=?, gender=?, calendar_type=?, is_leap_month=?, "
+                "forecast_profile=? WHERE id=?",
+                (birth_date, birth_hour, gender, calendar_type, int(is_leap_month), profile_json, user_id),
             )
+            # Forecasts precomputed from the old birth data no longer apply
+            await db.execute("DELETE FROM daily_forecasts WHERE user_id=?", (user_id,))
             await db.commit()
         user = await self.get_user_by_id(user_id)
         if user is None:
             raise ValueError("User not found")
         return user
+
+    async def update_forecast_profile(self, user_id: str, forecast_profile: Dict[str, Any]) -> None:
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                "UPDATE users SET forecast_profile=? WHERE id=?",
+                (json.dumps(forecast_profile), user_id),
+            )
+            await db.commit()
+
+    async def list_users_with_birth_data(self, offset: int = 0, limit: int = 1000) -> List[User]:
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                f"SELECT {self._SELECT_COLS} FROM users "
+                "WHERE birth_date IS NOT NULL AND birth_hour IS NOT NULL AND gender IS NOT NULL "
+                "ORDER BY id LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
+            rows = await cursor.fetchall()
+        return [self._row_to_user(row) for row in rows]
+
+    # ── Precomputed daily forecasts ────────────────────────────
+
+    async def save_daily_forecasts(self, records: List[Dict[str, Any]]) -> None:
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                "INSERT OR REPLACE INTO daily_forecasts "
+                "(user_id, forecast_date, language, profile_key, forecast) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        r["user_id"], r["forecast_date"], r["language"], r["profile_key"],
+                        json.dumps(r["forecast"], ensure_ascii=False, separators=(",", ":")),
+                    )
+                    for r in records
+                ],
+            )
+            await db.commit()
+
+    async def get_daily_forecast(
+        self, user_id: str, forecast_date: str, language: str, profile_key: str,
+    ) -> Optional[Dict[str, Any]]:
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                "SELECT forecast FROM daily_forecasts "
+                "WHERE user_id=? AND forecast_date=? AND language=? AND profile_key=?",
+                (user_id, forecast_date, language, profile_key),
+            )
+            row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def delete_daily_forecasts_before(self, forecast_date: str) -> None:
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("DELETE FROM daily_forecasts WHERE forecast_date < ?", (forecast_date,))
+            await db.commit()
@@ -6,6 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 
+from bazi_engine.daily_forecast import forecast_profile_for_birth
+
 from .base import User
 from .jwt_utils import create_access_token
 from .dependencies import get_auth_provider, get_current_user
@@ -91,12 +93,20 @@ async def save_birth_data(body: BirthDataRequest, user: User = Depends(get_curre
     if provider is None:
         raise HTTPException(status_code=500, detail="Auth provider not configured")
 
+    calendar_type = body.calendar_type or "solar"
+    is_leap_month = body.is_leap_month or False
+    # Stored with the birth data so the Daily Forecast never recomputes the chart
+    profile = forecast_profile_for_birth(
+        body.birth_date, body.birth_hour, body.gender, calendar_type, is_leap_month,
+    )
+
     updated = await provider.update_birth_data(
         user_id=user.id,
         birth_date=body.birth_date,
         birth_hour=body.birth_hour,
         gender=body.gender,
-        calendar_type=body.calendar_type or "solar",
-        is_leap_month=body.is_leap_month or False,
+        calendar_type=calendar_type,
+        is_leap_month=is_leap_month,
+        forecast_profile=profile.to_dict() if profile else None,
     )
     return updated
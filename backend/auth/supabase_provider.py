@@ -6,7 +6,7 @@ Uses Supabase Postgres as the backing store; manages passwords ourselves
 
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import bcrypt
 from supabase import create_client, Client
@@ -20,6 +20,7 @@ class SupabaseAuthProvider(AuthProvider):
     def __init__(self, url: str, key: str):
         self.client: Client = create_client(url, key)
         self.table = "users"
+        self.forecast_table = "daily_forecasts"
 
     # ── lifecycle ──────────────────────────────────────────────
 
@@ -52,6 +53,7 @@ class SupabaseAuthProvider(AuthProvider):
             gender=row.get("gender"),
             calendar_type=row.get("calendar_type"),
             is_leap_month=row.get("is_leap_month"),
+            forecast_profile=row.get("forecast_profile"),
         )
 
     # ── AuthProvider interface ─────────────────────────────────
@@ -143,6 +145,7 @@ class SupabaseAuthProvider(AuthProvider):
         gender: str,
         calendar_type: str = "solar",
         is_leap_month: bool = False,
+        forecast_profile: Optional[Dict[str, Any]] = None,
     ) -> User:
         self.client.table(self.table).update({
             "birth_date": birth_date,
@@ -150,8 +153,52 @@ class SupabaseAuthProvider(AuthProvider):
             "gender": gender,
             "calendar_type": calendar_type,
             "is_leap_month": is_leap_month,
+            "forecast_profile": forecast_profile,
         }).eq("id", user_id).execute()
+        # Forecasts precomputed from the old birth data no longer apply
+        self.client.table(self.forecast_table).delete().eq("user_id", user_id).execute()
         user = await self.get_user_by_id(user_id)
         if user is None:
             raise ValueError("User not found")
-        return user
\ No newline at end of file
+        return user
+
+    async def update_forecast_profile(self, user_id: str, forecast_profile: Dict[str, Any]) -> None:
+        self.client.table(self.table).update(
+            {"forecast_profile": forecast_profile}
+        ).eq("id", user_id).execute()
+
+    async def list_users_with_birth_data(self, offset: int = 0, limit: int = 1000) -> List[User]:
+        result = (
+            self.client.table(self.table).select("*")
+            .not_.is_("birth_date", "null")
+            .not_.is_("birth_hour", "null")
+            .not_.is_("gender", "null")
+            .order("id")
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return [self._row_to_user(row) for row in result.data or []]
+
+    # ── Precomputed daily forecasts ────────────────────────────
+
+    async def save_daily_forecasts(self, records: List[Dict[str, Any]]) -> None:
+        if records:
+            self.client.table(self.forecast_table).upsert(
+                records, on_conflict="user_id,forecast_date,language",
+            ).execute()
+
+    async def get_daily_forecast(
+        self, user_id: str, forecast_date: str, language: str, profile_key: str,
+    ) -> Optional[Dict[str, Any]]:
+        result = (
+            self.client.table(self.forecast_table).select("forecast")
+            .eq("user_id", user_id)
+            .eq("forecast_date", forecast_date)
+            .eq("language", language)
+            .eq("profile_key", profile_key)
+            .execute()
+        )
+        return result.data[0]["forecast"] if result.data else None
+
+    async def delete_daily_forecasts_before(self, forecast_date: str) -> None:
+        self.client.table(self.forecast_table).delete().lt("forecast_date", forecast_date).execute()
@@ -0,0 +1,265 @@
+"""
+Batch Charts (批量排盤)
+
+Chart computation for large lists of births. Items are processed in
+chunks on a process pool; every chunk comes back as one block of
+already-serialized NDJSON lines, in input order, so the caller only ever
+holds a bounded window of chunks in memory however long the batch is.
+The request body is read the same way: BatchBodyParser yields items as
+their bytes arrive.
+
+Worker processes have their own chart caches (see chart_cache.py) and
+mapped calendar tables, and are reused across batches.
+"""
+
+import codecs
+import json
+import multiprocessing
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .calculator import calculate_bazi
+
+# Same sections as the single-chart endpoint's BaziChartResponse
+CHART_RESPONSE_FIELDS = (
+    "four_pillars",
+    "day_master",
+    "elements",
+    "age_periods",
+    "strongest_ten_god",
+    "annual_luck",
+    "seasonal_strength",
+    "deities",
+    "use_god",
+    "pillar_interactions",
+    "rarity",
+)
+
+# (index in the batch, request fields, validation error or None)
+BatchItem = Tuple[int, Optional[Dict], Optional[str]]
+
+# (decoded item, None) or (None, why the item could not be read)
+ParsedItem = Tuple[object, Optional[str]]
+
+_JSON_BODY_START = re.compile(r'\s*(?:\{\s*"items"\s*:\s*)?\[')
+_WHITESPACE = re.compile(r"\s*")
+_JSON_DECODER = json.JSONDecoder()
+
+
+class BatchBodyParser:
+    """
+    Incremental parser of a batch request body: fed the raw bytes as they
+    arrive, it returns each item as soon as it is complete, so the body is
+    never held in full.
+
+    Two formats:
+    - NDJSON (ndjson=True): one item object per line. A line that is not
+      valid JSON is an error for that item only.
+    - JSON: an array of items, or {"items": [...]}, scanned one element at
+      a time. A syntax error ends the batch, as the elements after it
+      cannot be told apart.
+
+    Raises:
+        ValueError: A JSON body that is neither form (from feed / close,
+            before any item is returned)
+    """
+
+    def __init__(self, ndjson: bool, max_item_chars: int = 64 * 1024):
+        self.ndjson = ndjson
+        self.max_item_chars = max_item_chars
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+        self._in_array = False      # JSON: opening "[" consumed
+        self._expect_comma = False  # JSON: an element was just read
+        self._skip_line = False     # NDJSON: rest of an overlong line
+        self._done = False
+
+    def feed(self, data: bytes) -> List[ParsedItem]:
+        """Items completed by another piece of the body."""
+        self._buffer += self._decoder.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> List[ParsedItem]:
+        """Items left at the end of the body."""
+        self._buffer += self._decoder.decode(b"", final=True)
+        return self._parse(final=True)
+
+    def _parse(self, final: bool) -> List[ParsedItem]:
+        if self._done:
+            self._buffer = ""
+            return []
+        return self._parse_lines(final) if self.ndjson else self._parse_json(final)
+
+    def _parse_lines(self, final: bool) -> List[ParsedItem]:
+        lines = self._buffer.split("\n")
+        self._buffer = "" if final else lines.pop()
+        items: List[ParsedItem] = []
+        for line in lines:
+            if self._skip_line:
+                self._skip_line = False
+            elif line.strip():
+                try:
+                    items.append((json.loads(line), None))
+                except json.JSONDecodeError as e:
+                    items.append((None, f"Invalid JSON: {e.msg}"))
+        if len(self._buffer) > self.max_item_chars:
+            if not self._skip_line:
+                items.append((None, f"Item too large (over {self.max_item_chars} characters)"))
+            self._buffer = ""
+            self._skip_line = True
+        return items
+
+    def _parse_json(self, final: bool) -> List[ParsedItem]:
+        buf, pos = self._buffer, 0
+        items: List[ParsedItem] = []
+        if not self._in_array:
+            match = _JSON_BODY_START.match(buf)
+            if match is None:
+                if final or "[" in buf or len(buf) > 256:
+                    raise ValueError('Expected NDJSON items, a JSON array of items or {"items": [...]}')
+                return items
+            self._in_array = True
+            pos = match.end()
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos == len(buf):
+                if final:
+                    items.append((None, "Unexpected end of the JSON body"))
+                    self._done = True
+                break
+            if buf[pos] == "]":
+                self._done = True
+                break
+            if self._expect_comma:
+                if buf[pos] != ",":
+                    items.append((None, "Invalid JSON: expected ',' between items"))
+                    self._done = True
+                    break
+                self._expect_comma = False
+                pos += 1
+                continue
+            try:
+                item, end = _JSON_DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                if not final and len(buf) - pos <= self.max_item_chars:
+                    break  # incomplete: wait for more of the body
+                items.append((None, f"Invalid JSON: {e.msg}"))
+                self._done = True
+                break
+            items.append((item, None))
+            pos = end
+            self._expect_comma = True
+        self._buffer = "" if self._done else buf[pos:]
+        return items
+
+
+def chart_line(index: int, item: Optional[Dict], error: Optional[str] = None) -> str:
+    """One NDJSON line: the chart sections of an item, or its error."""
+    if error is None:
+        try:
+            chart = calculate_bazi(
+                item["birth_date"],
+                item["birth_hour"],
+                item["gender"],
+                item.get("language") or "en",
+                calendar_type=item.get("calendar_type") or "solar",
+                is_leap_month=item.get("is_leap_month") or False,
+            )
+        except Exception as e:
+            chart = {"success": False, "error": str(e)}
+        if chart.get("success"):
+            record = {"index": index, "success": True}
+            record.update((field, chart.get(field)) for field in CHART_RESPONSE_FIELDS)
+        else:
+            record = {"index": index, "success": False, "error": chart.get("error")}
+    else:
+        record = {"index": index, "success": False, "error": error}
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def compute_chunk(items: Sequence[BatchItem]) -> str:
+    """Worker entry point: the NDJSON lines of one chunk, concatenated."""
+    return "".join(chart_line(index, item, error) for index, item, error in items)
+
+
+def iter_chunks(items: Iterable[BatchItem], size: int) -> Iterable[List[BatchItem]]:
+    """Split a stream of batch items into lists of at most `size`."""
+    chunk: List[BatchItem] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_in_order(executor: Executor, fn: Callable, chunks: Iterable, in_flight: int) -> Iterator:
+    """
+    executor.map that never has more than `in_flight` chunks submitted.
+
+    Results come back in input order. Chunks are pulled from `chunks` only
+    as earlier results are consumed, so neither the input nor the output
+    is ever held in full.
+    """
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(fn, chunk))
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# ==================== WORKER POOL ====================
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def batch_worker_count(workers: int = 0, processes_per_host: int = 1) -> int:
+    """
+    Pool size for a configured worker count.
+
+    Args:
+        workers: Configured pool size; 0 shares the host's CPUs
+        processes_per_host: Processes on the host that each start a pool
+            (the gunicorn workers), so 0 gives each cpu_count // this
+    """
+    return workers or max(1, (os.cpu_count() or 1) // max(1, processes_per_host))
+
+
+def get_batch_executor(workers: int = 0) -> ProcessPoolExecutor:
+    """
+    Return the process-wide batch pool, starting it on first use.
+
+    Args:
+        workers: Pool size; 0 means one worker per CPU
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: never fork a process that is running an event loop and threads
+                _executor = ProcessPoolExecutor(
+                    max_workers=batch_worker_count(workers),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def shutdown_batch_executor() -> None:
+    """Stop the batch pool (if it was started)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,58 @@
+"""
+Build step for the engine's precomputed data tables.
+
+Run once per deploy (the Dockerfile does this) so workers only ever map
+finished files:
+
+    python -m bazi_engine.build_tables            # build missing or stale tables
+    python -m bazi_engine.build_tables --force    # rebuild everything
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from . import calendar_table, pillar_interactions, pillar_search, population_stats, signature_store, solar_terms
+from .table_store import table_is_current, table_path
+
+# (filename, builder) in build order; each builder takes the output path
+TABLE_BUILDERS: List[Tuple[str, Callable[[str], str]]] = [
+    (calendar_table.TABLE_FILENAME, calendar_table.build_table),
+    (solar_terms.TABLE_FILENAME, solar_terms.build_table),
+    (pillar_interactions.TABLE_FILENAME, pillar_interactions.build_table),
+    # Reads the interaction table, so it comes after it
+    (signature_store.TABLE_FILENAME, signature_store.build_table),
+    # Weighs the signature store's rows
+    (population_stats.TABLE_FILENAME, population_stats.build_table),
+    (pillar_search.TABLE_FILENAME, pillar_search.build_table),
+]
+
+
+def build_all(force: bool = False) -> None:
+    """
+    Build every registered table that is missing or stale (or all, with
+    force). A table is stale when its header carries another engine hash.
+    """
+    for filename, builder in TABLE_BUILDERS:
+        path = table_path(filename)
+        if table_is_current(path) and not force:
+            print(f"✓ {filename} (current)")
+            continue
+        started = time.perf_counter()
+        builder(path)
+        size_kb = os.path.getsize(path) / 1024
+        print(f"✓ {filename} built in {time.perf_counter() - started:.1f}s ({size_kb:.0f} KB)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build BAZI engine data tables")
+    parser.add_argument("--force", action="store_true", help="rebuild tables even if they are current")
+    args = parser.parse_args(argv)
+    build_all(force=args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
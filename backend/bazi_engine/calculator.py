@@ -7,7 +7,9 @@ This is the heart of the application
 
 from datetime import datetime, date as date_type
 from typing import Dict, List, Tuple, Optional
-from lunardate import LunarDate
+
+import numpy as np
+
 from .stems_branches import (
     HeavenlyStem,
     EarthlyBranch,
@@ -20,20 +22,57 @@ from .stems_branches import (
     STEM_INDEX,
     BRANCH_INDEX,
 )
-from .elements import count_elements, get_element_balance, get_element_relationships
-from .hidden_stems import annotate_four_pillars_with_hidden_stems
-from .ten_gods import annotate_four_pillars_with_ten_gods, get_strongest_ten_god
-from .annual_luck import calculate_annual_luck
+from .element_strength import element_strength_for_core, element_strength_matrix
+from .elements import count_elements, get_element_balance
+from .chart_core import (
+    BRANCH_ELEMENTS,
+    PILLAR_NAMES,
+    STEM_ELEMENTS,
+    STEM_NAMES_CN,
+    ChartCore,
+    shared_pillar_dict,
+)
+from .relations import (
+    REL_SAME,
+    REL_GENERATES,
+    REL_CONTROLS,
+    REL_CONTROLLED_BY,
+    REL_GENERATED_BY,
+    RELATION_NAMES,
+    ELEMENTS,
+    STEM_ELEMENT,
+    BRANCH_ELEMENT,
+    element_relation,
+)
+from .ten_gods import get_strongest_ten_god_for_core, strongest_ten_gods
+from .annual_luck import find_annual_luck, render_annual_luck
 from .seasonal_strength import get_seasonal_strength
-from .deities import get_deities_for_chart
-from .use_god import determine_use_god
-from .pillar_interactions import analyze_pillar_interactions
-from .hidden_stems import BRANCH_NAME_TO_ENUM
-
+from .deities import deities_from_codes, deity_code_matrix, get_deities_for_core
+from .use_god import determine_use_god_for_core, use_god_summaries
+from .pillar_interactions import (
+    find_pillar_interactions,
+    find_pillar_interactions_for_core,
+    find_pillar_interactions_for_charts,
+    render_pillar_interactions,
+)
+from .calendar_kernel import (
+    year_pillar,
+    month_pillar,
+    day_pillar,
+    hour_pillar,
+    hour_branch,
+    day_number,
+    compute_four_pillars,
+    four_pillar_indices,
+)
+from .calendar_table import get_calendar_table
+from .solar_terms import birth_timestamp, birth_timestamps, get_solar_term_table
+from .messages import Message, define, define_table, normalize_language, render, render_all
+from .chart_cache import FrozenDict, freeze, chart_cache, neutral_cache, signature_cache, timeline_cache
+from .luck_timeline import TIMELINE_YEARS, compute_luck_timeline
+from .signature_store import get_signature_store
+from .population_stats import chart_rarity
 
-# BAZI Chart data for years 1900-2100 (simplified version)
-# In production, use a proper lunar calendar library like pylunar when available on macOS
-# For now, we'll use a calculated approach
 
 GREGORIAN_EPOCH = 1900  # Starting reference year
 
@@ -51,18 +90,8 @@ def get_year_stem_branch(year: int) -> Tuple[HeavenlyStem, EarthlyBranch]:
     Returns:
         (HeavenlyStem, EarthlyBranch)
     """
-    # Calculate position in 60-year cycle
-    year_position = (year - GREGORIAN_EPOCH) % 60
-    
-    # Stem cycles every 10 years
-    stem_index = year_position % 10
-    # Branch cycles every 12 years
-    branch_index = year_position % 12
-    
-    stem = get_stem_by_index(stem_index)
-    branch = get_branch_by_index(branch_index)
-    
-    return stem, branch
+    stem_index, branch_index = year_pillar(year)
+    return get_stem_by_index(stem_index), get_branch_by_index(branch_index)
 
 
 def is_leap_year(year: int) -> bool:
@@ -94,30 +123,8 @@ def get_day_stem_branch(year: int, month: int, day: int) -> Tuple[HeavenlyStem,
     Returns:
         (HeavenlyStem, EarthlyBranch)
     """
-    # Calculate total days from January 1, 1900
-    total_days = 0
-    
-    # Add days for complete years
-    for y in range(GREGORIAN_EPOCH, year):
-        total_days += 366 if is_leap_year(y) else 365
-    
-    # Add days for complete months in current year
-    for m in range(1, month):
-        total_days += get_days_in_month(year, m)
-    
-    # Add remaining days
-    total_days += day
-    
-    # Day 1 (January 1, 1900) was 甲子 (position 0)
-    day_position = (total_days - 1) % 60
-    
-    stem_index = day_position % 10
-    branch_index = day_position % 12
-    
-    stem = get_stem_by_index(stem_index)
-    branch = get_branch_by_index(branch_index)
-    
-    return stem, branch
+    stem_index, branch_index = day_pillar(day_number(date_type(year, month, day)))
+    return get_stem_by_index(stem_index), get_branch_by_index(branch_index)
 
 
 def get_month_stem_branch(year: int, month: int) -> Tuple[HeavenlyStem, EarthlyBranch]:
@@ -126,6 +133,9 @@ def get_month_stem_branch(year: int, month: int) -> Tuple[HeavenlyStem, EarthlyB
     
     The month stem depends on the year stem
     The month branch follows the zodiac: Zǐ (11), Chǒu (12), Yín (1), Mǎo (2)...
+
+    This is the Gregorian-month approximation; calculate_bazi takes the
+    month pillar from the solar terms (see solar_terms.py).
     
     Args:
         year: Gregorian calendar year
@@ -134,32 +144,8 @@ def get_month_stem_branch(year: int, month: int) -> Tuple[HeavenlyStem, EarthlyB
     Returns:
         (HeavenlyStem, EarthlyBranch)
     """
-    # Get year stem
-    year_stem, _ = get_year_stem_branch(year)
-    year_stem_index = (year_stem.value["name_cn"].encode('utf-8'))
-    
-    # Find year stem in stem list (0-9)
-    from .stems_branches import STEM_INDEX
-    year_stem_pos = STEM_INDEX.get(year_stem, 0)
-    
-    # Month stem cycle: depends on year stem
-    # Each year, stems shift by 2 (yin-yang pairs)
-    # Month 1 (Jan/Feb in solar) = Month 11 in lunar (Zǐ) - actually it's complex
-    
-    # Simplified: Month stems follow a pattern based on year stem
-    # For now, use a basic pattern (this should be enhanced with lunar calendar)
-    month_stem_base = year_stem_pos * 2
-    month_stem_index = (month_stem_base + (month - 1) % 12) % 10
-    
-    month_stem = get_stem_by_index(month_stem_index)
-    
-    # Month branch follows lunar zodiac
-    # Solar month 1-2 = lunar 11, 12
-    # Solar month 3-4 = lunar 1, 2, etc.
-    month_branch_index = (month + 10) % 12  # Converts solar to lunar month branch
-    month_branch = get_branch_by_index(month_branch_index)
-    
-    return month_stem, month_branch
+    stem_index, branch_index = month_pillar(year, month)
+    return get_stem_by_index(stem_index), get_branch_by_index(branch_index)
 
 
 def get_hour_stem_branch(day_stem: HeavenlyStem, hour: int) -> Tuple[HeavenlyStem, EarthlyBranch]:
@@ -180,36 +166,8 @@ def get_hour_stem_branch(day_stem: HeavenlyStem, hour: int) -> Tuple[HeavenlySte
     Returns:
         (HeavenlyStem, EarthlyBranch)
     """
-    from .stems_branches import STEM_INDEX
-    
-    # Hour branch mapping (2-hour periods)
-    # Hour 0-1: Zǐ (11pm-1am)
-    # Hour 2-3: Chǒu (1am-3am)
-    # Hour 4-5: Yín (3am-5am)
-    # ... etc
-    hour_for_branch = hour % 24
-    
-    # Special handling: BAZI uses Chinese traditional hours (12 periods)
-    if hour_for_branch >= 23 or hour_for_branch < 1:
-        hour_branch_index = 0  # Zǐ
-    else:
-        hour_branch_index = (hour_for_branch + 1) // 2
-        if hour_branch_index > 11:
-            hour_branch_index = 11
-    
-    hour_branch = get_branch_by_index(hour_branch_index)
-    
-    # Hour stem calculation based on day stem
-    day_stem_pos = STEM_INDEX.get(day_stem, 0)
-    
-    # Each day stem corresponds to a starting hour stem
-    # The hour stems follow the pattern based on day stem
-    hour_stem_base = (day_stem_pos // 2) * 2  # Determine starting point
-    hour_stem_index = (hour_stem_base + hour_branch_index // 2) % 10
-    
-    hour_stem = get_stem_by_index(hour_stem_index)
-    
-    return hour_stem, hour_branch
+    stem_index, branch_index = hour_pillar(STEM_INDEX.get(day_stem, 0), hour)
+    return get_stem_by_index(stem_index), get_branch_by_index(branch_index)
 
 
 def _get_luck_direction(gender: str, year_stem: HeavenlyStem) -> int:
@@ -233,6 +191,19 @@ def _get_luck_direction(gender: str, year_stem: HeavenlyStem) -> int:
     return -1
 
 
+def get_luck_start_age(birth_date: date_type, birth_hour: int, gender: str, year_stem: HeavenlyStem) -> int:
+    """
+    Age (whole years) at which the first 10-year luck period begins.
+
+    Counted from the birth instant to the next solar-term month boundary
+    (節) for forward luck, or back to the previous one for backward luck;
+    every 3 days of that distance is one year of age.
+    """
+    forward = _get_luck_direction(gender, year_stem) == 1
+    years = get_solar_term_table().luck_start_age(birth_timestamp(birth_date, birth_hour), forward)
+    return int(round(years))
+
+
 def calculate_age_periods(
     birth_date: datetime,
     gender: str,
@@ -245,7 +216,8 @@ def calculate_age_periods(
     Calculate simplified 10-year luck periods (大運) as age-based ranges.
     
     This implementation is intentionally approximate but deterministic:
-    - Uses a fixed starting age of 8 for the first major luck period
+    - The first major luck period starts at the solar-term luck-start age
+      (get_luck_start_age, from the birth date and hour)
     - Each period covers 10 years (e.g., 8–17, 18–27, ...)
     - Luck pillars progress forward or backward in the sexagenary cycle
       based on gender and year stem yin/yang.
@@ -254,9 +226,33 @@ def calculate_age_periods(
     - We also derive simple life-domain themes and recommended actions
       to make the output practically useful.
     """
-    # Starting age for first major luck cycle (simplified)
-    start_age_base = 8
-    num_periods = 8  # Cover roughly age 8–87
+    periods = compute_age_periods(
+        birth_year=birth_date.year,
+        gender=gender,
+        year_stem=year_stem,
+        year_branch=year_branch,
+        day_master_element=day_master_element,
+        start_age=get_luck_start_age(birth_date.date(), birth_date.hour, gender, year_stem),
+    )
+    return render_age_periods(periods, language)
+
+
+def compute_age_periods(
+    birth_year: int,
+    gender: str,
+    year_stem: HeavenlyStem,
+    year_branch: EarthlyBranch,
+    day_master_element: str,
+    start_age: int = 8,
+) -> List[Dict]:
+    """
+    Language-neutral part of calculate_age_periods: ages, years, luck
+    pillar, score, quality and life-domain emphasis of each period, plus
+    its guidance as catalog Messages that render_age_periods formats.
+    """
+    # Starting age for first major luck cycle
+    start_age_base = start_age
+    num_periods = 8  # Eight decades from the luck-start age
     
     direction = _get_luck_direction(gender, year_stem)
     year_stem_index = STEM_INDEX.get(year_stem, 0)
@@ -264,268 +260,6 @@ def calculate_age_periods(
     
     periods: List[Dict] = []
 
-    def _derive_life_domains(main_element: str, relationship: str) -> Dict[str, int]:
-        """
-        Map element + relationship to emphasis scores for life domains.
-        
-        Domains: career, wealth, relationships, health, learning.
-        Scores range 0–3 (0 = no focus, 3 = very strong focus).
-        """
-        domains = {
-            "career": 0,
-            "wealth": 0,
-            "relationships": 0,
-            "health": 0,
-            "learning": 0,
-        }
-        element = (main_element or "").lower()
-
-        # Base mapping from element nature
-        if element == "wood":
-            domains["learning"] += 2
-            domains["career"] += 1
-        elif element == "fire":
-            domains["career"] += 2
-            domains["relationships"] += 1
-        elif element == "earth":
-            domains["wealth"] += 1
-            domains["health"] += 2
-        elif element == "metal":
-            domains["wealth"] += 2
-            domains["career"] += 1
-        elif element == "water":
-            domains["learning"] += 1
-            domains["relationships"] += 2
-
-        # Adjust based on relationship to day master
-        if relationship == "generates":
-            # Supportive to the day master → easier growth
-            for key in domains:
-                domains[key] += 1
-        elif relationship == "destroys":
-            # Pressures the day master → more challenges but also growth potential
-            domains["career"] += 1
-            domains["health"] += 1
-        elif relationship == "same":
-            # Same element → identity, self-development
-            domains["learning"] += 1
-            domains["relationships"] += 1
-
-        # Clamp to 0–3
-        for key in domains:
-            if domains[key] < 0:
-                domains[key] = 0
-            if domains[key] > 3:
-                domains[key] = 3
-
-        return domains
-
-    def _build_text_guidance(
-        start_age: int,
-        end_age: int,
-        main_element: str,
-        quality: str,
-        domains: Dict[str, int],
-        language: str,
-    ) -> Dict[str, List[str] | str]:
-        """
-        Create high-level themes, focus areas, cautions, and recommended actions
-        for a single 10-year period.
-        """
-        themes: List[str] = []
-        focus_areas: List[str] = []
-        cautions: List[str] = []
-        actions: List[str] = []
-
-        lang = language if language in ("en", "zh-TW", "zh-CN", "ko") else "en"
-
-        # Overall decade theme (localized)
-        if quality in ("very_auspicious", "auspicious"):
-            themes.append(
-                {
-                    "en": "This decade tends to bring supportive opportunities and smoother progress.",
-                    "zh-TW": "此十年多為順勢之運，較容易遇到助力與機會。",
-                    "zh-CN": "此十年多为顺势之运，更容易遇到助力与机会。",
-                    "ko": "이 10년은 지원적 기회와 순조로운 진전을 가져오는 경향이 있습니다.",
-                }[lang]
-            )
-        elif quality == "neutral":
-            themes.append(
-                {
-                    "en": "This decade is relatively balanced, offering steady growth if you act consciously.",
-                    "zh-TW": "此十年整體較為平衡，若能主動規劃，仍可穩健成長。",
-                    "zh-CN": "此十年整体较为平衡，若能主动规划，仍可稳健成长。",
-                    "ko": "이 10년은 상대적으로 균형 잡혀 있으며，의식적으로 행동하면 꾸준한 성장을 제공합니다.",
-                }[lang]
-            )
-        else:
-            themes.append(
-                {
-                    "en": "This decade may feel more testing, but it is powerful for inner growth and restructuring.",
-                    "zh-TW": "此十年較具考驗，但也是調整體質、重整方向的關鍵期。",
-                    "zh-CN": "此十年较具考验，但也是调整体质、重整方向的关键期。",
-                    "ko": "이 10년은 더 시험적일 수 있지만，내적 성장과 재구조화에 강력합니다.",
-                }[lang]
-            )
-
-        # Domain-based guidance
-        if domains.get("career", 0) >= 2:
-            focus_areas.append(
-                {
-                    "en": "Consider strategic career moves, role changes, or taking on more visible responsibilities.",
-                    "zh-TW": "事業面適合做策略性布局：調整跑道、升遷或承擔更高能見度的責任。",
-                    "zh-CN": "事业面适合做策略性布局：调整跑道、升迁或承担更高能见度的责任。",
-                    "ko": "전략적 직업 이동，역할 변경 또는 더 눈에 띄는 책임을 맡는 것을 고려하세요.",
-                }[lang]
-            )
-            if quality in ("very_challenging", "challenging"):
-                cautions.append(
-                    {
-                        "en": "Avoid impulsive job changes; prepare skills and networks before major moves.",
-                        "zh-TW": "避免衝動轉職；重大變動前先備妥技能與人脈。",
-                        "zh-CN": "避免冲动跳槽；重大变动前先备妥技能与人脉。",
-                        "ko": "충동적인 직업 변경을 피하고；중대한 변화 전에 기술과 인맥을 준비하세요.",
-                    }[lang]
-                )
-            else:
-                actions.append(
-                    {
-                        "en": "Invest in leadership skills, reputation-building, and long-term career positioning.",
-                        "zh-TW": "投資在領導力、口碑與長線職涯定位。",
-                        "zh-CN": "投资在领导力、口碑与长期职业定位。",
-                        "ko": "리더십，평판 구축 및 장기 직업 포지셔닝에 투자하세요.",
-                    }[lang]
-                )
-
-        if domains.get("wealth", 0) >= 2:
-            focus_areas.append(
-                {
-                    "en": "Strengthen your financial foundation, savings, and long-term assets.",
-                    "zh-TW": "財務面宜打底：儲蓄、現金流與長期資產配置。",
-                    "zh-CN": "财务面宜打底：储蓄、现金流与长期资产配置。",
-                    "ko": "재정 기반，저축 및 장기 자산을 강화하세요.",
-                }[lang]
-            )
-            if quality in ("very_challenging", "challenging"):
-                cautions.append(
-                    {
-                        "en": "Be conservative with debt and speculative investments; prioritize cash flow stability.",
-                        "zh-TW": "保守看待負債與投機；優先維持現金流穩定。",
-                        "zh-CN": "保守看待负债与投机；优先维持现金流稳定。",
-                        "ko": "부채와 투기적 투자에 보수적이고；현금 흐름 안정성을 우선시하세요.",
-                    }[lang]
-                )
-            else:
-                actions.append(
-                    {
-                        "en": "Plan for long-term investments and gradual asset accumulation.",
-                        "zh-TW": "規劃長期投資，循序累積資產。",
-                        "zh-CN": "规划长期投资，循序累积资产。",
-                        "ko": "장기 투자와 점진적 자산 축적을 계획하세요.",
-                    }[lang]
-                )
-
-        if domains.get("relationships", 0) >= 2:
-            focus_areas.append(
-                {
-                    "en": "Relationships, partnerships, and social connections are highlighted.",
-                    "zh-TW": "人際／伴侶關係是重點：合作、婚戀與社交連結更受影響。",
-                    "zh-CN": "人际／伴侣关系是重点：合作、婚恋与社交连结更受影响。",
-                    "ko": "관계，파트너십 및 사회적 연결이 강조됩니다.",
-                }[lang]
-            )
-            if quality in ("very_challenging", "challenging"):
-                cautions.append(
-                    {
-                        "en": "Attend to communication patterns and emotional triggers to avoid unnecessary conflicts.",
-                        "zh-TW": "留意溝通模式與情緒觸發點，避免無謂的衝突。",
-                        "zh-CN": "留意沟通模式与情绪触发点，避免无谓的冲突。",
-                        "ko": "불필요한 갈등을 피하기 위해 의사소통 패턴과 감정적 트리거에 주의하세요.",
-                    }[lang]
-                )
-            else:
-                actions.append(
-                    {
-                        "en": "Deepen key relationships and nurture supportive communities around you.",
-                        "zh-TW": "深化重要關係，經營能支持你的圈子與社群。",
-                        "zh-CN": "深化重要关系，经营能支持你的圈子与社群。",
-                        "ko": "핵심 관계를 심화하고 주변의 지원적인 공동체를 육성하세요.",
-                    }[lang]
-                )
-
-        if domains.get("health", 0) >= 2:
-            focus_areas.append(
-                {
-                    "en": "Body, energy, and emotional resilience require attention.",
-                    "zh-TW": "健康與精力管理很重要：作息、情緒韌性與壓力調節需特別留意。",
-                    "zh-CN": "健康与精力管理很重要：作息、情绪韧性与压力调节需特别留意。",
-                    "ko": "몸，에너지 및 감정적 회복력에 주의가 필요합니다.",
-                }[lang]
-            )
-            if quality in ("very_challenging", "challenging"):
-                cautions.append(
-                    {
-                        "en": "Avoid overwork and ignoring early health signals; build sustainable routines.",
-                        "zh-TW": "避免過勞與忽視警訊；建立可長期維持的健康習慣。",
-                        "zh-CN": "避免过劳与忽视信号；建立可长期维持的健康习惯。",
-                        "ko": "과로와 초기 건강 신호 무시를 피하고；지속 가능한 루틴을 구축하세요.",
-                    }[lang]
-                )
-            else:
-                actions.append(
-                    {
-                        "en": "Establish strong daily routines for sleep, movement, and nourishment.",
-                        "zh-TW": "建立穩定的睡眠、運動與飲食規律。",
-                        "zh-CN": "建立稳定的睡眠、运动与饮食规律。",
-                        "ko": "수면，운동 및 영양을 위한 강력한 일상 루틴을 확립하세요.",
-                    }[lang]
-                )
-
-        if domains.get("learning", 0) >= 2:
-            focus_areas.append(
-                {
-                    "en": "Learning, inner work, and skill-building are especially fruitful in this decade.",
-                    "zh-TW": "學習與內在修練有利：進修、累積技能與找到良師益友。",
-                    "zh-CN": "学习与内在修炼有利：进修、累积技能与找到良师益友。",
-                    "ko": "학습，내적 수양 및 기술 구축이 이 10년에 특히 유익합니다.",
-                }[lang]
-            )
-            actions.append(
-                {
-                    "en": "Pursue structured learning, mentorship, or spiritual/inner development practices.",
-                    "zh-TW": "建議採取結構化學習、尋找導師，或進行身心靈的內在成長練習。",
-                    "zh-CN": "建议采取结构化学习、寻找导师，或进行身心灵的内在成长练习。",
-                    "ko": "구조화된 학습，멘토십 또는 영적/내적 발전 실천을 추구하세요.",
-                }[lang]
-            )
-
-        summary = {
-            "en": (
-                f"From about age {start_age} to {end_age}, focus on steady work in the highlighted areas—"
-                f"this decade is about building foundations for the next cycles."
-            ),
-            "zh-TW": (
-                f"約在 {start_age}–{end_age} 歲之間，建議把重點放在上述面向的穩健經營；"
-                f"此十年適合打底，為下一輪運勢累積能量。"
-            ),
-            "zh-CN": (
-                f"约在 {start_age}–{end_age} 岁之间，建议把重点放在上述面向的稳健经营；"
-                f"此十年适合打底，为下一轮运势累积能量。"
-            ),
-            "ko": (
-                f"약 {start_age}–{end_age}세 사이에 강조된 영역에서 꾸준한 작업에 집중하세요—"
-                f"이 10년은 다음 주기를 위한 기반을 구축하는 시기입니다."
-            ),
-        }[lang]
-
-        return {
-            "summary": summary,
-            "themes": themes,
-            "focus_areas": focus_areas,
-            "cautions": cautions,
-            "recommended_actions": actions,
-        }
-    
     for i in range(num_periods):
         # Age range
         start_age = start_age_base + i * 10
@@ -542,27 +276,25 @@ def calculate_age_periods(
         luck_element = get_stem_element(luck_stem)
         
         # Determine relationship between luck element and day master
-        relationship = get_element_relationships(luck_element, day_master_element)
+        relation = element_relation(luck_element, day_master_element)
+        relationship = "none" if relation is None else RELATION_NAMES[relation]
         
         # Simple scoring heuristic
         score = 0
-        if relationship == "same":
+        if relation == REL_SAME:
             score = 2
-        elif relationship == "generates":
+        elif relation == REL_GENERATES:
             # Luck element generates the day master → supportive
             score = 2
-        else:
-            # Check reverse relationship (day master vs luck element)
-            reverse_rel = get_element_relationships(day_master_element, luck_element)
-            if reverse_rel == "generates":
-                # Day master generates luck element → more output/effort
-                score = 1
-            elif relationship == "destroys":
-                # Luck element destroys day master → challenging
-                score = -2
-            elif reverse_rel == "destroys":
-                # Day master destroys luck element → pressure/responsibility
-                score = -1
+        elif relation == REL_GENERATED_BY:
+            # Day master generates luck element → more output/effort
+            score = 1
+        elif relation == REL_CONTROLS:
+            # Luck element destroys day master → challenging
+            score = -2
+        elif relation == REL_CONTROLLED_BY:
+            # Day master destroys luck element → pressure/responsibility
+            score = -1
         
         if score >= 2:
             quality = "very_auspicious"
@@ -578,18 +310,10 @@ def calculate_age_periods(
         favorable = score >= 1
 
         domains = _derive_life_domains(luck_element, relationship)
-        guidance = _build_text_guidance(
-            start_age=start_age,
-            end_age=end_age,
-            main_element=luck_element,
-            quality=quality,
-            domains=domains,
-            language=language,
-        )
         
         # Approximate Gregorian years for this age range
-        start_year = birth_date.year + start_age
-        end_year = birth_date.year + end_age
+        start_year = birth_year + start_age
+        end_year = birth_year + end_age
         
         periods.append(
             {
@@ -608,23 +332,273 @@ def calculate_age_periods(
                 "quality": quality,
                 "favorable": favorable,
                 "domains": domains,
-                "summary": guidance["summary"],
-                "themes": guidance["themes"],
-                "focus_areas": guidance["focus_areas"],
-                "cautions": guidance["cautions"],
-                "recommended_actions": guidance["recommended_actions"],
+                "guidance": _build_text_guidance(
+                    start_age=start_age,
+                    end_age=end_age,
+                    main_element=luck_element,
+                    quality=quality,
+                    domains=domains,
+                ),
             }
         )
     
     return periods
 
 
+def render_age_periods(periods: List[Dict], language: str = "en") -> List[Dict]:
+    """Format the summary, themes and advice of compute_age_periods output."""
+    lang = normalize_language(language)
+    rendered = []
+    for period in periods:
+        guidance = period["guidance"]
+        item = {key: value for key, value in period.items() if key != "guidance"}
+        item["summary"] = render(guidance["summary"], lang)
+        item["themes"] = render_all(guidance["themes"], lang)
+        item["focus_areas"] = render_all(guidance["focus_areas"], lang)
+        item["cautions"] = render_all(guidance["cautions"], lang)
+        item["recommended_actions"] = render_all(guidance["recommended_actions"], lang)
+        rendered.append(item)
+    return rendered
+
+
+def _derive_life_domains(main_element: str, relationship: str) -> Dict[str, int]:
+    """
+    Map element + relationship to emphasis scores for life domains.
+
+    Domains: career, wealth, relationships, health, learning.
+    Scores range 0–3 (0 = no focus, 3 = very strong focus).
+    """
+    domains = {
+        "career": 0,
+        "wealth": 0,
+        "relationships": 0,
+        "health": 0,
+        "learning": 0,
+    }
+    element = (main_element or "").lower()
+
+    # Base mapping from element nature
+    if element == "wood":
+        domains["learning"] += 2
+        domains["career"] += 1
+    elif element == "fire":
+        domains["career"] += 2
+        domains["relationships"] += 1
+    elif element == "earth":
+        domains["wealth"] += 1
+        domains["health"] += 2
+    elif element == "metal":
+        domains["wealth"] += 2
+        domains["career"] += 1
+    elif element == "water":
+        domains["learning"] += 1
+        domains["relationships"] += 2
+
+    # Adjust based on relationship to day master
+    if relationship == "generates":
+        # Supportive to the day master → easier growth
+        for key in domains:
+            domains[key] += 1
+    elif relationship == "destroys":
+        # Pressures the day master → more challenges but also growth potential
+        domains["career"] += 1
+        domains["health"] += 1
+    elif relationship == "same":
+        # Same element → identity, self-development
+        domains["learning"] += 1
+        domains["relationships"] += 1
+
+    # Clamp to 0–3
+    for key in domains:
+        if domains[key] < 0:
+            domains[key] = 0
+        if domains[key] > 3:
+            domains[key] = 3
+
+    return domains
+
+
+# ---- Decade guidance messages (see messages.py) ----
+
+_DECADE_THEME_MSG = define_table({
+    "favorable": {
+        "en": "This decade tends to bring supportive opportunities and smoother progress.",
+        "zh-TW": "此十年多為順勢之運，較容易遇到助力與機會。",
+        "zh-CN": "此十年多为顺势之运，更容易遇到助力与机会。",
+        "ko": "이 10년은 지원적 기회와 순조로운 진전을 가져오는 경향이 있습니다.",
+    },
+    "neutral": {
+        "en": "This decade is relatively balanced, offering steady growth if you act consciously.",
+        "zh-TW": "此十年整體較為平衡，若能主動規劃，仍可穩健成長。",
+        "zh-CN": "此十年整体较为平衡，若能主动规划，仍可稳健成长。",
+        "ko": "이 10년은 상대적으로 균형 잡혀 있으며，의식적으로 행동하면 꾸준한 성장을 제공합니다.",
+    },
+    "testing": {
+        "en": "This decade may feel more testing, but it is powerful for inner growth and restructuring.",
+        "zh-TW": "此十年較具考驗，但也是調整體質、重整方向的關鍵期。",
+        "zh-CN": "此十年较具考验，但也是调整体质、重整方向的关键期。",
+        "ko": "이 10년은 더 시험적일 수 있지만，내적 성장과 재구조화에 강력합니다.",
+    },
+})
+
+# Per life domain, in output order: focus area, plus a caution for
+# testing decades and a recommended action otherwise
+_DOMAIN_GUIDANCE_MSG = {
+    "career": define_table({
+        "focus": {
+            "en": "Consider strategic career moves, role changes, or taking on more visible responsibilities.",
+            "zh-TW": "事業面適合做策略性布局：調整跑道、升遷或承擔更高能見度的責任。",
+            "zh-CN": "事业面适合做策略性布局：调整跑道、升迁或承担更高能见度的责任。",
+            "ko": "전략적 직업 이동，역할 변경 또는 더 눈에 띄는 책임을 맡는 것을 고려하세요.",
+        },
+        "caution": {
+            "en": "Avoid impulsive job changes; prepare skills and networks before major moves.",
+            "zh-TW": "避免衝動轉職；重大變動前先備妥技能與人脈。",
+            "zh-CN": "避免冲动跳槽；重大变动前先备妥技能与人脉。",
+            "ko": "충동적인 직업 변경을 피하고；중대한 변화 전에 기술과 인맥을 준비하세요.",
+        },
+        "action": {
+            "en": "Invest in leadership skills, reputation-building, and long-term career positioning.",
+            "zh-TW": "投資在領導力、口碑與長線職涯定位。",
+            "zh-CN": "投资在领导力、口碑与长期职业定位。",
+            "ko": "리더십，평판 구축 및 장기 직업 포지셔닝에 투자하세요.",
+        },
+    }),
+    "wealth": define_table({
+        "focus": {
+            "en": "Strengthen your financial foundation, savings, and long-term assets.",
+            "zh-TW": "財務面宜打底：儲蓄、現金流與長期資產配置。",
+            "zh-CN": "财务面宜打底：储蓄、现金流与长期资产配置。",
+            "ko": "재정 기반，저축 및 장기 자산을 강화하세요.",
+        },
+        "caution": {
+            "en": "Be conservative with debt and speculative investments; prioritize cash flow stability.",
+            "zh-TW": "保守看待負債與投機；優先維持現金流穩定。",
+            "zh-CN": "保守看待负债与投机；优先维持现金流稳定。",
+            "ko": "부채와 투기적 투자에 보수적이고；현금 흐름 안정성을 우선시하세요.",
+        },
+        "action": {
+            "en": "Plan for long-term investments and gradual asset accumulation.",
+            "zh-TW": "規劃長期投資，循序累積資產。",
+            "zh-CN": "规划长期投资，循序累积资产。",
+            "ko": "장기 투자와 점진적 자산 축적을 계획하세요.",
+        },
+    }),
+    "relationships": define_table({
+        "focus": {
+            "en": "Relationships, partnerships, and social connections are highlighted.",
+            "zh-TW": "人際／伴侶關係是重點：合作、婚戀與社交連結更受影響。",
+            "zh-CN": "人际／伴侣关系是重点：合作、婚恋与社交连结更受影响。",
+            "ko": "관계，파트너십 및 사회적 연결이 강조됩니다.",
+        },
+        "caution": {
+            "en": "Attend to communication patterns and emotional triggers to avoid unnecessary conflicts.",
+            "zh-TW": "留意溝通模式與情緒觸發點，避免無謂的衝突。",
+            "zh-CN": "留意沟通模式与情绪触发点，避免无谓的冲突。",
+            "ko": "불필요한 갈등을 피하기 위해 의사소통 패턴과 감정적 트리거에 주의하세요.",
+        },
+        "action": {
+            "en": "Deepen key relationships and nurture supportive communities around you.",
+            "zh-TW": "深化重要關係，經營能支持你的圈子與社群。",
+            "zh-CN": "深化重要关系，经营能支持你的圈子与社群。",
+            "ko": "핵심 관계를 심화하고 주변의 지원적인 공동체를 육성하세요.",
+        },
+    }),
+    "health": define_table({
+        "focus": {
+            "en": "Body, energy, and emotional resilience require attention.",
+            "zh-TW": "健康與精力管理很重要：作息、情緒韌性與壓力調節需特別留意。",
+            "zh-CN": "健康与精力管理很重要：作息、情绪韧性与压力调节需特别留意。",
+            "ko": "몸，에너지 및 감정적 회복력에 주의가 필요합니다.",
+        },
+        "caution": {
+            "en": "Avoid overwork and ignoring early health signals; build sustainable routines.",
+            "zh-TW": "避免過勞與忽視警訊；建立可長期維持的健康習慣。",
+            "zh-CN": "避免过劳与忽视信号；建立可长期维持的健康习惯。",
+            "ko": "과로와 초기 건강 신호 무시를 피하고；지속 가능한 루틴을 구축하세요.",
+        },
+        "action": {
+            "en": "Establish strong daily routines for sleep, movement, and nourishment.",
+            "zh-TW": "建立穩定的睡眠、運動與飲食規律。",
+            "zh-CN": "建立稳定的睡眠、运动与饮食规律。",
+            "ko": "수면，운동 및 영양을 위한 강력한 일상 루틴을 확립하세요.",
+        },
+    }),
+    "learning": define_table({
+        "focus": {
+            "en": "Learning, inner work, and skill-building are especially fruitful in this decade.",
+            "zh-TW": "學習與內在修練有利：進修、累積技能與找到良師益友。",
+            "zh-CN": "学习与内在修炼有利：进修、累积技能与找到良师益友。",
+            "ko": "학습，내적 수양 및 기술 구축이 이 10년에 특히 유익합니다.",
+        },
+        "action": {
+            "en": "Pursue structured learning, mentorship, or spiritual/inner development practices.",
+            "zh-TW": "建議採取結構化學習、尋找導師，或進行身心靈的內在成長練習。",
+            "zh-CN": "建议采取结构化学习、寻找导师，或进行身心灵的内在成长练习。",
+            "ko": "구조화된 학습，멘토십 또는 영적/내적 발전 실천을 추구하세요.",
+        },
+    }),
+}
+
+_DECADE_SUMMARY_MSG = define({
+    "en": "From about age {start_age} to {end_age}, focus on steady work in the highlighted areas—this decade is about building foundations for the next cycles.",
+    "zh-TW": "約在 {start_age}–{end_age} 歲之間，建議把重點放在上述面向的穩健經營；此十年適合打底，為下一輪運勢累積能量。",
+    "zh-CN": "约在 {start_age}–{end_age} 岁之间，建议把重点放在上述面向的稳健经营；此十年适合打底，为下一轮运势累积能量。",
+    "ko": "약 {start_age}–{end_age}세 사이에 강조된 영역에서 꾸준한 작업에 집중하세요—이 10년은 다음 주기를 위한 기반을 구축하는 시기입니다.",
+})
+
+
+def _build_text_guidance(
+    start_age: int,
+    end_age: int,
+    main_element: str,
+    quality: str,
+    domains: Dict[str, int],
+) -> Dict[str, List[Message] | Message]:
+    """
+    Create high-level themes, focus areas, cautions, and recommended actions
+    for a single 10-year period, as catalog Messages (rendered per language
+    by render_age_periods).
+    """
+    testing = quality in ("very_challenging", "challenging")
+    if quality in ("very_auspicious", "auspicious"):
+        theme = _DECADE_THEME_MSG["favorable"]
+    elif quality == "neutral":
+        theme = _DECADE_THEME_MSG["neutral"]
+    else:
+        theme = _DECADE_THEME_MSG["testing"]
+
+    focus_areas: List[Message] = []
+    cautions: List[Message] = []
+    actions: List[Message] = []
+
+    # Domain-based guidance
+    for domain, guidance in _DOMAIN_GUIDANCE_MSG.items():
+        if domains.get(domain, 0) < 2:
+            continue
+        focus_areas.append(Message(guidance["focus"]))
+        if testing and "caution" in guidance:
+            cautions.append(Message(guidance["caution"]))
+        else:
+            actions.append(Message(guidance["action"]))
+
+    return {
+        "summary": Message(_DECADE_SUMMARY_MSG, start_age=start_age, end_age=end_age),
+        "themes": [Message(theme)],
+        "focus_areas": focus_areas,
+        "cautions": cautions,
+        "recommended_actions": actions,
+    }
+
+
 def convert_lunar_to_solar(year: int, month: int, day: int, is_leap_month: bool = False) -> date_type:
     """
     Convert a Chinese lunar calendar date to a Gregorian solar date.
 
+    O(1) read from the memory-mapped calendar table (see calendar_table.py).
+
     Args:
-        year: Lunar year (1900-2050)
+        year: Lunar year (1900-2099)
         month: Lunar month (1-12)
         day: Lunar day (1-30)
         is_leap_month: Whether this is a leap month in the lunar calendar
@@ -636,23 +610,400 @@ def convert_lunar_to_solar(year: int, month: int, day: int, is_leap_month: bool
         ValueError: If the lunar date is invalid or out of range
     """
     try:
-        lunar = LunarDate(year, month, day, isLeapMonth=is_leap_month)
-        return lunar.toSolarDate()
+        return get_calendar_table().lunar_to_solar(year, month, day, is_leap_month)
     except Exception as e:
         raise ValueError(f"Invalid lunar date {year}-{month:02d}-{day:02d} (leap={is_leap_month}): {e}")
 
 
-def calculate_bazi(birth_date_str: str, birth_hour: int, gender: str, language: str = "en", calendar_type: str = "solar", is_leap_month: bool = False) -> Dict:
+# ==================== CHART ASSEMBLY ====================
+
+SUPPORTED_LANGUAGES = ("en", "zh-TW", "zh-CN", "ko")
+
+
+def _compute_signature_parts(indices: Tuple[int, ...]) -> Dict:
+    """
+    Chart sections determined by the four-pillar signature alone.
+
+    Everything here depends only on the eight stem/branch indices, not on
+    the birth year, gender, current year or display language, so every
+    birth sharing the same pillars shares one cached copy. The
+    analysis runs on a ChartCore; the nested four_pillars dict is only
+    expanded at the end, for the response.
+    """
+    core = ChartCore.from_indices(indices)
+
+    # Count the visible elements; weigh hidden stems and the season for analysis
+    all_elements = core.all_elements()
+    element_counts = count_elements(all_elements)
+    element_strength = element_strength_for_core(core)
+    element_analysis = get_element_balance(element_strength)
+
+    # Day master (core of the chart)
+    day_master_element = core.day_master_element
+
+    # Seasonal strength (得令/失令)
+    seasonal_strength = get_seasonal_strength(day_master_element, core.month_branch)
+
+    # Use God / Avoid God (用神 / 忌神)
+    use_god = determine_use_god_for_core(
+        core, seasonal_strength.get("strength", "neutral"), element_strength
+    )
+
+    four_pillars = core.to_four_pillars()
+
+    return {
+        "core": core,
+        "four_pillars": four_pillars,
+        "day_master": {
+            "stem_cn": four_pillars["day"]["stem"]["name_cn"],
+            "element": day_master_element,
+            "yin_yang": core.day_master_yin_yang,
+        },
+        "elements": {
+            "counts": element_counts,
+            "strength": element_strength,
+            "analysis": element_analysis,
+        },
+        "all_elements": all_elements,
+        # Ten Gods (Shi Shen)
+        "strongest_ten_god": get_strongest_ten_god_for_core(core),
+        "seasonal_strength": seasonal_strength,
+        # Deity interpretations (神煞)
+        "deities": get_deities_for_core(core),
+        "use_god": use_god,
+        # Pillar Interactions (合沖刑害), rendered per language later
+        "pillar_interactions": find_pillar_interactions_for_core(core),
+    }
+
+
+def _signature_parts(indices: Tuple[int, ...]) -> Dict:
+    """
+    _compute_signature_parts, read from the precomputed signature store
+    when it is built (signature_store.py) and computed live otherwise.
+    """
+    store = get_signature_store()
+    parts = store.signature_parts(indices) if store is not None else None
+    return parts if parts is not None else _compute_signature_parts(indices)
+
+
+def _compute_chart(birth_date: datetime, birth_hour: int, gender: str, as_of_year: int) -> Dict:
+    """
+    Language-neutral chart (everything except the per-call "input" echo).
+
+    age_periods, annual_luck and pillar_interactions hold the neutral
+    records; render_chart turns them into localized text.
+    """
+    # Calculate four pillars (one pass through the calendar kernel)
+    indices = four_pillar_indices(birth_date.date(), birth_hour)
+    parts = signature_cache.get_or_compute(indices, lambda: _signature_parts(indices))
+
+    # Calculate annual luck (as-of year pillar and interactions)
+    annual_luck = find_annual_luck(parts["core"].branch_map(), year=as_of_year)
+
+    # Calculate age-based luck periods (10-year cycles)
+    year_stem = get_stem_by_index(indices[0])
+    age_periods = compute_age_periods(
+        birth_year=birth_date.year,
+        gender=gender,
+        year_stem=year_stem,
+        year_branch=get_branch_by_index(indices[1]),
+        day_master_element=parts["day_master"]["element"],
+        start_age=get_luck_start_age(birth_date.date(), birth_hour, gender, year_stem),
+    )
+
+    return {
+        "four_pillars": parts["four_pillars"],
+        "day_master": parts["day_master"],
+        "elements": parts["elements"],
+        "age_periods": age_periods,
+        "all_elements": parts["all_elements"],
+        "strongest_ten_god": parts["strongest_ten_god"],
+        "annual_luck": annual_luck,
+        "seasonal_strength": parts["seasonal_strength"],
+        "deities": parts["deities"],
+        "use_god": parts["use_god"],
+        "pillar_interactions": parts["pillar_interactions"],
+        # How common the chart is (population_stats.py); None if not built
+        "rarity": chart_rarity(indices, parts),
+    }
+
+
+# ==================== UNKNOWN BIRTH HOUR ====================
+
+# Clock hour standing for each two-hour period (子 0:00, 丑 1:00 ... 亥 21:00);
+# any hour of a period gives the same hour pillar
+HOUR_VARIANT_HOURS = (0, 1, 3, 5, 7, 9, 11, 13, 15, 17, 19, 21)
+
+# Both clock hours of each period on the birth day; 子 holds the first and
+# the last hour of the day
+PERIOD_CLOCK_HOURS = tuple((hour, 23 if hour == 0 else hour + 1) for hour in HOUR_VARIANT_HOURS)
+
+# Hour that places the shared year and month pillars and luck-start age of
+# an hourless chart; a variant whose own hour lands on another 節 side says so
+HOURLESS_REFERENCE_HOUR = 12
+
+_STEM_ELEMENT_ARRAY = np.asarray(STEM_ELEMENT)
+_BRANCH_ELEMENT_ARRAY = np.asarray(BRANCH_ELEMENT)
+
+
+def _hour_range(hour: int) -> str:
+    """Clock range of the two-hour period of `hour` ("23:00-01:00" for 子)."""
+    start = (hour_branch(hour) * 2 - 1) % 24
+    return f"{start:02d}:00-{(start + 2) % 24:02d}:00"
+
+
+def _clock_hour_range(hour: int) -> str:
+    """Clock range of the single hour starting at `hour` ("17:00-18:00")."""
+    return f"{hour:02d}:00-{(hour + 1) % 24:02d}:00"
+
+
+def _compute_hourless_chart(birth_date: datetime, gender: str, as_of_year: int) -> Dict:
+    """
+    Language-neutral chart for a birth whose hour is unknown.
+
+    The year, month and day pillars and everything drawn from them alone
+    (day master, seasonal strength, their interactions and the deities
+    every hour shares) are returned once. Each two-hour period then gets a
+    compact delta under "hour_variants": its pillar, element counts and
+    strength, use god, strongest Ten God, luck-start age, and the
+    interactions and deities it adds. On a day a 節 falls on, the hours
+    past it also carry their month pillar and seasonal strength, and past
+    立春 their year pillar and age periods.
+
+    A variant matches calculate_bazi at both clock hours of its hour_range.
+    When a 節 (or a luck-start rounding step) falls between the two, the
+    period is split into one variant per clock hour, so a day has 12 to
+    24 variants.
+
+    The pillars and luck-start ages of all 24 clock hours come from one
+    vectorized calendar pass; element strength, use god, strongest Ten
+    God, deities and interaction lookups of the variants are each one
+    batch over the variant arrays.
+    """
+    d = birth_date.date()
+    clock_hours = np.arange(24, dtype=np.int64)
+    pillars = np.stack(compute_four_pillars(np.full(24, np.datetime64(d, "D")), clock_hours), axis=1)
+    reference = tuple(int(i) for i in pillars[HOURLESS_REFERENCE_HOUR])
+
+    # Luck runs the way of each hour's own year stem
+    timestamps = birth_timestamps([d] * 24, clock_hours)
+    year_stems = pillars[:, 0]
+    forward = np.zeros(24, dtype=bool)
+    for s in np.unique(year_stems).tolist():
+        forward[year_stems == s] = _get_luck_direction(gender, get_stem_by_index(s)) == 1
+    luck_ages = np.rint(np.where(
+        forward,
+        get_solar_term_table().luck_start_ages(timestamps, True),
+        get_solar_term_table().luck_start_ages(timestamps, False),
+    )).astype(np.int64)
+
+    # ---- one variant per period, two where its clock hours disagree ----
+    first, second = (np.array(hours) for hours in zip(*PERIOD_CLOCK_HOURS))
+    uniform = (pillars[first] == pillars[second]).all(axis=1) & (luck_ages[first] == luck_ages[second])
+    variant_hours: List[int] = []
+    hour_ranges: List[str] = []
+    for (a, b), whole in zip(PERIOD_CLOCK_HOURS, uniform.tolist()):
+        if whole:
+            variant_hours.append(a)
+            hour_ranges.append(_hour_range(a))
+        else:
+            for hour in sorted((a, b)):
+                variant_hours.append(hour)
+                hour_ranges.append(_clock_hour_range(hour))
+    variants = pillars[variant_hours]
+    stems, branches = variants[:, 0::2], variants[:, 1::2]
+
+    # ---- hour-invariant core ----
+    core = ChartCore.from_indices(reference)
+    stem_map = {pn: s for pn, s in core.stem_map().items() if pn != "hour"}
+    branch_map = {pn: b for pn, b in core.branch_map().items() if pn != "hour"}
+    core_interactions = find_pillar_interactions(stem_map, branch_map)
+    year_stem = get_stem_by_index(reference[0])
+    core_seasonal = get_seasonal_strength(core.day_master_element, core.month_branch)
+
+    # ---- variants, vectorized ----
+    elements = np.concatenate([_STEM_ELEMENT_ARRAY[stems], _BRANCH_ELEMENT_ARRAY[branches]], axis=1)
+    counts = (elements[:, :, None] == np.arange(5)).sum(axis=1)
+    strength = element_strength_matrix(stems, branches).round(2)
+
+    seasonal = [
+        core_seasonal["strength"] if month == core.month_branch
+        else get_seasonal_strength(core.day_master_element, month)["strength"]
+        for month in branches[:, 1].tolist()
+    ]
+    # Scored from the rounded strength, exactly as a full chart is
+    use_gods = use_god_summaries(np.full(len(variants), STEM_ELEMENT[core.day_master]), seasonal, strength)
+    strongest = strongest_ten_gods(stems, branches)
+    variant_deities = [deities_from_codes(codes) for codes in deity_code_matrix(stems, branches).tolist()]
+    shared_deities = [
+        deity for deity in variant_deities[0] if all(deity in other for other in variant_deities[1:])
+    ]
+    variant_interactions = find_pillar_interactions_for_charts(stems, branches)
+
+    day_stem = core.day_master
+    hour_variants = []
+    for i, (hour, hour_range, (ys, ms, _, hs), (yb, mb, _, hb)) in enumerate(
+        zip(variant_hours, hour_ranges, stems.tolist(), branches.tolist())
+    ):
+        interactions = variant_interactions[i]
+        delta = {
+            "birth_hour": hour,
+            "hour_range": hour_range,
+            "hour_pillar": shared_pillar_dict(day_stem, hs, hb),
+        }
+        if ys != core.stems[0]:
+            # 立春 falls on the birth day: this hour is in the other year
+            delta["year_pillar"] = shared_pillar_dict(day_stem, ys, yb)
+            delta["age_periods"] = compute_age_periods(
+                birth_year=birth_date.year,
+                gender=gender,
+                year_stem=get_stem_by_index(ys),
+                year_branch=get_branch_by_index(yb),
+                day_master_element=core.day_master_element,
+                start_age=int(luck_ages[hour]),
+            )
+        if ms != core.stems[1] or mb != core.branches[1]:
+            # A 節 falls on the birth day: this hour is in the other month
+            delta["month_pillar"] = shared_pillar_dict(day_stem, ms, mb)
+            delta["seasonal_strength"] = seasonal[i]
+        delta["elements"] = {
+            "counts": dict(zip(ELEMENTS, counts[i].tolist())),
+            "strength": dict(zip(ELEMENTS, strength[i].tolist())),
+        }
+        delta["use_god"] = use_gods[i]
+        delta["strongest_ten_god"] = strongest[i]
+        delta["luck_start_age"] = int(luck_ages[hour])
+        delta["deities"] = [deity for deity in variant_deities[i] if deity not in shared_deities]
+        delta["pillar_interactions"] = {
+            # Interactions this hour adds, and the positions of the core
+            # interactions it supersedes (a partial group it completes)
+            "added": [
+                item for item in interactions["interactions"]
+                if item not in core_interactions["interactions"]
+            ],
+            "superseded": [
+                j for j, item in enumerate(core_interactions["interactions"])
+                if item not in interactions["interactions"]
+            ],
+            "summary": interactions["summary"],
+        }
+        hour_variants.append(delta)
+
+    return {
+        "four_pillars": {
+            pn: shared_pillar_dict(day_stem, core.stems[i], core.branches[i])
+            for i, pn in enumerate(PILLAR_NAMES[:3])
+        },
+        "day_master": {
+            "stem_cn": STEM_NAMES_CN[reference[4]],
+            "element": core.day_master_element,
+            "yin_yang": core.day_master_yin_yang,
+        },
+        # Hour-dependent sections live in hour_variants
+        "elements": None,
+        "age_periods": compute_age_periods(
+            birth_year=birth_date.year,
+            gender=gender,
+            year_stem=year_stem,
+            year_branch=get_branch_by_index(reference[1]),
+            day_master_element=core.day_master_element,
+            start_age=int(luck_ages[HOURLESS_REFERENCE_HOUR]),
+        ),
+        "all_elements": [
+            element for pn in PILLAR_NAMES[:3] for element in (
+                STEM_ELEMENTS[stem_map[pn]], BRANCH_ELEMENTS[branch_map[pn]],
+            )
+        ],
+        "strongest_ten_god": None,
+        "annual_luck": find_annual_luck(branch_map, year=as_of_year),
+        "seasonal_strength": core_seasonal,
+        "deities": shared_deities,
+        "use_god": None,
+        "pillar_interactions": core_interactions,
+        "hour_variants": hour_variants,
+    }
+
+
+def _render_hour_variants(variants: List[Dict], language: str) -> List[Dict]:
+    """Localize the added interactions (and own age periods) of each hour variant."""
+    rendered = []
+    for variant in variants:
+        interactions = variant["pillar_interactions"]
+        item = {
+            **variant,
+            "pillar_interactions": {
+                **interactions,
+                "added": render_pillar_interactions(
+                    {"interactions": interactions["added"], "summary": {}}, language
+                )["interactions"],
+            },
+        }
+        if "age_periods" in variant:
+            item["age_periods"] = render_age_periods(variant["age_periods"], language)
+        rendered.append(item)
+    return rendered
+
+
+def render_chart(chart: Dict, language: str = "en") -> Dict:
+    """
+    Localization pass: attach the display-language text to a neutral chart.
+
+    Only the three text-bearing sections are rebuilt; everything else is
+    shared with the neutral chart as-is.
+    """
+    rendered = {
+        **chart,
+        "age_periods": render_age_periods(chart["age_periods"], language),
+        "annual_luck": render_annual_luck(chart["annual_luck"], language),
+        "pillar_interactions": render_pillar_interactions(chart["pillar_interactions"], language),
+    }
+    if "hour_variants" in chart:
+        rendered["hour_variants"] = _render_hour_variants(chart["hour_variants"], language)
+    return rendered
+
+
+def _parse_birth_date(
+    birth_date_str: str,
+    calendar_type: str = "solar",
+    is_leap_month: bool = False,
+) -> Tuple[datetime, str, Optional[str]]:
+    """(solar birth datetime, solar date string, lunar date string or None)."""
+    parsed = datetime.strptime(birth_date_str, "%Y-%m-%d")
+    if calendar_type == "lunar":
+        # Convert lunar -> solar
+        solar = convert_lunar_to_solar(parsed.year, parsed.month, parsed.day, is_leap_month)
+        return datetime(solar.year, solar.month, solar.day), solar.strftime("%Y-%m-%d"), birth_date_str
+    return parsed, birth_date_str, None
+
+
+def calculate_bazi(
+    birth_date_str: str,
+    birth_hour: Optional[int],
+    gender: str,
+    language: str = "en",
+    calendar_type: str = "solar",
+    is_leap_month: bool = False,
+    as_of_year: Optional[int] = None,
+) -> Dict:
     """
     Calculate complete BAZI chart for a person
 
+    The chart is computed once per birth, independent of language, and a
+    cheap render pass attaches the localized text, so asking for the same
+    chart in another language only re-renders it. Results are memoized
+    (see chart_cache.py) and returned read-only; use chart_cache.thaw() to
+    get a mutable copy.
+
     Args:
         birth_date_str: Birth date as "YYYY-MM-DD"
-        birth_hour: Birth hour (0-23)
+        birth_hour: Birth hour (0-23), or None if unknown: the chart then
+            holds the hour-invariant core plus one delta per two-hour period
+            under "hour_variants" (see _compute_hourless_chart)
         gender: "male" or "female"
         language: Display language
         calendar_type: "solar" (Gregorian) or "lunar" (Chinese lunar calendar)
         is_leap_month: Whether the lunar month is a leap month (ignored for solar)
+        as_of_year: Year used for the annual luck pillar (default: current year)
 
     Returns:
         Complete BAZI chart dictionary
@@ -660,144 +1011,124 @@ def calculate_bazi(birth_date_str: str, birth_hour: int, gender: str, language:
     Example:
         calculate_bazi("1990-05-15", 14, "male")
         calculate_bazi("1990-04-15", 14, "male", calendar_type="lunar")
+        calculate_bazi("1990-05-15", None, "male")  # birth hour unknown
     """
     try:
-        # Parse input date
-        parsed = datetime.strptime(birth_date_str, "%Y-%m-%d")
-        lunar_date_str = None
-        solar_date_str = None
-
-        if calendar_type == "lunar":
-            # Convert lunar -> solar
-            lunar_date_str = birth_date_str
-            solar = convert_lunar_to_solar(parsed.year, parsed.month, parsed.day, is_leap_month)
-            solar_date_str = solar.strftime("%Y-%m-%d")
-            birth_date = datetime(solar.year, solar.month, solar.day)
-        else:
-            solar_date_str = birth_date_str
-            birth_date = parsed
-
-        year = birth_date.year
-        month = birth_date.month
-        day = birth_date.day
-        
-        # Calculate four pillars
-        year_stem, year_branch = get_year_stem_branch(year)
-        month_stem, month_branch = get_month_stem_branch(year, month)
-        day_stem, day_branch = get_day_stem_branch(year, month, day)
-        hour_stem, hour_branch = get_hour_stem_branch(day_stem, birth_hour)
-        
-        # Convert to dictionary format
-        four_pillars = {
-            "year": {
-                "stem": stem_to_dict(year_stem),
-                "branch": branch_to_dict(year_branch),
-            },
-            "month": {
-                "stem": stem_to_dict(month_stem),
-                "branch": branch_to_dict(month_branch),
-            },
-            "day": {
-                "stem": stem_to_dict(day_stem),
-                "branch": branch_to_dict(day_branch),
-            },
-            "hour": {
-                "stem": stem_to_dict(hour_stem),
-                "branch": branch_to_dict(hour_branch),
-            },
-        }
-        
-        # Extract elements from all pillars
-        all_elements = []
-        for pillar_name in ["year", "month", "day", "hour"]:
-            pillar = four_pillars[pillar_name]
-            all_elements.append(pillar["stem"]["element"])
-            all_elements.append(pillar["branch"]["element"])
-        
-        # Count and analyze elements
-        element_counts = count_elements(all_elements)
-        element_analysis = get_element_balance(element_counts)
-        
-        # Determine day master (core of the chart)
-        day_master_stem = four_pillars["day"]["stem"]["name_cn"]
-        day_master_element = four_pillars["day"]["stem"]["element"]
-        day_master_dict = {
-            "element": day_master_element,
-            "yin_yang": four_pillars["day"]["stem"]["yin_yang"],
-        }
+        birth_date, solar_date_str, lunar_date_str = _parse_birth_date(
+            birth_date_str, calendar_type, is_leap_month
+        )
 
-        # Annotate four pillars with Hidden Stems (藏干)
-        annotate_four_pillars_with_hidden_stems(four_pillars)
+        if as_of_year is None:
+            as_of_year = datetime.now().year
 
-        # Annotate four pillars with Ten Gods (Shi Shen)
-        annotate_four_pillars_with_ten_gods(four_pillars, day_master_dict)
-        strongest_ten_god = get_strongest_ten_god(four_pillars)
+        lang = language if language in SUPPORTED_LANGUAGES else "en"
 
-        # Calculate annual luck (current year pillar and interactions)
-        annual_luck = calculate_annual_luck(four_pillars, language=language)
+        # Canonical key: the exact hour places the birth relative to the
+        # solar terms; the gender only matters through the luck direction
+        key = (
+            birth_date.date(),
+            birth_hour,
+            (gender or "").lower() == "male",
+            as_of_year,
+        )
 
-        # Seasonal strength (得令/失令)
-        month_branch_name = four_pillars["month"]["branch"].get("name_cn", "")
-        month_branch_enum = BRANCH_NAME_TO_ENUM.get(month_branch_name)
-        month_branch_index = BRANCH_INDEX.get(month_branch_enum, 0) if month_branch_enum else 0
-        seasonal_strength = get_seasonal_strength(day_master_element, month_branch_index)
+        def _compute():
+            if birth_hour is None:
+                return _compute_hourless_chart(birth_date, gender, as_of_year)
+            return _compute_chart(birth_date, birth_hour, gender, as_of_year)
 
-        # Deity interpretations (神煞)
-        deities = get_deities_for_chart(four_pillars, day_master_dict)
-
-        # Use God / Avoid God (用神 / 忌神)
-        use_god = determine_use_god(
-            day_master_element=day_master_element,
-            element_counts=element_counts,
-            seasonal_strength_str=seasonal_strength.get("strength", "neutral"),
-            four_pillars=four_pillars,
-        )
+        def _render():
+            neutral = neutral_cache.get_or_compute(key, _compute)
+            return render_chart(neutral, lang)
 
-        # Pillar Interactions (合沖刑害)
-        pillar_interactions = analyze_pillar_interactions(four_pillars, language=language)
+        chart = chart_cache.get_or_compute((*key, lang), _render)
 
-        # Calculate age-based luck periods (10-year cycles)
-        age_periods = calculate_age_periods(
-            birth_date=birth_date,
-            gender=gender,
-            year_stem=year_stem,
-            year_branch=year_branch,
-            day_master_element=day_master_element,
-            language=language,
-        )
-        
-        return {
+        return FrozenDict({
             "success": True,
-            "input": {
+            "input": freeze({
                 "birth_date": solar_date_str,
                 "birth_hour": birth_hour,
                 "gender": gender,
-                "birth_hour_name": f"{birth_hour}:00",
+                "birth_hour_name": None if birth_hour is None else f"{birth_hour}:00",
                 "calendar_type": calendar_type,
                 "solar_date": solar_date_str,
                 "lunar_date": lunar_date_str,
                 "is_leap_month": is_leap_month if calendar_type == "lunar" else None,
-            },
-            "four_pillars": four_pillars,
-            "day_master": {
-                "stem_cn": day_master_stem,
-                "element": day_master_element,
-                "yin_yang": four_pillars["day"]["stem"]["yin_yang"],
-            },
-            "elements": {
-                "counts": element_counts,
-                "analysis": element_analysis,
-            },
-            "age_periods": age_periods,
-            "all_elements": all_elements,
-            "strongest_ten_god": strongest_ten_god,
-            "annual_luck": annual_luck,
-            "seasonal_strength": seasonal_strength,
-            "deities": deities,
-            "use_god": use_god,
-            "pillar_interactions": pillar_interactions,
+            }),
+            **chart,
+        })
+
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": f"Invalid input: {str(e)}"
         }
-        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Calculation error: {str(e)}"
+        }
+
+
+# ==================== LUCK TIMELINE ====================
+
+def calculate_luck_timeline(
+    birth_date_str: str,
+    birth_hour: Optional[int],
+    gender: str,
+    calendar_type: str = "solar",
+    is_leap_month: bool = False,
+    as_of_year: Optional[int] = None,
+    years: int = TIMELINE_YEARS,
+) -> Dict:
+    """
+    Year-by-year luck pillar / annual pillar grid of a lifespan.
+
+    See luck_timeline.compute_luck_timeline for the row layout. The luck
+    pillars match age_periods of calculate_bazi, extended past the eighth
+    period to cover the whole grid. With birth_hour None the luck-start age
+    uses HOURLESS_REFERENCE_HOUR and the hour branch is left out of the flags.
+
+    Args:
+        birth_date_str: Birth date as "YYYY-MM-DD"
+        birth_hour: Birth hour (0-23), or None if unknown
+        gender: "male" or "female"
+        calendar_type: "solar" or "lunar"
+        is_leap_month: Whether the lunar month is a leap month (ignored for solar)
+        as_of_year: Year marked as current (default: current year)
+        years: Number of years covered, from the birth year
+
+    Returns:
+        Timeline dict (read-only, memoized per birth, as_of_year and span)
+    """
+    try:
+        birth_date, _, _ = _parse_birth_date(birth_date_str, calendar_type, is_leap_month)
+        if as_of_year is None:
+            as_of_year = datetime.now().year
+        if not 1 <= years <= 200:
+            raise ValueError(f"years must be between 1 and 200, got {years}")
+
+        is_male = (gender or "").lower() == "male"
+        key = (birth_date.date(), birth_hour, is_male, as_of_year, years)
+
+        def _compute():
+            hour = HOURLESS_REFERENCE_HOUR if birth_hour is None else birth_hour
+            ys, yb, _, mb, ds, db, _, hb = four_pillar_indices(birth_date.date(), hour)
+            year_stem = get_stem_by_index(ys)
+            return compute_luck_timeline(
+                birth_year=birth_date.year,
+                year_stem=ys,
+                year_branch=yb,
+                day_stem=ds,
+                natal_branches=(yb, mb, db, None if birth_hour is None else hb),
+                forward=_get_luck_direction(gender, year_stem) == 1,
+                start_age=get_luck_start_age(birth_date.date(), hour, gender, year_stem),
+                as_of_year=as_of_year,
+                years=years,
+            )
+
+        return FrozenDict({"success": True, **timeline_cache.get_or_compute(key, _compute)})
+
     except ValueError as e:
         return {
             "success": False,
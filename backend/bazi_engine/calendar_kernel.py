@@ -0,0 +1,199 @@
+"""
+Sexagenary Calendar Kernel (干支曆法核心)
+
+Pure index arithmetic for the Four Pillars. Every pillar function works on
+plain ints *and* on NumPy integer arrays, so a single birth and a batch of
+a million births go through exactly the same formulas — no per-year or
+per-month Python loops, constant time per element.
+
+Indices follow stems_branches: stems 0-9 (甲..癸), branches 0-11 (子..亥).
+
+Year and month pillars of births come from the solar-term boundaries
+(see solar_terms.py): one binary search over a precomputed table, also
+vectorized. Both turn at 立春, so a birth in January or early February
+takes the previous year's pillar and that year's 丑 (or 子) month, never
+a year/month pair the calendar cannot produce.
+"""
+
+from datetime import date
+from typing import NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+GREGORIAN_EPOCH = 1900  # Year 1900 (庚子) is position 0 of the year cycle
+
+# Day 0 of the day cycle: Jan 1, 1900 = sexagenary position 0 (甲子)
+EPOCH_DATE = date(GREGORIAN_EPOCH, 1, 1)
+_EPOCH_ORDINAL = EPOCH_DATE.toordinal()
+_EPOCH_DAY64 = np.datetime64(EPOCH_DATE.isoformat(), "D")
+
+IntOrArray = Union[int, np.ndarray]
+
+
+class PillarArrays(NamedTuple):
+    """Stem/branch index arrays for the Four Pillars of a batch of births."""
+    year_stem: np.ndarray
+    year_branch: np.ndarray
+    month_stem: np.ndarray
+    month_branch: np.ndarray
+    day_stem: np.ndarray
+    day_branch: np.ndarray
+    hour_stem: np.ndarray
+    hour_branch: np.ndarray
+
+
+# ==================== DAY NUMBERS ====================
+
+def day_number(d: date) -> int:
+    """Days elapsed since Jan 1, 1900 for a single date."""
+    return d.toordinal() - _EPOCH_ORDINAL
+
+
+def day_numbers(dates) -> np.ndarray:
+    """
+    Days elapsed since Jan 1, 1900 for an array of dates.
+
+    Args:
+        dates: datetime64 array, or any sequence of date objects / ISO strings
+
+    Returns:
+        int64 array
+    """
+    arr = np.asarray(dates, dtype="datetime64[D]")
+    return (arr - _EPOCH_DAY64).astype(np.int64)
+
+
+def split_dates(dates) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (years, months) int64 arrays for an array of dates."""
+    arr = np.asarray(dates, dtype="datetime64[D]")
+    years = arr.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = arr.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return years, months
+
+
+# ==================== PILLAR FORMULAS ====================
+
+def year_pillar(year: IntOrArray) -> Tuple[IntOrArray, IntOrArray]:
+    """
+    (stem, branch) indices of the pillar of a year; repeats every 60 years.
+
+    Births take it for their solar year (the year whose 立春 has passed,
+    see SolarTermTable.year_month_pillars); annual luck uses it for the
+    calendar year.
+    """
+    position = (year - GREGORIAN_EPOCH) % 60
+    return position % 10, position % 12
+
+
+def month_pillar(year: IntOrArray, month: IntOrArray) -> Tuple[IntOrArray, IntOrArray]:
+    """
+    (stem, branch) indices of a Gregorian-month approximation of the month
+    pillar, kept for get_month_stem_branch. Charts use the solar-term month
+    (solar_terms.SolarTermTable.month_pillar).
+
+    The month stem starts from twice the year stem; the branch maps solar
+    month 1-2 to 子/丑, 3-4 to 寅/卯, and so on.
+    """
+    year_stem = (year - GREGORIAN_EPOCH) % 10
+    stem = (year_stem * 2 + (month - 1) % 12) % 10
+    branch = (month + 10) % 12
+    return stem, branch
+
+
+def solar_month_pillar(solar_year: IntOrArray, month_offset: IntOrArray) -> Tuple[IntOrArray, IntOrArray]:
+    """
+    (stem, branch) indices of a solar-term month.
+
+    Args:
+        solar_year: Year whose 立春 opened the month's cycle
+        month_offset: 0 for the 寅 month (立春) ... 11 for the 丑 month (小寒)
+
+    The stem follows 五虎遁: the 寅 month stem is twice the year stem plus 2.
+    """
+    year_stem = (solar_year - GREGORIAN_EPOCH) % 10
+    stem = (year_stem * 2 + 2 + month_offset) % 10
+    branch = (month_offset + 2) % 12
+    return stem, branch
+
+
+def day_pillar(day_num: IntOrArray) -> Tuple[IntOrArray, IntOrArray]:
+    """(stem, branch) indices of the day pillar for a day number."""
+    position = day_num % 60
+    return position % 10, position % 12
+
+
+def hour_branch(hour: IntOrArray) -> IntOrArray:
+    """Branch index of the two-hour period (23:00-01:00 = 子)."""
+    return (hour % 24 + 1) // 2 % 12
+
+
+def hour_pillar(day_stem: IntOrArray, hour: IntOrArray) -> Tuple[IntOrArray, IntOrArray]:
+    """(stem, branch) indices of the hour pillar; the stem follows the day stem."""
+    branch = hour_branch(hour)
+    stem = ((day_stem // 2) * 2 + branch // 2) % 10
+    return stem, branch
+
+
+# ==================== BATCH / SINGLE ENTRY POINTS ====================
+
+def compute_four_pillars(dates, hours) -> PillarArrays:
+    """
+    Compute all four pillars for a batch of births in one vectorized pass.
+
+    Args:
+        dates: Solar birth dates (datetime64 array or sequence of dates)
+        hours: Birth hours 0-23 (scalar or array broadcastable to dates)
+
+    Returns:
+        PillarArrays of int64 index arrays
+    """
+    from .solar_terms import birth_timestamps, get_solar_term_table
+
+    hours = np.asarray(hours, dtype=np.int64)
+
+    year_stem, year_branch, month_stem, month_branch = (
+        get_solar_term_table().year_month_pillars(birth_timestamps(dates, hours))
+    )
+    day_stem, day_branch = day_pillar(day_numbers(dates))
+    hour_stem, hour_br = hour_pillar(day_stem, hours)
+
+    return PillarArrays(
+        year_stem, year_branch,
+        month_stem, month_branch,
+        day_stem, day_branch,
+        hour_stem, hour_br,
+    )
+
+
+def four_pillar_indices(d: date, hour: int) -> Tuple[int, ...]:
+    """
+    Scalar counterpart of compute_four_pillars for a single birth.
+
+    Returns:
+        (year_stem, year_branch, month_stem, month_branch,
+         day_stem, day_branch, hour_stem, hour_branch)
+    """
+    from .solar_terms import birth_timestamp, get_solar_term_table
+
+    year_stem, year_branch, month_stem, month_branch = (
+        get_solar_term_table().year_month_pillars(birth_timestamp(d, hour))
+    )
+    day_stem, day_branch = day_pillar(day_number(d))
+    hour_stem, hour_br = hour_pillar(day_stem, hour)
+    return (
+        int(year_stem), int(year_branch),
+        int(month_stem), int(month_branch),
+        day_stem, day_branch,
+        hour_stem, hour_br,
+    )
+
+
+def day_pillars_for_range(start: date, days: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(stem, branch) index arrays for `days` consecutive dates from `start`."""
+    return day_pillar(np.arange(days, dtype=np.int64) + day_number(start))
+
+
+def hour_stems_for_day(day_stem: int, hours: Sequence[int]) -> np.ndarray:
+    """Hour stem indices for the given hours of a day with `day_stem`."""
+    stems, _ = hour_pillar(day_stem, np.asarray(hours, dtype=np.int64))
+    return stems
@@ -0,0 +1,201 @@
+"""
+Precomputed Calendar Table (萬年曆) for 1900-2100
+
+One binary file indexed by day number (days since Jan 1, 1900) holding,
+for every solar day, its day-pillar position in the 60-cycle and its
+Chinese lunar date (year, month, day, leap flag). A second section maps
+each lunar month to the day number of its first day, so lunar -> solar and
+solar -> lunar conversion are both O(1) array reads.
+
+The file is opened with np.memmap, so all workers share one copy through
+the page cache and no Python objects are created per lookup.
+
+File layout (little-endian):
+    header   48 bytes  magic, engine hash, first lunar year, #days, #lunar years
+    days     #days x DAY_DTYPE
+    months   #lunar years x 13 int32 (months 1-12, then the leap month)
+"""
+
+import struct
+import threading
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .calendar_kernel import EPOCH_DATE, day_number
+from .table_store import ENGINE_HASH, check_header, table_path, write_atomic
+
+TABLE_FILENAME = "calendar_1900_2100.bin"
+
+_MAGIC = b"BAZICAL1"
+_HEADER = struct.Struct("<8s16siii12x")  # 48 bytes
+
+LAST_SOLAR_DATE = date(2100, 12, 31)
+FIRST_LUNAR_YEAR = 1900
+LAST_LUNAR_YEAR = 2099  # lunardate covers lunar years [1900, 2100)
+
+LEAP_SLOT = 12  # months section: slots 0-11 = months 1-12, slot 12 = leap month
+
+DAY_DTYPE = np.dtype([
+    ("day_cycle", "u1"),     # position in the 60-day cycle (0 = 甲子)
+    ("lunar_month", "u1"),   # 1-12, 0 = outside lunar coverage
+    ("lunar_day", "u1"),     # 1-30
+    ("lunar_leap", "u1"),    # 1 if the lunar month is a leap month
+    ("lunar_year", "<u2"),   # e.g. 1990, 0 = outside lunar coverage
+])
+
+
+class CalendarTable:
+    """Read-only view over the calendar table (memory-mapped or in-memory)."""
+
+    def __init__(self, days: np.ndarray, month_starts: np.ndarray, first_lunar_year: int):
+        self.days = days
+        self.month_starts = month_starts
+        self.first_lunar_year = first_lunar_year
+
+    # ---- loading ----
+
+    @classmethod
+    def open(cls, path: str) -> "CalendarTable":
+        """Memory-map an existing table file."""
+        with open(path, "rb") as fh:
+            magic, engine_hash, first_lunar_year, n_days, n_years = _HEADER.unpack(fh.read(_HEADER.size))
+        check_header(path, magic, _MAGIC, engine_hash, "calendar table")
+
+        days_offset = _HEADER.size
+        months_offset = days_offset + n_days * DAY_DTYPE.itemsize
+        days = np.memmap(path, dtype=DAY_DTYPE, mode="r", offset=days_offset, shape=(n_days,))
+        months = np.memmap(path, dtype="<i4", mode="r", offset=months_offset, shape=(n_years, 13))
+        return cls(days, months, first_lunar_year)
+
+    # ---- solar -> lunar ----
+
+    def solar_to_lunar(self, d: date) -> Optional[Tuple[int, int, int, bool]]:
+        """
+        Lunar date of a solar date.
+
+        Returns:
+            (lunar_year, lunar_month, lunar_day, is_leap_month), or None when
+            the date is outside the table's lunar coverage
+        """
+        num = day_number(d)
+        if not 0 <= num < len(self.days):
+            return None
+        rec = self.days[num]
+        if rec["lunar_year"] == 0:
+            return None
+        return int(rec["lunar_year"]), int(rec["lunar_month"]), int(rec["lunar_day"]), bool(rec["lunar_leap"])
+
+    def day_cycle(self, d: date) -> int:
+        """Day-pillar position (0-59) of a solar date."""
+        num = day_number(d)
+        if not 0 <= num < len(self.days):
+            raise ValueError(f"Date {d.isoformat()} is outside the calendar table")
+        return int(self.days[num]["day_cycle"])
+
+    # ---- lunar -> solar ----
+
+    def lunar_to_solar(self, year: int, month: int, day: int, is_leap_month: bool = False) -> date:
+        """
+        Solar date of a lunar date.
+
+        Raises:
+            ValueError: If the lunar date does not exist or is out of range
+        """
+        row = year - self.first_lunar_year
+        if not 0 <= row < len(self.month_starts):
+            raise ValueError(f"year out of range [{FIRST_LUNAR_YEAR}, {LAST_LUNAR_YEAR + 1})")
+        if not 1 <= month <= 12:
+            raise ValueError("month out of range")
+
+        start = int(self.month_starts[row, LEAP_SLOT if is_leap_month else month - 1])
+        if start < 0 or (is_leap_month and self.days[start]["lunar_month"] != month):
+            raise ValueError("month out of range")
+
+        num = start + day - 1
+        if day < 1 or num >= len(self.days) or self.days[num]["lunar_day"] != day \
+                or self.days[num]["lunar_month"] != month:
+            raise ValueError("day out of range")
+        return EPOCH_DATE + timedelta(days=num)
+
+
+# ==================== BUILD ====================
+
+def build_arrays() -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the day records and lunar month starts with lunardate."""
+    from lunardate import LunarDate
+
+    n_days = day_number(LAST_SOLAR_DATE) + 1
+    days = np.zeros(n_days, dtype=DAY_DTYPE)
+    days["day_cycle"] = np.arange(n_days) % 60
+
+    n_years = LAST_LUNAR_YEAR - FIRST_LUNAR_YEAR + 1
+    month_starts = np.full((n_years, 13), -1, dtype="<i4")
+
+    for year in range(FIRST_LUNAR_YEAR, LAST_LUNAR_YEAR + 1):
+        for month in range(1, 13):
+            for leap in (False, True):
+                try:
+                    first = LunarDate(year, month, 1, leap).toSolarDate()
+                except ValueError:
+                    continue  # no leap month here
+                try:
+                    LunarDate(year, month, 30, leap)
+                    length = 30
+                except ValueError:
+                    length = 29
+
+                start = day_number(first)
+                month_starts[year - FIRST_LUNAR_YEAR, LEAP_SLOT if leap else month - 1] = start
+                span = slice(start, start + length)
+                days["lunar_year"][span] = year
+                days["lunar_month"][span] = month
+                days["lunar_day"][span] = np.arange(1, length + 1)
+                days["lunar_leap"][span] = int(leap)
+
+    return days, month_starts
+
+
+def build_table(path: Optional[str] = None) -> str:
+    """Build the calendar table file; returns its path."""
+    path = path or table_path(TABLE_FILENAME)
+    days, month_starts = build_arrays()
+
+    def _write(fh):
+        fh.write(_HEADER.pack(_MAGIC, ENGINE_HASH, FIRST_LUNAR_YEAR, len(days), len(month_starts)))
+        fh.write(days.tobytes())
+        fh.write(month_starts.tobytes())
+
+    write_atomic(path, _write)
+    return path
+
+
+# ==================== SHARED INSTANCE ====================
+
+_table: Optional[CalendarTable] = None
+_table_lock = threading.Lock()
+
+
+def get_calendar_table() -> CalendarTable:
+    """
+    Return the process-wide calendar table.
+
+    Maps the table file, building it first if it is missing or stale. If the data
+    directory is not writable the table is built in memory instead.
+    """
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                path = table_path(TABLE_FILENAME)
+                try:
+                    try:
+                        _table = CalendarTable.open(path)
+                    except (FileNotFoundError, ValueError):
+                        build_table(path)
+                        _table = CalendarTable.open(path)
+                except OSError:
+                    days, month_starts = build_arrays()
+                    _table = CalendarTable(days, month_starts, FIRST_LUNAR_YEAR)
+    return _table
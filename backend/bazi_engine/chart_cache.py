@@ -0,0 +1,168 @@
+"""
+Chart Cache (命盤快取)
+
+Bounded, thread-safe LRU caches for calculate_bazi. A chart is fully
+determined by its normalized input, so repeated requests for the same
+birth data (analysis, chart, compatibility and every daily forecast) are
+served from memory instead of being recomputed. The language-neutral
+chart is cached separately from its rendered form, so a language switch
+only costs a render pass.
+
+Cached values are frozen: dicts become FrozenDict and lists become tuples,
+so a caller can never corrupt an entry that other requests share. Both
+still serialize to the same JSON as before. Callers that need to edit a
+chart can take a mutable deep copy with thaw() or copy.deepcopy().
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class FrozenDict(dict):
+    """Read-only dict; any mutation raises TypeError."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached BAZI charts are read-only; use thaw() for a mutable copy")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples."""
+    if isinstance(value, dict):
+        if isinstance(value, FrozenDict):
+            return value
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a frozen value (FrozenDict -> dict, tuple -> list)."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss/eviction counters."""
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        The computed value is frozen before it is stored. Exceptions from
+        compute propagate and nothing is cached.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Compute outside the lock; two threads racing on one key simply
+        # store the same (deterministic) value twice.
+        value = freeze(compute())
+
+        if self.maxsize <= 0:
+            return value
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# ==================== SHARED CACHES ====================
+
+# Rendered charts: canonical input (solar date, hour branch, gender, as-of year) + language
+CHART_CACHE_SIZE = int(os.environ.get("BAZI_CHART_CACHE_SIZE", "4096"))
+# Language-neutral charts: canonical input without the language
+NEUTRAL_CACHE_SIZE = int(os.environ.get("BAZI_NEUTRAL_CACHE_SIZE", "4096"))
+# Four-pillar signature (everything not tied to birth year, gender or language)
+SIGNATURE_CACHE_SIZE = int(os.environ.get("BAZI_SIGNATURE_CACHE_SIZE", "8192"))
+# Luck timelines: canonical input + as-of year + span
+TIMELINE_CACHE_SIZE = int(os.environ.get("BAZI_TIMELINE_CACHE_SIZE", "1024"))
+# Natal interaction states (interaction_layers): natal stem / branch indices
+INTERACTION_STATE_CACHE_SIZE = int(os.environ.get("BAZI_INTERACTION_STATE_CACHE_SIZE", "8192"))
+# Daily forecast score tables (daily_forecast): forecast profile
+FORECAST_SCORE_CACHE_SIZE = int(os.environ.get("BAZI_FORECAST_SCORE_CACHE_SIZE", "8192"))
+
+chart_cache = LRUCache("chart", CHART_CACHE_SIZE)
+neutral_cache = LRUCache("neutral", NEUTRAL_CACHE_SIZE)
+signature_cache = LRUCache("signature", SIGNATURE_CACHE_SIZE)
+timeline_cache = LRUCache("timeline", TIMELINE_CACHE_SIZE)
+interaction_state_cache = LRUCache("interaction_state", INTERACTION_STATE_CACHE_SIZE)
+forecast_score_cache = LRUCache("forecast_score", FORECAST_SCORE_CACHE_SIZE)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every cache level (per worker process)."""
+    return {
+        "chart": chart_cache.stats(),
+        "neutral": neutral_cache.stats(),
+        "signature": signature_cache.stats(),
+        "timeline": timeline_cache.stats(),
+        "interaction_state": interaction_state_cache.stats(),
+        "forecast_score": forecast_score_cache.stats(),
+    }
+
+
+def clear_caches() -> None:
+    """Empty every cache level."""
+    chart_cache.clear()
+    neutral_cache.clear()
+    signature_cache.clear()
+    timeline_cache.clear()
+    interaction_state_cache.clear()
+    forecast_score_cache.clear()
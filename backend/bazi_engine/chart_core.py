@@ -0,0 +1,227 @@
+"""
+Chart Core (命盤核心)
+
+Compact index-level representation of a natal chart. A ChartCore holds the
+eight stem/branch indices (stems 0-9 甲..癸, branches 0-11 子..亥) and the
+facts derived from them — day master, elements, hidden stems and Ten God
+keys — in __slots__ tuples of ints and interned strings.
+
+The analysis modules (ten_gods, deities, use_god, pillar_interactions,
+annual_luck, ...) work on a ChartCore. The nested four_pillars dict the
+API returns is only built by to_four_pillars() at serialization time.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .stems_branches import (
+    STEM_INDEX,
+    INDEX_TO_STEM,
+    INDEX_TO_BRANCH,
+    stem_to_dict,
+    branch_to_dict,
+)
+from .chart_cache import FrozenDict, freeze
+from .hidden_stems import BRANCH_HIDDEN_STEMS
+from .relations import BRANCH_COLUMN, TEN_GOD_KEYS, TEN_GOD_TABLE
+from .ten_gods import TEN_GODS
+
+PILLAR_NAMES = ("year", "month", "day", "hour")
+
+# ---- Per-index lookup tables (built once from the stem/branch enums) ----
+
+STEM_ELEMENTS: Tuple[str, ...] = tuple(INDEX_TO_STEM[i].value["element"] for i in range(10))
+STEM_YIN_YANG: Tuple[str, ...] = tuple(INDEX_TO_STEM[i].value["yin_yang"] for i in range(10))
+STEM_NAMES_CN: Tuple[str, ...] = tuple(INDEX_TO_STEM[i].value["name_cn"] for i in range(10))
+
+BRANCH_ELEMENTS: Tuple[str, ...] = tuple(INDEX_TO_BRANCH[i].value["element"] for i in range(12))
+BRANCH_YIN_YANG: Tuple[str, ...] = tuple(INDEX_TO_BRANCH[i].value["yin_yang"] for i in range(12))
+BRANCH_NAMES_CN: Tuple[str, ...] = tuple(INDEX_TO_BRANCH[i].value["name_cn"] for i in range(12))
+
+# Hidden stems (藏干) of each branch as stem indices
+BRANCH_HIDDEN_STEM_INDICES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(STEM_INDEX[s] for s in BRANCH_HIDDEN_STEMS[INDEX_TO_BRANCH[i]]) for i in range(12)
+)
+
+STEM_NAME_TO_INDEX: Dict[str, int] = {name: i for i, name in enumerate(STEM_NAMES_CN)}
+BRANCH_NAME_TO_INDEX: Dict[str, int] = {name: i for i, name in enumerate(BRANCH_NAMES_CN)}
+
+
+class ChartCore:
+    """
+    Index-level natal chart.
+
+    Attributes:
+        stems: (year, month, day, hour) stem indices
+        branches: (year, month, day, hour) branch indices
+        stem_ten_gods: Ten God key of each stem relative to the day master
+        branch_ten_gods: Ten God key of each branch relative to the day master
+    """
+
+    __slots__ = ("stems", "branches", "stem_ten_gods", "branch_ten_gods")
+
+    def __init__(self, stems: Sequence[int], branches: Sequence[int]):
+        self.stems = tuple(int(s) % 10 for s in stems)
+        self.branches = tuple(int(b) % 12 for b in branches)
+
+        row = TEN_GOD_TABLE[self.stems[2]]
+        self.stem_ten_gods = tuple(TEN_GOD_KEYS[row[s]] for s in self.stems)
+        self.branch_ten_gods = tuple(TEN_GOD_KEYS[row[BRANCH_COLUMN + b]] for b in self.branches)
+
+    # ---- construction ----
+
+    @classmethod
+    def from_indices(cls, indices: Sequence[int]) -> "ChartCore":
+        """
+        Build from the 8-tuple returned by calendar_kernel.four_pillar_indices:
+        (year_stem, year_branch, month_stem, month_branch,
+         day_stem, day_branch, hour_stem, hour_branch)
+        """
+        return cls(indices[0::2], indices[1::2])
+
+    @classmethod
+    def from_packed(cls, packed: bytes) -> "ChartCore":
+        """Inverse of pack()."""
+        return cls.from_indices(tuple(packed))
+
+    @classmethod
+    def from_four_pillars(cls, four_pillars: Dict) -> "ChartCore":
+        """
+        Build from a four_pillars dict (as returned in a chart).
+
+        Raises:
+            ValueError: If a pillar's stem or branch is missing or unknown
+        """
+        stems: List[int] = []
+        branches: List[int] = []
+        for pillar_name in PILLAR_NAMES:
+            pillar = four_pillars.get(pillar_name) or {}
+            stem_cn = (pillar.get("stem") or {}).get("name_cn", "")
+            branch_cn = (pillar.get("branch") or {}).get("name_cn", "")
+            if stem_cn not in STEM_NAME_TO_INDEX or branch_cn not in BRANCH_NAME_TO_INDEX:
+                raise ValueError(f"Incomplete {pillar_name} pillar")
+            stems.append(STEM_NAME_TO_INDEX[stem_cn])
+            branches.append(BRANCH_NAME_TO_INDEX[branch_cn])
+        return cls(stems, branches)
+
+    # ---- index-level facts ----
+
+    @property
+    def signature(self) -> Tuple[int, ...]:
+        """The 8 indices in kernel order (year stem, year branch, ..., hour branch)."""
+        return tuple(i for pair in zip(self.stems, self.branches) for i in pair)
+
+    def pack(self) -> bytes:
+        """The signature as 8 bytes."""
+        return bytes(self.signature)
+
+    @property
+    def day_master(self) -> int:
+        """Stem index of the day master (日主)."""
+        return self.stems[2]
+
+    @property
+    def day_master_element(self) -> str:
+        return STEM_ELEMENTS[self.stems[2]]
+
+    @property
+    def day_master_yin_yang(self) -> str:
+        return STEM_YIN_YANG[self.stems[2]]
+
+    @property
+    def month_branch(self) -> int:
+        return self.branches[1]
+
+    def stem_of(self, pillar_name: str) -> int:
+        return self.stems[PILLAR_NAMES.index(pillar_name)]
+
+    def branch_of(self, pillar_name: str) -> int:
+        return self.branches[PILLAR_NAMES.index(pillar_name)]
+
+    def branch_map(self) -> Dict[str, int]:
+        """{pillar_name: branch_index} for the four pillars."""
+        return dict(zip(PILLAR_NAMES, self.branches))
+
+    def stem_map(self) -> Dict[str, int]:
+        """{pillar_name: stem_index} for the four pillars."""
+        return dict(zip(PILLAR_NAMES, self.stems))
+
+    def all_elements(self) -> List[str]:
+        """Elements of the 8 characters: year stem, year branch, ..., hour branch."""
+        return [
+            element
+            for s, b in zip(self.stems, self.branches)
+            for element in (STEM_ELEMENTS[s], BRANCH_ELEMENTS[b])
+        ]
+
+    def positions(self, include_day_stem: bool = True) -> Iterable[Tuple[str, str, str]]:
+        """
+        Yield (pillar_name, "stem"|"branch", ten_god_key) for the 8 positions
+        in chart order, optionally skipping the day stem (the day master itself).
+        """
+        for i, pillar_name in enumerate(PILLAR_NAMES):
+            if include_day_stem or pillar_name != "day":
+                yield pillar_name, "stem", self.stem_ten_gods[i]
+            yield pillar_name, "branch", self.branch_ten_gods[i]
+
+    # ---- serialization ----
+
+    def to_four_pillars(self) -> Dict:
+        """
+        Expand to the API's nested four_pillars dict: stem/branch properties
+        plus hidden_stems on each branch and ten_god on every position.
+        """
+        return {pillar_name: self.pillar_dict(i) for i, pillar_name in enumerate(PILLAR_NAMES)}
+
+    def pillar_dict(self, i: int) -> Dict:
+        """One pillar of to_four_pillars (0 = year ... 3 = hour)."""
+        return _pillar_dict(self.stems[2], self.stems[i], self.branches[i])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ChartCore):
+            return NotImplemented
+        return self.stems == other.stems and self.branches == other.branches
+
+    def __hash__(self) -> int:
+        return hash((self.stems, self.branches))
+
+    def __repr__(self) -> str:
+        pillars = " ".join(
+            STEM_NAMES_CN[s] + BRANCH_NAMES_CN[b] for s, b in zip(self.stems, self.branches)
+        )
+        return f"ChartCore({pillars})"
+
+
+def _pillar_dict(day_stem: int, stem_index: int, branch_index: int) -> Dict:
+    row = TEN_GOD_TABLE[day_stem]
+
+    stem = stem_to_dict(INDEX_TO_STEM[stem_index])
+    stem["ten_god"] = TEN_GODS[TEN_GOD_KEYS[row[stem_index]]]
+
+    branch = branch_to_dict(INDEX_TO_BRANCH[branch_index])
+    branch["hidden_stems"] = [
+        stem_to_dict(INDEX_TO_STEM[s]) for s in BRANCH_HIDDEN_STEM_INDICES[branch_index]
+    ]
+    branch["ten_god"] = TEN_GODS[TEN_GOD_KEYS[row[BRANCH_COLUMN + branch_index]]]
+
+    return {"stem": stem, "branch": branch}
+
+
+# Read-only pillar dicts, one per (day stem, stem, branch): 600 at most
+_shared_pillars: Dict[Tuple[int, int, int], FrozenDict] = {}
+
+
+def shared_pillar_dict(day_stem: int, stem_index: int, branch_index: int) -> FrozenDict:
+    """Frozen pillar_dict of a pillar under a day stem, shared by every chart."""
+    key = (day_stem, stem_index, branch_index)
+    record = _shared_pillars.get(key)
+    if record is None:
+        record = _shared_pillars.setdefault(key, freeze(_pillar_dict(*key)))
+    return record
+
+
+def core_from_chart(chart: Dict) -> Optional[ChartCore]:
+    """ChartCore of a calculate_bazi result, or None if it has no valid pillars."""
+    try:
+        return ChartCore.from_four_pillars(chart.get("four_pillars") or {})
+    except ValueError:
+        return None
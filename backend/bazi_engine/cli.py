@@ -0,0 +1,449 @@
+"""
+Bulk chart CLI (批量排盤命令列)
+
+Offline chart computation for analytics backfills. Birth records are
+streamed from CSV or NDJSON, or read from a JSON array (a file or
+stdin), computed with
+calculate_bazi on a process pool in chunks, and written as NDJSON or
+Parquet with one flat row per record:
+
+    python -m bazi_engine.cli births.csv -o charts.parquet
+    cat births.ndjson | python -m bazi_engine.cli --workers 8 > charts.ndjson
+
+Input records need birth_date (YYYY-MM-DD), birth_hour (0-23) and gender;
+calendar_type, is_leap_month and an id (passed through to the output, for
+joining back) are optional. Rows keep the input order; a record that
+cannot be computed yields a row with success=false and its error.
+
+Parquet output needs pyarrow, an optional dependency kept out of the
+server requirements: pip install -r requirements-parquet.txt
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .batch import batch_worker_count, iter_chunks, map_in_order
+from .calculator import calculate_bazi
+from .calendar_kernel import four_pillar_indices
+from .elements import Element
+from .pillar_interactions import INTERACTION_TYPE_LABELS
+
+PILLARS = ("year", "month", "day", "hour")
+ELEMENTS = tuple(element.value for element in Element)
+
+# Output schema, in column order
+FLAT_COLUMNS: Tuple[str, ...] = (
+    "index",
+    "id",
+    "success",
+    "error",
+    "birth_date",
+    "solar_date",
+    "birth_hour",
+    "gender",
+    "calendar_type",
+    "is_leap_month",
+    *(f"{pillar}_{part}" for pillar in PILLARS for part in ("stem", "branch")),
+    "day_master_element",
+    *(f"{element.lower()}_count" for element in ELEMENTS),
+    *(f"{element.lower()}_strength" for element in ELEMENTS),
+    "dm_strength",
+    "dm_strength_score",
+    "seasonal_strength",
+    "use_god",
+    "use_god_secondary",
+    "avoid_god",
+    "avoid_god_secondary",
+    "strongest_ten_god",
+    "deity_count",
+    "interactions_positive",
+    "interactions_negative",
+    "interactions_total",
+    *(f"{kind}_count" for kind in INTERACTION_TYPE_LABELS),
+)
+
+# (index in the input, raw record)
+RawRecord = Tuple[int, Dict]
+
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+# ==================== RECORDS ====================
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def _parse_record(raw: Dict) -> Dict:
+    """Normalize one input record; raises ValueError on missing/invalid fields."""
+    birth_date = (raw.get("birth_date") or "").strip()
+    if not birth_date:
+        raise ValueError("Missing birth_date.")
+
+    hour = raw.get("birth_hour")
+    try:
+        birth_hour = int(hour)
+    except (TypeError, ValueError):
+        raise ValueError(f"Birth hour must be between 0 and 23. Got {hour}.")
+    if not 0 <= birth_hour <= 23:
+        raise ValueError(f"Birth hour must be between 0 and 23. Got {birth_hour}.")
+
+    gender = (raw.get("gender") or "").strip().lower()
+    if gender not in ("male", "female"):
+        raise ValueError(f"Gender must be 'male' or 'female'. Got {raw.get('gender')!r}.")
+
+    calendar_type = (raw.get("calendar_type") or "solar").strip().lower()
+    if calendar_type not in ("solar", "lunar"):
+        raise ValueError(f"Calendar type must be 'solar' or 'lunar'. Got {calendar_type!r}.")
+
+    return {
+        "birth_date": birth_date,
+        "birth_hour": birth_hour,
+        "gender": gender,
+        "calendar_type": calendar_type,
+        "is_leap_month": _parse_bool(raw.get("is_leap_month") or False),
+    }
+
+
+def flatten_chart(index: int, raw: Dict, as_of_year: Optional[int] = None) -> Dict:
+    """
+    One flat output row for an input record.
+
+    Args:
+        index: Position of the record in the input
+        raw: Input record (CSV row or NDJSON object)
+        as_of_year: Year for the annual luck pillar (default: current year)
+    """
+    row = dict.fromkeys(FLAT_COLUMNS)
+    record_id = raw.get("id")
+    row.update(
+        index=index,
+        id=None if record_id is None else str(record_id),
+        success=False,
+        birth_date=raw.get("birth_date"),
+        gender=raw.get("gender"),
+    )
+    try:
+        if "_error" in raw:
+            raise ValueError(raw["_error"])
+        item = _parse_record(raw)
+        chart = calculate_bazi(
+            item["birth_date"],
+            item["birth_hour"],
+            item["gender"],
+            calendar_type=item["calendar_type"],
+            is_leap_month=item["is_leap_month"],
+            as_of_year=as_of_year,
+        )
+    except Exception as e:
+        row["error"] = str(e)
+        return row
+    if not chart.get("success"):
+        row["error"] = chart.get("error")
+        return row
+
+    row.update(item)
+    solar_date = chart["input"]["solar_date"]
+    row["solar_date"] = solar_date
+    indices = four_pillar_indices(date.fromisoformat(solar_date), item["birth_hour"])
+    for i, pillar in enumerate(PILLARS):
+        row[f"{pillar}_stem"] = indices[2 * i]
+        row[f"{pillar}_branch"] = indices[2 * i + 1]
+
+    row["day_master_element"] = chart["day_master"]["element"]
+    counts = chart["elements"]["counts"]
+    for element in ELEMENTS:
+        row[f"{element.lower()}_count"] = counts.get(element, 0)
+    strength = chart["elements"]["strength"]
+    for element in ELEMENTS:
+        row[f"{element.lower()}_strength"] = strength.get(element, 0.0)
+
+    use_god = chart["use_god"]
+    for key in ("dm_strength", "dm_strength_score", "use_god", "use_god_secondary",
+                "avoid_god", "avoid_god_secondary"):
+        row[key] = use_god.get(key)
+    row["seasonal_strength"] = chart["seasonal_strength"].get("strength")
+    row["strongest_ten_god"] = chart["strongest_ten_god"].get("key")
+    row["deity_count"] = len(chart["deities"])
+
+    interactions = chart["pillar_interactions"]
+    summary = interactions["summary"]
+    row["interactions_positive"] = summary["positive"]
+    row["interactions_negative"] = summary["negative"]
+    row["interactions_total"] = summary["total"]
+    for kind in INTERACTION_TYPE_LABELS:
+        row[f"{kind}_count"] = 0
+    for interaction in interactions["interactions"]:
+        row[f"{interaction['type']}_count"] += 1
+
+    row["success"] = True
+    return row
+
+
+def flatten_chunk(records: Sequence[RawRecord], output_format: str, as_of_year: Optional[int]):
+    """
+    Worker entry point for one chunk.
+
+    Returns (output, failed): the chunk's NDJSON lines as one string, or
+    (for Parquet) its rows as tuples in FLAT_COLUMNS order, which pickle
+    much smaller than dicts on the way back from the worker; and the
+    number of rows with success=false.
+    """
+    rows = [flatten_chart(index, raw, as_of_year) for index, raw in records]
+    failed = sum(not row["success"] for row in rows)
+    if output_format == "ndjson":
+        return "".join(
+            json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows
+        ), failed
+    return [tuple(row[column] for column in FLAT_COLUMNS) for row in rows], failed
+
+
+# ==================== INPUT ====================
+
+def _detect_input_format(stream: io.TextIOBase, path: str) -> str:
+    """
+    csv/ndjson from the file extension, else from the first character:
+    "[" opens a JSON array, "{" an NDJSON object. A .json file may hold
+    either.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".ndjson", ".jsonl"):
+        return "ndjson"
+    head = stream.buffer.peek(64) if hasattr(stream, "buffer") else b""
+    head = head.lstrip(b"\xef\xbb\xbf \t\r\n")[:1]
+    if head == b"[":
+        return "json"
+    return "ndjson" if head == b"{" or ext == ".json" else "csv"
+
+
+def _as_record(record) -> Dict:
+    return record if isinstance(record, dict) else {"_error": "Expected a JSON object."}
+
+
+def _read_ndjson(stream: io.TextIOBase) -> Iterator[RawRecord]:
+    index = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            record = {"_error": f"Invalid JSON: {e}"}
+        yield index, _as_record(record)
+        index += 1
+
+
+def read_records(stream: io.TextIOBase, input_format: str) -> Iterator[RawRecord]:
+    """
+    (index, record) pairs from CSV, NDJSON or JSON array text.
+
+    CSV and NDJSON are streamed; a JSON array is parsed up front, so it
+    raises ValueError here if it is not valid JSON or not an array.
+    """
+    if input_format == "csv":
+        reader: Iterable[Dict] = csv.DictReader(stream)
+        return enumerate(reader)
+    if input_format == "ndjson":
+        return _read_ndjson(stream)
+    try:
+        records = json.load(stream)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(records, list):
+        raise ValueError("Expected a JSON array of records.")
+    return ((index, _as_record(record)) for index, record in enumerate(records))
+
+
+# ==================== OUTPUT ====================
+
+class NdjsonWriter:
+    """Writes each chunk's lines to a file, or to stdout for "-"."""
+
+    def __init__(self, path: str):
+        self.stream = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, lines: str) -> None:
+        self.stream.write(lines)
+
+    def close(self) -> None:
+        if self.stream is sys.stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+
+FLOAT_COLUMNS = frozenset({"dm_strength_score", *(f"{element.lower()}_strength" for element in ELEMENTS)})
+
+
+def _parquet_schema():
+    """Arrow schema of FLAT_COLUMNS (small ints for indices and counts)."""
+    import pyarrow as pa
+
+    def column_type(column: str):
+        if column == "index":
+            return pa.int64()
+        if column in ("success", "is_leap_month"):
+            return pa.bool_()
+        if column in FLOAT_COLUMNS:
+            return pa.float64()
+        if (column in ("birth_hour", "deity_count")
+                or column.endswith(("_stem", "_branch", "_count"))
+                or column.startswith("interactions_")):
+            return pa.int16()
+        return pa.string()
+
+    return pa.schema([(column, column_type(column)) for column in FLAT_COLUMNS])
+
+
+class ParquetWriter:
+    """Appends rows to a Parquet file, one row group per row_group_size rows."""
+
+    def __init__(self, path: str, row_group_size: int):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install -r requirements-parquet.txt")
+        self._pa = pa
+        self._schema = _parquet_schema()
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._row_group_size = row_group_size
+        self._rows: List[tuple] = []
+
+    def write(self, rows: List[tuple]) -> None:
+        self._rows.extend(rows)
+        if len(self._rows) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        columns = zip(*self._rows)
+        arrays = [
+            self._pa.array(values, type=field.type)
+            for field, values in zip(self._schema, columns)
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+# ==================== DRIVER ====================
+
+def run(
+    records: Iterable[RawRecord],
+    writer,
+    output_format: str,
+    workers: int = 0,
+    chunk_size: int = 1000,
+    as_of_year: Optional[int] = None,
+) -> int:
+    """
+    Compute and write every record.
+
+    Returns (succeeded, failed) row counts. workers=1 runs in-process
+    (no pool), which is handy for profiling.
+    """
+    work = partial(flatten_chunk, output_format=output_format, as_of_year=as_of_year)
+    chunks = iter_chunks(records, chunk_size)
+    written = failed = 0
+
+    def _count(result) -> int:
+        return result.count("\n") if output_format == "ndjson" else len(result)
+
+    if workers == 1:
+        for chunk in chunks:
+            result, chunk_failed = work(chunk)
+            writer.write(result)
+            written += _count(result)
+            failed += chunk_failed
+        return written - failed, failed
+
+    workers = batch_worker_count(workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result, chunk_failed in map_in_order(executor, work, chunks, workers * CHUNKS_IN_FLIGHT_PER_WORKER):
+            writer.write(result)
+            written += _count(result)
+            failed += chunk_failed
+    return written - failed, failed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compute BAZI charts in bulk",
+        epilog="Parquet output needs the optional pyarrow dependency: pip install -r requirements-parquet.txt",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="CSV, NDJSON or JSON array file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--input-format", choices=("csv", "ndjson", "json"), help="default: from extension / content")
+    parser.add_argument("--format", choices=("ndjson", "parquet"), help="default: from output extension (parquet needs pyarrow)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="records per work unit")
+    parser.add_argument("--row-group-size", type=int, default=100_000, help="Parquet rows per row group")
+    parser.add_argument("--as-of-year", type=int, help="annual luck year (default: current year)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no summary on stderr")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or (
+        "parquet" if args.output.lower().endswith((".parquet", ".pq")) else "ndjson"
+    )
+    if output_format == "parquet" and args.output == "-":
+        parser.error("Parquet output needs a file (-o charts.parquet)")
+    if args.chunk_size < 1 or args.workers < 0:
+        parser.error("--chunk-size must be >= 1 and --workers >= 0")
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    input_format = args.input_format or _detect_input_format(source, args.input)
+    try:
+        records = read_records(source, input_format)
+    except ValueError as e:
+        parser.error(f"{args.input}: {e}")
+
+    if output_format == "parquet":
+        writer = ParquetWriter(args.output, args.row_group_size)
+    else:
+        writer = NdjsonWriter(args.output)
+
+    started = time.perf_counter()
+    try:
+        succeeded, failed = run(
+            records,
+            writer,
+            output_format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            as_of_year=args.as_of_year,
+        )
+    finally:
+        writer.close()
+        if source is not sys.stdin:
+            source.close()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - started
+        rate = (succeeded + failed) / elapsed if elapsed else 0.0
+        print(f"✓ {succeeded} charts in {elapsed:.1f}s ({rate:.0f}/s)", file=sys.stderr)
+        if failed:
+            print(f"✗ {failed} record(s) failed (success=false rows)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,7 +13,14 @@ Returns a 0-100 score with dimensional breakdown and multi-language explanations
 
 from typing import Dict, List, Tuple
 
-from .elements import get_element_relationships, GENERATION_CYCLE, DESTRUCTION_CYCLE, Element
+from .relations import (
+    ELEMENTS,
+    REL_GENERATES,
+    REL_CONTROLS,
+    REL_CONTROLLED_BY,
+    REL_GENERATED_BY,
+    element_relation,
+)
 from .use_god import RESOURCE_FOR, OUTPUT_OF, CONTROLLER_OF, ELEMENT_ADVICE
 
 
@@ -109,13 +116,12 @@ def _score_dm_interaction(elem_a: str, elem_b: str) -> Tuple[float, str]:
     """Score Day Master element interaction (0-30)."""
     if elem_a == elem_b:
         return 22.0, "same"
-    rel_ab = get_element_relationships(elem_a, elem_b)
-    rel_ba = get_element_relationships(elem_b, elem_a)
-    if rel_ab == "generates" or rel_ba == "generates":
+    rel = element_relation(elem_a, elem_b)
+    if rel == REL_GENERATES or rel == REL_GENERATED_BY:
         return 28.0, "generates"
-    if rel_ab == "destroys":
+    if rel == REL_CONTROLS:
         return 10.0, "controls"
-    if rel_ba == "destroys":
+    if rel == REL_CONTROLLED_BY:
         return 10.0, "controlled"
     return 15.0, "neutral"
 
@@ -123,7 +129,7 @@ def _score_dm_interaction(elem_a: str, elem_b: str) -> Tuple[float, str]:
 def _score_element_complement(counts_a: Dict[str, int], counts_b: Dict[str, int]) -> float:
     """Score how well combined elements balance each other (0-10)."""
     combined = {}
-    for e in ["Wood", "Fire", "Earth", "Metal", "Water"]:
+    for e in ELEMENTS:
         combined[e] = counts_a.get(e, 0) + counts_b.get(e, 0)
     total = sum(combined.values())
     if total == 0:
@@ -4,10 +4,23 @@ Daily & Weekly Mini-Forecast Engine
 Pure-Python scoring that compares a target date's pillar against the user's
 natal BAZI chart.  All heavy lifting happens here — no AI needed except for
 the optional daily-wisdom quote (handled elsewhere).
+
+Clashes and combinations of a day's branch with the natal branches are read
+from the chart's cached natal state (interaction_layers.py), so scoring a
+day — or a whole week — never walks the natal pillars.
+
+A day's scores depend only on the natal forecast profile and the day
+pillar, which repeats every 60 days. forecast_score_table scores all 60
+pillars once per profile and caches the table, so the scores of any date
+are the table row at day_number % 60.
 """
 
+import hashlib
+import json
 from datetime import date, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Mapping, NamedTuple, Tuple, Optional
+
+import numpy as np
 
 from .stems_branches import (
     HeavenlyStem,
@@ -19,17 +32,30 @@ from .stems_branches import (
     stem_to_dict,
     branch_to_dict,
     STEM_INDEX,
-    BRANCH_INDEX,
 )
-from .elements import get_element_relationships
+from .relations import (
+    REL_SAME,
+    REL_GENERATES,
+    REL_CONTROLS,
+    REL_CONTROLLED_BY,
+    REL_GENERATED_BY,
+    RELATION,
+    ELEMENTS,
+    ELEMENT_INDEX,
+    STEM_ELEMENT,
+    GENERATES_ELEMENT,
+    CONTROLS_ELEMENT,
+    CONTROLLED_BY_ELEMENT,
+    GENERATED_BY_ELEMENT,
+    element_relation,
+)
 from .use_god import RESOURCE_FOR, OUTPUT_OF, CONTROLLER_OF, CONTROLLED_BY, ELEMENT_ADVICE
-from .annual_luck import BRANCH_NAME_TO_INDEX, _is_clash, _is_combination
-
-# ────────────────────────────────────────────────────────────
-# Reference date for O(1) day-pillar calculation
-# Jan 1, 1900 = sexagenary position 0 (甲子)
-# ────────────────────────────────────────────────────────────
-_REFERENCE_DATE = date(1900, 1, 1)
+from .chart_cache import FrozenDict, forecast_score_cache
+from .chart_core import PILLAR_NAMES
+from .interaction_layers import MASK_COUNT, NATAL_LAYERS, InteractionState, natal_state, natal_state_for_chart
+from .calendar_kernel import day_number, day_pillar, day_pillars_for_range, hour_stems_for_day
+from .calculator import calculate_bazi
+from .messages import LANGUAGES, define, define_table, normalize_language, text
 
 # ────────────────────────────────────────────────────────────
 # Peach Blossom (桃花) lookup
@@ -62,6 +88,9 @@ _CHINESE_HOURS = [
     (21, "亥", "21:00-23:00", {"en": "Hai",  "zh-TW": "亥時", "zh-CN": "亥时", "ko": "해시(亥時)"}),
 ]
 
+_SHICHEN_HOURS = [hr_24 for hr_24, _, _, _ in _CHINESE_HOURS]
+_HOUR_NAME_MSG = tuple(define(names) for _, _, _, names in _CHINESE_HOURS)
+
 # ────────────────────────────────────────────────────────────
 # Element-to-practical mappings (localized)
 # ────────────────────────────────────────────────────────────
@@ -102,6 +131,12 @@ ELEMENT_FOODS = {
     "Water": {"en": "Seaweed, black beans & soups",    "zh-TW": "海帶、黑豆與湯品",  "zh-CN": "海带、黑豆与汤品",  "ko": "미역, 검은콩과 국"},
 }
 
+# Catalog message IDs (see messages.py) of the tables above
+_COLOR_MSG = define_table(ELEMENT_COLORS)
+_DIRECTION_MSG = define_table(ELEMENT_DIRECTIONS)
+_OBJECT_MSG = define_table(ELEMENT_OBJECTS)
+_FOOD_MSG = define_table(ELEMENT_FOODS)
+
 # ────────────────────────────────────────────────────────────
 # Do's & Don'ts templates per element (localized, 4 per element)
 # ────────────────────────────────────────────────────────────
@@ -167,6 +202,9 @@ _DONT_TEMPLATES = {
     ],
 }
 
+_DO_MSG = {elem: tuple(define(t) for t in items) for elem, items in _DO_TEMPLATES.items()}
+_DONT_MSG = {elem: tuple(define(t) for t in items) for elem, items in _DONT_TEMPLATES.items()}
+
 # ────────────────────────────────────────────────────────────
 # Mood keywords
 # ────────────────────────────────────────────────────────────
@@ -178,6 +216,7 @@ _MOOD_TIERS = [
     (20, {"en": "Rest & Recharge",   "zh-TW": "養精蓄銳", "zh-CN": "养精蓄锐", "ko": "휴식과 재충전"}),
     (0,  {"en": "Lay Low",           "zh-TW": "韜光養晦", "zh-CN": "韬光养晦", "ko": "낮은 자세로"}),
 ]
+_MOOD_MSG = [(threshold, define(labels)) for threshold, labels in _MOOD_TIERS]
 
 
 # ════════════════════════════════════════════════════════════
@@ -185,22 +224,9 @@ _MOOD_TIERS = [
 # ════════════════════════════════════════════════════════════
 
 def get_daily_pillar(target_date: date) -> Tuple[HeavenlyStem, EarthlyBranch]:
-    """O(1) day-pillar calculation using datetime arithmetic."""
-    delta = (target_date - _REFERENCE_DATE).days
-    pos = delta % 60
-    return get_stem_by_index(pos % 10), get_branch_by_index(pos % 12)
-
-
-def _get_natal_branch_indices(chart: dict) -> List[int]:
-    """Extract branch indices from natal four pillars."""
-    indices = []
-    fp = chart.get("four_pillars", {})
-    for pillar_name in ("year", "month", "day", "hour"):
-        branch_cn = fp.get(pillar_name, {}).get("branch", {}).get("name_cn", "")
-        idx = BRANCH_NAME_TO_INDEX.get(branch_cn, -1)
-        if idx >= 0:
-            indices.append(idx)
-    return indices
+    """O(1) day-pillar calculation via the calendar kernel."""
+    stem_idx, branch_idx = day_pillar(day_number(target_date))
+    return get_stem_by_index(stem_idx), get_branch_by_index(branch_idx)
 
 
 def _get_peach_blossom_branch(day_branch_idx: int) -> int:
@@ -222,10 +248,16 @@ def calculate_overall_score(
     avoid_god: str,
     avoid_god_2: str,
     daily_elem: str,
-    daily_branch_idx: int,
-    natal_branch_indices: List[int],
+    clashes: int,
+    combinations: int,
 ) -> int:
-    """Score 0-100 for how favorable the day is."""
+    """
+    Score 0-100 for how favorable the day is.
+
+    clashes / combinations count the natal branches the day's branch
+    clashes or combines with. Reference for forecast_score_arrays, which
+    forecasts are scored with.
+    """
     score = 50.0
 
     # Use God / Avoid God alignment
@@ -239,26 +271,21 @@ def calculate_overall_score(
         score -= 12
 
     # Element relationship with Day Master
-    rel = get_element_relationships(daily_elem, dm_element)
-    if rel == "generates":
+    rel = element_relation(daily_elem, dm_element)
+    if rel == REL_GENERATES:
         score += 10   # Daily element nourishes DM (resource)
-    elif rel == "same":
+    elif rel == REL_SAME:
         score += 5    # Companion element
-    elif rel == "destroys":
+    elif rel == REL_CONTROLS:
         score -= 10   # Daily element attacks DM
-
-    reverse = get_element_relationships(dm_element, daily_elem)
-    if reverse == "generates":
+    elif rel == REL_GENERATED_BY:
         score -= 3    # DM drains into daily element (output)
-    elif reverse == "destroys":
+    elif rel == REL_CONTROLLED_BY:
         score -= 5    # DM conquers daily element (wealth, minor drain)
 
     # Branch interactions with natal chart
-    for nb_idx in natal_branch_indices:
-        if _is_clash(daily_branch_idx, nb_idx):
-            score -= 8
-        if _is_combination(daily_branch_idx, nb_idx):
-            score += 8
+    score -= 8 * clashes
+    score += 8 * combinations
 
     return max(0, min(100, int(round(score))))
 
@@ -274,9 +301,13 @@ def calculate_domain_scores(
     daily_elem: str,
     daily_branch_idx: int,
     natal_day_branch_idx: int,
-    natal_branch_indices: List[int],
+    clashes: int,
+    combinations: int,
 ) -> Dict[str, int]:
-    """Return scores 0-100 for love, wealth, career, study, social."""
+    """
+    Return scores 0-100 for love, wealth, career, study, social.
+    Reference for forecast_score_arrays, as calculate_overall_score.
+    """
     wealth_elem = CONTROLLED_BY.get(dm_element, "")   # What DM controls
     career_elem = CONTROLLER_OF.get(dm_element, "")   # What controls DM
     resource_elem = RESOURCE_FOR.get(dm_element, "")   # What generates DM
@@ -297,11 +328,8 @@ def calculate_domain_scores(
     if daily_elem == avoid_god:
         love -= 12
     # Combinations boost romance
-    for nb in natal_branch_indices:
-        if _is_combination(daily_branch_idx, nb):
-            love += 6
-        if _is_clash(daily_branch_idx, nb):
-            love -= 5
+    love += 6 * combinations
+    love -= 5 * clashes
     domains["love"] = max(0, min(100, int(round(love))))
 
     # --- Wealth ---
@@ -312,14 +340,10 @@ def calculate_domain_scores(
         wealth += 8
     if daily_elem == avoid_god:
         wealth -= 15
-    rel = get_element_relationships(dm_element, daily_elem)
-    if rel == "destroys":
+    if element_relation(dm_element, daily_elem) == REL_CONTROLS:
         wealth += 5  # DM conquers → wealth opportunity
-    for nb in natal_branch_indices:
-        if _is_combination(daily_branch_idx, nb):
-            wealth += 5
-        if _is_clash(daily_branch_idx, nb):
-            wealth -= 6
+    wealth += 5 * combinations
+    wealth -= 6 * clashes
     domains["wealth"] = max(0, min(100, int(round(wealth))))
 
     # --- Career ---
@@ -332,11 +356,8 @@ def calculate_domain_scores(
         career -= 15
     if daily_elem == use_god:
         career += 12
-    for nb in natal_branch_indices:
-        if _is_clash(daily_branch_idx, nb):
-            career -= 6
-        if _is_combination(daily_branch_idx, nb):
-            career += 5
+    career += 5 * combinations
+    career -= 6 * clashes
     domains["career"] = max(0, min(100, int(round(career))))
 
     # --- Study ---
@@ -349,11 +370,8 @@ def calculate_domain_scores(
         study -= 12
     if daily_elem == use_god:
         study += 10
-    for nb in natal_branch_indices:
-        if _is_combination(daily_branch_idx, nb):
-            study += 4
-        if _is_clash(daily_branch_idx, nb):
-            study -= 5
+    study += 4 * combinations
+    study -= 5 * clashes
     domains["study"] = max(0, min(100, int(round(study))))
 
     # --- Social ---
@@ -366,16 +384,94 @@ def calculate_domain_scores(
         social += 10
     if daily_elem == avoid_god:
         social -= 12
-    for nb in natal_branch_indices:
-        if _is_combination(daily_branch_idx, nb):
-            social += 7
-        if _is_clash(daily_branch_idx, nb):
-            social -= 6
+    social += 7 * combinations
+    social -= 6 * clashes
     domains["social"] = max(0, min(100, int(round(social))))
 
     return domains
 
 
+# ────────────────────────────────────────────────────────────
+# Shichen tables (12 Chinese hours)
+# ────────────────────────────────────────────────────────────
+# An hour's stem follows the day stem, so every shichen's element — and
+# with it the energy rhythm and the lucky hour — depends only on (daily
+# stem, DM element, use-god element). Both are built once at import for
+# all 10 × 5 × 6 combinations (use-god slot 5: none) in every language;
+# rows are read-only and shared by every forecast.
+
+_STEM_ELEMENT = np.asarray(STEM_ELEMENT)
+_RELATION = np.asarray(RELATION)
+
+_NO_USE_GOD = len(ELEMENTS)
+
+# _HOUR_ELEMENT[day stem][shichen]
+_HOUR_ELEMENT = np.stack([_STEM_ELEMENT[hour_stems_for_day(s, _SHICHEN_HOURS)] for s in range(10)])
+
+
+def _shichen_scores() -> Tuple[np.ndarray, np.ndarray]:
+    """(energy rhythm, lucky hour) scores, each [day stem][dm][use god][shichen]."""
+    h = _HOUR_ELEMENT[:, None, None, :]
+    dm = np.arange(5)[None, :, None, None]
+    ug = np.arange(_NO_USE_GOD + 1)[None, None, :, None]
+    rel = _RELATION[h, dm]
+
+    base = 25 * (h == ug) + 10 * (h == dm) + 15 * (rel == REL_GENERATES)
+    energy = 50 + base - 15 * (rel == REL_CONTROLS) - 10 * (h == np.asarray(CONTROLLED_BY_ELEMENT)[dm])
+    lucky = base + 5 * (h == ug)  # the use god weighs 30 for the lucky hour
+    return np.clip(energy, 0, 100), lucky
+
+
+def _build_shichen_tables(language: str) -> Tuple[Tuple[Tuple[FrozenDict, ...], ...], Tuple[FrozenDict, ...]]:
+    """Localized (energy rhythm rows, lucky hour) per _shichen_key."""
+    names = [text(msg, language) for msg in _HOUR_NAME_MSG]
+    energy, lucky = _shichen_scores()
+    energy = energy.reshape(-1, 12).tolist()
+    lucky = lucky.reshape(-1, 12)
+    best = lucky.argmax(axis=1).tolist()  # earliest hour wins a tie
+    elements = np.repeat(_HOUR_ELEMENT, 5 * (_NO_USE_GOD + 1), axis=0).tolist()
+
+    rows: Dict[Tuple[int, int, int], FrozenDict] = {}  # (shichen, element, score) → shared row
+
+    def _row(hour: int, element: int, score: int) -> FrozenDict:
+        key = (hour, element, score)
+        if key not in rows:
+            _, br_cn, time_range, _ = _CHINESE_HOURS[hour]
+            rows[key] = FrozenDict({
+                "branch": br_cn,
+                "name": names[hour],
+                "time": time_range,
+                "element": ELEMENTS[element],
+                "score": score,
+                "level": "high" if score >= 75 else "medium" if score >= 45 else "low",
+            })
+        return rows[key]
+
+    rhythms = tuple(
+        tuple(_row(hour, element, score) for hour, (element, score) in enumerate(zip(hour_elements, scores)))
+        for hour_elements, scores in zip(elements, energy)
+    )
+    best_hours = tuple(
+        FrozenDict({
+            "name": _CHINESE_HOURS[hour][1],
+            "time": _CHINESE_HOURS[hour][2],
+            "name_loc": names[hour],
+            "score": int(lucky[i, hour]),
+        })
+        for i, hour in enumerate(best)
+    )
+    return rhythms, best_hours
+
+
+def _shichen_key(daily_stem: HeavenlyStem, dm_element: str, use_god_elem: str) -> int:
+    """Flat [day stem][dm][use god] index into the shichen tables."""
+    use_god = ELEMENT_INDEX.get(use_god_elem, _NO_USE_GOD)
+    return (STEM_INDEX[daily_stem] * 5 + ELEMENT_INDEX[dm_element]) * (_NO_USE_GOD + 1) + use_god
+
+
+_SHICHEN_TABLES = {lang: _build_shichen_tables(lang) for lang in LANGUAGES}
+
+
 # ────────────────────────────────────────────────────────────
 # Lucky items
 # ────────────────────────────────────────────────────────────
@@ -388,34 +484,19 @@ def get_lucky_items(
     language: str,
 ) -> dict:
     """Derive lucky color, number, direction, hour, object, food."""
-    lang = language if language in ("en", "zh-TW", "zh-CN", "ko") else "en"
+    lang = normalize_language(language)
     elem = use_god_elem or dm_element  # Fallback
 
-    # Lucky hour — find the Chinese hour whose element == use_god_elem
-    best_hour: Optional[dict] = None
-    best_score = -999
-    from .calculator import get_hour_stem_branch
-    for hr_24, br_cn, time_range, names in _CHINESE_HOURS:
-        h_stem, h_branch = get_hour_stem_branch(daily_stem, hr_24)
-        h_elem = get_stem_element(h_stem)
-        sc = 0
-        if h_elem == use_god_elem:
-            sc += 30
-        if h_elem == dm_element:
-            sc += 10
-        if get_element_relationships(h_elem, dm_element) == "generates":
-            sc += 15
-        if sc > best_score:
-            best_score = sc
-            best_hour = {"name": br_cn, "time": time_range, "name_loc": names.get(lang, br_cn), "score": sc}
+    # Lucky hour — the shichen whose element best serves the use god
+    best_hour = _SHICHEN_TABLES[lang][1][_shichen_key(daily_stem, dm_element, use_god_elem)]
 
     return {
-        "color": ELEMENT_COLORS.get(elem, ELEMENT_COLORS["Wood"]).get(lang, ""),
+        "color": text(_COLOR_MSG.get(elem, _COLOR_MSG["Wood"]), lang),
         "number": ELEMENT_NUMBERS.get(elem, ""),
-        "direction": ELEMENT_DIRECTIONS.get(elem, ELEMENT_DIRECTIONS["Wood"]).get(lang, ""),
+        "direction": text(_DIRECTION_MSG.get(elem, _DIRECTION_MSG["Wood"]), lang),
         "hour": best_hour,
-        "object": ELEMENT_OBJECTS.get(elem, ELEMENT_OBJECTS["Wood"]).get(lang, ""),
-        "food": ELEMENT_FOODS.get(elem, ELEMENT_FOODS["Wood"]).get(lang, ""),
+        "object": text(_OBJECT_MSG.get(elem, _OBJECT_MSG["Wood"]), lang),
+        "food": text(_FOOD_MSG.get(elem, _FOOD_MSG["Wood"]), lang),
     }
 
 
@@ -430,45 +511,8 @@ def get_energy_rhythm(
     language: str,
 ) -> List[dict]:
     """Score each of the 12 shichen for the user."""
-    lang = language if language in ("en", "zh-TW", "zh-CN", "ko") else "en"
-    from .calculator import get_hour_stem_branch
-
-    rhythm = []
-    for hr_24, br_cn, time_range, names in _CHINESE_HOURS:
-        h_stem, h_branch = get_hour_stem_branch(daily_stem, hr_24)
-        h_elem = get_stem_element(h_stem)
-
-        sc = 50.0
-        if h_elem == use_god_elem:
-            sc += 25
-        if h_elem == dm_element:
-            sc += 10
-        rel = get_element_relationships(h_elem, dm_element)
-        if rel == "generates":
-            sc += 15
-        elif rel == "destroys":
-            sc -= 15
-        if h_elem == CONTROLLER_OF.get(dm_element, ""):
-            sc -= 10
-
-        sc = max(0, min(100, int(round(sc))))
-
-        if sc >= 75:
-            level = "high"
-        elif sc >= 45:
-            level = "medium"
-        else:
-            level = "low"
-
-        rhythm.append({
-            "branch": br_cn,
-            "name": names.get(lang, br_cn),
-            "time": time_range,
-            "element": h_elem,
-            "score": sc,
-            "level": level,
-        })
-    return rhythm
+    rhythms = _SHICHEN_TABLES[normalize_language(language)][0]
+    return list(rhythms[_shichen_key(daily_stem, dm_element, use_god_elem)])
 
 
 # ────────────────────────────────────────────────────────────
@@ -483,7 +527,7 @@ def get_dos_and_donts(
     language: str,
 ) -> Tuple[List[str], List[str]]:
     """Return (dos, donts) as localized strings."""
-    lang = language if language in ("en", "zh-TW", "zh-CN", "ko") else "en"
+    lang = normalize_language(language)
 
     # Determine which elements to draw from
     # Favorable = Use God element  +  daily element if favorable
@@ -493,21 +537,21 @@ def get_dos_and_donts(
     # If daily element is favorable, reinforce with its Do's
     is_daily_favorable = (
         daily_elem == use_god_elem
-        or get_element_relationships(daily_elem, dm_element) == "generates"
+        or element_relation(daily_elem, dm_element) == REL_GENERATES
         or daily_elem == dm_element
     )
 
     do_elem = daily_elem if is_daily_favorable else favorable_elem
     dont_elem = avoid_god_elem if avoid_god_elem else unfavorable_elem
 
-    dos = [t.get(lang, t["en"]) for t in _DO_TEMPLATES.get(do_elem, _DO_TEMPLATES.get(favorable_elem, []))][:4]
-    donts = [t.get(lang, t["en"]) for t in _DONT_TEMPLATES.get(dont_elem, _DONT_TEMPLATES.get(unfavorable_elem, []))][:3]
+    dos = [text(m, lang) for m in _DO_MSG.get(do_elem, _DO_MSG.get(favorable_elem, ()))[:4]]
+    donts = [text(m, lang) for m in _DONT_MSG.get(dont_elem, _DONT_MSG.get(unfavorable_elem, ()))[:3]]
 
     # Ensure we always have items
     if not dos:
-        dos = [t.get(lang, t["en"]) for t in _DO_TEMPLATES.get(dm_element, _DO_TEMPLATES["Wood"])][:3]
+        dos = [text(m, lang) for m in _DO_MSG.get(dm_element, _DO_MSG["Wood"])[:3]]
     if not donts:
-        donts = [t.get(lang, t["en"]) for t in _DONT_TEMPLATES.get(dm_element, _DONT_TEMPLATES["Wood"])][:3]
+        donts = [text(m, lang) for m in _DONT_MSG.get(dm_element, _DONT_MSG["Wood"])[:3]]
 
     return dos, donts
 
@@ -525,56 +569,245 @@ _DAY_NAMES = {
     5: {"en": "Sat", "zh-TW": "週六", "zh-CN": "周六", "ko": "토"},
     6: {"en": "Sun", "zh-TW": "週日", "zh-CN": "周日", "ko": "일"},
 }
+_DAY_NAME_MSG = define_table(_DAY_NAMES)
 
 
-def get_weekly_outlook(
-    dm_element: str,
-    use_god: str,
-    use_god_2: str,
-    avoid_god: str,
-    avoid_god_2: str,
-    natal_branch_indices: List[int],
-    target_date: date,
-    language: str,
-) -> List[dict]:
+def get_weekly_outlook(profile: "ForecastProfile", target_date: date, language: str) -> List[dict]:
     """7-day score trend starting from Mon of the week containing target_date."""
-    lang = language if language in ("en", "zh-TW", "zh-CN", "ko") else "en"
+    lang = normalize_language(language)
 
     # Find Monday of the target week
     monday = target_date - timedelta(days=target_date.weekday())
 
+    week_stems, _ = day_pillars_for_range(monday, 7)
+    scores = forecast_scores_for_range(profile, monday, 7)[:, 0].tolist()
+
     week = []
     for i in range(7):
         d = monday + timedelta(days=i)
-        d_stem, d_branch = get_daily_pillar(d)
-        d_elem = get_stem_element(d_stem)
-        d_branch_idx = BRANCH_INDEX[d_branch]
-
-        sc = calculate_overall_score(
-            dm_element, use_god, use_god_2, avoid_god, avoid_god_2,
-            d_elem, d_branch_idx, natal_branch_indices,
-        )
-
         week.append({
             "date": d.isoformat(),
-            "day": _DAY_NAMES.get(d.weekday(), {}).get(lang, ""),
-            "score": sc,
-            "element": d_elem,
+            "day": text(_DAY_NAME_MSG[d.weekday()], lang),
+            "score": scores[i],
+            "element": ELEMENTS[STEM_ELEMENT[week_stems[i]]],
             "is_today": d == target_date,
         })
     return week
 
 
+# ────────────────────────────────────────────────────────────
+# Score arrays (many days at once)
+# ────────────────────────────────────────────────────────────
+
+# calculate_overall_score's bonus by relation of the daily element to the DM
+_RELATION_BONUS = np.zeros(5, dtype=np.int64)
+_RELATION_BONUS[[REL_SAME, REL_GENERATES, REL_CONTROLS, REL_CONTROLLED_BY, REL_GENERATED_BY]] = [5, 10, -10, -5, -3]
+
+DOMAIN_KEYS = ("love", "wealth", "career", "study", "social")
+
+
+def forecast_score_arrays(
+    dm_element: str,
+    use_god: str,
+    use_god_2: str,
+    avoid_god: str,
+    avoid_god_2: str,
+    natal: InteractionState,
+    stems: np.ndarray,
+    branches: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    calculate_overall_score and calculate_domain_scores for many daily
+    pillars at once, as array operations.
+
+    Args:
+        dm_element, use_god ... avoid_god_2: The chart's element names
+        natal: The chart's natal interaction state
+        stems, branches: Daily pillar index arrays
+
+    Returns:
+        {"overall": int array, "love" ... "social": int arrays}, 0-100 each
+    """
+    stems = np.asarray(stems)
+    branches = np.asarray(branches)
+    d = _STEM_ELEMENT[stems]
+    dm = ELEMENT_INDEX.get(dm_element, -1)
+    ug, ug2, ag, ag2 = (ELEMENT_INDEX.get(e, -1) for e in (use_god, use_god_2, avoid_god, avoid_god_2))
+
+    hits = natal.hit_arrays(stems, branches)
+    clashes = MASK_COUNT[hits["clash"] & NATAL_LAYERS]
+    combinations = MASK_COUNT[hits["combination"] & NATAL_LAYERS]
+
+    # ---- overall ----
+    overall = 50 + np.select([d == ug, d == ug2, d == ag, d == ag2], [25, 15, -20, -12], 0)
+    if dm >= 0:
+        overall = overall + _RELATION_BONUS[_RELATION[d, dm]]
+    overall = overall - 8 * clashes + 8 * combinations
+
+    # ---- domains ----
+    if dm >= 0:
+        wealth_elem, career_elem = CONTROLS_ELEMENT[dm], CONTROLLED_BY_ELEMENT[dm]
+        resource_elem, output_elem = GENERATED_BY_ELEMENT[dm], GENERATES_ELEMENT[dm]
+        dm_controls_day = _RELATION[dm, d] == REL_CONTROLS
+    else:
+        wealth_elem = career_elem = resource_elem = output_elem = -1
+        dm_controls_day = np.zeros(len(d), dtype=bool)
+
+    natal_day_branch = natal.branch_of("day")
+    peach = branches == _get_peach_blossom_branch(0 if natal_day_branch is None else natal_day_branch)
+    is_dm, is_ug, is_ag = d == dm, d == ug, d == ag
+    is_resource, is_output = d == resource_elem, d == output_elem
+
+    love = 50 + 25 * peach + 10 * is_resource + 5 * is_dm - 12 * is_ag + 6 * combinations - 5 * clashes
+    wealth = (
+        50 + 22 * (d == wealth_elem) + 8 * (is_ug & (wealth_elem == ug)) - 15 * is_ag
+        + 5 * dm_controls_day + 5 * combinations - 6 * clashes
+    )
+    career = (
+        50 + 20 * (d == career_elem) + 10 * is_output - 15 * is_ag + 12 * is_ug
+        + 5 * combinations - 6 * clashes
+    )
+    study = 50 + 22 * is_resource + 5 * is_dm - 12 * is_ag + 10 * is_ug + 4 * combinations - 5 * clashes
+    social = 50 + 15 * is_dm + 12 * is_output + 10 * peach - 12 * is_ag + 7 * combinations - 6 * clashes
+
+    scores = {"overall": overall, "love": love, "wealth": wealth, "career": career, "study": study, "social": social}
+    return {key: np.clip(value, 0, 100) for key, value in scores.items()}
+
+
+# ────────────────────────────────────────────────────────────
+# Score table (every day pillar of the 60-cycle)
+# ────────────────────────────────────────────────────────────
+
+SCORE_COLUMNS = ("overall",) + DOMAIN_KEYS
+
+# Bump when the chart facts a profile is built from change (its fields, or
+# how the engine derives them), so profiles stored by an older release are
+# recomputed instead of trusted. Kept apart from ENGINE_HASH, which changes
+# with any engine file and would invalidate every stored profile on each deploy.
+FORECAST_PROFILE_VERSION = 3
+
+
+class ForecastProfile(NamedTuple):
+    """
+    The natal facts a forecast depends on. Hashable, so a profile is also
+    the fingerprint its score table is cached under, and compact enough to
+    store with a user's birth data (to_dict / from_dict).
+    """
+    dm_element: str
+    use_god: str
+    use_god_2: str
+    avoid_god: str
+    avoid_god_2: str
+    natal: Tuple[Tuple[Optional[int], Optional[int]], ...]  # (stem, branch) per natal pillar
+
+    def natal_state(self) -> InteractionState:
+        """Cached natal interaction state of the profile's pillars."""
+        stems = {name: s for name, (s, _) in zip(PILLAR_NAMES, self.natal) if s is not None}
+        branches = {name: b for name, (_, b) in zip(PILLAR_NAMES, self.natal) if b is not None}
+        return natal_state(stems, branches)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form, for storing alongside the birth data."""
+        return {
+            "version": FORECAST_PROFILE_VERSION,
+            "dm_element": self.dm_element,
+            "use_god": self.use_god,
+            "use_god_2": self.use_god_2,
+            "avoid_god": self.avoid_god,
+            "avoid_god_2": self.avoid_god_2,
+            "natal": [list(pillar) for pillar in self.natal],
+        }
+
+    def fingerprint(self) -> str:
+        """
+        Digest of to_dict(). Precomputed forecasts are stored under the
+        fingerprint of the profile they were computed from, and served only
+        while the user's current profile still has it.
+        """
+        payload = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    @classmethod
+    def from_dict(cls, data: Optional[Mapping]) -> Optional["ForecastProfile"]:
+        """Profile stored by to_dict, or None if missing, malformed or outdated."""
+        if not data or data.get("version") != FORECAST_PROFILE_VERSION:
+            return None
+        try:
+            natal = tuple((stem, branch) for stem, branch in data["natal"])
+            if len(natal) != len(PILLAR_NAMES):
+                return None
+            return cls(
+                data["dm_element"], data["use_god"], data["use_god_2"],
+                data["avoid_god"], data["avoid_god_2"], natal,
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def forecast_profile(chart: Mapping) -> ForecastProfile:
+    """ForecastProfile of a calculate_bazi chart."""
+    dm_element = chart["day_master"]["element"]
+    ug_data = chart.get("use_god") or {}
+    natal = [(None, None)] * len(PILLAR_NAMES)
+    for index, stem, branch in natal_state_for_chart(chart).layers:
+        natal[index] = (stem, branch)
+    return ForecastProfile(
+        dm_element,
+        ug_data.get("use_god", dm_element),
+        ug_data.get("use_god_secondary", ""),
+        ug_data.get("avoid_god", ""),
+        ug_data.get("avoid_god_secondary", ""),
+        tuple(natal),
+    )
+
+
+def forecast_profile_for_birth(
+    birth_date: str,
+    birth_hour: Optional[int],
+    gender: str,
+    calendar_type: str = "solar",
+    is_leap_month: bool = False,
+) -> Optional[ForecastProfile]:
+    """ForecastProfile of birth data, or None if no chart can be computed for it."""
+    chart = calculate_bazi(
+        birth_date, birth_hour, gender, calendar_type=calendar_type, is_leap_month=is_leap_month,
+    )
+    return forecast_profile(chart) if chart.get("success") else None
+
+
+def forecast_score_table(profile: ForecastProfile) -> np.ndarray:
+    """
+    Scores of every day pillar for a profile, built once and cached.
+
+    Returns:
+        Read-only (60, len(SCORE_COLUMNS)) uint8 array; row p holds the
+        SCORE_COLUMNS scores of 60-cycle position p (= day_number % 60)
+    """
+    def _build():
+        cycle = np.arange(60)
+        scores = forecast_score_arrays(*profile[:5], profile.natal_state(), cycle % 10, cycle % 12)
+        table = np.stack([scores[key] for key in SCORE_COLUMNS], axis=1).astype(np.uint8)
+        table.setflags(write=False)
+        return table
+
+    return forecast_score_cache.get_or_compute(profile, _build)
+
+
+def forecast_scores_for_range(profile: ForecastProfile, start: date, days: int) -> np.ndarray:
+    """(days, len(SCORE_COLUMNS)) score rows for consecutive dates from start."""
+    return forecast_score_table(profile)[(np.arange(days) + day_number(start)) % 60]
+
+
 # ────────────────────────────────────────────────────────────
 # Fortune mood
 # ────────────────────────────────────────────────────────────
 
 def get_fortune_mood(score: int, language: str) -> str:
-    lang = language if language in ("en", "zh-TW", "zh-CN", "ko") else "en"
-    for threshold, labels in _MOOD_TIERS:
+    lang = normalize_language(language)
+    for threshold, msg_id in _MOOD_MSG:
         if score >= threshold:
-            return labels.get(lang, labels["en"])
-    return _MOOD_TIERS[-1][1].get(lang, "")
+            return text(msg_id, lang)
+    return text(_MOOD_MSG[-1][1], lang)
 
 
 # ════════════════════════════════════════════════════════════
@@ -593,39 +826,27 @@ def calculate_daily_forecast(chart: dict, language: str = "en", target_date: Opt
     Returns:
         Complete forecast dict suitable for JSON serialisation.
     """
+    return forecast_for_profile(forecast_profile(chart), language, target_date)
+
+
+def forecast_for_profile(
+    profile: ForecastProfile, language: str = "en", target_date: Optional[date] = None
+) -> dict:
+    """calculate_daily_forecast from a ForecastProfile, without the chart."""
     if target_date is None:
         target_date = date.today()
 
-    # ---- Extract natal chart info ----
-    dm_element = chart["day_master"]["element"]
-    ug_data = chart.get("use_god", {})
-    use_god_elem = ug_data.get("use_god", dm_element)
-    use_god_2 = ug_data.get("use_god_secondary", "")
-    avoid_god_elem = ug_data.get("avoid_god", "")
-    avoid_god_2 = ug_data.get("avoid_god_secondary", "")
-
-    natal_branches = _get_natal_branch_indices(chart)
-    fp = chart.get("four_pillars", {})
-    day_branch_cn = fp.get("day", {}).get("branch", {}).get("name_cn", "")
-    natal_day_branch_idx = BRANCH_NAME_TO_INDEX.get(day_branch_cn, 0)
+    # ---- Natal profile ----
+    dm_element, use_god_elem, _, avoid_god_elem, _, _ = profile
 
     # ---- Daily pillar ----
     daily_stem, daily_branch = get_daily_pillar(target_date)
     daily_elem = get_stem_element(daily_stem)
-    daily_branch_idx = BRANCH_INDEX[daily_branch]
-
-    # ---- Scores ----
-    overall = calculate_overall_score(
-        dm_element, use_god_elem, use_god_2, avoid_god_elem, avoid_god_2,
-        daily_elem, daily_branch_idx, natal_branches,
-    )
 
+    # ---- Scores (row of the profile's score table) ----
+    overall, *domain_scores = forecast_scores_for_range(profile, target_date, 1)[0].tolist()
     mood = get_fortune_mood(overall, language)
-
-    domains = calculate_domain_scores(
-        dm_element, use_god_elem, avoid_god_elem,
-        daily_elem, daily_branch_idx, natal_day_branch_idx, natal_branches,
-    )
+    domains = dict(zip(DOMAIN_KEYS, domain_scores))
 
     lucky = get_lucky_items(use_god_elem, daily_stem, daily_branch, dm_element, language)
 
@@ -633,10 +854,7 @@ def calculate_daily_forecast(chart: dict, language: str = "en", target_date: Opt
 
     energy = get_energy_rhythm(dm_element, use_god_elem, daily_stem, language)
 
-    weekly = get_weekly_outlook(
-        dm_element, use_god_elem, use_god_2, avoid_god_elem, avoid_god_2,
-        natal_branches, target_date, language,
-    )
+    weekly = get_weekly_outlook(profile, target_date, language)
 
     return {
         "date": target_date.isoformat(),
@@ -653,3 +871,61 @@ def calculate_daily_forecast(chart: dict, language: str = "en", target_date: Opt
         "energy_rhythm": energy,
         "weekly_trend": weekly,
     }
+
+
+# ════════════════════════════════════════════════════════════
+# Forecast range (calendar views)
+# ════════════════════════════════════════════════════════════
+
+MAX_RANGE_DAYS = 366
+
+
+def calculate_forecast_range(chart: dict, start_date: date, days: int, language: str = "en") -> dict:
+    """
+    Overall and domain scores for `days` consecutive dates from start_date.
+
+    Same scores as calculate_daily_forecast: every date is a row of the
+    chart's cached score table (forecast_score_table).
+
+    Args:
+        chart: result of calculate_bazi()
+        start_date: First date of the range
+        days: Number of dates (1 - MAX_RANGE_DAYS)
+        language: en / zh-TW / zh-CN / ko (for the mood labels)
+
+    Returns:
+        {"start_date", "end_date", "days": [{"date", "daily_pillar", "element",
+         "overall_score", "mood", "domains"}, ...]}
+    """
+    return forecast_range_for_profile(forecast_profile(chart), start_date, days, language)
+
+
+def forecast_range_for_profile(
+    profile: ForecastProfile, start_date: date, days: int, language: str = "en"
+) -> dict:
+    """calculate_forecast_range from a ForecastProfile, without the chart."""
+    if not 1 <= days <= MAX_RANGE_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_RANGE_DAYS}")
+
+    stems, branches = day_pillars_for_range(start_date, days)
+    columns = forecast_scores_for_range(profile, start_date, days).T.tolist()
+    elements = _STEM_ELEMENT[stems].tolist()
+    stems, branches = stems.tolist(), branches.tolist()
+
+    records = []
+    for i in range(days):
+        overall = columns[0][i]
+        records.append({
+            "date": (start_date + timedelta(days=i)).isoformat(),
+            "daily_pillar": get_stem_by_index(stems[i]).value["name_cn"] + get_branch_by_index(branches[i]).value["name_cn"],
+            "element": ELEMENTS[elements[i]],
+            "overall_score": overall,
+            "mood": get_fortune_mood(overall, language),
+            "domains": {key: columns[k][i] for k, key in enumerate(DOMAIN_KEYS, 1)},
+        })
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": (start_date + timedelta(days=days - 1)).isoformat(),
+        "days": records,
+    }
@@ -1,80 +1,247 @@
 """
 Deity Interpretations (神煞) - Symbolic stars based on stem/branch combinations
 
-Implements simplified versions of:
-- Heavenly Virtue Nobleman (天乙貴人): Based on day stem + day/hour branches
-- Heavenly Virtue (天德): Based on month branch
-- Peach Blossom (桃花): Based on year/day branch
+Stars are declared as data (DEITY_RULES) and compiled at import into 12-bit
+branch masks, one per reference value: bit b of a mask is set when branch b
+carries the star. Evaluating a chart is then one AND per rule and reference
+pillar against the chart's branch bits.
+
+Implemented stars:
+- Heavenly Virtue Nobleman (天乙貴人): day stem → day/hour branches
+- Peach Blossom (桃花): year/day branch → other branches
+- Traveling Horse (驛馬): year/day branch → other branches
+- Canopy (華蓋): year/day branch → other branches
+- Academic Star (文昌): day stem → any branch
+- Yang Blade (羊刃): day stem → any branch
+- Void (空亡): day pillar's decade (旬) → other branches
 """
 
-from typing import Dict, List, Optional
-from .stems_branches import (
-    HeavenlyStem,
-    EarthlyBranch,
-    STEM_INDEX,
-    BRANCH_INDEX,
-    INDEX_TO_STEM,
-    INDEX_TO_BRANCH,
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .chart_cache import FrozenDict
+from .chart_core import ChartCore, PILLAR_NAMES
+from .stems_branches import BRANCH_INDEX, STEM_INDEX, EarthlyBranch, HeavenlyStem
+
+_STEM_BY_CN = {stem.value["name_cn"]: STEM_INDEX[stem] for stem in HeavenlyStem}
+_BRANCH_BY_CN = {branch.value["name_cn"]: BRANCH_INDEX[branch] for branch in EarthlyBranch}
+
+# ==================== RULES ====================
+#
+# Each rule names:
+#   references  (pillar, kind) pairs checked in order; kind is "stem",
+#               "branch" or "xun" (the decade 旬 of the pillar)
+#   targets     pillars whose branches may carry the star (a branch or
+#               xun reference never targets its own pillar)
+#   table       reference characters → star branches. A key lists every
+#               reference value sharing the entry ("寅午戌": "卯"); xun keys
+#               are the decade's first pillar ("甲子": "戌亥").
+#   report      "pillars": one entry listing every target that carries the
+#               star; "trigger": "<reference>_triggers_<target>" for the
+#               first reference pillar with a hit
+#
+# Traditional mnemonics are quoted next to each table.
+
+DEITY_RULES: List[Dict] = [
+    {
+        "key": "tianyi_guiren",
+        "name_en": "Heavenly Virtue Nobleman",
+        "name_cn": "天乙貴人",
+        "references": [("day", "stem")],
+        "targets": ("day", "hour"),
+        # 甲戊庚牛羊，乙己鼠猴乡，丙丁猪鸡位，壬癸兔蛇藏，六辛逢虎马
+        "table": {"甲戊庚": "丑未", "乙己": "子申", "丙丁": "亥酉", "壬癸": "卯巳", "辛": "寅午"},
+        "report": "pillars",
+        "interpretation_en": "Auspicious star indicating noble support, help from others, and the ability to overcome difficulties.",
+        "interpretation_zh_tw": "貴人星，主得貴人相助，逢凶化吉，易得他人提攜。",
+        "interpretation_zh_cn": "贵人星，主得贵人相助，逢凶化吉，易得他人提携。",
+        "interpretation_ko": "귀인성으로，귀인 도움과 타인의 지원을 받으며 어려움을 극복하는 능력이 있습니다.",
+    },
+    {
+        "key": "taohua",
+        "name_en": "Peach Blossom",
+        "name_cn": "桃花",
+        "references": [("year", "branch"), ("day", "branch")],
+        "targets": PILLAR_NAMES,
+        # 寅午戌桃花在卯，巳酉丑桃花在午，亥卯未桃花在子，申子辰桃花在酉
+        "table": {"寅午戌": "卯", "巳酉丑": "午", "亥卯未": "子", "申子辰": "酉"},
+        "report": "trigger",
+        "interpretation_en": "Peach Blossom star — relates to charm, romance, and social appeal. Can indicate popularity or romantic opportunities.",
+        "interpretation_zh_tw": "桃花星，主魅力、人緣與感情機緣，日時見為牆內桃花（恩愛），年月見為牆外桃花。",
+        "interpretation_zh_cn": "桃花星，主魅力、人缘与感情机缘，日时见为墙内桃花（恩爱），年月见为墙外桃花。",
+        "interpretation_ko": "도화성으로，매력，인연 및 감정적 기회와 관련됩니다. 인기나 로맨틱한 기회를 나타낼 수 있습니다.",
+    },
+    {
+        "key": "yima",
+        "name_en": "Traveling Horse",
+        "name_cn": "驛馬",
+        "references": [("year", "branch"), ("day", "branch")],
+        "targets": PILLAR_NAMES,
+        # 申子辰馬在寅，寅午戌馬在申，巳酉丑馬在亥，亥卯未馬在巳
+        "table": {"申子辰": "寅", "寅午戌": "申", "巳酉丑": "亥", "亥卯未": "巳"},
+        "report": "trigger",
+        "interpretation_en": "Traveling Horse star — indicates movement, travel, relocation, and a restless drive. Opportunities often come from going further afield.",
+        "interpretation_zh_tw": "驛馬星，主奔波、遠行與遷動，宜向外發展，動中求財。",
+        "interpretation_zh_cn": "驿马星，主奔波、远行与迁动，宜向外发展，动中求财。",
+        "interpretation_ko": "역마성으로，이동，여행，이주와 관련됩니다. 밖으로 나아갈 때 기회가 찾아옵니다.",
+    },
+    {
+        "key": "huagai",
+        "name_en": "Canopy",
+        "name_cn": "華蓋",
+        "references": [("year", "branch"), ("day", "branch")],
+        "targets": PILLAR_NAMES,
+        # 申子辰見辰，寅午戌見戌，巳酉丑見丑，亥卯未見未
+        "table": {"申子辰": "辰", "寅午戌": "戌", "巳酉丑": "丑", "亥卯未": "未"},
+        "report": "trigger",
+        "interpretation_en": "Canopy star — relates to intellect, spirituality, and the arts. Suggests a reflective, independent nature that may feel somewhat solitary.",
+        "interpretation_zh_tw": "華蓋星，主聰慧、藝術與宗教玄學緣分，性情清高，略顯孤獨。",
+        "interpretation_zh_cn": "华盖星，主聪慧、艺术与宗教玄学缘分，性情清高，略显孤独。",
+        "interpretation_ko": "화개성으로，지혜，예술，종교·철학과 인연이 있습니다. 고고하고 독립적인 성향으로 다소 고독할 수 있습니다.",
+    },
+    {
+        "key": "wenchang",
+        "name_en": "Academic Star",
+        "name_cn": "文昌",
+        "references": [("day", "stem")],
+        "targets": PILLAR_NAMES,
+        # 甲乙巳午報君知，丙戊申宮丁己雞，庚豬辛鼠壬逢虎，癸人見卯入雲梯
+        "table": {"甲": "巳", "乙": "午", "丙戊": "申", "丁己": "酉", "庚": "亥", "辛": "子", "壬": "寅", "癸": "卯"},
+        "report": "pillars",
+        "interpretation_en": "Academic Star — favors learning, writing, and examinations. Indicates intelligence and a talent for study.",
+        "interpretation_zh_tw": "文昌星，主聰明好學、文筆出眾，利於考試與學業。",
+        "interpretation_zh_cn": "文昌星，主聪明好学、文笔出众，利于考试与学业。",
+        "interpretation_ko": "문창성으로，총명하고 학문을 좋아하며 글재주가 뛰어나 시험과 학업에 유리합니다.",
+    },
+    {
+        "key": "yangren",
+        "name_en": "Yang Blade",
+        "name_cn": "羊刃",
+        "references": [("day", "stem")],
+        "targets": PILLAR_NAMES,
+        # Yang stems only: 甲刃在卯，丙戊刃在午，庚刃在酉，壬刃在子
+        "table": {"甲": "卯", "丙戊": "午", "庚": "酉", "壬": "子"},
+        "report": "pillars",
+        "interpretation_en": "Yang Blade star — strong will, courage, and decisiveness, but also impulsiveness. Channel its force carefully to avoid conflict or injury.",
+        "interpretation_zh_tw": "羊刃星，主剛強果決、膽識過人，但性急易衝動，需防爭鬥與血光。",
+        "interpretation_zh_cn": "羊刃星，主刚强果决、胆识过人，但性急易冲动，需防争斗与血光。",
+        "interpretation_ko": "양인성으로，강한 의지와 결단력을 주지만 성급하고 충동적일 수 있어 다툼과 부상에 주의해야 합니다.",
+    },
+    {
+        "key": "kongwang",
+        "name_en": "Void",
+        "name_cn": "空亡",
+        "references": [("day", "xun")],
+        "targets": PILLAR_NAMES,
+        # 甲子旬中戌亥空，甲戌旬中申酉空 …
+        "table": {"甲子": "戌亥", "甲戌": "申酉", "甲申": "午未", "甲午": "辰巳", "甲辰": "寅卯", "甲寅": "子丑"},
+        "report": "pillars",
+        "interpretation_en": "Void (Empty) star — the affected pillars' influence is weakened. Efforts there may feel hollow or delayed; favorable for spiritual pursuits.",
+        "interpretation_zh_tw": "空亡，所落之柱力量減弱，相關事項易有落空或延遲，利於修行與精神追求。",
+        "interpretation_zh_cn": "空亡，所落之柱力量减弱，相关事项易有落空或延迟，利于修行与精神追求。",
+        "interpretation_ko": "공망으로，해당 기둥의 힘이 약해져 관련 일이 허사가 되거나 지연되기 쉽습니다. 수행과 정신적 추구에는 유리합니다.",
+    },
+]
+
+_RECORD_FIELDS = (
+    "key", "name_en", "name_cn", "pillar",
+    "interpretation_en", "interpretation_zh_tw", "interpretation_zh_cn", "interpretation_ko",
 )
 
-# 天乙贵人: Day stem -> nobleman branches (2 per stem)
-# "甲戊庚牛羊，乙己鼠猴乡，丙丁猪鸡位，壬癸兔蛇藏，六辛逢虎马"
-TIANYI_GUIREN = {
-    HeavenlyStem.JIA: [EarthlyBranch.CHOU, EarthlyBranch.WEI],   # 牛羊
-    HeavenlyStem.WU: [EarthlyBranch.CHOU, EarthlyBranch.WEI],
-    HeavenlyStem.GENG: [EarthlyBranch.CHOU, EarthlyBranch.WEI],
-    HeavenlyStem.YI: [EarthlyBranch.ZI, EarthlyBranch.SHEN],       # 鼠猴
-    HeavenlyStem.JI: [EarthlyBranch.ZI, EarthlyBranch.SHEN],
-    HeavenlyStem.BING: [EarthlyBranch.HAI, EarthlyBranch.YOU],    # 猪鸡
-    HeavenlyStem.DING: [EarthlyBranch.HAI, EarthlyBranch.YOU],
-    HeavenlyStem.REN: [EarthlyBranch.MAO, EarthlyBranch.SI],      # 兔蛇
-    HeavenlyStem.GUI: [EarthlyBranch.MAO, EarthlyBranch.SI],
-    HeavenlyStem.XIN: [EarthlyBranch.YIN, EarthlyBranch.WU_BRANCH],  # 虎马
-}
-
-# 桃花 (Peach Blossom): Branch -> peach blossom branch
-# "寅午戌桃花在卯，巳酉丑桃花在午，亥卯未桃花在子，申子辰桃花在酉"
-TAOHUA_MAP = {
-    EarthlyBranch.YIN: EarthlyBranch.MAO,   # 寅午戌 -> 卯
-    EarthlyBranch.WU_BRANCH: EarthlyBranch.MAO,
-    EarthlyBranch.XU: EarthlyBranch.MAO,
-    EarthlyBranch.SI: EarthlyBranch.WU_BRANCH,   # 巳酉丑 -> 午
-    EarthlyBranch.YOU: EarthlyBranch.WU_BRANCH,
-    EarthlyBranch.CHOU: EarthlyBranch.WU_BRANCH,
-    EarthlyBranch.HAI: EarthlyBranch.ZI,     # 亥卯未 -> 子
-    EarthlyBranch.MAO: EarthlyBranch.ZI,
-    EarthlyBranch.WEI: EarthlyBranch.ZI,
-    EarthlyBranch.SHEN: EarthlyBranch.YOU,  # 申子辰 -> 酉
-    EarthlyBranch.ZI: EarthlyBranch.YOU,
-    EarthlyBranch.CHEN: EarthlyBranch.YOU,
-}
-
-# Day stem name_cn to enum
-STEM_NAME_TO_ENUM = {
-    "甲": HeavenlyStem.JIA, "乙": HeavenlyStem.YI, "丙": HeavenlyStem.BING,
-    "丁": HeavenlyStem.DING, "戊": HeavenlyStem.WU, "己": HeavenlyStem.JI,
-    "庚": HeavenlyStem.GENG, "辛": HeavenlyStem.XIN, "壬": HeavenlyStem.REN,
-    "癸": HeavenlyStem.GUI,
-}
-
-# Branch name_cn to enum
-BRANCH_NAME_TO_ENUM = {
-    "子": EarthlyBranch.ZI, "丑": EarthlyBranch.CHOU, "寅": EarthlyBranch.YIN,
-    "卯": EarthlyBranch.MAO, "辰": EarthlyBranch.CHEN, "巳": EarthlyBranch.SI,
-    "午": EarthlyBranch.WU_BRANCH, "未": EarthlyBranch.WEI, "申": EarthlyBranch.SHEN,
-    "酉": EarthlyBranch.YOU, "戌": EarthlyBranch.XU, "亥": EarthlyBranch.HAI,
-}
-
-
-def _get_branch_enum(branch_dict: Dict) -> Optional[EarthlyBranch]:
-    name = branch_dict.get("name_cn") if isinstance(branch_dict, dict) else None
-    return BRANCH_NAME_TO_ENUM.get(name) if name else None
-
-
-def _get_stem_enum(stem_dict: Dict) -> Optional[HeavenlyStem]:
-    name = stem_dict.get("name_cn") if isinstance(stem_dict, dict) else None
-    return STEM_NAME_TO_ENUM.get(name) if name else None
 
+# ==================== COMPILER ====================
+
+_PILLAR_POS = {pn: i for i, pn in enumerate(PILLAR_NAMES)}
+
+
+def _reference_values(key: str, kind: str) -> List[int]:
+    """Reference values (stem, branch or decade index) named by a table key."""
+    if kind == "stem":
+        return [_STEM_BY_CN[ch] for ch in key]
+    if kind == "branch":
+        return [_BRANCH_BY_CN[ch] for ch in key]
+    if kind == "xun":
+        # A decade is identified by (branch - stem) % 12 of any of its pillars
+        return [(_BRANCH_BY_CN[key[1]] - _STEM_BY_CN[key[0]]) % 12]
+    raise ValueError(f"Unknown deity reference kind: {kind}")
+
+
+def _compile_masks(rule: Dict, kind: str) -> Tuple[int, ...]:
+    """Reference value → 12-bit mask of the branches carrying the star."""
+    masks = [0] * 12
+    for key, star_branches in rule["table"].items():
+        mask = 0
+        for ch in star_branches:
+            mask |= 1 << _BRANCH_BY_CN[ch]
+        for value in _reference_values(key, kind):
+            masks[value] |= mask
+    return tuple(masks)
+
+
+# Every rule owns a 12-bit field of one packed int (rule i at bit 12 * i),
+# so a reference slot — (pillar, kind) — holds all rules' masks for a
+# reference value in a single int, and one AND against the chart's branch
+# bits (replicated into every field) tests every rule on that slot.
+_FIELD = 0xFFF
+
+_SLOTS: List[Tuple[int, str]] = []          # (pillar position, kind)
+_slot_masks: List[List[int]] = []           # slot → reference value → packed masks
+_RULE_REFERENCES: List[Tuple] = []          # rule → ((slot, target positions), ...)
+
+for _i, _rule in enumerate(DEITY_RULES):
+    if _rule["report"] not in ("pillars", "trigger"):
+        raise ValueError(f"Unknown deity report mode: {_rule['report']}")
+    _references = []
+    for _pillar, _kind in _rule["references"]:
+        _slot_key = (_PILLAR_POS[_pillar], _kind)
+        if _slot_key not in _SLOTS:
+            _SLOTS.append(_slot_key)
+            _slot_masks.append([0] * 12)
+        _slot = _SLOTS.index(_slot_key)
+        for _value, _mask in enumerate(_compile_masks(_rule, _kind)):
+            _slot_masks[_slot][_value] |= _mask << (12 * _i)
+        _targets = tuple(
+            _PILLAR_POS[pn] for pn in _rule["targets"] if _kind == "stem" or pn != _pillar
+        )
+        _references.append((_slot, _targets))
+    _RULE_REFERENCES.append(tuple(_references))
+
+_COMPILED_SLOTS = tuple((pos, kind, tuple(masks)) for (pos, kind), masks in zip(_SLOTS, _slot_masks))
+_REPLICATE = sum(1 << (12 * i) for i in range(len(DEITY_RULES)))
+
+# The same masks unpacked for arrays of charts: _MASK_ARRAY[slot][value][rule]
+_MASK_ARRAY = np.array([
+    [[packed >> (12 * i) & _FIELD for i in range(len(DEITY_RULES))] for packed in masks]
+    for masks in _slot_masks
+], dtype=np.int64)
+
+# Each rule's references in order, padded with target-less entries:
+# slot, reference pillar position, and the 4-bit mask of its target pillars
+_MAX_REFERENCES = max(len(references) for references in _RULE_REFERENCES)
+_REFERENCE_SLOTS = np.zeros((len(DEITY_RULES), _MAX_REFERENCES), dtype=np.int64)
+_REFERENCE_POSITIONS = np.zeros((len(DEITY_RULES), _MAX_REFERENCES), dtype=np.int64)
+_REFERENCE_TARGETS = np.zeros((len(DEITY_RULES), _MAX_REFERENCES), dtype=np.int64)
+for _i, _references in enumerate(_RULE_REFERENCES):
+    for _r, (_slot, _targets) in enumerate(_references):
+        _REFERENCE_SLOTS[_i, _r] = _slot
+        _REFERENCE_POSITIONS[_i, _r] = _SLOTS[_slot][0]
+        _REFERENCE_TARGETS[_i, _r] = sum(1 << t for t in _targets)
+
+# Shared read-only records, one per (star, pillar description)
+_records: Dict[Tuple[str, str], FrozenDict] = {}
+
+
+def _record(rule: Dict, pillar: str) -> FrozenDict:
+    key = (rule["key"], pillar)
+    record = _records.get(key)
+    if record is None:
+        record = FrozenDict((f, pillar if f == "pillar" else rule[f]) for f in _RECORD_FIELDS)
+        record = _records.setdefault(key, record)
+    return record
+
+
+# ==================== EVALUATION ====================
 
 def get_deities_for_chart(four_pillars: Dict, day_master: Dict) -> List[Dict]:
     """
@@ -87,58 +254,115 @@ def get_deities_for_chart(four_pillars: Dict, day_master: Dict) -> List[Dict]:
     Returns:
         List of deity dicts: { key, name_en, name_cn, pillar, interpretation }
     """
-    deities = []
-    day_stem = four_pillars.get("day", {}).get("stem", {})
-    day_branch = four_pillars.get("day", {}).get("branch", {})
-    hour_branch = four_pillars.get("hour", {}).get("branch", {})
-    year_branch = four_pillars.get("year", {}).get("branch", {})
-    month_branch = four_pillars.get("month", {}).get("branch", {})
-
-    # 天乙贵人 (Tian Yi Gui Ren)
-    stem_enum = _get_stem_enum(day_stem)
-    if stem_enum and stem_enum in TIANYI_GUIREN:
-        noble_branches = TIANYI_GUIREN[stem_enum]
-        day_br_enum = _get_branch_enum(day_branch)
-        hour_br_enum = _get_branch_enum(hour_branch)
-        found_in = []
-        if day_br_enum in noble_branches:
-            found_in.append("day")
-        if hour_br_enum in noble_branches:
-            found_in.append("hour")
-        if found_in:
-            deities.append({
-                "key": "tianyi_guiren",
-                "name_en": "Heavenly Virtue Nobleman",
-                "name_cn": "天乙貴人",
-                "pillar": ",".join(found_in),
-                "interpretation_en": "Auspicious star indicating noble support, help from others, and the ability to overcome difficulties.",
-                "interpretation_zh_tw": "貴人星，主得貴人相助，逢凶化吉，易得他人提攜。",
-                "interpretation_zh_cn": "贵人星，主得贵人相助，逢凶化吉，易得他人提携。",
-                "interpretation_ko": "귀인성으로，귀인 도움과 타인의 지원을 받으며 어려움을 극복하는 능력이 있습니다.",
-            })
-
-    # 桃花 (Peach Blossom) - check year and day branch
-    taohua_added = False
-    for pillar_name, branch_dict in [("year", year_branch), ("day", day_branch)]:
-        if taohua_added:
-            break
-        br_enum = _get_branch_enum(branch_dict)
-        if br_enum and br_enum in TAOHUA_MAP:
-            peach_branch = TAOHUA_MAP[br_enum]
-            for pn, pdata in four_pillars.items():
-                pb = pdata.get("branch", {})
-                if _get_branch_enum(pb) == peach_branch:
-                    deities.append({
-                        "key": "taohua",
-                        "name_en": "Peach Blossom",
-                        "name_cn": "桃花",
-                        "pillar": f"{pillar_name}_triggers_{pn}",
-                        "interpretation_en": "Peach Blossom star — relates to charm, romance, and social appeal. Can indicate popularity or romantic opportunities.",
-                        "interpretation_zh_tw": "桃花星，主魅力、人緣與感情機緣，日時見為牆內桃花（恩愛），年月見為牆外桃花。",
-                        "interpretation_zh_cn": "桃花星，主魅力、人缘与感情机缘，日时见为墙内桃花（恩爱），年月见为墙外桃花。",
-                        "interpretation_ko": "도화성으로，매력，인연 및 감정적 기회와 관련됩니다. 인기나 로맨틱한 기회를 나타낼 수 있습니다.",
-                    })
-                    taohua_added = True
-                    break
-
-    return deities
+    try:
+        core = ChartCore.from_four_pillars(four_pillars)
+    except ValueError:
+        return []
+    return get_deities_for_core(core)
+
+
+def get_deities_for_core(core: ChartCore) -> List[Dict]:
+    """get_deities_for_chart for a ChartCore."""
+    return deities_from_codes(deity_codes_for_core(core))
+
+
+# A rule's code is 0 if the star is absent, else FOUND_FLAG | (reference
+# pillar position << 4) | (mask of the pillars carrying it)
+FOUND_FLAG = 0x80
+
+
+def deity_codes_for_core(core: ChartCore) -> List[int]:
+    """One byte per rule in DEITY_RULES order: where (if anywhere) the star sits."""
+    stems, branches = core.stems, core.branches
+    bits = [1 << b for b in branches]
+    chart_bits = (bits[0] | bits[1] | bits[2] | bits[3]) * _REPLICATE
+
+    # One AND per reference slot tests every rule at once
+    slot_hits = []
+    pending = 0
+    for pos, kind, masks in _COMPILED_SLOTS:
+        if kind == "stem":
+            hits = masks[stems[pos]] & chart_bits
+        elif kind == "branch":
+            hits = masks[branches[pos]] & chart_bits
+        else:
+            hits = masks[(branches[pos] - stems[pos]) % 12] & chart_bits
+        slot_hits.append(hits)
+        pending |= hits
+
+    # Resolve the pillars of each candidate rule
+    codes = [0] * len(DEITY_RULES)
+    while pending:
+        i = ((pending & -pending).bit_length() - 1) // 12
+        shift = 12 * i
+        pending &= ~(_FIELD << shift)
+        for slot, targets in _RULE_REFERENCES[i]:
+            mask = slot_hits[slot] >> shift & _FIELD
+            found = 0
+            for t in targets:
+                if bits[t] & mask:
+                    found |= 1 << t
+            if found:
+                codes[i] = FOUND_FLAG | _SLOTS[slot][0] << 4 | found
+                break
+
+    return codes
+
+
+def deity_code_matrix(stems: np.ndarray, branches: np.ndarray) -> np.ndarray:
+    """
+    deity_codes_for_core of N charts at once: an (N, len(DEITY_RULES)) array.
+
+    All slot masks of the batch are gathered in one step; each rule then
+    keeps the code of its first reference that finds the star.
+
+    Args:
+        stems: (N, 4) year/month/day/hour stem indices
+        branches: (N, 4) year/month/day/hour branch indices
+    """
+    stems = np.asarray(stems, dtype=np.int64)
+    branches = np.asarray(branches, dtype=np.int64)
+    bits = np.left_shift(1, branches)                                     # (N, 4)
+    chart_bits = np.bitwise_or.reduce(bits, axis=1)
+
+    values = np.stack([
+        stems[:, pos] if kind == "stem"
+        else branches[:, pos] if kind == "branch"
+        else (branches[:, pos] - stems[:, pos]) % 12
+        for pos, kind in _SLOTS
+    ], axis=1)                                                            # (N, slots)
+    hits = _MASK_ARRAY[np.arange(len(_SLOTS)), values] & chart_bits[:, None, None]
+    hits = hits[:, _REFERENCE_SLOTS, np.arange(len(DEITY_RULES))[:, None]]  # (N, rules, refs)
+
+    # Mask of the target pillars whose branch carries the star
+    present = (bits[:, None, None, :] & hits[..., None]) != 0
+    found = (present @ (1 << np.arange(4))) & _REFERENCE_TARGETS
+    first = (found != 0).argmax(axis=2)[..., None]
+    found = np.take_along_axis(found, first, axis=2)[..., 0]
+    positions = np.take_along_axis(
+        np.broadcast_to(_REFERENCE_POSITIONS, hits.shape), first, axis=2
+    )[..., 0]
+    return np.where(found != 0, FOUND_FLAG | positions << 4 | found, 0)
+
+
+# Record of each (rule position, code) seen so far
+_records_by_code: Dict[Tuple[int, int], FrozenDict] = {}
+
+
+def _code_record(i: int, code: int) -> FrozenDict:
+    record = _records_by_code.get((i, code))
+    if record is None:
+        rule = DEITY_RULES[i]
+        found = [t for t in range(4) if code >> t & 1]
+        if rule["report"] == "trigger":
+            pos = code >> 4 & 0x3
+            pillar = f"{PILLAR_NAMES[pos]}_triggers_{PILLAR_NAMES[found[0]]}"
+        else:
+            pillar = ",".join(PILLAR_NAMES[t] for t in found)
+        record = _records_by_code.setdefault((i, code), _record(rule, pillar))
+    return record
+
+
+def deities_from_codes(codes: Sequence[int]) -> List[Dict]:
+    """Shared deity records of deity_codes_for_core output, in rule order."""
+    return [_code_record(i, code) for i, code in enumerate(codes) if code]
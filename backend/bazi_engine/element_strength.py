@@ -0,0 +1,104 @@
+"""
+Weighted Element Strength (五行力量)
+
+count_elements tallies the eight visible characters. The strength model
+also weighs what the branches hide: every branch contributes the
+5-vector of its hidden stems (藏干, weighted by HIDDEN_STEM_WEIGHTS), and
+the month branch (月令) is scaled per element by its seasonal state in that
+month (SEASONAL_MULTIPLIER). Stems contribute their own element.
+
+Each of the 34 distinct (position class, character) pairs — 10 stems,
+12 branches, 12 month branches — has a fixed row in CHARACTER_ELEMENTS
+(34 x 5). A chart is a row of character counts, so for N charts
+
+    strength (N x 5) = counts (N x 34) @ CHARACTER_ELEMENTS
+
+and a batch of any size is one matrix product. Element order is
+relations.ELEMENTS (Wood, Fire, Earth, Metal, Water).
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from .chart_core import ChartCore
+from .hidden_stems import BRANCH_HIDDEN_STEMS, HIDDEN_STEM_WEIGHTS
+from .relations import ELEMENTS, STEM_ELEMENT
+from .seasonal_strength import SEASONAL_MULTIPLIER, element_season_state
+from .stems_branches import INDEX_TO_BRANCH, STEM_INDEX
+
+# ---- Character rows ----
+
+STEM_ELEMENT_WEIGHTS = np.zeros((10, 5))
+STEM_ELEMENT_WEIGHTS[np.arange(10), STEM_ELEMENT] = 1.0
+
+BRANCH_ELEMENT_WEIGHTS = np.zeros((12, 5))
+for _b in range(12):
+    _branch = INDEX_TO_BRANCH[_b]
+    for _stem, _weight in zip(BRANCH_HIDDEN_STEMS[_branch], HIDDEN_STEM_WEIGHTS[_branch]):
+        BRANCH_ELEMENT_WEIGHTS[_b, STEM_ELEMENT[STEM_INDEX[_stem]]] += _weight
+
+# SEASONAL_ELEMENT_MULTIPLIER[month branch][element]
+SEASONAL_ELEMENT_MULTIPLIER = np.array([
+    [SEASONAL_MULTIPLIER[element_season_state(element, m)] for element in ELEMENTS]
+    for m in range(12)
+])
+MONTH_BRANCH_ELEMENT_WEIGHTS = BRANCH_ELEMENT_WEIGHTS * SEASONAL_ELEMENT_MULTIPLIER
+
+# Column offsets of each character class in the count matrix
+STEM_COLUMN = 0
+BRANCH_COLUMN = 10
+MONTH_BRANCH_COLUMN = 22
+CHARACTER_COLUMNS = 34
+
+CHARACTER_ELEMENTS = np.vstack([
+    STEM_ELEMENT_WEIGHTS,
+    BRANCH_ELEMENT_WEIGHTS,
+    MONTH_BRANCH_ELEMENT_WEIGHTS,
+])
+CHARACTER_ELEMENTS.setflags(write=False)
+
+
+def character_counts(stems: np.ndarray, branches: np.ndarray) -> np.ndarray:
+    """
+    (N x 34) character count matrix of N charts.
+
+    Args:
+        stems: (N, 4) year/month/day/hour stem indices
+        branches: (N, 4) year/month/day/hour branch indices
+    """
+    stems = np.asarray(stems)
+    branches = np.asarray(branches)
+    rows = np.arange(len(stems))
+    counts = np.zeros((len(stems), CHARACTER_COLUMNS), dtype=np.float32)
+    # Each statement touches every row once, so fancy += never double-counts
+    for p in range(4):
+        counts[rows, STEM_COLUMN + stems[:, p]] += 1
+    for p in (0, 2, 3):
+        counts[rows, BRANCH_COLUMN + branches[:, p]] += 1
+    counts[rows, MONTH_BRANCH_COLUMN + branches[:, 1]] += 1
+    return counts
+
+
+def element_strength_matrix(stems: np.ndarray, branches: np.ndarray) -> np.ndarray:
+    """
+    (N x 5) weighted element strength of N charts.
+
+    Args:
+        stems: (N, 4) year/month/day/hour stem indices
+        branches: (N, 4) year/month/day/hour branch indices
+    """
+    return character_counts(stems, branches) @ CHARACTER_ELEMENTS
+
+
+def element_strength_for_core(core: ChartCore) -> Dict[str, float]:
+    """Weighted element strength of one chart as {element: strength}."""
+    stems, branches = core.stems, core.branches
+    # Same product for a single row; bincount builds the count row cheaply
+    columns = [
+        STEM_COLUMN + stems[0], STEM_COLUMN + stems[1], STEM_COLUMN + stems[2], STEM_COLUMN + stems[3],
+        BRANCH_COLUMN + branches[0], MONTH_BRANCH_COLUMN + branches[1],
+        BRANCH_COLUMN + branches[2], BRANCH_COLUMN + branches[3],
+    ]
+    vector = np.bincount(columns, minlength=CHARACTER_COLUMNS) @ CHARACTER_ELEMENTS
+    return {element: round(v, 2) for element, v in zip(ELEMENTS, vector.tolist())}
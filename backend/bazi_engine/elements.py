@@ -7,6 +7,15 @@ Implements element generation/destruction cycles and balance calculations
 from typing import Dict, List
 from enum import Enum
 
+from .relations import (
+    ELEMENTS,
+    ELEMENT_INDEX,
+    RELATION_NAMES,
+    CONTROLLED_BY_ELEMENT,
+    GENERATED_BY_ELEMENT,
+    element_relation,
+)
+
 
 class Element(Enum):
     """Five Elements"""
@@ -103,31 +112,32 @@ def count_elements(elements_list: List[str]) -> Dict[str, int]:
         count_elements(['Wood', 'Fire', 'Wood', 'Water'])
         -> {'Wood': 2, 'Fire': 1, 'Water': 1, 'Earth': 0, 'Metal': 0}
     """
-    counts = {elem.value: 0 for elem in Element}
-    
+    tally = [0] * 5
     for elem_str in elements_list:
-        for elem in Element:
-            if elem.value == elem_str:
-                counts[elem_str] += 1
-                break
-    
-    return counts
+        index = ELEMENT_INDEX.get(elem_str)
+        if index is not None:
+            tally[index] += 1
+    return dict(zip(ELEMENTS, tally))
 
 
-def get_element_balance(element_counts: Dict[str, int]) -> Dict:
+def get_element_balance(element_counts: Dict[str, float]) -> Dict:
     """
     Analyze element balance and determine deficiencies/excesses
+
+    Args:
+        element_counts: Element counts (count_elements) or weighted
+            strengths (element_strength.py); the chart uses the latter
     
     Returns:
         {
-            "total": int,
+            "total": float,
             "balance": str,  # "weak", "neutral", "strong"
             "deficient": List[str],
             "abundant": List[str],
             "recommendations": str
         }
     """
-    total = sum(element_counts.values())
+    total = round(sum(element_counts.values()), 2)
     
     if total == 0:
         return {
@@ -176,29 +186,12 @@ def get_element_relationships(elem1: str, elem2: str) -> str:
     Get relationship between two elements
     
     Returns: "generates", "destroys", "same", "none"
+
+    Engine code compares relations.element_relation codes instead; this
+    is the string form of the same table.
     """
-    elem1_obj = None
-    elem2_obj = None
-    
-    for elem in Element:
-        if elem.value == elem1:
-            elem1_obj = elem
-        if elem.value == elem2:
-            elem2_obj = elem
-    
-    if elem1_obj is None or elem2_obj is None:
-        return "none"
-    
-    if elem1_obj == elem2_obj:
-        return "same"
-    
-    if GENERATION_CYCLE.get(elem1_obj) == elem2_obj:
-        return "generates"
-    
-    if DESTRUCTION_CYCLE.get(elem1_obj) == elem2_obj:
-        return "destroys"
-    
-    return "none"
+    relation = element_relation(elem1, elem2)
+    return "none" if relation is None else RELATION_NAMES[relation]
 
 
 def get_favorable_elements(deficient: List[str], abundant: List[str]) -> List[str]:
@@ -212,16 +205,12 @@ def get_favorable_elements(deficient: List[str], abundant: List[str]) -> List[st
     
     # For deficient elements, add elements that generate them
     for deficient_elem in deficient:
-        for generator_elem in Element:
-            if GENERATION_CYCLE.get(generator_elem) and \
-               GENERATION_CYCLE.get(generator_elem).value == deficient_elem:
-                favorable.append(generator_elem.value)
+        if deficient_elem in ELEMENT_INDEX:
+            favorable.append(ELEMENTS[GENERATED_BY_ELEMENT[ELEMENT_INDEX[deficient_elem]]])
     
     # For abundant elements, add elements that destroy them
     for abundant_elem in abundant:
-        for destroyer_elem in Element:
-            if DESTRUCTION_CYCLE.get(destroyer_elem) and \
-               DESTRUCTION_CYCLE.get(destroyer_elem).value == abundant_elem:
-                favorable.append(destroyer_elem.value)
+        if abundant_elem in ELEMENT_INDEX:
+            favorable.append(ELEMENTS[CONTROLLED_BY_ELEMENT[ELEMENT_INDEX[abundant_elem]]])
     
     return list(set(favorable))  # Remove duplicates
@@ -0,0 +1,77 @@
+"""
+Forecast Batch (批量流日)
+
+Daily forecasts for many natal profiles at once — the nightly job that
+precomputes tomorrow's forecast of every user with saved birth data.
+
+Users are processed in chunks on a process pool (see batch.py). Each
+user's natal profile is read from the stored forecast profile when it is
+current, so a worker only computes a chart for users whose stored
+profile is missing or outdated; those recomputed profiles are handed back
+to be stored. One profile then yields the forecast in every requested
+language from the same cached score table.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .daily_forecast import ForecastProfile, forecast_for_profile, forecast_profile_for_birth
+from .messages import LANGUAGES
+
+# (user id, stored forecast profile or None, birth data fields)
+ForecastItem = Tuple[str, Optional[Dict], Dict]
+
+
+def item_profile(item: ForecastItem) -> Optional[ForecastProfile]:
+    """Natal profile of a batch item, or None if its birth data has no chart."""
+    _, stored, birth = item
+    profile = ForecastProfile.from_dict(stored)
+    if profile is not None:
+        return profile
+    return forecast_profile_for_birth(
+        birth["birth_date"],
+        birth["birth_hour"],
+        birth["gender"],
+        birth.get("calendar_type") or "solar",
+        birth.get("is_leap_month") or False,
+    )
+
+
+def compute_forecast_chunk(
+    items: Sequence[ForecastItem],
+    target_date: date,
+    languages: Sequence[str] = LANGUAGES,
+) -> Tuple[List[Dict], int, List[Tuple[str, Dict]]]:
+    """
+    Worker entry point: the forecasts of one chunk of users.
+
+    Returns:
+        ([{"user_id", "forecast_date", "language", "profile_key", "forecast"}, ...],
+         number of users skipped because no chart could be computed,
+         [(user id, profile dict), ...] of the profiles recomputed because
+         the stored one was missing or outdated)
+    """
+    records: List[Dict] = []
+    skipped = 0
+    refreshed: List[Tuple[str, Dict]] = []
+    for item in items:
+        try:
+            profile = item_profile(item)
+        except Exception:
+            profile = None
+        if profile is None:
+            skipped += 1
+            continue
+        current = profile.to_dict()
+        if current != item[1]:
+            refreshed.append((item[0], current))
+        profile_key = profile.fingerprint()
+        for language in languages:
+            records.append({
+                "user_id": item[0],
+                "forecast_date": target_date.isoformat(),
+                "language": language,
+                "profile_key": profile_key,
+                "forecast": forecast_for_profile(profile, language, target_date),
+            })
+    return records, skipped, refreshed
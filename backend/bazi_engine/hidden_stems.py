@@ -6,7 +6,7 @@ internal, hidden aspects beneath surface manifestations.
 Standard mapping per Wikibooks/Imperial Harvest.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from .stems_branches import (
     EarthlyBranch,
     HeavenlyStem,
@@ -31,6 +31,25 @@ BRANCH_HIDDEN_STEMS: Dict[EarthlyBranch, List[HeavenlyStem]] = {
     EarthlyBranch.HAI: [HeavenlyStem.REN, HeavenlyStem.JIA],      # 亥: 壬甲
 }
 
+# Share of each hidden stem in its branch, aligned with BRANCH_HIDDEN_STEMS:
+# main qi (本氣) 0.6, middle qi (中氣) 0.3, residual qi (餘氣) 0.1; two-stem
+# branches split 0.7 / 0.3. The main qi is always the branch's own element
+# (巳: 丙 main, 戊 middle, 庚 residual).
+HIDDEN_STEM_WEIGHTS: Dict[EarthlyBranch, Tuple[float, ...]] = {
+    EarthlyBranch.ZI: (1.0,),                 # 壬
+    EarthlyBranch.CHOU: (0.6, 0.3, 0.1),      # 己 癸 辛
+    EarthlyBranch.YIN: (0.1, 0.6, 0.3),       # 戊 甲 丙
+    EarthlyBranch.MAO: (1.0,),                # 乙
+    EarthlyBranch.CHEN: (0.6, 0.3, 0.1),      # 戊 乙 癸
+    EarthlyBranch.SI: (0.1, 0.6, 0.3),        # 庚 丙 戊
+    EarthlyBranch.WU_BRANCH: (0.7, 0.3),      # 丁 己
+    EarthlyBranch.WEI: (0.6, 0.3, 0.1),       # 己 丁 乙
+    EarthlyBranch.SHEN: (0.1, 0.6, 0.3),      # 戊 庚 壬
+    EarthlyBranch.YOU: (1.0,),                # 辛
+    EarthlyBranch.XU: (0.3, 0.1, 0.6),        # 辛 丁 戊
+    EarthlyBranch.HAI: (0.7, 0.3),            # 壬 甲
+}
+
 # Map branch name_cn to EarthlyBranch for lookup from dict
 BRANCH_NAME_TO_ENUM = {
     "子": EarthlyBranch.ZI,
@@ -0,0 +1,239 @@
+"""
+Layered Interactions (命局 → 大運 → 流年 → 流日)
+
+One interaction engine for the natal chart and the pillars laid over it:
+a luck pillar (大運), an annual pillar (流年) and a daily pillar (流日).
+
+An InteractionState holds, for every branch (0-11) and stem (0-9) a new
+pillar could bring, a bitmask of the layers it would interact with:
+
+    branch_masks[kind][b]  bit L set → branch b clashes / combines / harms layer L
+    stem_masks[kind][s]    bit L set → stem s combines with layer L
+
+Layers are the four natal pillars (bits 0-3), then luck, annual and daily
+(bits 4-6). The natal state is built once per chart and cached; overlaying
+a pillar reads its interactions straight from the masks and ORs one table
+column into them for the next layer, so "this day, in this year, in this
+decade" is a few array lookups — and a whole year of days is one gather.
+
+Branch kinds: six clashes (六沖), six combinations (六合), six harms (六害).
+Stem kinds: stem combinations (天干合). The multi-branch natal patterns
+(三合, 三刑, self-punishment) stay in pillar_interactions.
+"""
+
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .chart_cache import interaction_state_cache
+from .chart_core import BRANCH_NAME_TO_INDEX, PILLAR_NAMES, STEM_NAME_TO_INDEX, ChartCore
+from .pillar_interactions import (
+    SIX_CLASHES,
+    SIX_COMBINATIONS,
+    SIX_HARMS,
+    STEM_COMBINATIONS,
+    find_pillar_interactions_for_core,
+)
+
+# ---- Layers ----
+
+LAYER_KEYS: Tuple[str, ...] = PILLAR_NAMES + ("luck", "annual", "daily")
+LAYER_INDEX: Dict[str, int] = {key: i for i, key in enumerate(LAYER_KEYS)}
+NATAL_LAYERS = 0b1111
+
+# ---- Pair tables ----
+
+BRANCH_KINDS: Tuple[str, ...] = ("clash", "combination", "harm")
+STEM_KINDS: Tuple[str, ...] = ("stem_combination",)
+
+
+def _pair_table(size: int, pairs: Iterable[frozenset]) -> np.ndarray:
+    table = np.zeros((size, size), dtype=np.int64)
+    for pair in pairs:
+        a, b = sorted(pair)
+        table[a, b] = table[b, a] = 1
+    return table
+
+
+# BRANCH_TABLES[kind][a][b] = 1 if branches a and b form that pair
+BRANCH_TABLES = np.stack([
+    _pair_table(12, SIX_CLASHES),
+    _pair_table(12, SIX_COMBINATIONS),
+    _pair_table(12, SIX_HARMS),
+])
+STEM_TABLES = np.stack([_pair_table(10, STEM_COMBINATIONS)])
+BRANCH_TABLES.setflags(write=False)
+STEM_TABLES.setflags(write=False)
+
+CLASH, COMBINATION, HARM = BRANCH_TABLES.astype(bool)
+
+# Layer keys of each layer mask, and its popcount
+_MASK_LAYERS = tuple(
+    tuple(LAYER_KEYS[i] for i in range(len(LAYER_KEYS)) if mask >> i & 1)
+    for mask in range(1 << len(LAYER_KEYS))
+)
+MASK_COUNT = np.array([len(layers) for layers in _MASK_LAYERS], dtype=np.int64)
+
+
+def mask_layers(mask: int) -> Tuple[str, ...]:
+    """Layer keys set in a layer mask, in layer order."""
+    return _MASK_LAYERS[mask]
+
+
+class InteractionState:
+    """
+    Interaction masks of a stack of layers (see module docstring).
+
+    States are immutable: overlay() returns a new state, so a cached natal
+    state can be shared by every query built on it.
+    """
+
+    __slots__ = ("layers", "branch_masks", "stem_masks")
+
+    def __init__(
+        self,
+        layers: Tuple[Tuple[int, Optional[int], Optional[int]], ...] = (),
+        branch_masks: Optional[np.ndarray] = None,
+        stem_masks: Optional[np.ndarray] = None,
+    ):
+        self.layers = layers
+        self.branch_masks = (
+            np.zeros((len(BRANCH_KINDS), 12), dtype=np.int64) if branch_masks is None else branch_masks
+        )
+        self.stem_masks = (
+            np.zeros((len(STEM_KINDS), 10), dtype=np.int64) if stem_masks is None else stem_masks
+        )
+
+    def overlay(self, layer: str, stem: Optional[int], branch: Optional[int]) -> "InteractionState":
+        """
+        New state with a pillar added as `layer`.
+
+        Args:
+            layer: One of LAYER_KEYS
+            stem: Stem index of the pillar, or None
+            branch: Branch index of the pillar, or None
+        """
+        index = LAYER_INDEX[layer]
+        bit = 1 << index
+        branch_masks = self.branch_masks
+        if branch is not None:
+            branch_masks = branch_masks | BRANCH_TABLES[:, :, branch] * bit
+        stem_masks = self.stem_masks
+        if stem is not None:
+            stem_masks = stem_masks | STEM_TABLES[:, :, stem] * bit
+        return InteractionState(self.layers + ((index, stem, branch),), branch_masks, stem_masks)
+
+    def branch_of(self, layer: str) -> Optional[int]:
+        """Branch index of a layer in this state, or None if it is absent."""
+        index = LAYER_INDEX[layer]
+        for layer_index, _, branch in self.layers:
+            if layer_index == index:
+                return branch
+        return None
+
+    def hits(self, stem: Optional[int], branch: Optional[int]) -> Dict[str, int]:
+        """{kind: layer mask} a pillar would interact with in this state."""
+        result = dict.fromkeys(BRANCH_KINDS + STEM_KINDS, 0)
+        if branch is not None:
+            result.update(zip(BRANCH_KINDS, self.branch_masks[:, branch].tolist()))
+        if stem is not None:
+            result.update(zip(STEM_KINDS, self.stem_masks[:, stem].tolist()))
+        return result
+
+    def hit_arrays(self, stems: np.ndarray, branches: np.ndarray) -> Dict[str, np.ndarray]:
+        """hits() for many pillars at once: {kind: layer mask array}."""
+        result = {kind: masks[branches] for kind, masks in zip(BRANCH_KINDS, self.branch_masks)}
+        result.update({kind: masks[stems] for kind, masks in zip(STEM_KINDS, self.stem_masks)})
+        return result
+
+
+# ==================== NATAL STATE ====================
+
+def natal_state(
+    stems: Optional[Mapping[str, int]] = None,
+    branches: Optional[Mapping[str, int]] = None,
+) -> InteractionState:
+    """
+    Cached state of the natal pillars.
+
+    Args:
+        stems: {pillar_name: stem_index} (pillars may be missing)
+        branches: {pillar_name: branch_index} (pillars may be missing)
+    """
+    stems = stems or {}
+    branches = branches or {}
+    key = tuple((stems.get(name), branches.get(name)) for name in PILLAR_NAMES)
+
+    def _build():
+        state = InteractionState()
+        for name, (stem, branch) in zip(PILLAR_NAMES, key):
+            if stem is not None or branch is not None:
+                state = state.overlay(name, stem, branch)
+        return state
+
+    return interaction_state_cache.get_or_compute(key, _build)
+
+
+def natal_state_for_core(core: ChartCore) -> InteractionState:
+    """natal_state of a ChartCore."""
+    return natal_state(core.stem_map(), core.branch_map())
+
+
+def natal_state_for_chart(chart: Mapping) -> InteractionState:
+    """natal_state of a calculate_bazi chart (unknown pillars are left out)."""
+    stems: Dict[str, int] = {}
+    branches: Dict[str, int] = {}
+    four_pillars = chart.get("four_pillars") or {}
+    for name in PILLAR_NAMES:
+        pillar = four_pillars.get(name) or {}
+        stem = STEM_NAME_TO_INDEX.get((pillar.get("stem") or {}).get("name_cn", ""))
+        branch = BRANCH_NAME_TO_INDEX.get((pillar.get("branch") or {}).get("name_cn", ""))
+        if stem is not None:
+            stems[name] = stem
+        if branch is not None:
+            branches[name] = branch
+    return natal_state(stems, branches)
+
+
+# ==================== LAYERED QUERIES ====================
+
+def hit_records(hits: Mapping[str, int]) -> Sequence[Dict[str, str]]:
+    """[{"type": kind, "pillar": layer}] of a hits() result, in layer then kind order."""
+    records = []
+    for layer in range(len(LAYER_KEYS)):
+        bit = 1 << layer
+        for kind in BRANCH_KINDS + STEM_KINDS:
+            if hits.get(kind, 0) & bit:
+                records.append({"type": kind, "pillar": LAYER_KEYS[layer]})
+    return records
+
+
+def layered_interactions(
+    core: ChartCore,
+    luck: Optional[Tuple[int, int]] = None,
+    annual: Optional[Tuple[int, int]] = None,
+    daily: Optional[Tuple[int, int]] = None,
+) -> Dict:
+    """
+    Interactions of a natal chart with luck, annual and daily pillars.
+
+    Each overlay is evaluated against the natal pillars and every layer
+    beneath it (the daily pillar against natal, luck and annual).
+
+    Args:
+        core: Natal chart
+        luck, annual, daily: (stem, branch) of each layer, or None to skip it
+
+    Returns:
+        {"natal": find_pillar_interactions_for_core(core),
+         "luck" / "annual" / "daily": [{"type", "pillar"}, ...] for each given layer}
+    """
+    state = natal_state_for_core(core)
+    result: Dict = {"natal": find_pillar_interactions_for_core(core)}
+    for layer, pillar in (("luck", luck), ("annual", annual), ("daily", daily)):
+        if pillar is None:
+            continue
+        stem, branch = pillar
+        result[layer] = hit_records(state.hits(stem, branch))
+        state = state.overlay(layer, stem, branch)
+    return result
@@ -0,0 +1,195 @@
+"""
+Luck Timeline (大運流年表)
+
+Year-by-year grid of a lifespan: for every year the luck pillar (大運) in
+force, the annual pillar (流年), a relationship score against the Day
+Master, and the clash / combination flags of the annual and luck branches
+with the natal branches and with each other.
+
+Both pillars walk the 60-cycle (六十甲子), so the whole grid is array
+arithmetic over small precomputed tables:
+
+- luck pillar of age a: natal year cycle position + (period + 1) * direction,
+  where period = (a - luck start age) // 10
+- annual pillar of year y: calendar_kernel.year_pillar(y)
+- scores: RELATION_SCORE[relation of the pillar's stem element to the Day Master]
+- flags: natal pillar masks read from the cached natal state of
+  interaction_layers, one gather per year column
+
+The result depends only on the birth data and as_of_year (which merely
+marks the current row), so it is deterministic and cacheable.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .calendar_kernel import year_pillar
+from .chart_cache import FrozenDict
+from .interaction_layers import CLASH, COMBINATION, mask_layers, natal_state
+from .relations import RELATION, STEM_ELEMENT
+from .stems_branches import branch_to_dict, get_branch_by_index, get_stem_by_index, stem_to_dict
+
+# Default lifespan covered by the grid (ages 0-99)
+TIMELINE_YEARS = 100
+PERIOD_YEARS = 10
+
+PILLAR_KEYS = ("year", "month", "day", "hour")
+
+# ---- 60-cycle tables ----
+
+CYCLE_STEM = np.arange(60) % 10
+CYCLE_BRANCH = np.arange(60) % 12
+# CYCLE_POSITION[stem][branch]: position in the 60-cycle (-1 if the parities differ)
+CYCLE_POSITION = np.full((10, 12), -1, dtype=np.int64)
+CYCLE_POSITION[CYCLE_STEM, CYCLE_BRANCH] = np.arange(60)
+
+# One shared read-only {"stem", "branch"} record per cycle position
+CYCLE_PILLARS = tuple(
+    FrozenDict({
+        "stem": FrozenDict(stem_to_dict(get_stem_by_index(int(s)))),
+        "branch": FrozenDict(branch_to_dict(get_branch_by_index(int(b)))),
+    })
+    for s, b in zip(CYCLE_STEM, CYCLE_BRANCH)
+)
+
+# ---- Score tables ----
+
+# Score of a pillar by the relation code of its stem element to the Day
+# Master element (same scale as calculator.compute_age_periods):
+# same +2, generates DM +2, controls DM -2, controlled by DM -1, fed by DM +1
+RELATION_SCORE = np.array([2, 2, -2, -1, 1])
+# STEM_SCORE[day master stem][stem]
+STEM_SCORE = np.array([
+    [RELATION_SCORE[RELATION[STEM_ELEMENT[s]][STEM_ELEMENT[dm]]] for s in range(10)]
+    for dm in range(10)
+])
+
+
+def luck_timeline_arrays(
+    birth_year: int,
+    year_stem: int,
+    year_branch: int,
+    day_stem: int,
+    natal_branches: Sequence[Optional[int]],
+    forward: bool,
+    start_age: int,
+    years: int = TIMELINE_YEARS,
+) -> Dict[str, np.ndarray]:
+    """
+    Column arrays of the timeline grid, one entry per year of life.
+
+    Args:
+        birth_year: Gregorian birth year (age 0)
+        year_stem, year_branch: Natal year pillar indices
+        day_stem: Day Master stem index
+        natal_branches: Year/month/day/hour branch indices (None where unknown)
+        forward: Luck pillars run forward through the 60-cycle
+        start_age: Age at which the first luck period begins
+        years: Number of years covered
+
+    Returns:
+        year, age, luck_period (-1 before the first period), luck_cycle and
+        annual_cycle (60-cycle positions, luck -1 before the first period),
+        luck_score, annual_score, and the natal pillar bitmasks
+        annual_clash, annual_combination, luck_clash, luck_combination,
+        plus the boolean luck_annual_clash / luck_annual_combination.
+    """
+    age = np.arange(years)
+    year = birth_year + age
+
+    # ---- luck pillars ----
+    period = np.where(age >= start_age, (age - start_age) // PERIOD_YEARS, -1)
+    has_luck = period >= 0
+    direction = 1 if forward else -1
+    luck_cycle = np.where(
+        has_luck, (CYCLE_POSITION[year_stem, year_branch] + (period + 1) * direction) % 60, -1
+    )
+    luck_stem = CYCLE_STEM[luck_cycle]
+    luck_branch = CYCLE_BRANCH[luck_cycle]
+
+    # ---- annual pillars ----
+    annual_stem, annual_branch = year_pillar(year)
+    annual_cycle = CYCLE_POSITION[annual_stem, annual_branch]
+
+    # ---- scores and flags ----
+    scores = STEM_SCORE[day_stem]
+    luck_score = np.where(has_luck, scores[luck_stem], 0)
+    annual_score = scores[annual_stem]
+    clash_masks, combination_masks = natal_state(
+        branches={name: b for name, b in zip(PILLAR_KEYS, natal_branches) if b is not None}
+    ).branch_masks[:2]
+
+    return {
+        "year": year,
+        "age": age,
+        "luck_period": period,
+        "luck_cycle": luck_cycle,
+        "annual_cycle": annual_cycle,
+        "luck_score": luck_score,
+        "annual_score": annual_score,
+        "annual_clash": clash_masks[annual_branch],
+        "annual_combination": combination_masks[annual_branch],
+        "luck_clash": np.where(has_luck, clash_masks[luck_branch], 0),
+        "luck_combination": np.where(has_luck, combination_masks[luck_branch], 0),
+        "luck_annual_clash": has_luck & CLASH[luck_branch, annual_branch],
+        "luck_annual_combination": has_luck & COMBINATION[luck_branch, annual_branch],
+    }
+
+
+def compute_luck_timeline(
+    birth_year: int,
+    year_stem: int,
+    year_branch: int,
+    day_stem: int,
+    natal_branches: Sequence[Optional[int]],
+    forward: bool,
+    start_age: int,
+    as_of_year: int,
+    years: int = TIMELINE_YEARS,
+) -> Dict:
+    """
+    Timeline grid as one record per year (see luck_timeline_arrays).
+
+    Each row holds year, age, luck_period, luck_pillar (None before the
+    first period), annual_pillar, luck_score, annual_score, score (their
+    sum), the natal pillars the annual and luck branches clash / combine
+    with, and whether the luck and annual branches clash / combine.
+    "current" is the row index of as_of_year (None if outside the grid).
+    """
+    columns = luck_timeline_arrays(
+        birth_year, year_stem, year_branch, day_stem, natal_branches, forward, start_age, years
+    )
+    lists = {name: column.tolist() for name, column in columns.items()}
+
+    # Rows are built read-only, so caching the result never copies them
+    rows: List[FrozenDict] = []
+    for i in range(years):
+        luck_cycle = lists["luck_cycle"][i]
+        has_luck = luck_cycle >= 0
+        rows.append(FrozenDict({
+            "year": lists["year"][i],
+            "age": lists["age"][i],
+            "luck_period": lists["luck_period"][i] if has_luck else None,
+            "luck_pillar": CYCLE_PILLARS[luck_cycle] if has_luck else None,
+            "annual_pillar": CYCLE_PILLARS[lists["annual_cycle"][i]],
+            "luck_score": lists["luck_score"][i],
+            "annual_score": lists["annual_score"][i],
+            "score": lists["luck_score"][i] + lists["annual_score"][i],
+            "annual_clashes": mask_layers(lists["annual_clash"][i]),
+            "annual_combinations": mask_layers(lists["annual_combination"][i]),
+            "luck_clashes": mask_layers(lists["luck_clash"][i]),
+            "luck_combinations": mask_layers(lists["luck_combination"][i]),
+            "luck_annual_clash": lists["luck_annual_clash"][i],
+            "luck_annual_combination": lists["luck_annual_combination"][i],
+        }))
+
+    current = as_of_year - birth_year
+    return FrozenDict({
+        "birth_year": birth_year,
+        "as_of_year": as_of_year,
+        "start_age": start_age,
+        "direction": "forward" if forward else "backward",
+        "current": current if 0 <= current < years else None,
+        "years": tuple(rows),
+    })
@@ -0,0 +1,162 @@
+"""
+Message Catalog (訊息目錄)
+
+All localized engine text lives in one catalog addressed by integer
+message IDs. Modules register their templates once, at import time, with
+define()/define_table(); analysis code then returns Message(msg_id, **args)
+records instead of pre-expanded strings, and the render pass formats them
+for a single language.
+
+Each language is compiled once into a tuple of templates indexed by
+message ID, so rendering is one tuple index plus str.format_map over the
+parameters — no per-call construction of four-language dicts. Templates
+missing a translation fall back to English.
+"""
+
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+LANGUAGES = ("en", "zh-TW", "zh-CN", "ko")
+DEFAULT_LANGUAGE = "en"
+
+
+def normalize_language(language: Optional[str]) -> str:
+    """Supported language code, or the default for anything else."""
+    return language if language in LANGUAGES else DEFAULT_LANGUAGE
+
+
+class Message:
+    """
+    A message ID plus its format parameters.
+
+    Parameter values may themselves be Messages (rendered first) or lists of
+    Messages (rendered and joined with the language's list separator).
+    """
+
+    __slots__ = ("msg_id", "args")
+
+    def __init__(self, msg_id: int, **args: Any):
+        self.msg_id = msg_id
+        self.args = args
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Message):
+            return NotImplemented
+        return self.msg_id == other.msg_id and self.args == other.args
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Message({self.msg_id}, {self.args!r})"
+
+
+class MessageCatalog:
+    """Registry of localized templates, compiled per language on first use."""
+
+    def __init__(self):
+        self._sources: List[Dict[str, str]] = []
+        self._compiled: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+        self.formatted = 0
+
+    def define(self, translations: Mapping[str, str]) -> int:
+        """
+        Register a template and return its message ID.
+
+        Args:
+            translations: {language: template}; "en" is required and used as
+                the fallback. Templates use str.format fields ({name}).
+        """
+        if DEFAULT_LANGUAGE not in translations:
+            raise ValueError(f"Message template needs an '{DEFAULT_LANGUAGE}' text: {translations!r}")
+        with self._lock:
+            self._sources.append(dict(translations))
+            self._compiled.clear()
+            return len(self._sources) - 1
+
+    def compile(self, language: str) -> Tuple[str, ...]:
+        """The template table of one language (built once, then reused)."""
+        table = self._compiled.get(language)
+        if table is None:
+            with self._lock:
+                table = tuple(src.get(language, src[DEFAULT_LANGUAGE]) for src in self._sources)
+                self._compiled[language] = table
+        return table
+
+    def preload(self, languages: Iterable[str] = LANGUAGES) -> None:
+        """Compile the given languages up front (e.g. at worker startup)."""
+        for language in languages:
+            self.compile(language)
+
+    def text(self, msg_id: int, language: str) -> str:
+        """Template of a parameterless message."""
+        return self.compile(language)[msg_id]
+
+    def render(self, message: Message, language: str) -> str:
+        """Format a Message for one language."""
+        template = self.compile(language)[message.msg_id]
+        if not message.args:
+            return template
+        args = {}
+        for name, value in message.args.items():
+            if isinstance(value, Message):
+                value = self.render(value, language)
+            elif isinstance(value, (list, tuple)):
+                separator = self.compile(language)[LIST_SEPARATOR]
+                value = separator.join(self.render(v, language) for v in value)
+            args[name] = value
+        self.formatted += 1
+        return template.format_map(args)
+
+    def stats(self) -> Dict[str, Any]:
+        """Catalog size, compiled languages and number of formatted strings."""
+        return {
+            "messages": len(self._sources),
+            "languages": sorted(self._compiled),
+            "formatted": self.formatted,
+        }
+
+
+catalog = MessageCatalog()
+
+# Separator for list-valued parameters ("Year, Month" / "年柱、月柱")
+LIST_SEPARATOR = catalog.define({"en": ", ", "zh-TW": "、", "zh-CN": "、", "ko": ", "})
+
+
+def define(translations: Mapping[str, str]) -> int:
+    """Register a template in the shared catalog; returns its message ID."""
+    return catalog.define(translations)
+
+
+def define_table(table: Mapping[Hashable, Mapping[str, str]]) -> Dict[Hashable, int]:
+    """Register every {language: text} value of a table; returns {key: message ID}."""
+    return {key: catalog.define(translations) for key, translations in table.items()}
+
+
+def text(msg_id: int, language: str) -> str:
+    """Localized text of a parameterless message."""
+    return catalog.compile(language)[msg_id]
+
+
+def render(message: Message, language: str) -> str:
+    """Format a Message for one language."""
+    return catalog.render(message, language)
+
+
+def render_all(messages: Iterable[Message], language: str) -> List[str]:
+    """Format a sequence of Messages for one language."""
+    return [catalog.render(m, language) for m in messages]
+
+
+# Chart sections that ship their explanation in every language at once
+_EXPLANATION_KEYS = (
+    ("en", "explanation_en"),
+    ("zh-TW", "explanation_zh_tw"),
+    ("zh-CN", "explanation_zh_cn"),
+    ("ko", "explanation_ko"),
+)
+
+
+def render_explanations(message: Message) -> Dict[str, str]:
+    """{"explanation_en": ..., "explanation_zh_tw": ..., ...} for one Message."""
+    return {key: catalog.render(message, language) for language, key in _EXPLANATION_KEYS}
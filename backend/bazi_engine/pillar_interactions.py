@@ -13,9 +13,25 @@ Analyzes all interactions among the Four Pillars of the natal chart:
 Each interaction is returned with:
   pillar_a, pillar_b (and optionally pillar_c for trios),
   type, polarity (+/-/neutral), and multi-language labels.
+
+Branch and stem interactions are independent, so every one of the 12^4
+branch tuples and 10^4 stem tuples is scanned once at build time into a
+table of one-byte interaction codes (see build_tables.py). A chart's
+analysis is then two row lookups, and each code expands to a shared
+read-only record whose rendered form is kept per language.
 """
 
-from typing import Dict, List
+import itertools
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .chart_cache import FrozenDict, freeze
+from .chart_core import ChartCore
+from .messages import Message, define, define_table, normalize_language, render, text
+from .table_store import ENGINE_HASH, check_header, table_path, write_atomic
 
 # ---- Branch index table ----
 BRANCH_NAME_TO_IDX = {
@@ -136,9 +152,26 @@ POLARITY_LABELS = {
     "neutral":  {"en": "Neutral", "zh-TW": "中", "zh-CN": "中", "ko": "중"},
 }
 
+# Catalog message IDs of the label tables
+_TYPE_LABEL_MSG = define_table(INTERACTION_TYPE_LABELS)
+_PILLAR_NAME_MSG = define_table(PILLAR_NAMES)
+_POLARITY_LABEL_MSG = define_table(POLARITY_LABELS)
+_PUNISHMENT_LABEL_MSG = {
+    info["type"]: define({
+        "en": info["label_en"], "zh-TW": info["label_tw"],
+        "zh-CN": info["label_cn"], "ko": info["label_ko"],
+    })
+    for info in [*PAIR_PUNISHMENTS.values(), *THREE_PUNISHMENT_GROUPS]
+}
+
 
 # =============== Analysis ===============
 
+PILLAR_KEYS = ("year", "month", "day", "hour")
+
+BRANCH_CN = tuple(sorted(BRANCH_NAME_TO_IDX, key=BRANCH_NAME_TO_IDX.get))
+STEM_CN = tuple(sorted(STEM_NAME_TO_IDX, key=STEM_NAME_TO_IDX.get))
+
 def _extract_branches(four_pillars: Dict) -> Dict[str, int]:
     """Return {pillar_name: branch_index} for each pillar."""
     result = {}
@@ -161,22 +194,6 @@ def _extract_stems(four_pillars: Dict) -> Dict[str, int]:
     return result
 
 
-def _branch_cn(idx: int) -> str:
-    """Get Chinese name from branch index."""
-    for name, i in BRANCH_NAME_TO_IDX.items():
-        if i == idx:
-            return name
-    return ""
-
-
-def _stem_cn(idx: int) -> str:
-    """Get Chinese name from stem index."""
-    for name, i in STEM_NAME_TO_IDX.items():
-        if i == idx:
-            return name
-    return ""
-
-
 def analyze_pillar_interactions(four_pillars: Dict, language: str = "en") -> Dict:
     """
     Find all interactions among the natal Four Pillars.
@@ -192,164 +209,168 @@ def analyze_pillar_interactions(four_pillars: Dict, language: str = "en") -> Dic
             "detail_cn": "子午沖",
             "polarity": "negative",
             "polarity_label": "Challenging",
-            "description_en": "...",
-            "description_zh_tw": "...",
-            "description_zh_cn": "...",
-            "description_ko": "...",
+            "description": "...",
           },
           ...
         ],
         "summary": { "positive": N, "negative": N, "total": N }
       }
     """
-    lang = language if language in ("en", "zh-TW", "zh-CN", "ko") else "en"
-    branches = _extract_branches(four_pillars)
-    stems = _extract_stems(four_pillars)
+    neutral = find_pillar_interactions(_extract_stems(four_pillars), _extract_branches(four_pillars))
+    return render_pillar_interactions(neutral, language)
+
+
+def analyze_pillar_interactions_for_core(core: ChartCore, language: str = "en") -> Dict:
+    """analyze_pillar_interactions for a ChartCore."""
+    return render_pillar_interactions(find_pillar_interactions_for_core(core), language)
+
+
+# Interaction codes: one byte per interaction, kind << 4 | pillar mask
+# (bit 0 = year ... bit 3 = hour). Together with the pillar indices a code
+# determines the whole language-neutral record.
+_PAIR_KINDS = ("six_combination", "six_clash", "six_harm", "pair_punishment", "self_punishment")
+_KIND_HARMONY = len(_PAIR_KINDS)                                   # + frame 0-3
+_KIND_PUNISHMENT_GROUP = _KIND_HARMONY + len(THREE_HARMONIES)      # + group 0-1
+_KIND_STEM_COMBINATION = _KIND_PUNISHMENT_GROUP + len(THREE_PUNISHMENT_GROUPS)
+
+_HARMONY_FRAMES = list(THREE_HARMONIES.items())
+
+# The record "type" of each code kind (code >> 4)
+INTERACTION_TYPES: Tuple[str, ...] = (
+    "six_combination", "six_clash", "six_harm", "three_punishment",
+    "self_punishment", "three_harmony", "stem_combination",
+)
+KIND_TYPES: Tuple[str, ...] = (
+    ("six_combination", "six_clash", "six_harm", "three_punishment", "self_punishment")
+    + ("three_harmony",) * len(THREE_HARMONIES)
+    + ("three_punishment",) * len(THREE_PUNISHMENT_GROUPS)
+    + ("stem_combination",)
+)
+
+# Pillar positions of each 4-bit mask, in pillar order
+_MASK_PILLARS = tuple(tuple(p for p in range(4) if mask >> p & 1) for mask in range(16))
+
+
+def _code(kind: int, pillars) -> int:
+    mask = 0
+    for p in pillars:
+        mask |= 1 << p
+    return kind << 4 | mask
+
 
-    pillar_keys = ["year", "month", "day", "hour"]
-    interactions = []
+def _branch_codes(branches: Sequence[Optional[int]]) -> List[int]:
+    """Interaction codes of (year, month, day, hour) branches; None = missing."""
+    codes = []
 
     # --- Branch pair interactions ---
-    for i in range(len(pillar_keys)):
-        for j in range(i + 1, len(pillar_keys)):
-            pn_a, pn_b = pillar_keys[i], pillar_keys[j]
-            if pn_a not in branches or pn_b not in branches:
+    for i in range(4):
+        for j in range(i + 1, 4):
+            idx_a, idx_b = branches[i], branches[j]
+            if idx_a is None or idx_b is None:
                 continue
-            idx_a, idx_b = branches[pn_a], branches[pn_b]
             pair = frozenset({idx_a, idx_b})
-            br_a, br_b = _branch_cn(idx_a), _branch_cn(idx_b)
-
-            pa_label = PILLAR_NAMES[pn_a].get(lang, pn_a)
-            pb_label = PILLAR_NAMES[pn_b].get(lang, pn_b)
-
-            # Six Combination
             if pair in SIX_COMBINATIONS:
-                info = SIX_COMBINATIONS[pair]
-                interactions.append(_make_interaction(
-                    itype="six_combination", polarity="positive",
-                    pillars=[pn_a, pn_b], branches=f"{br_a}{br_b}",
-                    detail_cn=info["cn"], lang=lang,
-                    pa_label=pa_label, pb_label=pb_label,
-                    extra=info["result"],
-                ))
-
-            # Six Clash
+                codes.append(_code(0, (i, j)))
             if pair in SIX_CLASHES:
-                interactions.append(_make_interaction(
-                    itype="six_clash", polarity="negative",
-                    pillars=[pn_a, pn_b], branches=f"{br_a}{br_b}",
-                    detail_cn=SIX_CLASHES[pair], lang=lang,
-                    pa_label=pa_label, pb_label=pb_label,
-                ))
-
-            # Six Harm
+                codes.append(_code(1, (i, j)))
             if pair in SIX_HARMS:
-                interactions.append(_make_interaction(
-                    itype="six_harm", polarity="negative",
-                    pillars=[pn_a, pn_b], branches=f"{br_a}{br_b}",
-                    detail_cn=SIX_HARMS[pair], lang=lang,
-                    pa_label=pa_label, pb_label=pb_label,
-                ))
-
-            # Pair Punishment (子卯)
+                codes.append(_code(2, (i, j)))
             if pair in PAIR_PUNISHMENTS:
-                info = PAIR_PUNISHMENTS[pair]
-                interactions.append(_make_interaction(
-                    itype="three_punishment", polarity="negative",
-                    pillars=[pn_a, pn_b], branches=f"{br_a}{br_b}",
-                    detail_cn=info["cn"], lang=lang,
-                    pa_label=pa_label, pb_label=pb_label,
-                    extra_label=info.get(f"label_{_lang_key(lang)}", info["label_en"]),
-                ))
-
-            # Self-punishment (same branch in two pillars)
+                codes.append(_code(3, (i, j)))
             if idx_a == idx_b and idx_a in SELF_PUNISHMENT:
-                interactions.append(_make_interaction(
-                    itype="self_punishment", polarity="negative",
-                    pillars=[pn_a, pn_b], branches=f"{br_a}{br_b}",
-                    detail_cn=f"{br_a}自刑", lang=lang,
-                    pa_label=pa_label, pb_label=pb_label,
-                ))
-
-    # --- Three Harmonies (need 3 branches present) ---
-    branch_set = set(branches.values())
-    for trio_set, info in THREE_HARMONIES.items():
-        present = []
-        for pn in pillar_keys:
-            if pn in branches and branches[pn] in trio_set:
-                present.append(pn)
-        if len(present) >= 3:
-            br_names = "".join(_branch_cn(branches[p]) for p in present[:3])
-            interactions.append({
-                "type": "three_harmony",
-                "type_label": INTERACTION_TYPE_LABELS["three_harmony"].get(lang, ""),
-                "pillars": present[:3],
-                "branches": br_names,
-                "detail_cn": info["cn"],
-                "polarity": "positive",
-                "polarity_label": POLARITY_LABELS["positive"].get(lang, ""),
-                "description": _desc_three_harmony(present[:3], info, lang),
-            })
-        # Also check partial (2 of 3) — note as a "partial" three harmony
-        elif len(present) == 2:
-            br_names = "".join(_branch_cn(branches[p]) for p in present)
-            pa_label = PILLAR_NAMES[present[0]].get(lang, present[0])
-            pb_label = PILLAR_NAMES[present[1]].get(lang, present[1])
-            interactions.append({
-                "type": "three_harmony",
-                "type_label": INTERACTION_TYPE_LABELS["three_harmony"].get(lang, ""),
-                "pillars": present,
-                "branches": br_names,
-                "detail_cn": info["cn"] + "（半合）",
-                "polarity": "positive",
-                "polarity_label": POLARITY_LABELS["positive"].get(lang, ""),
-                "description": _desc_partial_three_harmony(present, info, lang),
-                "partial": True,
-            })
+                codes.append(_code(4, (i, j)))
+
+    # --- Three Harmonies: full (3 present) or partial (2 of 3) ---
+    for frame, (trio_set, _info) in enumerate(_HARMONY_FRAMES):
+        present = [p for p in range(4) if branches[p] is not None and branches[p] in trio_set]
+        if len(present) >= 2:
+            codes.append(_code(_KIND_HARMONY + frame, present[:3]))
 
     # --- Three Punishment groups (need at least 2 of 3) ---
-    for group in THREE_PUNISHMENT_GROUPS:
-        present = []
-        for pn in pillar_keys:
-            if pn in branches and branches[pn] in group["indices"]:
-                present.append(pn)
+    for group_no, group in enumerate(THREE_PUNISHMENT_GROUPS):
+        present = [p for p in range(4) if branches[p] is not None and branches[p] in group["indices"]]
         if len(present) >= 2:
-            br_names = "".join(_branch_cn(branches[p]) for p in present)
-            sub_label = group.get(f"label_{_lang_key(lang)}", group["label_en"])
-            interactions.append({
-                "type": "three_punishment",
-                "type_label": INTERACTION_TYPE_LABELS["three_punishment"].get(lang, ""),
-                "pillars": present,
-                "branches": br_names,
-                "detail_cn": group["cn"] + (""  if len(present) >= 3 else "（部分）"),
-                "polarity": "negative",
-                "polarity_label": POLARITY_LABELS["negative"].get(lang, ""),
-                "description": _desc_punishment(present, group, lang, len(present) >= 3),
-                "sub_label": sub_label,
-            })
-
-    # --- Stem Combinations ---
-    for i in range(len(pillar_keys)):
-        for j in range(i + 1, len(pillar_keys)):
-            pn_a, pn_b = pillar_keys[i], pillar_keys[j]
-            if pn_a not in stems or pn_b not in stems:
+            codes.append(_code(_KIND_PUNISHMENT_GROUP + group_no, present))
+
+    return codes
+
+
+def _stem_codes(stems: Sequence[Optional[int]]) -> List[int]:
+    """Interaction codes of (year, month, day, hour) stems; None = missing."""
+    codes = []
+    for i in range(4):
+        for j in range(i + 1, 4):
+            if stems[i] is None or stems[j] is None:
                 continue
-            pair = frozenset({stems[pn_a], stems[pn_b]})
-            if pair in STEM_COMBINATIONS:
-                info = STEM_COMBINATIONS[pair]
-                sa, sb = _stem_cn(stems[pn_a]), _stem_cn(stems[pn_b])
-                pa_label = PILLAR_NAMES[pn_a].get(lang, pn_a)
-                pb_label = PILLAR_NAMES[pn_b].get(lang, pn_b)
-                interactions.append({
-                    "type": "stem_combination",
-                    "type_label": INTERACTION_TYPE_LABELS["stem_combination"].get(lang, ""),
-                    "pillars": [pn_a, pn_b],
-                    "branches": f"{sa}{sb}",
-                    "detail_cn": info["cn"],
-                    "polarity": "positive",
-                    "polarity_label": POLARITY_LABELS["positive"].get(lang, ""),
-                    "description": _desc_stem_combo(pn_a, pn_b, sa, sb, info, lang),
-                })
+            if frozenset({stems[i], stems[j]}) in STEM_COMBINATIONS:
+                codes.append(_code(_KIND_STEM_COMBINATION, (i, j)))
+    return codes
+
+
+def find_pillar_interactions_for_core(core: ChartCore) -> Dict:
+    """Language-neutral interactions of a ChartCore (see find_pillar_interactions)."""
+    table = get_interaction_table()
+    return _interaction_result(
+        table.branch_codes(core.branches), core.branches,
+        table.stem_codes(core.stems), core.stems,
+    )
+
+
+def find_pillar_interactions_for_charts(stems: np.ndarray, branches: np.ndarray) -> List[Dict]:
+    """find_pillar_interactions_for_core of N charts ((N, 4) index arrays), one table gather."""
+    codes = get_interaction_table().chart_codes(stems, branches)
+    return [
+        _interaction_result(branch_codes, tuple(b), stem_codes, tuple(s))
+        for (branch_codes, stem_codes), s, b in zip(codes, np.asarray(stems).tolist(), np.asarray(branches).tolist())
+    ]
+
+
+def find_pillar_interactions(stems: Dict[str, int], branches: Dict[str, int]) -> Dict:
+    """
+    Language-neutral interactions among {pillar_name: index} stem and branch maps.
+
+    Each interaction carries type, pillars, branches, detail_cn and polarity
+    plus its description as a catalog Message; labels are looked up and the
+    description formatted by render_pillar_interactions. Complete maps are
+    answered from the precomputed interaction table; maps with missing
+    pillars are scanned directly.
+    """
+    stem_values = tuple(stems.get(pn) for pn in PILLAR_KEYS)
+    branch_values = tuple(branches.get(pn) for pn in PILLAR_KEYS)
+    table = get_interaction_table()
+    if None in branch_values:
+        branch_codes = _branch_codes(branch_values)
+    else:
+        branch_codes = table.branch_codes(branch_values)
+    if None in stem_values:
+        stem_codes = _stem_codes(stem_values)
+    else:
+        stem_codes = table.stem_codes(stem_values)
+    return _interaction_result(branch_codes, branch_values, stem_codes, stem_values)
+
+
+def interactions_from_codes(
+    codes: Sequence[int], branches: Sequence[int], stems: Sequence[int]
+) -> Dict:
+    """
+    find_pillar_interactions result of stored interaction codes.
+
+    Args:
+        codes: Branch codes followed by stem codes, as concatenated from the
+            interaction table (the kind in each code's high nibble tells them apart)
+        branches, stems: (year, month, day, hour) indices of the chart
+    """
+    split = len(codes)
+    for i, code in enumerate(codes):
+        if code >> 4 == _KIND_STEM_COMBINATION:
+            split = i
+            break
+    return _interaction_result(codes[:split], tuple(branches), codes[split:], tuple(stems))
+
+
+def _interaction_result(branch_codes, branch_values, stem_codes, stem_values) -> Dict:
+    interactions = [_record(code, branch_values) for code in branch_codes]
+    interactions += [_record(code, stem_values) for code in stem_codes]
 
     pos = sum(1 for i in interactions if i["polarity"] == "positive")
     neg = sum(1 for i in interactions if i["polarity"] == "negative")
@@ -364,132 +385,337 @@ def analyze_pillar_interactions(four_pillars: Dict, language: str = "en") -> Dic
     }
 
 
-# =============== Description builders ===============
+# ---- Interaction records ----
+
+# Records are read-only and shared: one per (code, indices of its pillars),
+# a few thousand in all. Their rendered forms are kept per language.
+_records: Dict[Tuple[int, Tuple[int, ...]], FrozenDict] = {}
+_records_by_id: Dict[int, FrozenDict] = {}
+_rendered: Dict[Tuple[int, str], FrozenDict] = {}
+
+
+def _record(code: int, values: Sequence[int]) -> FrozenDict:
+    """The shared neutral record of an interaction code over pillar indices."""
+    pillars = _MASK_PILLARS[code & 0xF]
+    key = (code, tuple(values[p] for p in pillars))
+    record = _records.get(key)
+    if record is None:
+        record = freeze(_build_record(code >> 4, pillars, key[1]))
+        record = _records.setdefault(key, record)
+        _records_by_id[id(record)] = record
+    return record
+
+
+def _build_record(kind: int, pillars: Tuple[int, ...], values: Tuple[int, ...]) -> Dict:
+    names = [PILLAR_KEYS[p] for p in pillars]
+
+    if kind < _KIND_HARMONY:
+        pn_a, pn_b = names
+        br_a, br_b = BRANCH_CN[values[0]], BRANCH_CN[values[1]]
+        pair = frozenset(values)
+        args = {}
+        if kind == 0:
+            itype, polarity = "six_combination", "positive"
+            detail_cn, args["result"] = SIX_COMBINATIONS[pair]["cn"], SIX_COMBINATIONS[pair]["result"]
+        elif kind == 1:
+            itype, polarity, detail_cn = "six_clash", "negative", SIX_CLASHES[pair]
+        elif kind == 2:
+            itype, polarity, detail_cn = "six_harm", "negative", SIX_HARMS[pair]
+        elif kind == 3:
+            info = PAIR_PUNISHMENTS[pair]
+            itype, polarity, detail_cn = "three_punishment", "negative", info["cn"]
+            args["punishment"] = Message(_PUNISHMENT_LABEL_MSG[info["type"]])
+        else:
+            itype, polarity, detail_cn = "self_punishment", "negative", f"{br_a}自刑"
+        return {
+            "type": itype,
+            "pillars": names,
+            "branches": f"{br_a}{br_b}",
+            "detail_cn": detail_cn,
+            "polarity": polarity,
+            "description": Message(
+                _PAIR_DESC_MSG[itype],
+                pa=_pillar_name(pn_a), pb=_pillar_name(pn_b),
+                branches=f"{br_a}{br_b}", **args,
+            ),
+        }
+
+    if kind < _KIND_PUNISHMENT_GROUP:
+        info = _HARMONY_FRAMES[kind - _KIND_HARMONY][1]
+        record = {
+            "type": "three_harmony",
+            "pillars": names,
+            "branches": "".join(BRANCH_CN[v] for v in values),
+            "detail_cn": info["cn"],
+            "polarity": "positive",
+        }
+        if len(pillars) >= 3:
+            record["description"] = Message(
+                _THREE_HARMONY_MSG,
+                names=[_pillar_name(p) for p in names], result=info["result"],
+            )
+        else:
+            # Partial (2 of 3) three harmony
+            record["detail_cn"] += "（半合）"
+            record["description"] = Message(
+                _PARTIAL_THREE_HARMONY_MSG,
+                names=[_pillar_name(p) for p in names], result=info["result"],
+            )
+            record["partial"] = True
+        return record
+
+    if kind < _KIND_STEM_COMBINATION:
+        group = THREE_PUNISHMENT_GROUPS[kind - _KIND_PUNISHMENT_GROUP]
+        full = len(pillars) >= 3
+        label_msg = _PUNISHMENT_LABEL_MSG[group["type"]]
+        return {
+            "type": "three_punishment",
+            "pillars": names,
+            "branches": "".join(BRANCH_CN[v] for v in values),
+            "detail_cn": group["cn"] + ("" if full else "（部分）"),
+            "polarity": "negative",
+            "description": Message(
+                _PUNISHMENT_GROUP_MSG,
+                names=[_pillar_name(p) for p in names],
+                sub=Message(label_msg),
+                qualifier="" if full else Message(_PARTIAL_QUALIFIER_MSG),
+            ),
+            "sub_label": label_msg,
+        }
+
+    pn_a, pn_b = names
+    sa, sb = STEM_CN[values[0]], STEM_CN[values[1]]
+    info = STEM_COMBINATIONS[frozenset(values)]
+    return {
+        "type": "stem_combination",
+        "pillars": names,
+        "branches": f"{sa}{sb}",
+        "detail_cn": info["cn"],
+        "polarity": "positive",
+        "description": Message(
+            _STEM_COMBO_MSG,
+            pa=_pillar_name(pn_a), pb=_pillar_name(pn_b),
+            sa=sa, sb=sb, result=info["result"],
+        ),
+    }
+
+
+def _pillar_name(pillar_name: str) -> Message:
+    return Message(_PILLAR_NAME_MSG[pillar_name])
+
+
+# =============== Interaction table ===============
+#
+# File layout (little-endian):
+#     header   32 bytes  magic, engine hash, #rows, row width
+#     rows     #rows x width uint8: count, then that many interaction codes
+#
+# Rows 0 .. 12^4-1 are branch tuples packed base 12 (year most significant),
+# the next 10^4 rows stem tuples packed base 10.
+
+TABLE_FILENAME = "pillar_interactions.bin"
+
+_MAGIC = b"BAZIPIN1"
+_HEADER = struct.Struct("<8s16sii")
+
+BRANCH_ROWS = 12 ** 4
+STEM_ROWS = 10 ** 4
+
+
+class InteractionTable:
+    """Read-only view over the interaction code table (memory-mapped or in-memory)."""
+
+    def __init__(self, rows: np.ndarray):
+        # Plain ndarray view: memmap row slices are several times slower
+        self.rows = rows.view(np.ndarray)  # (BRANCH_ROWS + STEM_ROWS, width) uint8
+
+    @classmethod
+    def open(cls, path: str) -> "InteractionTable":
+        """Memory-map an existing table file."""
+        with open(path, "rb") as fh:
+            magic, engine_hash, n_rows, width = _HEADER.unpack(fh.read(_HEADER.size))
+        check_header(path, magic, _MAGIC, engine_hash, "pillar interaction table")
+        if n_rows != BRANCH_ROWS + STEM_ROWS:
+            raise ValueError(f"Not a pillar interaction table: {path}")
+        rows = np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER.size, shape=(n_rows, width))
+        return cls(rows)
+
+    def _codes(self, row: int) -> List[int]:
+        codes = self.rows[row].tolist()
+        return codes[1:1 + codes[0]]
+
+    def branch_codes(self, branches: Sequence[int]) -> List[int]:
+        """Interaction codes of (year, month, day, hour) branch indices."""
+        y, m, d, h = branches
+        return self._codes(((y * 12 + m) * 12 + d) * 12 + h)
+
+    def stem_codes(self, stems: Sequence[int]) -> List[int]:
+        """Interaction codes of (year, month, day, hour) stem indices."""
+        y, m, d, h = stems
+        return self._codes(BRANCH_ROWS + ((y * 10 + m) * 10 + d) * 10 + h)
+
+    def chart_codes(self, stems: np.ndarray, branches: np.ndarray) -> List[Tuple[List[int], List[int]]]:
+        """(branch codes, stem codes) of N charts, gathered in one pass over (N, 4) index arrays."""
+        stems = np.asarray(stems, dtype=np.int64)
+        branches = np.asarray(branches, dtype=np.int64)
+        branch_rows = ((branches[:, 0] * 12 + branches[:, 1]) * 12 + branches[:, 2]) * 12 + branches[:, 3]
+        stem_rows = BRANCH_ROWS + ((stems[:, 0] * 10 + stems[:, 1]) * 10 + stems[:, 2]) * 10 + stems[:, 3]
+        rows = self.rows[np.concatenate([branch_rows, stem_rows])].tolist()
+        codes = [row[1:1 + row[0]] for row in rows]
+        return list(zip(codes[:len(stems)], codes[len(stems):]))
+
+
+def build_rows() -> np.ndarray:
+    """Scan every branch and stem tuple into the (#rows, width) code array."""
+    all_codes = [_branch_codes(t) for t in itertools.product(range(12), repeat=4)]
+    all_codes += [_stem_codes(t) for t in itertools.product(range(10), repeat=4)]
+    width = 1 + max(len(codes) for codes in all_codes)
+    rows = np.zeros((len(all_codes), width), dtype=np.uint8)
+    for row, codes in zip(rows, all_codes):
+        row[0] = len(codes)
+        row[1:1 + len(codes)] = codes
+    return rows
+
 
-def _lang_key(lang: str) -> str:
-    return {"zh-TW": "tw", "zh-CN": "cn", "ko": "ko"}.get(lang, "en")
+def build_table(path: Optional[str] = None) -> str:
+    """Build the pillar interaction table file; returns its path."""
+    path = path or table_path(TABLE_FILENAME)
+    rows = build_rows()
 
+    def _write(fh):
+        fh.write(_HEADER.pack(_MAGIC, ENGINE_HASH, rows.shape[0], rows.shape[1]))
+        fh.write(rows.tobytes())
 
-def _make_interaction(itype, polarity, pillars, branches, detail_cn, lang,
-                      pa_label, pb_label, extra="", extra_label=""):
-    desc = _desc_pair(itype, pa_label, pb_label, branches, extra, extra_label, lang)
+    write_atomic(path, _write)
+    return path
+
+
+_table: Optional[InteractionTable] = None
+_table_lock = threading.Lock()
+
+
+def get_interaction_table() -> InteractionTable:
+    """
+    Return the process-wide pillar interaction table.
+
+    Maps the table file, building it first if it is missing or stale. If the data
+    directory is not writable the table is built in memory instead.
+    """
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                path = table_path(TABLE_FILENAME)
+                try:
+                    try:
+                        _table = InteractionTable.open(path)
+                    except (FileNotFoundError, ValueError):
+                        build_table(path)
+                        _table = InteractionTable.open(path)
+                except OSError:
+                    _table = InteractionTable(build_rows())
+    return _table
+
+
+# =============== Render pass ===============
+
+def render_pillar_interactions(neutral: Dict, language: str = "en") -> Dict:
+    """Attach localized labels and descriptions to find_pillar_interactions output."""
+    lang = normalize_language(language)
     return {
-        "type": itype,
-        "type_label": INTERACTION_TYPE_LABELS[itype].get(lang, ""),
-        "pillars": pillars,
-        "branches": branches,
-        "detail_cn": detail_cn,
-        "polarity": polarity,
-        "polarity_label": POLARITY_LABELS[polarity].get(lang, ""),
-        "description": desc,
+        "interactions": [_render_interaction(item, lang) for item in neutral["interactions"]],
+        "summary": dict(neutral["summary"]),
     }
 
 
-def _desc_pair(itype, pa, pb, branches, extra, extra_label, lang):
-    if lang == "zh-TW":
-        if itype == "six_combination":
-            return f"{pa}與{pb}地支{branches}六合，合化{extra}，主和諧融洽。"
-        if itype == "six_clash":
-            return f"{pa}與{pb}地支{branches}六沖，主動盪變化，需注意衝突與轉變。"
-        if itype == "six_harm":
-            return f"{pa}與{pb}地支{branches}六害，暗中有損，留意人際暗流。"
-        if itype == "three_punishment":
-            return f"{pa}與{pb}地支{branches}構成{extra_label}，主磨練考驗。"
-        if itype == "self_punishment":
-            return f"{pa}與{pb}地支相同構成自刑，主內心矛盾與自我消耗。"
-    elif lang == "zh-CN":
-        if itype == "six_combination":
-            return f"{pa}与{pb}地支{branches}六合，合化{extra}，主和谐融洽。"
-        if itype == "six_clash":
-            return f"{pa}与{pb}地支{branches}六冲，主动荡变化，需注意冲突与转变。"
-        if itype == "six_harm":
-            return f"{pa}与{pb}地支{branches}六害，暗中有损，留意人际暗流。"
-        if itype == "three_punishment":
-            return f"{pa}与{pb}地支{branches}构成{extra_label}，主磨练考验。"
-        if itype == "self_punishment":
-            return f"{pa}与{pb}地支相同构成自刑，主内心矛盾与自我消耗。"
-    elif lang == "ko":
-        if itype == "six_combination":
-            return f"{pa}와 {pb} 지지 {branches} 육합, {extra}로 합화, 조화와 화합을 의미합니다."
-        if itype == "six_clash":
-            return f"{pa}와 {pb} 지지 {branches} 육충, 변동과 충돌에 주의가 필요합니다."
-        if itype == "six_harm":
-            return f"{pa}와 {pb} 지지 {branches} 육해, 은밀한 손해가 있으니 대인관계에 유의하세요."
-        if itype == "three_punishment":
-            return f"{pa}와 {pb} 지지 {branches}로 {extra_label} 구성, 시련과 단련을 의미합니다."
-        if itype == "self_punishment":
-            return f"{pa}와 {pb} 같은 지지로 자형 구성, 내면의 갈등과 자기 소모에 주의하세요."
-    # English
-    if itype == "six_combination":
-        return f"{pa} and {pb} branches ({branches}) form a Six Combination, merging into {extra}. This indicates natural harmony and mutual support."
-    if itype == "six_clash":
-        return f"{pa} and {pb} branches ({branches}) form a Six Clash. Expect tension, change, and the need for adaptability in this life area."
-    if itype == "six_harm":
-        return f"{pa} and {pb} branches ({branches}) form a Six Harm. Watch for hidden friction and subtle undermining in related matters."
-    if itype == "three_punishment":
-        return f"{pa} and {pb} branches ({branches}) form a {extra_label}. This brings karmic tests and growth through adversity."
-    if itype == "self_punishment":
-        return f"{pa} and {pb} share the same branch ({branches}), forming a Self-Punishment. This suggests inner conflict and self-sabotaging tendencies."
-    return ""
-
-
-def _desc_three_harmony(pillars, info, lang):
-    names = {"en": [PILLAR_NAMES[p]["en"] for p in pillars],
-             "zh-TW": [PILLAR_NAMES[p]["zh-TW"] for p in pillars],
-             "zh-CN": [PILLAR_NAMES[p]["zh-CN"] for p in pillars],
-             "ko": [PILLAR_NAMES[p]["ko"] for p in pillars]}
-    n = names.get(lang, names["en"])
-    result = info["result"]
-    if lang == "zh-TW":
-        return f"{'、'.join(n)}地支構成三合{result}局，力量強大，主人生中{result}五行能量顯著增強。"
-    if lang == "zh-CN":
-        return f"{'、'.join(n)}地支构成三合{result}局，力量强大，主人生中{result}五行能量显著增强。"
-    if lang == "ko":
-        return f"{', '.join(n)} 지지가 삼합 {result}국을 구성, 강력한 힘으로 {result} 오행 에너지가 크게 증강됩니다."
-    return f"{', '.join(n)} branches form a Three Harmony {result} frame. This is a powerful configuration that greatly amplifies {result} energy in your life."
-
-
-def _desc_partial_three_harmony(pillars, info, lang):
-    names = {"en": [PILLAR_NAMES[p]["en"] for p in pillars],
-             "zh-TW": [PILLAR_NAMES[p]["zh-TW"] for p in pillars],
-             "zh-CN": [PILLAR_NAMES[p]["zh-CN"] for p in pillars],
-             "ko": [PILLAR_NAMES[p]["ko"] for p in pillars]}
-    n = names.get(lang, names["en"])
-    result = info["result"]
-    if lang == "zh-TW":
-        return f"{'、'.join(n)}地支構成三合{result}局的半合，{result}五行能量有一定增強。"
-    if lang == "zh-CN":
-        return f"{'、'.join(n)}地支构成三合{result}局的半合，{result}五行能量有一定增强。"
-    if lang == "ko":
-        return f"{', '.join(n)} 지지가 삼합 {result}국의 반합을 구성, {result} 오행 에너지가 어느 정도 증강됩니다."
-    return f"{', '.join(n)} branches form a partial Three Harmony toward {result}. The {result} element has moderate additional influence."
-
-
-def _desc_punishment(pillars, group, lang, is_full):
-    names = {"en": [PILLAR_NAMES[p]["en"] for p in pillars],
-             "zh-TW": [PILLAR_NAMES[p]["zh-TW"] for p in pillars],
-             "zh-CN": [PILLAR_NAMES[p]["zh-CN"] for p in pillars],
-             "ko": [PILLAR_NAMES[p]["ko"] for p in pillars]}
-    n = names.get(lang, names["en"])
-    sub = group.get(f"label_{_lang_key(lang)}", group["label_en"])
-    qualifier = "" if is_full else (" (partial)" if lang == "en" else "（部分）" if lang in ("zh-TW", "zh-CN") else " (부분)")
-    if lang == "zh-TW":
-        return f"{'、'.join(n)}地支構成{sub}{qualifier}，主考驗磨練，需耐心化解。"
-    if lang == "zh-CN":
-        return f"{'、'.join(n)}地支构成{sub}{qualifier}，主考验磨练，需耐心化解。"
-    if lang == "ko":
-        return f"{', '.join(n)} 지지가 {sub}{qualifier}를 구성, 시련과 단련을 의미하며 인내심으로 극복해야 합니다."
-    return f"{', '.join(n)} branches form a {sub}{qualifier}. This indicates karmic challenges that require patience and conscious effort to navigate."
-
-
-def _desc_stem_combo(pn_a, pn_b, sa, sb, info, lang):
-    pa = PILLAR_NAMES[pn_a].get(lang, pn_a)
-    pb = PILLAR_NAMES[pn_b].get(lang, pn_b)
-    result = info["result"]
-    if lang == "zh-TW":
-        return f"{pa}與{pb}天干{sa}{sb}合化{result}，主此兩柱所代表的人生領域互有助益。"
-    if lang == "zh-CN":
-        return f"{pa}与{pb}天干{sa}{sb}合化{result}，主此两柱所代表的人生领域互有助益。"
-    if lang == "ko":
-        return f"{pa}와 {pb} 천간 {sa}{sb}가 {result}로 합화, 이 두 주가 나타내는 인생 영역이 서로 도움을 줍니다."
-    return f"{pa} and {pb} stems ({sa}{sb}) combine into {result}. The life areas represented by these two pillars support and enhance each other."
+def _render_interaction(item: Dict, lang: str) -> Dict:
+    # Shared records are rendered once per language
+    shared = _records_by_id.get(id(item)) is item
+    if shared:
+        rendered = _rendered.get((id(item), lang))
+        if rendered is not None:
+            return rendered
+
+    rendered = {
+        "type": item["type"],
+        "type_label": text(_TYPE_LABEL_MSG[item["type"]], lang),
+        "pillars": list(item["pillars"]),
+        "branches": item["branches"],
+        "detail_cn": item["detail_cn"],
+        "polarity": item["polarity"],
+        "polarity_label": text(_POLARITY_LABEL_MSG[item["polarity"]], lang),
+        "description": render(item["description"], lang),
+    }
+    if item.get("partial"):
+        rendered["partial"] = True
+    elif "sub_label" in item:
+        rendered["sub_label"] = text(item["sub_label"], lang)
+    if shared:
+        rendered = _rendered.setdefault((id(item), lang), freeze(rendered))
+    return rendered
+
+
+# =============== Description templates ===============
+
+_PAIR_DESC_MSG = define_table({
+    "six_combination": {
+        "en": "{pa} and {pb} branches ({branches}) form a Six Combination, merging into {result}. This indicates natural harmony and mutual support.",
+        "zh-TW": "{pa}與{pb}地支{branches}六合，合化{result}，主和諧融洽。",
+        "zh-CN": "{pa}与{pb}地支{branches}六合，合化{result}，主和谐融洽。",
+        "ko": "{pa}와 {pb} 지지 {branches} 육합, {result}로 합화, 조화와 화합을 의미합니다.",
+    },
+    "six_clash": {
+        "en": "{pa} and {pb} branches ({branches}) form a Six Clash. Expect tension, change, and the need for adaptability in this life area.",
+        "zh-TW": "{pa}與{pb}地支{branches}六沖，主動盪變化，需注意衝突與轉變。",
+        "zh-CN": "{pa}与{pb}地支{branches}六冲，主动荡变化，需注意冲突与转变。",
+        "ko": "{pa}와 {pb} 지지 {branches} 육충, 변동과 충돌에 주의가 필요합니다.",
+    },
+    "six_harm": {
+        "en": "{pa} and {pb} branches ({branches}) form a Six Harm. Watch for hidden friction and subtle undermining in related matters.",
+        "zh-TW": "{pa}與{pb}地支{branches}六害，暗中有損，留意人際暗流。",
+        "zh-CN": "{pa}与{pb}地支{branches}六害，暗中有损，留意人际暗流。",
+        "ko": "{pa}와 {pb} 지지 {branches} 육해, 은밀한 손해가 있으니 대인관계에 유의하세요.",
+    },
+    "three_punishment": {
+        "en": "{pa} and {pb} branches ({branches}) form a {punishment}. This brings karmic tests and growth through adversity.",
+        "zh-TW": "{pa}與{pb}地支{branches}構成{punishment}，主磨練考驗。",
+        "zh-CN": "{pa}与{pb}地支{branches}构成{punishment}，主磨练考验。",
+        "ko": "{pa}와 {pb} 지지 {branches}로 {punishment} 구성, 시련과 단련을 의미합니다.",
+    },
+    "self_punishment": {
+        "en": "{pa} and {pb} share the same branch ({branches}), forming a Self-Punishment. This suggests inner conflict and self-sabotaging tendencies.",
+        "zh-TW": "{pa}與{pb}地支相同構成自刑，主內心矛盾與自我消耗。",
+        "zh-CN": "{pa}与{pb}地支相同构成自刑，主内心矛盾与自我消耗。",
+        "ko": "{pa}와 {pb} 같은 지지로 자형 구성, 내면의 갈등과 자기 소모에 주의하세요.",
+    },
+})
+
+_THREE_HARMONY_MSG = define({
+    "en": "{names} branches form a Three Harmony {result} frame. This is a powerful configuration that greatly amplifies {result} energy in your life.",
+    "zh-TW": "{names}地支構成三合{result}局，力量強大，主人生中{result}五行能量顯著增強。",
+    "zh-CN": "{names}地支构成三合{result}局，力量强大，主人生中{result}五行能量显著增强。",
+    "ko": "{names} 지지가 삼합 {result}국을 구성, 강력한 힘으로 {result} 오행 에너지가 크게 증강됩니다.",
+})
+
+_PARTIAL_THREE_HARMONY_MSG = define({
+    "en": "{names} branches form a partial Three Harmony toward {result}. The {result} element has moderate additional influence.",
+    "zh-TW": "{names}地支構成三合{result}局的半合，{result}五行能量有一定增強。",
+    "zh-CN": "{names}地支构成三合{result}局的半合，{result}五行能量有一定增强。",
+    "ko": "{names} 지지가 삼합 {result}국의 반합을 구성, {result} 오행 에너지가 어느 정도 증강됩니다.",
+})
+
+_PARTIAL_QUALIFIER_MSG = define({"en": " (partial)", "zh-TW": "（部分）", "zh-CN": "（部分）", "ko": " (부분)"})
+
+_PUNISHMENT_GROUP_MSG = define({
+    "en": "{names} branches form a {sub}{qualifier}. This indicates karmic challenges that require patience and conscious effort to navigate.",
+    "zh-TW": "{names}地支構成{sub}{qualifier}，主考驗磨練，需耐心化解。",
+    "zh-CN": "{names}地支构成{sub}{qualifier}，主考验磨练，需耐心化解。",
+    "ko": "{names} 지지가 {sub}{qualifier}를 구성, 시련과 단련을 의미하며 인내심으로 극복해야 합니다.",
+})
+
+_STEM_COMBO_MSG = define({
+    "en": "{pa} and {pb} stems ({sa}{sb}) combine into {result}. The life areas represented by these two pillars support and enhance each other.",
+    "zh-TW": "{pa}與{pb}天干{sa}{sb}合化{result}，主此兩柱所代表的人生領域互有助益。",
+    "zh-CN": "{pa}与{pb}天干{sa}{sb}合化{result}，主此两柱所代表的人生领域互有助益。",
+    "ko": "{pa}와 {pb} 천간 {sa}{sb}가 {result}로 합화, 이 두 주가 나타내는 인생 영역이 서로 도움을 줍니다.",
+})
@@ -0,0 +1,268 @@
+"""
+Reverse Pillar Search (干支查日)
+
+"Which dates produce this chart?" — every (date, clock hour) from 1900 to
+2100 is a slot, numbered day_number * 24 + hour. For each of the eight
+pillar fields (year/month/day/hour stem and branch) and each of its
+values, a roaring bitmap holds the slots carrying that value:
+
+    slots where the day pillar is 甲子 and the hour branch is 午
+        = BITMAPS[day_stem][甲] & BITMAPS[day_branch][子] & BITMAPS[hour_branch][午]
+
+so a multi-pillar query is a few bitmap intersections, never a scan of
+calculate_bazi over decades. Pillars are those calculate_bazi gives the
+same birth (year and month from the solar terms, 子 hour from 23:00).
+
+The 88 bitmaps are built in one vectorized pass over the calendar kernel
+and stored serialized (see build_tables.py).
+"""
+
+import struct
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from pyroaring import BitMap, FrozenBitMap
+
+from .calendar_kernel import EPOCH_DATE, compute_four_pillars, day_number
+from .calendar_table import LAST_SOLAR_DATE
+from .chart_core import BRANCH_NAME_TO_INDEX, STEM_NAME_TO_INDEX
+from .table_store import ENGINE_HASH, check_header, table_path, write_atomic
+
+TABLE_FILENAME = "pillar_search_1900_2100.bin"
+
+_MAGIC = b"BAZIPSR1"
+_HEADER = struct.Struct("<8s16sii")  # magic, engine hash, #slots, #bitmaps
+_LENGTH = struct.Struct("<i")
+
+HOURS_PER_DAY = 24
+SLOT_COUNT = (day_number(LAST_SOLAR_DATE) + 1) * HOURS_PER_DAY
+
+# Fields in calendar_kernel.four_pillar_indices order, with their value counts
+FIELDS: Tuple[str, ...] = (
+    "year_stem", "year_branch", "month_stem", "month_branch",
+    "day_stem", "day_branch", "hour_stem", "hour_branch",
+)
+FIELD_SIZES: Tuple[int, ...] = (10, 12) * 4
+PILLAR_KEYS = ("year", "month", "day", "hour")
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+
+class PillarSearchIndex:
+    """Read-only slot bitmaps of every pillar field value."""
+
+    def __init__(self, bitmaps: List[List[FrozenBitMap]]):
+        self.bitmaps = bitmaps  # [field][value]
+
+    @classmethod
+    def open(cls, path: str) -> "PillarSearchIndex":
+        """Load an existing index file."""
+        with open(path, "rb") as fh:
+            data = fh.read()
+        magic, engine_hash, n_slots, n_bitmaps = _HEADER.unpack_from(data)
+        check_header(path, magic, _MAGIC, engine_hash, "pillar search index")
+        if n_slots != SLOT_COUNT or n_bitmaps != sum(FIELD_SIZES):
+            raise ValueError(f"Not a pillar search index: {path}")
+
+        flat = []
+        offset = _HEADER.size
+        for _ in range(n_bitmaps):
+            (length,) = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            flat.append(FrozenBitMap.deserialize(data[offset:offset + length]))
+            offset += length
+        return cls(_by_field(flat))
+
+    def match(
+        self,
+        criteria: Mapping[str, int],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> BitMap:
+        """
+        Slots matching every {field: value} criterion within [start, end].
+
+        Args:
+            criteria: FIELDS name → stem or branch index
+            start, end: Inclusive date range (defaults: the whole index)
+        """
+        bitmaps = sorted(
+            (self.bitmaps[FIELDS.index(field)][value] for field, value in criteria.items()),
+            key=len,
+        )
+        first = day_number(start) * HOURS_PER_DAY if start else 0
+        stop = (day_number(end) + 1) * HOURS_PER_DAY if end else SLOT_COUNT
+        window = BitMap()
+        window.add_range(max(first, 0), min(stop, SLOT_COUNT))
+        # Smallest bitmap first keeps every intermediate result small
+        for bitmap in bitmaps:
+            window &= bitmap
+        return window
+
+
+def _by_field(flat: List[FrozenBitMap]) -> List[List[FrozenBitMap]]:
+    by_field = []
+    offset = 0
+    for size in FIELD_SIZES:
+        by_field.append(flat[offset:offset + size])
+        offset += size
+    return by_field
+
+
+def build_bitmaps() -> List[List[FrozenBitMap]]:
+    """Compute every slot's pillars and collect the [field][value] bitmaps."""
+    days = np.arange(
+        np.datetime64(EPOCH_DATE.isoformat(), "D"),
+        np.datetime64((LAST_SOLAR_DATE + timedelta(days=1)).isoformat(), "D"),
+    )
+    dates = np.repeat(days, HOURS_PER_DAY)
+    hours = np.tile(np.arange(HOURS_PER_DAY), len(days))
+    pillars = compute_four_pillars(dates, hours)
+
+    bitmaps = []
+    for column, size in zip(pillars, FIELD_SIZES):
+        row = []
+        for value in range(size):
+            bitmap = BitMap(np.flatnonzero(column == value).astype(np.uint32))
+            bitmap.run_optimize()
+            row.append(FrozenBitMap(bitmap))
+        bitmaps.append(row)
+    return bitmaps
+
+
+def build_table(path: Optional[str] = None) -> str:
+    """Build the pillar search index file; returns its path."""
+    path = path or table_path(TABLE_FILENAME)
+    flat = [bitmap for row in build_bitmaps() for bitmap in row]
+
+    def _write(fh):
+        fh.write(_HEADER.pack(_MAGIC, ENGINE_HASH, SLOT_COUNT, len(flat)))
+        for bitmap in flat:
+            data = bitmap.serialize()
+            fh.write(_LENGTH.pack(len(data)))
+            fh.write(data)
+
+    write_atomic(path, _write)
+    return path
+
+
+_index: Optional[PillarSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_pillar_search_index() -> PillarSearchIndex:
+    """
+    Return the process-wide pillar search index.
+
+    Loads the index file, building it first if it is missing or stale. If the data
+    directory is not writable the index is built in memory instead.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = table_path(TABLE_FILENAME)
+                try:
+                    try:
+                        _index = PillarSearchIndex.open(path)
+                    except (FileNotFoundError, ValueError):
+                        build_table(path)
+                        _index = PillarSearchIndex.open(path)
+                except OSError:
+                    _index = PillarSearchIndex(build_bitmaps())
+    return _index
+
+
+# ==================== QUERIES ====================
+
+def parse_pillar(value: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (stem, branch) indices of a pillar pattern: "甲子", a stem alone ("壬")
+    or a branch alone ("午"). Any stem + branch pair is accepted: month
+    pillars before 立春 need not be one of the sixty. Raises ValueError on
+    anything else.
+    """
+    text = (value or "").strip()
+    if len(text) == 2 and text[0] in STEM_NAME_TO_INDEX and text[1] in BRANCH_NAME_TO_INDEX:
+        return STEM_NAME_TO_INDEX[text[0]], BRANCH_NAME_TO_INDEX[text[1]]
+    if len(text) == 1 and text in STEM_NAME_TO_INDEX:
+        return STEM_NAME_TO_INDEX[text], None
+    if len(text) == 1 and text in BRANCH_NAME_TO_INDEX:
+        return None, BRANCH_NAME_TO_INDEX[text]
+    raise ValueError(f"Invalid pillar pattern: {value!r} (expected e.g. 甲子, 甲 or 子)")
+
+
+def search_pillars(
+    pillars: Mapping[str, Optional[str]],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = DEFAULT_LIMIT,
+) -> Dict:
+    """
+    Dates (and clock hours) whose pillars match the given patterns.
+
+    Args:
+        pillars: {"year" | "month" | "day" | "hour": pattern (see parse_pillar)};
+            None or missing pillars are unconstrained
+        start, end: Inclusive solar date range (defaults: 1900-01-01 to 2100-12-31)
+        limit: Maximum dates listed (1 - MAX_LIMIT)
+
+    Returns:
+        {"query": {pillar: pattern}, "start_date", "end_date",
+         "count": matching dates, "slot_count": matching (date, hour) pairs,
+         "truncated": bool, "dates": [{"date", "hours": [0-23, ...]}, ...]}
+
+    Raises:
+        ValueError: on an unknown pillar, invalid pattern, empty query,
+            out-of-range dates or limit
+    """
+    criteria: Dict[str, int] = {}
+    query: Dict[str, str] = {}
+    for key, pattern in pillars.items():
+        if pattern is None or pattern == "":
+            continue
+        if key not in PILLAR_KEYS:
+            raise ValueError(f"Unknown pillar: {key}")
+        stem, branch = parse_pillar(pattern)
+        if stem is not None:
+            criteria[f"{key}_stem"] = stem
+        if branch is not None:
+            criteria[f"{key}_branch"] = branch
+        query[key] = pattern.strip()
+    if not criteria:
+        raise ValueError("At least one pillar pattern is required")
+
+    start = start or EPOCH_DATE
+    end = end or LAST_SOLAR_DATE
+    if start < EPOCH_DATE or end > LAST_SOLAR_DATE or start > end:
+        raise ValueError(
+            f"Date range must lie within {EPOCH_DATE.isoformat()} - {LAST_SOLAR_DATE.isoformat()}"
+        )
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    slots = get_pillar_search_index().match(criteria, start, end)
+    days, hours = np.divmod(np.asarray(slots.to_array(), dtype=np.int64), HOURS_PER_DAY)
+    unique_days, first = np.unique(days, return_index=True)
+    bounds = np.append(first, len(days)).tolist()
+    hours = hours.tolist()
+
+    dates = [
+        {
+            "date": (EPOCH_DATE + timedelta(days=day)).isoformat(),
+            "hours": hours[bounds[i]:bounds[i + 1]],
+        }
+        for i, day in enumerate(unique_days[:limit].tolist())
+    ]
+    return {
+        "query": query,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "count": len(unique_days),
+        "slot_count": len(slots),
+        "truncated": len(unique_days) > limit,
+        "dates": dates,
+    }
@@ -0,0 +1,265 @@
+"""
+Population Statistics (命盤稀有度)
+
+"How common is my chart?" — distributions over every birth from 1900 to
+2100, one birth per (date, clock hour), so each day weighs the same:
+
+- signature: births per four-pillar signature (signature_store rows)
+- day master stem, primary use god, dm strength label
+- dm strength score, in tenths
+- visible element-count vectors (counts 0-8 per element, base-9 code)
+- interaction types: births whose natal chart has at least one of each
+
+Building is vectorized end to end: the calendar kernel gives every
+birth's pillars, signature_rows maps them to signature rows, and one
+bincount gives births per signature. Every other histogram is a
+bincount of a signature_store field weighted by those counts, so no
+chart is analyzed at build time beyond the store itself.
+
+The histograms are written to one small file, mapped at startup, and
+chart_rarity reads a chart's figures with O(1) array lookups.
+"""
+
+import struct
+import threading
+from datetime import timedelta
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .calendar_kernel import EPOCH_DATE, compute_four_pillars
+from .calendar_table import LAST_SOLAR_DATE
+from .pillar_interactions import INTERACTION_TYPES, KIND_TYPES
+from .relations import ELEMENT_INDEX, ELEMENTS
+from .signature_store import (
+    DM_STRENGTHS,
+    INTERACTION_SLOTS,
+    SIGNATURE_ROWS,
+    build_rows,
+    get_signature_store,
+    signature_indices,
+    signature_row,
+    signature_rows,
+)
+from .table_store import ENGINE_HASH, check_header, table_path, write_atomic
+
+TABLE_FILENAME = "population_stats_1900_2100.bin"
+
+_MAGIC = b"BAZIPOP1"
+_HEADER = struct.Struct("<8s16siii")  # magic, engine hash, population, lowest score (tenths), score bins
+
+HOURS_PER_DAY = 24
+ELEMENT_CODE_BASE = 9  # an element appears 0-8 times among the 8 characters
+ELEMENT_CODES = ELEMENT_CODE_BASE ** 5
+
+# (name, length) of each histogram section in file order; dm_score's
+# length comes from the header
+_SECTIONS = (
+    ("signature", SIGNATURE_ROWS),
+    ("day_master", 10),
+    ("use_god", 5),
+    ("dm_strength", len(DM_STRENGTHS)),
+    ("dm_score", None),
+    ("element_counts", ELEMENT_CODES),
+    ("interaction_types", len(INTERACTION_TYPES)),
+)
+
+_KIND_TYPE_INDEX = np.array([INTERACTION_TYPES.index(t) for t in KIND_TYPES] + [0] * (16 - len(KIND_TYPES)))
+_ELEMENT_WEIGHTS = ELEMENT_CODE_BASE ** np.arange(5)
+
+
+def element_code(counts: Sequence[int]) -> int:
+    """Base-9 code of a (Wood, Fire, Earth, Metal, Water) count vector."""
+    return sum(int(c) * int(w) for c, w in zip(counts, _ELEMENT_WEIGHTS))
+
+
+class PopulationStats:
+    """Read-only histograms (memory-mapped or in-memory) and lookups on them."""
+
+    def __init__(self, histograms: Dict[str, np.ndarray], population: int, score_min: int):
+        # Plain ndarray views: memmap element access is several times slower
+        self.histograms = {name: h.view(np.ndarray) for name, h in histograms.items()}
+        self.population = population
+        self.score_min = score_min
+        # Births at or below each score bin, for percentiles
+        self.score_cumulative = np.cumsum(self.histograms["dm_score"])
+
+    @classmethod
+    def open(cls, path: str) -> "PopulationStats":
+        """Memory-map an existing stats file."""
+        with open(path, "rb") as fh:
+            magic, engine_hash, population, score_min, score_bins = _HEADER.unpack(fh.read(_HEADER.size))
+        check_header(path, magic, _MAGIC, engine_hash, "population stats file")
+
+        histograms = {}
+        offset = _HEADER.size
+        for name, length in _SECTIONS:
+            length = score_bins if length is None else length
+            histograms[name] = np.memmap(path, dtype="<u4", mode="r", offset=offset, shape=(length,))
+            offset += length * 4
+        return cls(histograms, population, score_min)
+
+    def percent(self, name: str, index: int) -> float:
+        """Share of all births (in %) falling in one bin of a histogram."""
+        return round(100 * int(self.histograms[name][index]) / self.population, 4)
+
+    def score_percentile(self, score: float) -> float:
+        """Share of births (in %) with a dm strength score at or below `score`."""
+        index = int(round(score * 10)) - self.score_min
+        index = min(max(index, -1), len(self.score_cumulative) - 1)
+        at_or_below = int(self.score_cumulative[index]) if index >= 0 else 0
+        return round(100 * at_or_below / self.population, 2)
+
+
+def build_histograms() -> Dict:
+    """
+    Count every birth 1900-2100 into the histograms.
+
+    Returns:
+        {"population", "score_min", "histograms": {name: uint32 array}}
+    """
+    days = np.arange(
+        np.datetime64(EPOCH_DATE.isoformat(), "D"),
+        np.datetime64((LAST_SOLAR_DATE + timedelta(days=1)).isoformat(), "D"),
+    )
+    pillars = compute_four_pillars(
+        np.repeat(days, HOURS_PER_DAY), np.tile(np.arange(HOURS_PER_DAY), len(days))
+    )
+    birth_rows = signature_rows(np.stack(pillars[0::2], axis=1), np.stack(pillars[1::2], axis=1))
+    if (birth_rows < 0).any():
+        raise ValueError("A birth has no signature_store row")
+    weights = np.bincount(birth_rows, minlength=SIGNATURE_ROWS)
+
+    store = get_signature_store()
+    rows = store.rows if store is not None else build_rows()
+
+    def _histogram(values: np.ndarray, length: int) -> np.ndarray:
+        return np.bincount(values, weights=weights, minlength=length).astype(np.uint32)
+
+    stems, _ = signature_indices(0, SIGNATURE_ROWS)
+    scores = np.rint(rows["dm_strength_score"] * 10).astype(np.int64)
+    score_min = int(scores.min())
+    score_bins = int(scores.max()) - score_min + 1
+
+    codes = rows["interactions"].astype(np.int64)
+    present = np.arange(INTERACTION_SLOTS) < rows["interaction_count"][:, None]
+    code_types = np.where(present, _KIND_TYPE_INDEX[codes >> 4], -1)
+    interaction_types = np.array([
+        weights[(code_types == t).any(axis=1)].sum() for t in range(len(INTERACTION_TYPES))
+    ], dtype=np.uint32)
+
+    return {
+        "population": int(weights.sum()),
+        "score_min": score_min,
+        "histograms": {
+            "signature": weights.astype(np.uint32),
+            "day_master": _histogram(stems[:, 2], 10),
+            "use_god": _histogram(rows["gods"][:, 0].astype(np.int64), 5),
+            "dm_strength": _histogram(rows["dm_strength"].astype(np.int64), len(DM_STRENGTHS)),
+            "dm_score": _histogram(scores - score_min, score_bins),
+            "element_counts": _histogram(rows["element_counts"].astype(np.int64) @ _ELEMENT_WEIGHTS, ELEMENT_CODES),
+            "interaction_types": interaction_types,
+        },
+    }
+
+
+def build_table(path: Optional[str] = None) -> str:
+    """Build the population stats file; returns its path."""
+    path = path or table_path(TABLE_FILENAME)
+    built = build_histograms()
+    histograms = built["histograms"]
+
+    def _write(fh):
+        fh.write(_HEADER.pack(
+            _MAGIC, ENGINE_HASH, built["population"], built["score_min"], len(histograms["dm_score"]),
+        ))
+        for name, _ in _SECTIONS:
+            fh.write(histograms[name].astype("<u4").tobytes())
+
+    write_atomic(path, _write)
+    return path
+
+
+_stats: Optional[PopulationStats] = None
+_stats_loaded = False
+_stats_lock = threading.Lock()
+
+
+def get_population_stats() -> Optional[PopulationStats]:
+    """
+    Return the process-wide population stats, or None if they are not
+    built (or were built by another engine version).
+
+    Like the signature store they are built by build_tables at deploy time,
+    not on demand; without them charts carry no rarity figures.
+    """
+    global _stats, _stats_loaded
+    if not _stats_loaded:
+        with _stats_lock:
+            if not _stats_loaded:
+                try:
+                    _stats = PopulationStats.open(table_path(TABLE_FILENAME))
+                except (OSError, ValueError):
+                    _stats = None
+                _stats_loaded = True
+    return _stats
+
+
+# ==================== CHART LOOKUP ====================
+
+def chart_rarity(indices: Sequence[int], parts: Dict) -> Optional[Dict]:
+    """
+    How common a chart is among all births 1900-2100.
+
+    Args:
+        indices: Four-pillar signature (calendar_kernel.four_pillar_indices)
+        parts: The chart's signature parts (calculator._compute_signature_parts)
+
+    Returns:
+        {"population": births counted,
+         "signature": {"percent", "one_in"}: births sharing all eight characters,
+         "day_master" / "use_god" / "dm_strength": {"value", "percent"},
+            dm_strength also with "percentile" (births scoring at or below),
+         "element_counts": {"percent"}: births with the same visible counts,
+         "interactions": [{"type", "percent"}] for each interaction type present},
+        or None if the stats are not built.
+    """
+    stats = get_population_stats()
+    if stats is None:
+        return None
+
+    row = signature_row(indices)
+    births = int(stats.histograms["signature"][row]) if row is not None else 0
+    use_god = parts["use_god"]
+    present = {item["type"] for item in parts["pillar_interactions"]["interactions"]}
+
+    return {
+        "population": stats.population,
+        "signature": {
+            "percent": round(100 * births / stats.population, 6),
+            "one_in": round(stats.population / births) if births else None,
+        },
+        "day_master": {
+            "value": parts["day_master"]["stem_cn"],
+            "percent": stats.percent("day_master", indices[4]),
+        },
+        "use_god": {
+            "value": use_god["use_god"],
+            "percent": stats.percent("use_god", ELEMENT_INDEX[use_god["use_god"]]),
+        },
+        "dm_strength": {
+            "value": use_god["dm_strength"],
+            "percent": stats.percent("dm_strength", DM_STRENGTHS.index(use_god["dm_strength"])),
+            "percentile": stats.score_percentile(use_god["dm_strength_score"]),
+        },
+        "element_counts": {
+            "percent": stats.percent(
+                "element_counts", element_code([parts["elements"]["counts"][e] for e in ELEMENTS])
+            ),
+        },
+        "interactions": [
+            {"type": t, "percent": stats.percent("interaction_types", i)}
+            for i, t in enumerate(INTERACTION_TYPES)
+            if t in present
+        ],
+    }
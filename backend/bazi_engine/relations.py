@@ -0,0 +1,129 @@
+"""
+Element / Ten God relations (五行生剋 · 十神)
+
+Precomputed relation tables keyed by small ints, shared by every engine
+module:
+
+- elements 0-4 in generation order: Wood, Fire, Earth, Metal, Water
+- RELATION[a][b]: how element a relates to element b (one of the relation
+  codes below). In generation order this is simply (b - a) % 5.
+- GENERATES_ELEMENT / CONTROLS_ELEMENT / ...: element → element
+- TEN_GOD_TABLE[day_master][i]: Ten God index of stem i (0-9) or of
+  branch i - 10 (10-21) relative to a day-master stem
+
+Ten God results are shared read-only records (TEN_GOD_RECORDS), never
+per-call copies.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from .chart_cache import FrozenDict
+from .stems_branches import INDEX_TO_BRANCH, INDEX_TO_STEM
+
+# ---- Elements ----
+
+ELEMENTS: Tuple[str, ...] = ("Wood", "Fire", "Earth", "Metal", "Water")
+ELEMENT_INDEX: Dict[str, int] = {name: i for i, name in enumerate(ELEMENTS)}
+
+# ---- Relation codes: how element a relates to element b ----
+
+REL_SAME = 0           # a is b (比和)
+REL_GENERATES = 1      # a produces b (我生)
+REL_CONTROLS = 2       # a controls b (我剋)
+REL_CONTROLLED_BY = 3  # b controls a (剋我)
+REL_GENERATED_BY = 4   # b produces a (生我)
+
+RELATION: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple((b - a) % 5 for b in range(5)) for a in range(5)
+)
+
+GENERATES_ELEMENT: Tuple[int, ...] = tuple((e + 1) % 5 for e in range(5))      # output (我生)
+CONTROLS_ELEMENT: Tuple[int, ...] = tuple((e + 2) % 5 for e in range(5))       # wealth (我剋)
+CONTROLLED_BY_ELEMENT: Tuple[int, ...] = tuple((e + 3) % 5 for e in range(5))  # power (剋我)
+GENERATED_BY_ELEMENT: Tuple[int, ...] = tuple((e + 4) % 5 for e in range(5))   # resource (生我)
+
+# Name of each relation code in get_element_relationships' vocabulary,
+# which only speaks from a's side ("generates", "destroys", "same", "none")
+RELATION_NAMES: Tuple[str, ...] = ("same", "generates", "destroys", "none", "none")
+
+_RELATION_BY_NAME: Dict[Tuple[str, str], int] = {
+    (ELEMENTS[a], ELEMENTS[b]): RELATION[a][b] for a in range(5) for b in range(5)
+}
+
+
+def element_relation(element_a: str, element_b: str) -> Optional[int]:
+    """Relation code of element a to element b (names), or None if either is unknown."""
+    return _RELATION_BY_NAME.get((element_a, element_b))
+
+
+# ---- Stems and branches ----
+
+STEM_ELEMENT: Tuple[int, ...] = tuple(
+    ELEMENT_INDEX[INDEX_TO_STEM[i].value["element"]] for i in range(10)
+)
+BRANCH_ELEMENT: Tuple[int, ...] = tuple(
+    ELEMENT_INDEX[INDEX_TO_BRANCH[i].value["element"]] for i in range(12)
+)
+# 0 = Yang, 1 = Yin
+STEM_POLARITY: Tuple[int, ...] = tuple(
+    0 if INDEX_TO_STEM[i].value["yin_yang"] == "Yang" else 1 for i in range(10)
+)
+BRANCH_POLARITY: Tuple[int, ...] = tuple(
+    0 if INDEX_TO_BRANCH[i].value["yin_yang"] == "Yang" else 1 for i in range(12)
+)
+
+# ---- Ten Gods ----
+
+# Index = relation code * 2 + (1 if the polarities differ else 0)
+TEN_GOD_KEYS: Tuple[str, ...] = (
+    "friend", "rob_wealth",                     # same element
+    "eating_god", "hurting_officer",            # DM produces target
+    "indirect_wealth", "direct_wealth",         # DM controls target
+    "seven_killings", "direct_officer",         # target controls DM
+    "indirect_resource", "direct_resource",     # target produces DM
+)
+TEN_GOD_INDEX: Dict[str, int] = {key: i for i, key in enumerate(TEN_GOD_KEYS)}
+
+_TEN_GOD_NAMES = {
+    "friend": ("Friend", "比肩", "Bǐ Jiān"),
+    "rob_wealth": ("Rob Wealth", "劫財", "Jié Cái"),
+    "eating_god": ("Eating God", "食神", "Shí Shén"),
+    "hurting_officer": ("Hurting Officer", "傷官", "Shāng Guān"),
+    "indirect_wealth": ("Indirect Wealth", "偏財", "Piān Cái"),
+    "direct_wealth": ("Direct Wealth", "正財", "Zhèng Cái"),
+    "seven_killings": ("Seven Killings", "七殺", "Qī Shā"),
+    "direct_officer": ("Direct Officer", "正官", "Zhèng Guān"),
+    "indirect_resource": ("Indirect Resource", "偏印", "Piān Yìn"),
+    "direct_resource": ("Direct Resource", "正印", "Zhèng Yìn"),
+}
+
+# One shared read-only record per Ten God (key, name_en, name_cn, name_pinyin)
+TEN_GOD_RECORDS: Tuple[FrozenDict, ...] = tuple(
+    FrozenDict({
+        "key": key,
+        "name_en": _TEN_GOD_NAMES[key][0],
+        "name_cn": _TEN_GOD_NAMES[key][1],
+        "name_pinyin": _TEN_GOD_NAMES[key][2],
+    })
+    for key in TEN_GOD_KEYS
+)
+
+
+def ten_god_index(dm_element: int, dm_polarity: int, element: int, polarity: int) -> int:
+    """Ten God index of a target (element, polarity) relative to the day master."""
+    return RELATION[dm_element][element] * 2 + (dm_polarity != polarity)
+
+
+# 10 day-master stems × (10 stems + 12 branches)
+TEN_GOD_TABLE: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(
+        ten_god_index(STEM_ELEMENT[dm], STEM_POLARITY[dm], STEM_ELEMENT[s], STEM_POLARITY[s])
+        for s in range(10)
+    ) + tuple(
+        ten_god_index(STEM_ELEMENT[dm], STEM_POLARITY[dm], BRANCH_ELEMENT[b], BRANCH_POLARITY[b])
+        for b in range(12)
+    )
+    for dm in range(10)
+)
+
+BRANCH_COLUMN = 10  # TEN_GOD_TABLE column of branch 0
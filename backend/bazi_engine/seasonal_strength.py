@@ -8,6 +8,8 @@ Element-season mapping per Five Elements theory.
 
 from typing import Dict
 
+from .messages import Message, define, define_table, render_explanations
+
 # Month branch index (0-11) -> season for element
 # Wood: Spring (寅2, 卯3); Fire: Summer (巳5, 午6); Metal: Autumn (申8, 酉9);
 # Water: Winter (亥11, 子12); Earth: Late season (辰4, 未7, 戌10, 丑1)
@@ -28,6 +30,49 @@ ELEMENT_OPPOSITE_BRANCHES = {
     "Earth": [],         # Earth is neutral in transition; use weak for non-season months
 }
 
+# Weight of an element's presence in the month branch, by its seasonal state
+SEASONAL_MULTIPLIER = {"strong": 1.5, "neutral": 1.0, "weak": 0.5}
+
+
+def element_season_state(element: str, month_branch_index: int) -> str:
+    """"strong" in its season, "weak" in the opposite season, else "neutral"."""
+    if month_branch_index in ELEMENT_SEASON_BRANCHES[element]:
+        return "strong"
+    if month_branch_index in ELEMENT_OPPOSITE_BRANCHES.get(element, []):
+        return "weak"
+    return "neutral"
+
+
+# ---- Explanation messages (see messages.py); {element} is the English name ----
+
+_UNKNOWN_MSG = define({
+    "en": "Unable to determine seasonal strength.",
+    "zh-TW": "無法判斷得令與否。",
+    "zh-CN": "无法判断得令与否。",
+    "ko": "득령 여부를 판단할 수 없습니다.",
+})
+
+_STRENGTH_MSG = define_table({
+    "strong": {
+        "en": "Your Day Master ({element}) is in season (得令) — born in its element's peak month. This suggests natural vitality and support from the environment.",
+        "zh-TW": "您的日主（{element}）得令，生於該五行當令之月，代表先天能量較旺，環境對您有助益。",
+        "zh-CN": "您的日主（{element}）得令，生于该五行当令之月，代表先天能量较旺，环境对您有助益。",
+        "ko": "일주（{element}）가 득령입니다. 해당 오행이 당령인 달에 태어나 선천적 에너지가 왕성하고 환경의 도움을 받습니다.",
+    },
+    "weak": {
+        "en": "Your Day Master ({element}) is out of season (失令) — born in its opposite element's peak month. This suggests the need for support from other pillars or elements.",
+        "zh-TW": "您的日主（{element}）失令，生於剋制該五行之月，代表先天能量較弱，需從其他柱或五行中尋求補益。",
+        "zh-CN": "您的日主（{element}）失令，生于克制该五行之月，代表先天能量较弱，需从其他柱或五行中寻求补益。",
+        "ko": "일주（{element}）가 실령입니다. 해당 오행을 극하는 달에 태어나 선천적 에너지가 약하며 다른 주나 오행에서 보완이 필요합니다.",
+    },
+    "neutral": {
+        "en": "Your Day Master ({element}) is in a neutral season — neither strongly supported nor weakened by the birth month.",
+        "zh-TW": "您的日主（{element}）處於平令，出生月份對日主既無明顯助益也無明顯剋制。",
+        "zh-CN": "您的日主（{element}）处于平令，出生月份对日主既无明显助益也无明显克制。",
+        "ko": "일주（{element}）가 평령입니다. 출생 월이 일주에 뚜렷한 도움이나 극제를 주지 않습니다.",
+    },
+})
+
 
 def get_seasonal_strength(day_master_element: str, month_branch_index: int) -> Dict:
     """
@@ -41,41 +86,11 @@ def get_seasonal_strength(day_master_element: str, month_branch_index: int) -> D
         Dict with strength ("strong"|"neutral"|"weak"), explanation_en, explanation_zh
     """
     if not day_master_element or day_master_element not in ELEMENT_SEASON_BRANCHES:
-        return {
-            "strength": "neutral",
-            "explanation_en": "Unable to determine seasonal strength.",
-            "explanation_zh_tw": "無法判斷得令與否。",
-            "explanation_zh_cn": "无法判断得令与否。",
-            "explanation_ko": "득령 여부를 판단할 수 없습니다.",
-        }
-
-    in_season = month_branch_index in ELEMENT_SEASON_BRANCHES[day_master_element]
-    opposite = ELEMENT_OPPOSITE_BRANCHES.get(day_master_element, [])
-    in_opposite = month_branch_index in opposite
-
-    if in_season:
-        strength = "strong"
-        exp_en = f"Your Day Master ({day_master_element}) is in season (得令) — born in its element's peak month. This suggests natural vitality and support from the environment."
-        exp_tw = f"您的日主（{day_master_element}）得令，生於該五行當令之月，代表先天能量較旺，環境對您有助益。"
-        exp_cn = f"您的日主（{day_master_element}）得令，生于该五行当令之月，代表先天能量较旺，环境对您有助益。"
-        exp_ko = f"일주（{day_master_element}）가 득령입니다. 해당 오행이 당령인 달에 태어나 선천적 에너지가 왕성하고 환경의 도움을 받습니다."
-    elif in_opposite:
-        strength = "weak"
-        exp_en = f"Your Day Master ({day_master_element}) is out of season (失令) — born in its opposite element's peak month. This suggests the need for support from other pillars or elements."
-        exp_tw = f"您的日主（{day_master_element}）失令，生於剋制該五行之月，代表先天能量較弱，需從其他柱或五行中尋求補益。"
-        exp_cn = f"您的日主（{day_master_element}）失令，生于克制该五行之月，代表先天能量较弱，需从其他柱或五行中寻求补益。"
-        exp_ko = f"일주（{day_master_element}）가 실령입니다. 해당 오행을 극하는 달에 태어나 선천적 에너지가 약하며 다른 주나 오행에서 보완이 필요합니다."
-    else:
-        strength = "neutral"
-        exp_en = f"Your Day Master ({day_master_element}) is in a neutral season — neither strongly supported nor weakened by the birth month."
-        exp_tw = f"您的日主（{day_master_element}）處於平令，出生月份對日主既無明顯助益也無明顯剋制。"
-        exp_cn = f"您的日主（{day_master_element}）处于平令，出生月份对日主既无明显助益也无明显克制。"
-        exp_ko = f"일주（{day_master_element}）가 평령입니다. 출생 월이 일주에 뚜렷한 도움이나 극제를 주지 않습니다."
+        return {"strength": "neutral", **render_explanations(Message(_UNKNOWN_MSG))}
+
+    strength = element_season_state(day_master_element, month_branch_index)
 
     return {
         "strength": strength,
-        "explanation_en": exp_en,
-        "explanation_zh_tw": exp_tw,
-        "explanation_zh_cn": exp_cn,
-        "explanation_ko": exp_ko,
+        **render_explanations(Message(_STRENGTH_MSG[strength], element=day_master_element)),
     }
@@ -0,0 +1,445 @@
+"""
+Signature Store (命盤特徵表)
+
+Everything _compute_signature_parts derives from a four-pillar signature
+— element counts and weighted strength, Ten God counts and the strongest
+Ten God, seasonal state, Day Master strength score, Use / Avoid Gods, the
+natal interaction codes and the deity codes — precomputed for every
+signature a birth can produce and stored as one fixed-width row each.
+
+A chart then costs one row read plus assembly from shared read-only
+records (one per pillar, use god, seasonal state ...), instead of the
+full analysis.
+
+Which signatures exist:
+- year pillar: any of the 60 (calendar_kernel.year_pillar)
+- month branch: any of 12; the month stem follows the year stem (the
+  year and the 寅 month both turn at 立春)
+- day pillar: any of the 60
+- hour branch: any of 12; the hour stem follows the day stem
+
+    row = ((year_cycle * 12 + month_branch) * 60 + day_cycle) * 12 + hour_branch
+
+60 x 12 x 60 x 12 = 518,400 rows of ROW_DTYPE. The table is built
+by build_tables (vectorized, chunk by year pillar) and memory-mapped; if
+the file is missing or stale, charts are analyzed live.
+"""
+
+import math
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calendar_kernel import hour_pillar
+from .chart_cache import FrozenDict, freeze
+from .chart_core import ChartCore, shared_pillar_dict
+from .deities import DEITY_RULES, deities_from_codes, deity_codes_for_core
+from .element_strength import element_strength_matrix
+from .elements import get_element_balance
+from .luck_timeline import CYCLE_BRANCH, CYCLE_POSITION, CYCLE_STEM
+from .pillar_interactions import BRANCH_ROWS, get_interaction_table, interactions_from_codes
+from .relations import (
+    BRANCH_COLUMN,
+    BRANCH_ELEMENT,
+    ELEMENT_INDEX,
+    ELEMENTS,
+    STEM_ELEMENT,
+    TEN_GOD_KEYS,
+    TEN_GOD_TABLE,
+)
+from .seasonal_strength import element_season_state, get_seasonal_strength
+from .table_store import ENGINE_HASH, check_header, table_path, write_atomic
+from .ten_gods import strongest_ten_god_record
+from .use_god import (
+    DM_SUPPORT_MATRIX,
+    DM_SUPPORT_WEIGHT,
+    SEASONAL_SCORE,
+    STRONG_THRESHOLD,
+    WEAK_THRESHOLD,
+    use_god_for_strength,
+)
+
+TABLE_FILENAME = "signatures.bin"
+
+_MAGIC = b"BAZISIG1"
+_HEADER = struct.Struct("<8s16sii")  # magic, engine hash, rows, row size
+
+SIGNATURE_ROWS = 60 * 12 * 60 * 12
+_YEAR_ROWS = SIGNATURE_ROWS // 60
+
+SEASON_STATES: Tuple[str, ...] = ("strong", "neutral", "weak")
+DM_STRENGTHS: Tuple[str, ...] = ("strong", "balanced", "weak")
+
+# Interaction codes of a chart: at most 8 branch + 4 stem codes
+INTERACTION_SLOTS = 12
+
+# Field order is the stored byte order (packed, little-endian)
+ROW_DTYPE = np.dtype([
+    ("element_counts", "u1", 5),          # visible characters per element
+    ("element_strength", "<u2", 5),       # weighted strength, hundredths
+    ("ten_god_counts", "u1", 10),         # year, month and hour pillars
+    ("strongest_ten_god", "u1"),
+    ("strongest_count", "u1"),
+    ("seasonal", "u1"),                   # SEASON_STATES index
+    ("dm_strength", "u1"),                # DM_STRENGTHS index
+    ("dm_strength_score", "<f8"),         # as reported (one decimal)
+    ("gods", "u1", 4),                    # use, use secondary, avoid, avoid secondary
+    ("interaction_count", "u1"),
+    ("interactions", "u1", INTERACTION_SLOTS),
+    ("deities", "u1", len(DEITY_RULES)),  # deities.deity_codes_for_core
+])
+_ROW = struct.Struct(
+    f"<5B5H10BBBBBd4BB{INTERACTION_SLOTS}B{len(DEITY_RULES)}B"
+)
+
+# Offsets of each field in an unpacked _ROW tuple
+_COUNTS = slice(0, 5)
+_STRENGTH = slice(5, 10)
+_STRONGEST = 20
+_SEASONAL = 22
+_DM_STRENGTH = 23
+_SCORE = 24
+_INTERACTION_COUNT = 29
+_INTERACTIONS = 30
+_DEITIES = slice(30 + INTERACTION_SLOTS, 30 + INTERACTION_SLOTS + len(DEITY_RULES))
+
+
+# ==================== SIGNATURE INDEX ====================
+
+def month_stem(year_stem, month_branch):
+    """Month stem of a month branch in a year with `year_stem` (五虎遁)."""
+    return (year_stem % 5 * 2 + 2 + (month_branch - 2) % 12) % 10
+
+
+def signature_row(indices: Sequence[int]) -> Optional[int]:
+    """
+    Row of an 8-index signature (calendar_kernel.four_pillar_indices order),
+    or None if no birth produces it.
+    """
+    ys, yb, ms, mb, ds, db, hs, hb = indices
+    year_cycle = CYCLE_POSITION[ys, yb]
+    day_cycle = CYCLE_POSITION[ds, db]
+    if year_cycle < 0 or day_cycle < 0 or hs != hour_pillar(ds, hb * 2)[0] or ms != month_stem(ys, mb):
+        return None
+    return ((int(year_cycle) * 12 + mb) * 60 + int(day_cycle)) * 12 + hb
+
+
+def signature_rows(stems: np.ndarray, branches: np.ndarray) -> np.ndarray:
+    """
+    signature_row of N charts at once (-1 where no birth produces one).
+
+    Args:
+        stems: (N, 4) year/month/day/hour stem indices
+        branches: (N, 4) year/month/day/hour branch indices
+    """
+    stems = np.asarray(stems)
+    branches = np.asarray(branches)
+    year_cycle = CYCLE_POSITION[stems[:, 0], branches[:, 0]]
+    day_cycle = CYCLE_POSITION[stems[:, 2], branches[:, 2]]
+    month_branch = branches[:, 1]
+    valid = (
+        (year_cycle >= 0) & (day_cycle >= 0)
+        & (stems[:, 1] == month_stem(stems[:, 0], month_branch))
+        & (stems[:, 3] == hour_pillar(stems[:, 2], branches[:, 3] * 2)[0])
+    )
+    rows = ((year_cycle * 12 + month_branch) * 60 + day_cycle) * 12 + branches[:, 3]
+    return np.where(valid, rows, -1)
+
+
+def signature_indices(start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(stems, branches), each (n, 4), of rows start..stop."""
+    row = np.arange(start, stop)
+    hour_branch = row % 12
+    day_cycle = row // 12 % 60
+    month_branch = row // 720 % 12
+    year_cycle = row // _YEAR_ROWS
+
+    year_stem = CYCLE_STEM[year_cycle]
+    day_stem = CYCLE_STEM[day_cycle]
+    stems = np.stack([
+        year_stem,
+        month_stem(year_stem, month_branch),
+        day_stem,
+        hour_pillar(day_stem, hour_branch * 2)[0],
+    ], axis=1)
+    branches = np.stack([
+        CYCLE_BRANCH[year_cycle], month_branch, CYCLE_BRANCH[day_cycle], hour_branch,
+    ], axis=1)
+    return stems, branches
+
+
+# ==================== BUILD ====================
+
+_STEM_ELEMENT = np.asarray(STEM_ELEMENT)
+_BRANCH_ELEMENT = np.asarray(BRANCH_ELEMENT)
+_TEN_GOD_TABLE = np.asarray(TEN_GOD_TABLE)
+
+# _SEASON_TABLE[day master element][month branch]: SEASON_STATES index
+_SEASON_TABLE = np.array([
+    [SEASON_STATES.index(element_season_state(element, m)) for m in range(12)]
+    for element in ELEMENTS
+])
+_SEASON_SCORE = np.array([SEASONAL_SCORE.get(state, 0.0) for state in SEASON_STATES])
+
+# _GOD_TABLE[day master element][dm strength]: (use, use2, avoid, avoid2) elements
+_GOD_FIELDS = ("use_god", "use_god_secondary", "avoid_god", "avoid_god_secondary")
+_GOD_TABLE = np.array([
+    [
+        [ELEMENT_INDEX[record[field]] for field in _GOD_FIELDS]
+        for record in (use_god_for_strength(element, label, 0.0) for label in DM_STRENGTHS)
+    ]
+    for element in ELEMENTS
+])
+
+
+def _deity_table() -> np.ndarray:
+    """
+    Deity codes by (day pillar, year, month, hour branch).
+
+    Stars read only the day stem and the branches, so 60 x 12^3 charts
+    cover every signature.
+    """
+    table = np.zeros((60, 12, 12, 12, len(DEITY_RULES)), dtype=np.uint8)
+    for day_cycle in range(60):
+        ds, db = day_cycle % 10, day_cycle % 12
+        for yb in range(12):
+            for mb in range(12):
+                for hb in range(12):
+                    core = ChartCore((0, 0, ds, 0), (yb, mb, db, hb))
+                    table[day_cycle, yb, mb, hb] = deity_codes_for_core(core)
+    return table
+
+
+def _one_hot_counts(values: np.ndarray, size: int) -> np.ndarray:
+    """(n, size) occurrence counts of each value in the rows of an (n, k) array."""
+    return (values[:, :, None] == np.arange(size)).sum(axis=1)
+
+
+def _build_chunk(rows: np.ndarray, start: int, deity_table: np.ndarray, interaction_rows: np.ndarray) -> None:
+    """Fill rows (a ROW_DTYPE array) with signatures start..start + len(rows)."""
+    stems, branches = signature_indices(start, start + len(rows))
+    n = len(rows)
+    day_stem = stems[:, 2]
+    day_master = _STEM_ELEMENT[day_stem]
+
+    # ---- elements ----
+    visible = np.concatenate([_STEM_ELEMENT[stems], _BRANCH_ELEMENT[branches]], axis=1)
+    rows["element_counts"] = _one_hot_counts(visible, 5)
+    hundredths = np.rint(element_strength_matrix(stems, branches) * 100).astype(np.int64)
+    rows["element_strength"] = hundredths
+
+    # ---- ten gods (positions in chart order, day pillar skipped) ----
+    position_gods = np.stack([
+        _TEN_GOD_TABLE[day_stem, stems[:, 0]],
+        _TEN_GOD_TABLE[day_stem, BRANCH_COLUMN + branches[:, 0]],
+        _TEN_GOD_TABLE[day_stem, stems[:, 1]],
+        _TEN_GOD_TABLE[day_stem, BRANCH_COLUMN + branches[:, 1]],
+        _TEN_GOD_TABLE[day_stem, stems[:, 3]],
+        _TEN_GOD_TABLE[day_stem, BRANCH_COLUMN + branches[:, 3]],
+    ], axis=1)
+    ten_god_counts = _one_hot_counts(position_gods, 10)
+    rows["ten_god_counts"] = ten_god_counts
+    # Most frequent; argmax keeps the first position, so first seen wins ties
+    position_counts = np.take_along_axis(ten_god_counts, position_gods, axis=1)
+    best = position_counts.argmax(axis=1)
+    rows["strongest_ten_god"] = position_gods[np.arange(n), best]
+    rows["strongest_count"] = position_counts[np.arange(n), best]
+
+    # ---- day master strength: use_god._calculate_dm_strength_score, same
+    # operations in the same order on the rounded strengths ----
+    season = _SEASON_TABLE[day_master, branches[:, 1]]
+    rows["seasonal"] = season
+    strength = hundredths / 100
+    support = DM_SUPPORT_MATRIX[day_master]
+    score = _SEASON_SCORE[season]
+    for e in range(5):
+        score = score + strength[:, e] * support[:, e]
+    score = score - DM_SUPPORT_WEIGHT[0]
+    label = np.where(score >= STRONG_THRESHOLD, 0, np.where(score <= WEAK_THRESHOLD, 2, 1))
+    rows["dm_strength"] = label
+    # Python's round() is correctly rounded; np.round is not, so round each
+    # distinct score in Python
+    distinct, inverse = np.unique(score, return_inverse=True)
+    rows["dm_strength_score"] = np.array([round(v, 1) for v in distinct.tolist()])[inverse]
+    rows["gods"] = _GOD_TABLE[day_master, label]
+
+    # ---- interactions: branch codes, then stem codes ----
+    y, m, d, h = branches.T
+    branch_codes = interaction_rows[((y * 12 + m) * 12 + d) * 12 + h]
+    y, m, d, h = stems.T
+    stem_codes = interaction_rows[BRANCH_ROWS + ((y * 10 + m) * 10 + d) * 10 + h]
+    branch_count = branch_codes[:, 0].astype(np.int64)
+    stem_count = stem_codes[:, 0].astype(np.int64)
+    if (branch_count + stem_count).max() > INTERACTION_SLOTS:
+        raise ValueError("Interaction codes exceed INTERACTION_SLOTS")
+    codes = np.zeros((n, INTERACTION_SLOTS + 1), dtype=np.uint8)
+    width = branch_codes.shape[1] - 1
+    codes[:, :width] = branch_codes[:, 1:]
+    for k in range(stem_codes.shape[1] - 1):
+        at = np.flatnonzero(k < stem_count)
+        codes[at, branch_count[at] + k] = stem_codes[at, 1 + k]
+    rows["interaction_count"] = branch_count + stem_count
+    rows["interactions"] = codes[:, :INTERACTION_SLOTS]
+
+    # ---- deities ----
+    day_cycle = CYCLE_POSITION[day_stem, branches[:, 2]]
+    rows["deities"] = deity_table[day_cycle, branches[:, 0], branches[:, 1], branches[:, 3]]
+
+
+def build_rows() -> np.ndarray:
+    """Analyze every signature into the (SIGNATURE_ROWS,) ROW_DTYPE array."""
+    rows = np.zeros(SIGNATURE_ROWS, dtype=ROW_DTYPE)
+    deity_table = _deity_table()
+    interaction_rows = get_interaction_table().rows
+    for start in range(0, SIGNATURE_ROWS, _YEAR_ROWS):
+        _build_chunk(rows[start:start + _YEAR_ROWS], start, deity_table, interaction_rows)
+    return rows
+
+
+def build_table(path: Optional[str] = None) -> str:
+    """Build the signature store file; returns its path."""
+    path = path or table_path(TABLE_FILENAME)
+    rows = build_rows()
+
+    def _write(fh):
+        fh.write(_HEADER.pack(_MAGIC, ENGINE_HASH, len(rows), ROW_DTYPE.itemsize))
+        fh.write(rows.tobytes())
+
+    write_atomic(path, _write)
+    return path
+
+
+# ==================== LOOKUP ====================
+
+# Shared read-only pieces the stored rows are assembled from
+_seasonal: Dict[Tuple[str, int], FrozenDict] = {}
+_use_gods: Dict[Tuple[str, int, float, float], FrozenDict] = {}
+_strongest: Dict[Tuple[int, int], FrozenDict] = {}
+
+
+def _pillar(core: ChartCore, i: int) -> FrozenDict:
+    return shared_pillar_dict(core.stems[2], core.stems[i], core.branches[i])
+
+
+def _seasonal_record(element: str, state: int) -> FrozenDict:
+    key = (element, state)
+    record = _seasonal.get(key)
+    if record is None:
+        # Any month branch in that state gives the same record
+        month = next(m for m in range(12) if element_season_state(element, m) == SEASON_STATES[state])
+        record = _seasonal.setdefault(key, freeze(get_seasonal_strength(element, month)))
+    return record
+
+
+def _use_god_record(element: str, label: int, score: float) -> FrozenDict:
+    # 0.0 and -0.0 are one dict key but are reported differently
+    key = (element, label, score, math.copysign(1.0, score))
+    record = _use_gods.get(key)
+    if record is None:
+        record = _use_gods.setdefault(
+            key, freeze(use_god_for_strength(element, DM_STRENGTHS[label], score))
+        )
+    return record
+
+
+def _strongest_record(ten_god: int, count: int) -> FrozenDict:
+    key = (ten_god, count)
+    record = _strongest.get(key)
+    if record is None:
+        record = _strongest.setdefault(key, freeze(strongest_ten_god_record(TEN_GOD_KEYS[ten_god], count)))
+    return record
+
+
+class SignatureStore:
+    """Read-only view over the signature rows (memory-mapped or in-memory)."""
+
+    def __init__(self, rows: np.ndarray):
+        # Plain ndarray view: memmap element access is several times slower
+        self.rows = rows.view(np.ndarray)  # (SIGNATURE_ROWS,) ROW_DTYPE
+        self._buffer = memoryview(self.rows.view(np.uint8))
+
+    @classmethod
+    def open(cls, path: str) -> "SignatureStore":
+        """Memory-map an existing store file."""
+        with open(path, "rb") as fh:
+            magic, engine_hash, n_rows, row_size = _HEADER.unpack(fh.read(_HEADER.size))
+        check_header(path, magic, _MAGIC, engine_hash, "signature store")
+        if n_rows != SIGNATURE_ROWS or row_size != ROW_DTYPE.itemsize:
+            raise ValueError(f"Not a signature store: {path}")
+        rows = np.memmap(path, dtype=ROW_DTYPE, mode="r", offset=_HEADER.size, shape=(n_rows,))
+        return cls(rows)
+
+    def row(self, indices: Sequence[int]) -> Optional[np.void]:
+        """Stored row of a signature (ROW_DTYPE fields), or None if it has none."""
+        row = signature_row(indices)
+        return None if row is None else self.rows[row]
+
+    def signature_parts(self, indices: Sequence[int]) -> Optional[Dict]:
+        """
+        calculator._compute_signature_parts of a signature, from its stored
+        row; None if the signature has no row.
+        """
+        row = signature_row(indices)
+        if row is None:
+            return None
+        values = _ROW.unpack_from(self._buffer, row * _ROW.size)
+
+        core = ChartCore.from_indices(indices)
+        day_master_element = core.day_master_element
+        element_strength = {e: v / 100 for e, v in zip(ELEMENTS, values[_STRENGTH])}
+        four_pillars = {
+            "year": _pillar(core, 0),
+            "month": _pillar(core, 1),
+            "day": _pillar(core, 2),
+            "hour": _pillar(core, 3),
+        }
+        codes: List[int] = list(values[_INTERACTIONS:_INTERACTIONS + values[_INTERACTION_COUNT]])
+
+        return {
+            "core": core,
+            "four_pillars": four_pillars,
+            "day_master": {
+                "stem_cn": four_pillars["day"]["stem"]["name_cn"],
+                "element": day_master_element,
+                "yin_yang": core.day_master_yin_yang,
+            },
+            "elements": {
+                "counts": dict(zip(ELEMENTS, values[_COUNTS])),
+                "strength": element_strength,
+                "analysis": get_element_balance(element_strength),
+            },
+            "all_elements": core.all_elements(),
+            "strongest_ten_god": _strongest_record(values[_STRONGEST], values[_STRONGEST + 1]),
+            "seasonal_strength": _seasonal_record(day_master_element, values[_SEASONAL]),
+            "deities": deities_from_codes(values[_DEITIES]),
+            "use_god": _use_god_record(day_master_element, values[_DM_STRENGTH], values[_SCORE]),
+            "pillar_interactions": interactions_from_codes(codes, core.branches, core.stems),
+        }
+
+
+_store: Optional[SignatureStore] = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+
+def get_signature_store() -> Optional[SignatureStore]:
+    """
+    Return the process-wide signature store, or None if it is not built
+    (or was built by another engine version).
+
+    Unlike the small tables the store is never built on demand (it takes
+    a while and some 30 MB); build_tables creates it at deploy time, and
+    without it charts are analyzed live.
+    """
+    global _store, _store_loaded
+    if not _store_loaded:
+        with _store_lock:
+            if not _store_loaded:
+                try:
+                    _store = SignatureStore.open(table_path(TABLE_FILENAME))
+                except (OSError, ValueError):
+                    _store = None
+                _store_loaded = True
+    return _store
@@ -0,0 +1,369 @@
+"""
+Engine sweep verifier (全量比對)
+
+Proof that an engine change is output-identical before it ships. Every
+birth input in the supported range is run through this tree's
+calculate_bazi and through a reference copy of the engine (typically the
+last release), and canonical hashes of the two outputs are compared:
+
+    git worktree add /tmp/bazi-ref v1.4
+    python -m bazi_engine.sweep --reference /tmp/bazi-ref/backend/bazi_engine
+
+The case space is every date 1900-01-01..2100-12-31 × 12 hour branches ×
+2 genders × 2 calendar types. The lunar case of a day is the same birth
+spelled as its lunar date, so it exercises the lunar conversion and then
+hits the chart caches. Days are split into shards that run on every
+core. The first diverging inputs are reported in case order, with the
+chart sections that differ.
+
+Every run also prints a fingerprint: one hash over all case hashes, in
+order (see SectionHasher). It can be recorded for a release and compared later without
+checking out the reference.
+"""
+
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from lunardate import LunarDate
+
+from .batch import batch_worker_count, map_in_order
+from .calculator import calculate_bazi
+from .messages import LANGUAGES
+
+FIRST_DATE = date(1900, 1, 1)
+LAST_DATE = date(2100, 12, 31)
+
+# One hour per hour branch: 子 0, 丑 1, 寅 3, ... 亥 21
+SWEEP_HOURS = (0, *range(1, 23, 2))
+GENDERS = ("male", "female")
+
+REFERENCE_PACKAGE = "bazi_engine_reference"
+
+# (first day offset from FIRST_DATE, number of days)
+Shard = Tuple[int, int]
+
+
+# ==================== CANONICAL HASH ====================
+
+def _json_hash(value: Any) -> bytes:
+    encoded = json.dumps(
+        value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=repr,
+    ).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+class SectionHasher:
+    """
+    Canonical 128-bit hashes of chart outputs.
+
+    A chart hashes as its sorted top-level keys plus the hash of each
+    section's canonical JSON (sorted keys, fixed encoding), so two outputs
+    hash equal exactly when every section serializes to the same JSON.
+
+    Cached charts share their section objects across languages, genders
+    and calendar spellings, so section hashes are memoized by identity.
+    The memo holds a reference to every object it has seen, which keeps
+    ids from being reused; call clear() between runs of cases.
+    """
+
+    def __init__(self):
+        self._memo: Dict[int, Tuple[Any, bytes]] = {}
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    def section(self, value: Any) -> bytes:
+        if not isinstance(value, (dict, list, tuple)):
+            return _json_hash(value)
+        entry = self._memo.get(id(value))
+        if entry is None or entry[0] is not value:
+            entry = (value, _json_hash(value))
+            self._memo[id(value)] = entry
+        return entry[1]
+
+    def chart(self, output: Any) -> bytes:
+        if not isinstance(output, dict):
+            return _json_hash(output)
+        digest = hashlib.blake2b(digest_size=16)
+        for key in sorted(output):
+            digest.update(key.encode("utf-8") + b"\0" + self.section(output[key]))
+        return digest.digest()
+
+    def differing_sections(self, ours: Dict, reference: Dict) -> List[str]:
+        """Top-level chart keys whose values differ between two outputs."""
+        keys = list(ours) + [k for k in reference if k not in ours]
+        return [k for k in keys if self.section(ours.get(k)) != self.section(reference.get(k))]
+
+
+# ==================== REFERENCE ENGINE ====================
+
+def load_reference(path: str) -> Callable[..., Dict]:
+    """
+    Import a copy of the bazi_engine package from `path` and return its
+    calculate_bazi.
+
+    The copy is imported under its own package name, so it runs side by
+    side with this tree's engine; its relative imports resolve inside the
+    copy.
+    """
+    path = os.path.abspath(path)
+    init = os.path.join(path, "__init__.py")
+    if not os.path.exists(init):
+        raise FileNotFoundError(f"Not a bazi_engine package directory: {path}")
+    if REFERENCE_PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            REFERENCE_PACKAGE, init, submodule_search_locations=[path],
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[REFERENCE_PACKAGE] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"{REFERENCE_PACKAGE}.calculator").calculate_bazi
+
+
+def _accepts_as_of_year(calculate: Callable) -> bool:
+    return "as_of_year" in inspect.signature(calculate).parameters
+
+
+# Per worker process: the reference engine's calculate_bazi (or None)
+_reference: Optional[Callable[..., Dict]] = None
+
+
+def _init_worker(reference_path: Optional[str]) -> None:
+    global _reference
+    _reference = load_reference(reference_path) if reference_path else None
+
+
+# ==================== CASES ====================
+
+def _lunar_spelling(d: date) -> Optional[Tuple[str, bool]]:
+    """(lunar "YYYY-MM-DD", is_leap_month) of a solar date, if lunardate covers it."""
+    try:
+        lunar = LunarDate.fromSolarDate(d.year, d.month, d.day)
+    except (ValueError, IndexError):
+        return None
+    if lunar.day < 1:  # before the first lunar year of the table
+        return None
+    return f"{lunar.year:04d}-{lunar.month:02d}-{lunar.day:02d}", bool(lunar.isLeapMonth)
+
+
+def iter_cases(d: date) -> Iterator[Dict]:
+    """Every sweep case of one day, in case order."""
+    lunar = _lunar_spelling(d)
+    solar_str = d.isoformat()
+    for hour in SWEEP_HOURS:
+        for gender in GENDERS:
+            yield {"birth_date": solar_str, "birth_hour": hour, "gender": gender,
+                   "calendar_type": "solar", "is_leap_month": False}
+            if lunar is not None:
+                yield {"birth_date": lunar[0], "birth_hour": hour, "gender": gender,
+                       "calendar_type": "lunar", "is_leap_month": lunar[1]}
+
+
+def _run(calculate: Callable[..., Dict], case: Dict, language: str, as_of_year: Optional[int]) -> Dict:
+    kwargs = {"as_of_year": as_of_year} if as_of_year is not None else {}
+    try:
+        return calculate(
+            case["birth_date"], case["birth_hour"], case["gender"], language,
+            calendar_type=case["calendar_type"], is_leap_month=case["is_leap_month"], **kwargs,
+        )
+    except Exception as e:
+        return {"exception": f"{type(e).__name__}: {e}"}
+
+
+def sweep_shard(
+    shard: Shard,
+    languages: Sequence[str],
+    as_of_year: Optional[int],
+    max_divergences: int,
+) -> Dict:
+    """
+    Worker entry point: hash (and compare) every case of a run of days.
+
+    Returns {"shard", "cases", "hashes", "divergences"}: the concatenated
+    output hashes in case order, and at most max_divergences divergences.
+    """
+    first_day, days = shard
+    reference_as_of = as_of_year if _reference and _accepts_as_of_year(_reference) else None
+    hasher = SectionHasher()
+    hashes: List[bytes] = []
+    divergences: List[Dict] = []
+    for offset in range(first_day, first_day + days):
+        hasher.clear()
+        for case in iter_cases(FIRST_DATE + timedelta(days=offset)):
+            for language in languages:
+                ours = _run(calculate_bazi, case, language, as_of_year)
+                ours_hash = hasher.chart(ours)
+                hashes.append(ours_hash)
+                if _reference is None:
+                    continue
+                reference = _run(_reference, case, language, reference_as_of)
+                reference_hash = hasher.chart(reference)
+                if reference_hash != ours_hash and len(divergences) < max_divergences:
+                    divergences.append({
+                        **case,
+                        "language": language,
+                        "hash": ours_hash.hex(),
+                        "reference_hash": reference_hash.hex(),
+                        "sections": hasher.differing_sections(ours, reference),
+                    })
+    return {"shard": shard, "cases": len(hashes), "hashes": b"".join(hashes), "divergences": divergences}
+
+
+def iter_shards(start: date, end: date, shard_days: int) -> Iterator[Shard]:
+    """Consecutive day ranges covering start..end (inclusive)."""
+    first = (start - FIRST_DATE).days
+    last = (end - FIRST_DATE).days
+    for offset in range(first, last + 1, shard_days):
+        yield offset, min(shard_days, last + 1 - offset)
+
+
+# ==================== DRIVER ====================
+
+def run_sweep(
+    start: date = FIRST_DATE,
+    end: date = LAST_DATE,
+    reference_path: Optional[str] = None,
+    languages: Sequence[str] = LANGUAGES,
+    as_of_year: Optional[int] = None,
+    workers: int = 0,
+    shard_days: int = 32,
+    max_divergences: int = 10,
+    progress: Optional[Callable[[int, int, int], None]] = None,
+) -> Dict:
+    """
+    Sweep start..end and return the report.
+
+    Shards are consumed in order, so the reported divergences are the
+    first ones in case order; the sweep stops once max_divergences have
+    been found (the fingerprint is then partial). A case is one output:
+    one input in one language. The fingerprint does not depend on the
+    sharding or the number of workers.
+
+    Args:
+        progress: Called as progress(days_done, days_total, cases) after each shard
+
+    Returns:
+        {"cases", "days", "complete", "fingerprint", "divergences"}
+    """
+    if as_of_year is None:
+        as_of_year = datetime.now().year
+    work = partial(sweep_shard, languages=tuple(languages), as_of_year=as_of_year,
+                   max_divergences=max_divergences)
+    shards = iter_shards(start, end, shard_days)
+    total_days = (end - start).days + 1
+
+    fingerprint = hashlib.blake2b(digest_size=16)
+    divergences: List[Dict] = []
+    cases = days = 0
+
+    def consume(results) -> bool:
+        nonlocal cases, days
+        for result in results:
+            fingerprint.update(result["hashes"])
+            cases += result["cases"]
+            days += result["shard"][1]
+            divergences.extend(result["divergences"])
+            if progress:
+                progress(days, total_days, cases)
+            if len(divergences) >= max_divergences:
+                return False
+        return True
+
+    if workers == 1:
+        _init_worker(reference_path)
+        complete = consume(work(shard) for shard in shards)
+    else:
+        workers = batch_worker_count(workers)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(reference_path,),
+        ) as executor:
+            results = map_in_order(executor, work, shards, workers * 2)
+            complete = consume(results)
+            results.close()
+
+    return {
+        "cases": cases,
+        "days": days,
+        "complete": complete,
+        "fingerprint": fingerprint.hexdigest(),
+        "divergences": divergences[:max_divergences],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep every birth input and compare against a reference engine")
+    parser.add_argument("--reference", help="path of a reference bazi_engine package (omit to only fingerprint)")
+    parser.add_argument("--start", type=date.fromisoformat, default=FIRST_DATE, help="first date (default 1900-01-01)")
+    parser.add_argument("--end", type=date.fromisoformat, default=LAST_DATE, help="last date (default 2100-12-31)")
+    parser.add_argument("--languages", default=",".join(LANGUAGES), help="comma-separated (default: all)")
+    parser.add_argument("--as-of-year", type=int, help="annual luck year (default: current year)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--shard-days", type=int, default=32, help="days per work unit")
+    parser.add_argument("--max-divergences", type=int, default=10, help="stop after this many")
+    parser.add_argument("--expect", help="fail unless the fingerprint equals this")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    unknown = [lang for lang in languages if lang not in LANGUAGES]
+    if unknown:
+        parser.error(f"unknown language(s): {', '.join(unknown)}")
+    if not FIRST_DATE <= args.start <= args.end <= LAST_DATE:
+        parser.error(f"dates must satisfy {FIRST_DATE} <= start <= end <= {LAST_DATE}")
+    if args.reference:
+        reference = load_reference(args.reference)
+        if not _accepts_as_of_year(reference):
+            print("! reference has no as_of_year; both engines use the current year", file=sys.stderr)
+
+    started = time.perf_counter()
+
+    def progress(days_done: int, days_total: int, cases: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"\r  {days_done / days_total:6.1%}  {cases} cases  {elapsed:.0f}s",
+              end="", file=sys.stderr, flush=True)
+
+    report = run_sweep(
+        start=args.start,
+        end=args.end,
+        reference_path=args.reference,
+        languages=languages,
+        as_of_year=args.as_of_year,
+        workers=args.workers,
+        shard_days=args.shard_days,
+        max_divergences=args.max_divergences,
+        progress=None if args.quiet else progress,
+    )
+    elapsed = time.perf_counter() - started
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    for divergence in report["divergences"]:
+        print(json.dumps(divergence, ensure_ascii=False))
+    status = "complete" if report["complete"] else "stopped early"
+    print(f"{report['cases']} cases over {report['days']} days in {elapsed:.0f}s ({status})", file=sys.stderr)
+    print(f"fingerprint {report['fingerprint']}", file=sys.stderr)
+
+    if report["divergences"]:
+        print(f"✗ {len(report['divergences'])} divergence(s) from the reference", file=sys.stderr)
+        return 1
+    if args.expect and (not report["complete"] or report["fingerprint"] != args.expect):
+        print(f"✗ fingerprint differs from {args.expect}", file=sys.stderr)
+        return 1
+    if args.reference:
+        print("✓ identical to the reference", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
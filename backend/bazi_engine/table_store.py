@@ -0,0 +1,96 @@
+"""
+Location and atomic writing of the engine's precomputed data tables.
+
+Tables are built once (see build_tables.py) into the backend `data/`
+directory and memory-mapped read-only by every worker, so the OS page
+cache holds a single copy no matter how many gunicorn workers are running.
+
+Every table header starts with an 8-byte magic and the 16-byte
+ENGINE_HASH of the engine source that built it. A table from another
+engine version is stale: open() raises StaleTableError, the getters treat
+it as not built, and build_tables rebuilds it.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Callable
+
+# Same data directory the mock auth provider keeps its SQLite file in;
+# BAZI_DATA_DIR overrides it (e.g. a shared volume in production).
+DATA_DIR = os.environ.get("BAZI_DATA_DIR") or os.path.join(
+    os.path.dirname(__file__), "..", "data"
+)
+
+ENGINE_HASH_SIZE = 16
+_HASH_OFFSET = 8  # after the magic
+
+
+def _engine_hash() -> bytes:
+    """Digest of every engine module: the rule tables live in the source."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(package_dir, name), "rb") as fh:
+                digest.update(fh.read())
+    return digest.digest()[:ENGINE_HASH_SIZE]
+
+
+ENGINE_HASH = _engine_hash()
+
+
+class StaleTableError(ValueError):
+    """A table file was built by a different engine version."""
+
+
+def check_header(path: str, magic: bytes, expected_magic: bytes, engine_hash: bytes, kind: str) -> None:
+    """
+    Validate the magic and engine hash read from a table header.
+
+    Raises:
+        ValueError: Not a table of this kind
+        StaleTableError: Built by another engine version
+    """
+    if magic != expected_magic:
+        raise ValueError(f"Not a {kind}: {path}")
+    if engine_hash != ENGINE_HASH:
+        raise StaleTableError(f"Stale {kind} (built by another engine version): {path}")
+
+
+def table_is_current(path: str) -> bool:
+    """Whether a table file exists and was built by this engine version."""
+    try:
+        with open(path, "rb") as fh:
+            head = fh.read(_HASH_OFFSET + ENGINE_HASH_SIZE)
+    except OSError:
+        return False
+    return head[_HASH_OFFSET:] == ENGINE_HASH
+
+
+def table_path(filename: str) -> str:
+    """Absolute path of a table file inside the data directory."""
+    return os.path.abspath(os.path.join(DATA_DIR, filename))
+
+
+def write_atomic(path: str, write: Callable[[object], None]) -> None:
+    """
+    Write a table file atomically.
+
+    `write` receives an open binary file object. The data goes to a temp
+    file in the same directory and is renamed into place, so concurrent
+    workers never map a half-written table.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
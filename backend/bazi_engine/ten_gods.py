@@ -6,32 +6,27 @@ in the chart. Each of the 10 outcomes describes how a target element
 relates to the Day Master via Five Elements + Yin/Yang polarity.
 """
 
-from typing import Dict, List
-from .elements import get_element_relationships
-
-# Ten God definitions: (key, name_en, name_cn, name_pinyin)
-TEN_GODS = {
-    "friend": {"key": "friend", "name_en": "Friend", "name_cn": "比肩", "name_pinyin": "Bǐ Jiān"},
-    "rob_wealth": {"key": "rob_wealth", "name_en": "Rob Wealth", "name_cn": "劫財", "name_pinyin": "Jié Cái"},
-    "eating_god": {"key": "eating_god", "name_en": "Eating God", "name_cn": "食神", "name_pinyin": "Shí Shén"},
-    "hurting_officer": {"key": "hurting_officer", "name_en": "Hurting Officer", "name_cn": "傷官", "name_pinyin": "Shāng Guān"},
-    "indirect_wealth": {"key": "indirect_wealth", "name_en": "Indirect Wealth", "name_cn": "偏財", "name_pinyin": "Piān Cái"},
-    "direct_wealth": {"key": "direct_wealth", "name_en": "Direct Wealth", "name_cn": "正財", "name_pinyin": "Zhèng Cái"},
-    "seven_killings": {"key": "seven_killings", "name_en": "Seven Killings", "name_cn": "七殺", "name_pinyin": "Qī Shā"},
-    "direct_officer": {"key": "direct_officer", "name_en": "Direct Officer", "name_cn": "正官", "name_pinyin": "Zhèng Guān"},
-    "indirect_resource": {"key": "indirect_resource", "name_en": "Indirect Resource", "name_cn": "偏印", "name_pinyin": "Piān Yìn"},
-    "direct_resource": {"key": "direct_resource", "name_en": "Direct Resource", "name_cn": "正印", "name_pinyin": "Zhèng Yìn"},
-}
+from typing import TYPE_CHECKING, Dict, Iterable, List
 
+import numpy as np
 
-def get_ten_god(
+from .relations import BRANCH_COLUMN, ELEMENT_INDEX, TEN_GOD_KEYS, TEN_GOD_RECORDS, TEN_GOD_TABLE, ten_god_index
+
+if TYPE_CHECKING:
+    from .chart_core import ChartCore
+
+# Ten God definitions: key -> shared read-only {key, name_en, name_cn, name_pinyin}
+TEN_GODS = {record["key"]: record for record in TEN_GOD_RECORDS}
+
+
+def get_ten_god_key(
     dm_element: str,
     dm_yin_yang: str,
     target_element: str,
     target_yin_yang: str,
-) -> Dict:
+) -> str:
     """
-    Calculate the Ten God relationship between Day Master and a target (Stem or Branch).
+    Key of the Ten God relationship between Day Master and a target (Stem or Branch).
 
     Args:
         dm_element: Day Master element (e.g., "Wood", "Fire")
@@ -40,41 +35,32 @@ def get_ten_god(
         target_yin_yang: Target polarity
 
     Returns:
-        Dict with keys: key, name_en, name_cn, name_pinyin
+        One of the TEN_GODS keys (e.g. "eating_god")
     """
-    same_polarity = (dm_yin_yang or "").lower() == (target_yin_yang or "").lower()
-
-    # DM -> Target relationship
-    rel_dm_to_target = get_element_relationships(dm_element, target_element)
-    rel_target_to_dm = get_element_relationships(target_element, dm_element)
-
-    # Same element: Friend (same polarity) | Rob Wealth (diff polarity)
-    if rel_dm_to_target == "same":
-        key = "friend" if same_polarity else "rob_wealth"
-        return TEN_GODS[key].copy()
-
-    # DM produces target (Output): Eating God (same) | Hurting Officer (diff)
-    if rel_dm_to_target == "generates":
-        key = "eating_god" if same_polarity else "hurting_officer"
-        return TEN_GODS[key].copy()
+    dm_index = ELEMENT_INDEX.get(dm_element)
+    target_index = ELEMENT_INDEX.get(target_element)
+    # Fallback for edge case (e.g., invalid elements)
+    if dm_index is None or target_index is None:
+        return "friend"
 
-    # DM destroys target (Wealth): Indirect Wealth (same) | Direct Wealth (diff)
-    if rel_dm_to_target == "destroys":
-        key = "indirect_wealth" if same_polarity else "direct_wealth"
-        return TEN_GODS[key].copy()
+    same_polarity = (dm_yin_yang or "").lower() == (target_yin_yang or "").lower()
+    return TEN_GOD_KEYS[ten_god_index(dm_index, 0, target_index, 0 if same_polarity else 1)]
 
-    # Target destroys DM (Influence): Seven Killings (same) | Direct Officer (diff)
-    if rel_target_to_dm == "destroys":
-        key = "seven_killings" if same_polarity else "direct_officer"
-        return TEN_GODS[key].copy()
 
-    # Target produces DM (Resource): Indirect Resource (same) | Direct Resource (diff)
-    if rel_target_to_dm == "generates":
-        key = "indirect_resource" if same_polarity else "direct_resource"
-        return TEN_GODS[key].copy()
+def get_ten_god(
+    dm_element: str,
+    dm_yin_yang: str,
+    target_element: str,
+    target_yin_yang: str,
+) -> Dict:
+    """
+    Calculate the Ten God relationship between Day Master and a target (Stem or Branch).
 
-    # Fallback for edge case (e.g., invalid elements)
-    return TEN_GODS["friend"].copy()
+    Returns:
+        Shared read-only dict with keys: key, name_en, name_cn, name_pinyin
+    """
+    key = get_ten_god_key(dm_element, dm_yin_yang, target_element, target_yin_yang)
+    return TEN_GODS[key]
 
 
 def annotate_four_pillars_with_ten_gods(
@@ -129,7 +115,7 @@ def get_strongest_ten_god(four_pillars: Dict) -> Dict:
     Returns:
         Dict with strongest_ten_god key, count, name_en, name_cn
     """
-    counts: Dict[str, int] = {}
+    keys: List[str] = []
 
     for pillar_name in ["year", "month", "day", "hour"]:
         pillar = four_pillars.get(pillar_name, {})
@@ -140,14 +126,25 @@ def get_strongest_ten_god(four_pillars: Dict) -> Dict:
             # Exclude Day pillar stem (self = Day Master, always Friend)
             if pillar_name == "day":
                 continue
-            key = stem["ten_god"].get("key", "")
-            if key:
-                counts[key] = counts.get(key, 0) + 1
+            keys.append(stem["ten_god"].get("key", ""))
 
         if branch and "ten_god" in branch:
-            key = branch["ten_god"].get("key", "")
-            if key:
-                counts[key] = counts.get(key, 0) + 1
+            keys.append(branch["ten_god"].get("key", ""))
+
+    return _strongest_of(keys)
+
+
+def get_strongest_ten_god_for_core(core: "ChartCore") -> Dict:
+    """get_strongest_ten_god for a ChartCore (the day pillar is skipped, as above)."""
+    return _strongest_of(key for pillar_name, _, key in core.positions() if pillar_name != "day")
+
+
+def _strongest_of(keys: Iterable[str]) -> Dict:
+    """Most frequent Ten God key (first seen wins ties)."""
+    counts: Dict[str, int] = {}
+    for key in keys:
+        if key:
+            counts[key] = counts.get(key, 0) + 1
 
     if not counts:
         return {
@@ -158,12 +155,47 @@ def get_strongest_ten_god(four_pillars: Dict) -> Dict:
         }
 
     strongest_key = max(counts, key=counts.get)
-    tg = TEN_GODS.get(strongest_key, TEN_GODS["friend"])
+    return strongest_ten_god_record(strongest_key, counts[strongest_key])
+
+
+_TEN_GOD_ARRAY = np.asarray(TEN_GOD_TABLE)
+
+
+def strongest_ten_gods(stems: np.ndarray, branches: np.ndarray) -> List[str]:
+    """
+    Strongest Ten God key of N charts at once (get_strongest_ten_god_for_core).
+
+    The six positions outside the day pillar are looked up in one gather
+    and tallied per key; ties go to the key seen first in chart order.
+
+    Args:
+        stems: (N, 4) year/month/day/hour stem indices
+        branches: (N, 4) year/month/day/hour branch indices
+    """
+    stems = np.asarray(stems)
+    branches = np.asarray(branches)
+    # Chart order of positions(): year stem, year branch, ..., hour branch
+    columns = np.stack([
+        stems[:, 0], BRANCH_COLUMN + branches[:, 0],
+        stems[:, 1], BRANCH_COLUMN + branches[:, 1],
+        stems[:, 3], BRANCH_COLUMN + branches[:, 3],
+    ], axis=1)
+    keys = _TEN_GOD_ARRAY[stems[:, 2, None], columns]                     # (N, 6)
+    seen = keys[:, :, None] == np.arange(len(TEN_GOD_KEYS))               # (N, 6, 10)
+    counts = seen.sum(axis=1)
+    first_seen = np.where(seen.any(axis=1), seen.argmax(axis=1), columns.shape[1])
+    strongest = (counts * (columns.shape[1] + 1) - first_seen).argmax(axis=1)
+    return [TEN_GOD_KEYS[k] for k in strongest.tolist()]
+
+
+def strongest_ten_god_record(key: str, count: int) -> Dict:
+    """get_strongest_ten_god result for a Ten God key seen `count` times."""
+    tg = TEN_GODS.get(key, TEN_GODS["friend"])
 
     return {
-        "key": strongest_key,
-        "strongest_ten_god": strongest_key,
-        "count": counts[strongest_key],
+        "key": key,
+        "strongest_ten_god": key,
+        "count": count,
         "name_en": tg["name_en"],
         "name_cn": tg["name_cn"],
     }
@@ -13,46 +13,59 @@ Traditional method:
 Also provides actionable advice: colors, directions, seasons, career types.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
+import numpy as np
 
-# ---- Five-element cycles ----
+from .chart_core import ChartCore
+from .element_strength import element_strength_for_core, element_strength_matrix
+from .relations import (
+    ELEMENTS,
+    ELEMENT_INDEX,
+    RELATION,
+    STEM_ELEMENT,
+    GENERATES_ELEMENT,
+    CONTROLS_ELEMENT,
+    CONTROLLED_BY_ELEMENT,
+    GENERATED_BY_ELEMENT,
+)
+from .messages import Message, define, define_table, render_explanations
+from .seasonal_strength import element_season_state
+
+
+# ---- Five-element cycles (name-keyed views of relations.py) ----
 
 # What produces each element (Resource / 生我)
-RESOURCE_FOR = {
-    "Wood": "Water",
-    "Fire": "Wood",
-    "Earth": "Fire",
-    "Metal": "Earth",
-    "Water": "Metal",
-}
+RESOURCE_FOR = {ELEMENTS[e]: ELEMENTS[GENERATED_BY_ELEMENT[e]] for e in range(5)}
 
 # What each element produces (Output / 我生)
-OUTPUT_OF = {
-    "Wood": "Fire",
-    "Fire": "Earth",
-    "Earth": "Metal",
-    "Metal": "Water",
-    "Water": "Wood",
-}
+OUTPUT_OF = {ELEMENTS[e]: ELEMENTS[GENERATES_ELEMENT[e]] for e in range(5)}
 
 # What controls each element (Power / 克我)
-CONTROLLER_OF = {
-    "Wood": "Metal",
-    "Fire": "Water",
-    "Earth": "Wood",
-    "Metal": "Fire",
-    "Water": "Earth",
-}
+CONTROLLER_OF = {ELEMENTS[e]: ELEMENTS[CONTROLLED_BY_ELEMENT[e]] for e in range(5)}
 
 # What each element controls (Wealth / 我克)
-CONTROLLED_BY = {
-    "Wood": "Earth",
-    "Fire": "Metal",
-    "Earth": "Water",
-    "Metal": "Wood",
-    "Water": "Fire",
-}
+CONTROLLED_BY = {ELEMENTS[e]: ELEMENTS[CONTROLS_ELEMENT[e]] for e in range(5)}
+
+# Day Master support of a stem/branch, by the DM's relation code to its element
+DM_SUPPORT_WEIGHT = (
+    1.0,    # SAME: same element = support
+    -0.5,   # GENERATES: output = drain
+    0.0,    # CONTROLS: controlled element is neutral (DM conquers it — slight drain but also wealth)
+    -1.0,   # CONTROLLED_BY: controller = opposition
+    0.5,    # GENERATED_BY: resource = moderate support
+)
+
+# DM_SUPPORT_MATRIX[day master element][element]
+DM_SUPPORT_MATRIX = np.array([
+    [DM_SUPPORT_WEIGHT[RELATION[dm][e]] for e in range(5)] for dm in range(5)
+])
+
+SEASONAL_SCORE = {"strong": 2.0, "weak": -2.0}
+
+# dm_strength_score thresholds
+STRONG_THRESHOLD = 1.5
+WEAK_THRESHOLD = -1.5
 
 # ---- Practical advice per element ----
 
@@ -101,73 +114,131 @@ ELEMENT_ADVICE = {
 
 
 def _calculate_dm_strength_score(
-    day_master_element: str,
-    element_counts: Dict[str, int],
+    day_master: int,
     seasonal_strength: str,
-    four_pillars: Dict,
+    element_strength: Sequence[float],
 ) -> float:
     """
     Calculate a numeric Day Master strength score.
 
     Factors:
     - Seasonal strength: strong +2, neutral 0, weak -2
-    - Each stem/branch with same element: +1
-    - Each stem/branch with resource element: +0.5
-    - Each stem/branch with controller element: -1
-    - Each stem/branch with output element: -0.5
+    - Same element: +1 per unit of strength
+    - Resource element: +0.5 per unit
+    - Controller element: -1 per unit
+    - Output element: -0.5 per unit
     - Day stem itself is excluded (it IS the Day Master)
 
+    Args:
+        day_master: Element index of the Day Master
+        element_strength: Weighted strength of each element (element_strength.py),
+            day stem included
+
     Returns a float score. Positive = strong DM, negative = weak DM.
     """
-    score = 0.0
-
-    # Seasonal factor
-    if seasonal_strength == "strong":
-        score += 2.0
-    elif seasonal_strength == "weak":
-        score -= 2.0
-
-    resource_elem = RESOURCE_FOR.get(day_master_element, "")
-    output_elem = OUTPUT_OF.get(day_master_element, "")
-    controller_elem = CONTROLLER_OF.get(day_master_element, "")
-    controlled_elem = CONTROLLED_BY.get(day_master_element, "")
-
-    # Walk every stem and branch except day stem
-    for pillar_name in ["year", "month", "day", "hour"]:
-        pillar = four_pillars.get(pillar_name, {})
-        positions = []
-
-        # Exclude the Day Stem (it's the DM itself)
-        if pillar_name != "day":
-            positions.append(pillar.get("stem", {}))
-        positions.append(pillar.get("branch", {}))
-
-        for pos in positions:
-            elem = pos.get("element", "")
-            if not elem:
-                continue
-            if elem == day_master_element:
-                score += 1.0   # Same element = support
-            elif elem == resource_elem:
-                score += 0.5   # Resource = moderate support
-            elif elem == controller_elem:
-                score -= 1.0   # Controller = opposition
-            elif elem == output_elem:
-                score -= 0.5   # Output = drain
-            # controlled_elem is neutral (DM conquers it — slight drain but also wealth)
-
-    return score
+    score = SEASONAL_SCORE.get(seasonal_strength, 0.0)
+    support = DM_SUPPORT_MATRIX[day_master]
+    for e in range(5):
+        score += element_strength[e] * support[e]
+    # The day stem counted one unit of its own element
+    return float(score) - DM_SUPPORT_WEIGHT[0]
+
+
+def dm_strength_scores(stems: np.ndarray, branches: np.ndarray) -> np.ndarray:
+    """
+    Day Master strength scores of N charts at once.
+
+    Scores the element strength of every chart against all five possible
+    day-master elements in one matrix product, then takes each chart's own
+    column and adds its seasonal term. Same values as
+    _calculate_dm_strength_score.
+
+    Args:
+        stems: (N, 4) year/month/day/hour stem indices
+        branches: (N, 4) year/month/day/hour branch indices
+    """
+    stems = np.asarray(stems)
+    branches = np.asarray(branches)
+    strength = element_strength_matrix(stems, branches)
+    day_master = np.asarray(STEM_ELEMENT)[stems[:, 2]]
+    by_day_master = strength @ DM_SUPPORT_MATRIX.T           # (N, 5)
+    scores = np.take_along_axis(by_day_master, day_master[:, None], axis=1)[:, 0]
+    return scores + _SEASONAL_SCORE_TABLE[day_master, branches[:, 1]] - DM_SUPPORT_WEIGHT[0]
+
+
+# _SEASONAL_SCORE_TABLE[day master element][month branch]
+_SEASONAL_SCORE_TABLE = np.array([
+    [SEASONAL_SCORE.get(element_season_state(element, m), 0.0) for m in range(12)]
+    for element in ELEMENTS
+])
+
+
+DM_STRENGTH_LABELS = ("strong", "weak", "balanced")
+
+# _GODS_BY_STRENGTH[day master element][label] = (use, use secondary, avoid,
+# avoid secondary) element indices, as picked by use_god_for_strength
+_GODS_BY_STRENGTH = np.array([
+    [
+        (GENERATES_ELEMENT[dm], CONTROLLED_BY_ELEMENT[dm], dm, GENERATED_BY_ELEMENT[dm]),
+        (GENERATED_BY_ELEMENT[dm], dm, CONTROLLED_BY_ELEMENT[dm], GENERATES_ELEMENT[dm]),
+        (GENERATED_BY_ELEMENT[dm], dm, CONTROLLED_BY_ELEMENT[dm], GENERATES_ELEMENT[dm]),
+    ]
+    for dm in range(5)
+])
+
+
+def use_god_summaries(
+    day_masters: Sequence[int],
+    seasonal_strengths: Sequence[str],
+    element_strength: np.ndarray,
+) -> List[Dict]:
+    """
+    Strength label, score and the four gods of N charts at once.
+
+    The scores add the same terms in the same order as
+    _calculate_dm_strength_score, so every chart lands on the same side of
+    the thresholds as determine_use_god; advice and explanations are left out.
+
+    Args:
+        day_masters: Element index of each chart's Day Master
+        seasonal_strengths: "strong" | "neutral" | "weak" of each chart
+        element_strength: (N, 5) weighted element strength
+    """
+    day_masters = np.asarray(day_masters)
+    support = DM_SUPPORT_MATRIX[day_masters]                              # (N, 5)
+    scores = np.array([SEASONAL_SCORE.get(s, 0.0) for s in seasonal_strengths])
+    for e in range(5):
+        scores = scores + element_strength[:, e] * support[:, e]
+    scores = scores - DM_SUPPORT_WEIGHT[0]
+    labels = np.where(scores >= STRONG_THRESHOLD, 0, np.where(scores <= WEAK_THRESHOLD, 1, 2))
+    gods = _GODS_BY_STRENGTH[day_masters, labels].tolist()
+    return [
+        {
+            "dm_strength": DM_STRENGTH_LABELS[label],
+            "dm_strength_score": round(score, 1),
+            "use_god": ELEMENTS[ug],
+            "use_god_secondary": ELEMENTS[ug2],
+            "avoid_god": ELEMENTS[ag],
+            "avoid_god_secondary": ELEMENTS[ag2],
+        }
+        for label, score, (ug, ug2, ag, ag2) in zip(labels.tolist(), scores.tolist(), gods)
+    ]
 
 
 def determine_use_god(
     day_master_element: str,
-    element_counts: Dict[str, int],
+    element_strength: Dict[str, float],
     seasonal_strength_str: str,
-    four_pillars: Dict,
 ) -> Dict:
     """
     Determine the Use God (用神) and Avoid God (忌神) for the chart.
 
+    Args:
+        day_master_element: Element of the day stem
+        element_strength: {element: weighted strength} of the whole chart
+            (element_strength.py)
+        seasonal_strength_str: "strong" | "neutral" | "weak"
+
     Returns a dict with:
       - dm_strength: "strong" | "weak" | "balanced"
       - dm_strength_score: float
@@ -179,26 +250,58 @@ def determine_use_god(
       - avoid_advice: what to minimize
       - explanation_en / explanation_zh_tw / explanation_zh_cn / explanation_ko
     """
-    score = _calculate_dm_strength_score(
-        day_master_element, element_counts, seasonal_strength_str, four_pillars
-    )
+    day_master = ELEMENT_INDEX.get(day_master_element)
+    if day_master is None:
+        score = SEASONAL_SCORE.get(seasonal_strength_str, 0.0)
+    else:
+        vector = [element_strength.get(element, 0.0) for element in ELEMENTS]
+        score = _calculate_dm_strength_score(day_master, seasonal_strength_str, vector)
+    return _use_god_from_score(day_master_element, score)
+
+
+def determine_use_god_for_core(
+    core: ChartCore,
+    seasonal_strength_str: str,
+    element_strength: Optional[Dict[str, float]] = None,
+) -> Dict:
+    """determine_use_god for a ChartCore (element strength computed if not given)."""
+    if element_strength is None:
+        element_strength = element_strength_for_core(core)
+    return determine_use_god(core.day_master_element, element_strength, seasonal_strength_str)
 
+
+def dm_strength_label(score: float) -> str:
+    """"strong" | "weak" | "balanced" of a Day Master strength score."""
+    if score >= STRONG_THRESHOLD:
+        return "strong"
+    if score <= WEAK_THRESHOLD:
+        return "weak"
+    return "balanced"
+
+
+def _use_god_from_score(day_master_element: str, score: float) -> Dict:
+    """Pick Use / Avoid God from a Day Master strength score."""
+    return use_god_for_strength(day_master_element, dm_strength_label(score), score)
+
+
+def use_god_for_strength(day_master_element: str, dm_strength: str, score: float) -> Dict:
+    """
+    Use / Avoid God record of a Day Master strength label (dm_strength_label).
+
+    score is only reported (rounded to one decimal); the gods follow the label.
+    """
     resource = RESOURCE_FOR.get(day_master_element, "")
     output = OUTPUT_OF.get(day_master_element, "")
     controller = CONTROLLER_OF.get(day_master_element, "")
-    controlled = CONTROLLED_BY.get(day_master_element, "")
 
-    # Thresholds
-    if score >= 1.5:
-        dm_strength = "strong"
+    if dm_strength == "strong":
         # Strong DM: weaken it
         # Primary: output (drain / 泄), Secondary: controller (control / 克)
         use_god = output
         use_god_secondary = controller
         avoid_god = day_master_element   # same element adds more strength
         avoid_god_secondary = resource   # resource also strengthens
-    elif score <= -1.5:
-        dm_strength = "weak"
+    elif dm_strength == "weak":
         # Weak DM: strengthen it
         # Primary: resource (生我), Secondary: same element (比劫)
         use_god = resource
@@ -206,7 +309,6 @@ def determine_use_god(
         avoid_god = controller           # controller further weakens
         avoid_god_secondary = output     # output drains
     else:
-        dm_strength = "balanced"
         # Balanced: gentle support preferred
         use_god = resource
         use_god_secondary = day_master_element
@@ -244,98 +346,95 @@ def determine_use_god(
     }
 
 
+# ---- Explanation messages (see messages.py) ----
+
+_STRENGTH_LABEL_MSG = define_table({
+    "strong": {"en": "Strong", "zh-TW": "偏旺", "zh-CN": "偏旺", "ko": "강"},
+    "weak": {"en": "Weak", "zh-TW": "偏弱", "zh-CN": "偏弱", "ko": "약"},
+    "balanced": {"en": "Balanced", "zh-TW": "中和", "zh-CN": "中和", "ko": "균형"},
+})
+
+_ELEMENT_NAME_MSG = define_table({
+    "Wood": {"en": "Wood", "zh-TW": "木", "zh-CN": "木", "ko": "목(木)"},
+    "Fire": {"en": "Fire", "zh-TW": "火", "zh-CN": "火", "ko": "화(火)"},
+    "Earth": {"en": "Earth", "zh-TW": "土", "zh-CN": "土", "ko": "토(土)"},
+    "Metal": {"en": "Metal", "zh-TW": "金", "zh-CN": "金", "ko": "금(金)"},
+    "Water": {"en": "Water", "zh-TW": "水", "zh-CN": "水", "ko": "수(水)"},
+})
+# Unknown element: raw name in English, blank elsewhere
+_RAW_ELEMENT_MSG = define({"en": "{name}", "zh-TW": "", "zh-CN": "", "ko": ""})
+
+_REASON_MSG = define_table({
+    "strong": {
+        "en": "Your Day Master ({dm}) is {strength} — it has ample support from the chart and season. To achieve balance, you need elements that drain or control its excess energy.",
+        "zh-TW": "您的日主（{dm}）{strength}——命盤中得到充足助力。需要泄耗或克制的五行來取得平衡。",
+        "zh-CN": "您的日主（{dm}）{strength}——命盘中得到充足助力。需要泄耗或克制的五行来取得平衡。",
+        "ko": "일주（{dm}）가 {strength}합니다 — 명반에서 충분한 지지를 받고 있습니다. 균형을 위해 설기(泄氣)하거나 극제하는 오행이 필요합니다.",
+    },
+    "weak": {
+        "en": "Your Day Master ({dm}) is {strength} — it lacks sufficient support from the chart and season. To achieve balance, you need elements that nourish and strengthen it.",
+        "zh-TW": "您的日主（{dm}）{strength}——命盤中助力不足。需要生扶的五行來增強力量。",
+        "zh-CN": "您的日主（{dm}）{strength}——命盘中助力不足。需要生扶的五行来增强力量。",
+        "ko": "일주（{dm}）가 {strength}합니다 — 명반에서 지지가 부족합니다. 균형을 위해 생부(生扶)하는 오행이 필요합니다.",
+    },
+    "balanced": {
+        "en": "Your Day Master ({dm}) is {strength} — it has a relatively even distribution of support and opposition. Gentle support from resource elements is recommended.",
+        "zh-TW": "您的日主（{dm}）{strength}——命盤中生克較為均衡。建議以印星（生我之五行）溫和補益。",
+        "zh-CN": "您的日主（{dm}）{strength}——命盘中生克较为均衡。建议以印星（生我之五行）温和补益。",
+        "ko": "일주（{dm}）가 {strength}입니다 — 명반에서 생극이 비교적 균형을 이루고 있습니다. 인성(생아지오행)으로 부드러운 보완을 권장합니다.",
+    },
+})
+
+_EXPLANATION_MSG = define({
+    "en": (
+        "{reason}\n\n"
+        "Use God: {ug} — your most favorable element. "
+        "Secondary: {ug2}.\n"
+        "Avoid God: {ag} — the element to minimize. "
+        "Secondary: {ag2}."
+    ),
+    "zh-TW": (
+        "{reason}\n\n"
+        "用神：{ug}——最有利的五行。輔助用神：{ug2}。\n"
+        "忌神：{ag}——應盡量避開的五行。輔助忌神：{ag2}。"
+    ),
+    "zh-CN": (
+        "{reason}\n\n"
+        "用神：{ug}——最有利的五行。辅助用神：{ug2}。\n"
+        "忌神：{ag}——应尽量避开的五行。辅助忌神：{ag2}。"
+    ),
+    "ko": (
+        "{reason}\n\n"
+        "용신(用神): {ug} — 가장 유리한 오행. 보조 용신: {ug2}.\n"
+        "기신(忌神): {ag} — 최소화해야 할 오행. 보조 기신: {ag2}."
+    ),
+})
+
+
+def _element_name(element: str) -> Message:
+    if element in _ELEMENT_NAME_MSG:
+        return Message(_ELEMENT_NAME_MSG[element])
+    return Message(_RAW_ELEMENT_MSG, name=element)
+
+
 def _build_explanations(
     dm_element: str, dm_strength: str, score: float,
     use_god: str, use_god_2: str,
     avoid_god: str, avoid_god_2: str,
     advice: Dict, avoid_info: Dict,
 ) -> Dict:
-    """Build multi-language explanation strings."""
-
-    strength_label = {
-        "strong": {"en": "Strong", "zh-TW": "偏旺", "zh-CN": "偏旺", "ko": "강"},
-        "weak": {"en": "Weak", "zh-TW": "偏弱", "zh-CN": "偏弱", "ko": "약"},
-        "balanced": {"en": "Balanced", "zh-TW": "中和", "zh-CN": "中和", "ko": "균형"},
-    }
-
-    sl = strength_label.get(dm_strength, strength_label["balanced"])
-
-    # Element name translations
-    elem_names = {
-        "Wood": {"en": "Wood", "zh-TW": "木", "zh-CN": "木", "ko": "목(木)"},
-        "Fire": {"en": "Fire", "zh-TW": "火", "zh-CN": "火", "ko": "화(火)"},
-        "Earth": {"en": "Earth", "zh-TW": "土", "zh-CN": "土", "ko": "토(土)"},
-        "Metal": {"en": "Metal", "zh-TW": "金", "zh-CN": "金", "ko": "금(金)"},
-        "Water": {"en": "Water", "zh-TW": "水", "zh-CN": "水", "ko": "수(水)"},
-    }
-
-    ug = elem_names.get(use_god, {})
-    ug2 = elem_names.get(use_god_2, {})
-    ag = elem_names.get(avoid_god, {})
-    ag2 = elem_names.get(avoid_god_2, {})
-    dm = elem_names.get(dm_element, {})
-
-    # English
-    if dm_strength == "strong":
-        reason_en = f"Your Day Master ({dm.get('en', dm_element)}) is {sl['en']} — it has ample support from the chart and season. To achieve balance, you need elements that drain or control its excess energy."
-    elif dm_strength == "weak":
-        reason_en = f"Your Day Master ({dm.get('en', dm_element)}) is {sl['en']} — it lacks sufficient support from the chart and season. To achieve balance, you need elements that nourish and strengthen it."
-    else:
-        reason_en = f"Your Day Master ({dm.get('en', dm_element)}) is {sl['en']} — it has a relatively even distribution of support and opposition. Gentle support from resource elements is recommended."
-
-    explanation_en = (
-        f"{reason_en}\n\n"
-        f"Use God: {ug.get('en', use_god)} — your most favorable element. "
-        f"Secondary: {ug2.get('en', use_god_2)}.\n"
-        f"Avoid God: {ag.get('en', avoid_god)} — the element to minimize. "
-        f"Secondary: {ag2.get('en', avoid_god_2)}."
+    """Build multi-language explanation strings from the message catalog."""
+    strength = dm_strength if dm_strength in _REASON_MSG else "balanced"
+    reason = Message(
+        _REASON_MSG[strength],
+        dm=_element_name(dm_element),
+        strength=Message(_STRENGTH_LABEL_MSG[strength]),
     )
-
-    # Traditional Chinese
-    if dm_strength == "strong":
-        reason_tw = f"您的日主（{dm.get('zh-TW', '')}）{sl['zh-TW']}——命盤中得到充足助力。需要泄耗或克制的五行來取得平衡。"
-    elif dm_strength == "weak":
-        reason_tw = f"您的日主（{dm.get('zh-TW', '')}）{sl['zh-TW']}——命盤中助力不足。需要生扶的五行來增強力量。"
-    else:
-        reason_tw = f"您的日主（{dm.get('zh-TW', '')}）{sl['zh-TW']}——命盤中生克較為均衡。建議以印星（生我之五行）溫和補益。"
-
-    explanation_tw = (
-        f"{reason_tw}\n\n"
-        f"用神：{ug.get('zh-TW', '')}——最有利的五行。輔助用神：{ug2.get('zh-TW', '')}。\n"
-        f"忌神：{ag.get('zh-TW', '')}——應盡量避開的五行。輔助忌神：{ag2.get('zh-TW', '')}。"
-    )
-
-    # Simplified Chinese
-    if dm_strength == "strong":
-        reason_cn = f"您的日主（{dm.get('zh-CN', '')}）{sl['zh-CN']}——命盘中得到充足助力。需要泄耗或克制的五行来取得平衡。"
-    elif dm_strength == "weak":
-        reason_cn = f"您的日主（{dm.get('zh-CN', '')}）{sl['zh-CN']}——命盘中助力不足。需要生扶的五行来增强力量。"
-    else:
-        reason_cn = f"您的日主（{dm.get('zh-CN', '')}）{sl['zh-CN']}——命盘中生克较为均衡。建议以印星（生我之五行）温和补益。"
-
-    explanation_cn = (
-        f"{reason_cn}\n\n"
-        f"用神：{ug.get('zh-CN', '')}——最有利的五行。辅助用神：{ug2.get('zh-CN', '')}。\n"
-        f"忌神：{ag.get('zh-CN', '')}——应尽量避开的五行。辅助忌神：{ag2.get('zh-CN', '')}。"
-    )
-
-    # Korean
-    if dm_strength == "strong":
-        reason_ko = f"일주（{dm.get('ko', '')}）가 {sl['ko']}합니다 — 명반에서 충분한 지지를 받고 있습니다. 균형을 위해 설기(泄氣)하거나 극제하는 오행이 필요합니다."
-    elif dm_strength == "weak":
-        reason_ko = f"일주（{dm.get('ko', '')}）가 {sl['ko']}합니다 — 명반에서 지지가 부족합니다. 균형을 위해 생부(生扶)하는 오행이 필요합니다."
-    else:
-        reason_ko = f"일주（{dm.get('ko', '')}）가 {sl['ko']}입니다 — 명반에서 생극이 비교적 균형을 이루고 있습니다. 인성(생아지오행)으로 부드러운 보완을 권장합니다."
-
-    explanation_ko = (
-        f"{reason_ko}\n\n"
-        f"용신(用神): {ug.get('ko', '')} — 가장 유리한 오행. 보조 용신: {ug2.get('ko', '')}.\n"
-        f"기신(忌神): {ag.get('ko', '')} — 최소화해야 할 오행. 보조 기신: {ag2.get('ko', '')}."
-    )
-
-    return {
-        "explanation_en": explanation_en,
-        "explanation_zh_tw": explanation_tw,
-        "explanation_zh_cn": explanation_cn,
-        "explanation_ko": explanation_ko,
-    }
+    return render_explanations(Message(
+        _EXPLANATION_MSG,
+        reason=reason,
+        ug=_element_name(use_god),
+        ug2=_element_name(use_god_2),
+        ag=_element_name(avoid_god),
+        ag2=_element_name(avoid_god_2),
+    ))
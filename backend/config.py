@@ -22,6 +22,17 @@ class Settings(BaseSettings):
     # BAZI Configuration
     max_tokens: int = Field(default=8192, alias="MAX_TOKENS")
     api_timeout: int = Field(default=180, alias="API_TIMEOUT")
+
+    # Batch charts (/api/bazi-chart/batch)
+    batch_max_items: int = Field(default=50000, alias="BATCH_MAX_ITEMS")
+    batch_workers: int = Field(default=0, alias="BATCH_WORKERS")  # 0 = CPUs / WEB_CONCURRENCY
+    batch_chunk_size: int = Field(default=256, alias="BATCH_CHUNK_SIZE")
+    # gunicorn workers per host (gunicorn reads it too); each starts its own pool
+    web_concurrency: int = Field(default=1, alias="WEB_CONCURRENCY")
+
+    # Nightly forecast precomputation (forecast_jobs.py): hour (0-23, server
+    # local time) to run it in-process; -1 = off (run the CLI from cron instead)
+    forecast_precompute_hour: int = Field(default=-1, alias="FORECAST_PRECOMPUTE_HOUR")
     
     # AI Provider (deepseek | azure)
     ai_provider: str = Field(default="deepseek", alias="AI_PROVIDER")
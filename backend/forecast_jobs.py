@@ -0,0 +1,240 @@
+"""
+Nightly forecast precomputation.
+
+Everyone opens the Daily Forecast in the morning. This job computes the
+next day's forecast for every user with saved birth data, in every
+language, the night before, and stores it with the auth provider keyed
+by (user, date, language) with the fingerprint of the natal profile it
+was computed from. /api/daily-forecast serves the stored copy while the
+user's profile still has that fingerprint and computes live otherwise.
+
+    python forecast_jobs.py                              # tomorrow, all languages
+    python forecast_jobs.py --date 2026-03-01 --languages en,ko --workers 4
+
+Or set FORECAST_PRECOMPUTE_HOUR (0-23, server local time) to run it
+in-process every night (run_forecast_scheduler). Every gunicorn worker
+schedules it, and a lock file in the data directory lets one of them run
+each night. The lock is per host: with several hosts, set it on one.
+"""
+
+import argparse
+import asyncio
+import fcntl
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import IO, Dict, List, Optional, Sequence
+
+from auth.base import AuthProvider, User
+from auth.dependencies import create_auth_provider
+from bazi_engine.batch import batch_worker_count
+from bazi_engine.forecast_batch import ForecastItem, compute_forecast_chunk
+from bazi_engine.messages import LANGUAGES
+from bazi_engine.table_store import table_path
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Shared by the schedulers of every worker process on a host
+RUN_LOCK_FILENAME = "forecast_jobs.lock"
+
+
+def _batch_item(user: User) -> ForecastItem:
+    return (
+        user.id,
+        user.forecast_profile,
+        {
+            "birth_date": user.birth_date,
+            "birth_hour": user.birth_hour,
+            "gender": user.gender,
+            "calendar_type": user.calendar_type,
+            "is_leap_month": user.is_leap_month,
+        },
+    )
+
+
+async def precompute_daily_forecasts(
+    provider: AuthProvider,
+    executor: Executor,
+    target_date: Optional[date] = None,
+    languages: Sequence[str] = LANGUAGES,
+    chunk_size: int = 256,
+    in_flight: int = 8,
+) -> Dict[str, int]:
+    """
+    Compute and store the forecasts of every user with saved birth data.
+
+    Users are read page by page and each page is one chunk on the executor;
+    at most `in_flight` chunks are pending, and each chunk is stored as soon
+    as it is done, along with the profiles the chunk had to recompute. Forecasts
+    for dates before today are dropped afterwards.
+
+    Args:
+        provider: Auth provider the users are read from and forecasts stored in
+        executor: Pool the chunks run on
+        target_date: Forecast date (default: tomorrow)
+        languages: Languages to store a forecast in
+        chunk_size: Users per chunk (and per page read)
+        in_flight: Maximum chunks submitted at once
+
+    Returns:
+        {"users", "forecasts", "skipped", "refreshed"} counts
+    """
+    target_date = target_date or date.today() + timedelta(days=1)
+    worker = partial(compute_forecast_chunk, target_date=target_date, languages=tuple(languages))
+    stats = {"users": 0, "forecasts": 0, "skipped": 0, "refreshed": 0}
+    pending: deque = deque()
+
+    async def _store_next() -> None:
+        records, skipped, refreshed = await pending.popleft()
+        await provider.save_daily_forecasts(records)
+        # Stored so neither tomorrow's job nor /api/daily-forecast recomputes the chart
+        for user_id, profile in refreshed:
+            await provider.update_forecast_profile(user_id, profile)
+        stats["forecasts"] += len(records)
+        stats["skipped"] += skipped
+        stats["refreshed"] += len(refreshed)
+
+    try:
+        offset = 0
+        while True:
+            users: List[User] = await provider.list_users_with_birth_data(offset, chunk_size)
+            if not users:
+                break
+            offset += len(users)
+            stats["users"] += len(users)
+            pending.append(asyncio.wrap_future(executor.submit(worker, [_batch_item(u) for u in users])))
+            if len(pending) >= in_flight:
+                await _store_next()
+        while pending:
+            await _store_next()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    await provider.delete_daily_forecasts_before(date.today().isoformat())
+    return stats
+
+
+def _claim_run(target_date: date) -> Optional[IO]:
+    """
+    Take the scheduled run for `target_date` in this process.
+
+    The first scheduler to lock the run lock file runs the job and stamps
+    the date in it when done; the others find it locked or stamped and
+    skip the night. Returns the locked file (closing it releases the lock),
+    or None if the run is not this process's.
+    """
+    path = table_path(RUN_LOCK_FILENAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock = open(path, "a+")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        lock.seek(0)
+        if lock.read().strip() != target_date.isoformat():
+            return lock
+    except BlockingIOError:
+        pass
+    lock.close()
+    return None
+
+
+def _mark_run_done(lock: IO, target_date: date) -> None:
+    lock.seek(0)
+    lock.truncate()
+    lock.write(target_date.isoformat())
+    lock.flush()
+
+
+async def run_forecast_scheduler(
+    provider: AuthProvider,
+    executor: Executor,
+    hour: int,
+    languages: Sequence[str] = LANGUAGES,
+    chunk_size: int = 256,
+) -> None:
+    """
+    Precompute the next day's forecasts every day at `hour`:00 (server
+    local time), unless another process on the host has the run (see
+    _claim_run). Runs until cancelled; a failed run is logged and retried
+    the next night.
+    """
+    while True:
+        now = datetime.now()
+        next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+
+        target_date = date.today() + timedelta(days=1)
+        lock = _claim_run(target_date)
+        if lock is None:
+            logger.info(f"Forecasts for {target_date} are precomputed by another process")
+            continue
+        started = time.perf_counter()
+        try:
+            stats = await precompute_daily_forecasts(
+                provider, executor, target_date=target_date, languages=languages, chunk_size=chunk_size,
+            )
+            _mark_run_done(lock, target_date)
+            logger.info(
+                f"Precomputed {stats['forecasts']} forecasts for {stats['users']} users "
+                f"({stats['skipped']} skipped, {stats['refreshed']} profiles refreshed) "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        except Exception as e:
+            logger.error(f"Forecast precomputation failed: {e}", exc_info=True)
+        finally:
+            lock.close()
+
+
+# ==================== CLI ====================
+
+async def _run(args) -> int:
+    settings = get_settings()
+    provider = create_auth_provider(settings)
+    await provider.startup()
+
+    workers = batch_worker_count(args.workers)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        stats = await precompute_daily_forecasts(
+            provider,
+            executor,
+            target_date=args.date,
+            languages=args.languages,
+            chunk_size=args.chunk_size,
+            in_flight=2 * workers,
+        )
+    print(
+        f"✓ {stats['forecasts']} forecasts for {stats['users']} users "
+        f"({stats['skipped']} skipped, {stats['refreshed']} profiles refreshed) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+def main(argv=None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Precompute daily forecasts for users with saved birth data")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="forecast date (default: tomorrow)")
+    parser.add_argument("--languages", default=",".join(LANGUAGES), help="comma-separated language codes")
+    parser.add_argument("--workers", type=int, default=settings.batch_workers, help="pool size (0 = one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=settings.batch_chunk_size, help="users per chunk")
+    args = parser.parse_args(argv)
+
+    args.languages = [code.strip() for code in args.languages.split(",") if code.strip()]
+    unknown = [code for code in args.languages if code not in LANGUAGES]
+    if unknown or not args.languages:
+        parser.error(f"languages must be among {', '.join(LANGUAGES)}")
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
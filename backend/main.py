@@ -4,22 +4,47 @@ FastAPI Backend for BAZI AI Analysis
 Main entry point for the application
 Routes:
 - POST /api/analyze - Analyze BAZI chart and return insights (streaming)
+- POST /api/bazi-chart/batch - Charts for many births (streaming NDJSON, premium)
+- POST /api/luck-timeline - Year-by-year luck / annual pillar grid
 - GET /api/health - Health check
 """
 
+import asyncio
 import json
 import logging
+from collections import deque
 from datetime import date as date_type, datetime as dt_type
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.requests import ClientDisconnect
 
 from models import AnalyzeRequest
-from pydantic import BaseModel
-from typing import Optional, List, Dict
-from bazi_engine.calculator import calculate_bazi
+from pydantic import BaseModel, ValidationError
+from typing import AsyncIterator, Optional, List, Dict
+from bazi_engine.calculator import calculate_bazi, calculate_luck_timeline
+from bazi_engine.chart_cache import get_cache_stats
+from bazi_engine.batch import (
+    BatchBodyParser,
+    BatchItem,
+    batch_worker_count,
+    compute_chunk,
+    get_batch_executor,
+    shutdown_batch_executor,
+)
+from bazi_engine.messages import catalog as message_catalog, normalize_language
+from bazi_engine.pillar_interactions import get_interaction_table
+from bazi_engine.signature_store import get_signature_store
+from bazi_engine.population_stats import get_population_stats
+from bazi_engine.pillar_search import DEFAULT_LIMIT as PILLAR_SEARCH_LIMIT, get_pillar_search_index, search_pillars
 from bazi_engine.compatibility import analyze_compatibility
-from bazi_engine.daily_forecast import calculate_daily_forecast
+from bazi_engine.daily_forecast import (
+    MAX_RANGE_DAYS,
+    ForecastProfile,
+    forecast_for_profile,
+    forecast_profile,
+    forecast_range_for_profile,
+)
 from ai_insights.generator import (
     generate_insights_generator,
     generate_insights_non_stream,
@@ -27,12 +52,13 @@ from ai_insights.generator import (
     generate_sections_parallel,
 )
 from config import get_settings
+from forecast_jobs import run_forecast_scheduler
 from auth.router import router as auth_router
-from auth.dependencies import set_auth_provider, get_optional_user, get_current_user
+from auth.dependencies import create_auth_provider, get_auth_provider, set_auth_provider, get_optional_user, get_current_user
 from auth.base import User, SubscriptionTier
 from subscriptions.router import router as subscriptions_router
 from subscriptions.content_gate import gate_content, gate_streaming_section
-from subscriptions.feature_flags import get_effective_tier
+from subscriptions.feature_flags import get_effective_tier, get_features_for_user
 
 
 # Configure logging
@@ -74,24 +100,39 @@ app.include_router(auth_router)
 app.include_router(subscriptions_router)
 
 
+_forecast_scheduler: Optional[asyncio.Task] = None
+
+
 @app.on_event("startup")
 async def startup_event():
+    # Compile the localized message tables once per worker
+    message_catalog.preload()
+    # Map the precomputed pillar interaction table and signature store
+    get_interaction_table()
+    get_signature_store()
+    # Map the population histograms behind chart rarity figures
+    get_population_stats()
+    # Load the reverse pillar search bitmaps
+    get_pillar_search_index()
+
     provider_name = settings.auth_provider
-    if provider_name == "mock":
-        from auth.mock_provider import MockAuthProvider
-        provider = MockAuthProvider()
-    elif provider_name == "supabase":
-        from auth.supabase_provider import SupabaseAuthProvider
-        provider = SupabaseAuthProvider(
-            url=settings.supabase_url,
-            key=settings.supabase_service_key,
-        )
-    else:
-        raise ValueError(f"Unknown auth provider: {provider_name}")
+    provider = create_auth_provider(settings)
     await provider.startup()
     set_auth_provider(provider)
     logger.info(f"Auth provider initialised: {provider_name}")
 
+    # Nightly precomputation of the next day's forecasts (opt-in); every
+    # worker schedules it and a lock file lets one of them run each night
+    global _forecast_scheduler
+    if 0 <= settings.forecast_precompute_hour <= 23:
+        _forecast_scheduler = asyncio.create_task(run_forecast_scheduler(
+            provider,
+            get_batch_executor(BATCH_POOL_SIZE),
+            settings.forecast_precompute_hour,
+            chunk_size=settings.batch_chunk_size,
+        ))
+        logger.info(f"Forecast precomputation scheduled daily at {settings.forecast_precompute_hour:02d}:00")
+
     # Seed a premium admin account only for mock provider (local dev)
     if provider_name == "mock":
         ADMIN_EMAIL = "admin@bazi.ai"
@@ -123,18 +164,29 @@ async def startup_event():
         raise ValueError("JWT_SECRET must be changed for production (Supabase auth)")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _forecast_scheduler is not None:
+        _forecast_scheduler.cancel()
+    shutdown_batch_executor()
+
+
 # ==================== VALIDATION ====================
 
 def validate_birth_input(
     birth_date: str,
-    birth_hour: int,
+    birth_hour: Optional[int],
     gender: str,
     calendar_type: str = "solar",
+    allow_unknown_hour: bool = False,
 ):
     """
     Validate common birth input fields.  Raises HTTPException(400) with a
     human-readable message on the first error found.  This is called *before*
     the BAZI engine so that bad data never reaches the calculator.
+
+    With allow_unknown_hour, a missing birth_hour is accepted (the chart is
+    then computed in unknown-hour mode).
     """
     # --- birth_date format ---
     try:
@@ -160,7 +212,9 @@ def validate_birth_input(
         )
 
     # --- birth_hour ---
-    if birth_hour is None or not (0 <= birth_hour <= 23):
+    if birth_hour is None and allow_unknown_hour:
+        pass
+    elif birth_hour is None or not (0 <= birth_hour <= 23):
         raise HTTPException(
             status_code=400,
             detail=f"Birth hour must be between 0 and 23. Got {birth_hour}.",
@@ -193,6 +247,11 @@ class BaziAnalysisRequest(BaseModel):
     is_leap_month: Optional[bool] = False  # Only relevant when calendar_type="lunar"
 
 
+class BaziChartRequest(BaziAnalysisRequest):
+    """Request body for the chart alone, which also works without the birth hour"""
+    birth_hour: Optional[int] = None  # 0-23, omitted if unknown
+
+
 class PersonInput(BaseModel):
     """Input for one person in compatibility analysis"""
     birth_date: str  # "YYYY-MM-DD"
@@ -222,6 +281,30 @@ class DailyForecastRequest(BaseModel):
     target_date: Optional[str] = None    # "YYYY-MM-DD", defaults to today
 
 
+class DailyForecastRangeRequest(BaseModel):
+    """Request body for a range of daily forecast scores.
+    Birth fields fall back to the saved profile as for the daily forecast."""
+    birth_date: Optional[str] = None     # "YYYY-MM-DD"
+    birth_hour: Optional[int] = None     # 0-23
+    gender: Optional[str] = None         # "male" or "female"
+    language: Optional[str] = "en"
+    calendar_type: Optional[str] = "solar"
+    is_leap_month: Optional[bool] = False
+    start_date: Optional[str] = None     # "YYYY-MM-DD", defaults to today
+    days: Optional[int] = 30             # 1-366
+
+
+class LuckTimelineRequest(BaseModel):
+    """Request body for the luck timeline"""
+    birth_date: str                      # "YYYY-MM-DD"
+    birth_hour: Optional[int] = None     # 0-23, omitted if unknown
+    gender: str                          # "male" or "female"
+    calendar_type: Optional[str] = "solar"
+    is_leap_month: Optional[bool] = False
+    as_of_year: Optional[int] = None     # year marked as current, defaults to this year
+    years: Optional[int] = 100           # span from the birth year (1-200)
+
+
 class BaziChartResponse(BaseModel):
     """Response with BAZI chart calculation"""
     success: bool
@@ -235,6 +318,8 @@ class BaziChartResponse(BaseModel):
     deities: Optional[List[Dict]] = None
     use_god: Optional[dict] = None
     pillar_interactions: Optional[dict] = None
+    hour_variants: Optional[List[Dict]] = None  # unknown birth hour only
+    rarity: Optional[dict] = None
     error: Optional[str] = None
 
 
@@ -250,6 +335,12 @@ async def health_check():
     }
 
 
+@app.get("/api/engine/cache-stats", tags=["Health"])
+async def engine_cache_stats():
+    """Hit/miss/eviction counters of the chart caches and message catalog usage (this worker only)"""
+    return {**get_cache_stats(), "messages": message_catalog.stats()}
+
+
 @app.post("/api/analyze")
 async def stream_insights(request: AnalyzeRequest, http_request: Request):
     """Stream BAZI insights (with content gating for free users)"""
@@ -313,6 +404,10 @@ async def stream_insights(request: AnalyzeRequest, http_request: Request):
                         gender=request.gender,
                         calendar_type=request.calendar_type or "solar",
                         is_leap_month=request.is_leap_month or False,
+                        forecast_profile=(
+                            forecast_profile(bazi_data).to_dict()
+                            if bazi_data.get("success") and request.birth_hour is not None else None
+                        ),
                     ))
             except Exception as e:
                 logger.warning(f"Failed to auto-save birth data: {e}")
@@ -448,15 +543,20 @@ async def analyze_sync(request: BaziAnalysisRequest, http_request: Request):
 
 
 @app.post("/api/bazi-chart", tags=["Analysis"])
-async def get_bazi_chart(request: BaziAnalysisRequest) -> BaziChartResponse:
+async def get_bazi_chart(request: BaziChartRequest) -> BaziChartResponse:
     """
     Get BAZI chart calculation without AI insights
+
+    birth_hour may be omitted when the birth time is unknown: the chart then
+    holds the hour-independent pillars once and a compact delta per possible
+    hour pillar under "hour_variants".
     """
     
     try:
         validate_birth_input(
             request.birth_date, request.birth_hour, request.gender,
             calendar_type=request.calendar_type or "solar",
+            allow_unknown_hour=True,
         )
         bazi_data = calculate_bazi(
             request.birth_date,
@@ -479,6 +579,8 @@ async def get_bazi_chart(request: BaziAnalysisRequest) -> BaziChartResponse:
             deities=bazi_data.get("deities"),
             use_god=bazi_data.get("use_god"),
             pillar_interactions=bazi_data.get("pillar_interactions"),
+            hour_variants=bazi_data.get("hour_variants"),
+            rarity=bazi_data.get("rarity"),
             error=bazi_data.get("error")
         )
     
@@ -489,6 +591,165 @@ async def get_bazi_chart(request: BaziAnalysisRequest) -> BaziChartResponse:
         )
 
 
+# Chunks computed ahead of the one being streamed, per worker
+BATCH_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Batch pool of this process: the host's CPUs are shared by all web workers
+BATCH_POOL_SIZE = batch_worker_count(settings.batch_workers, settings.web_concurrency)
+
+# Content types read as one item per line; anything else is read as JSON
+BATCH_NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines")
+
+
+class _BatchStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose disconnect listener starts once the request body
+    is read. The batch body is still being read while the charts stream
+    back, and the listener would otherwise take (and drop) its chunks.
+    """
+
+    def __init__(self, content, body_read: asyncio.Event, **kwargs):
+        super().__init__(content, **kwargs)
+        self.body_read = body_read
+
+    async def listen_for_disconnect(self, receive) -> None:
+        await self.body_read.wait()
+        await super().listen_for_disconnect(receive)
+
+
+async def _parsed_batch_body(request: Request, parser: BatchBodyParser, body_read: asyncio.Event) -> AsyncIterator:
+    """(item, error) pairs of the request body, parsed as its bytes arrive."""
+    try:
+        async for data in request.stream():
+            for parsed in parser.feed(data):
+                yield parsed
+    except ClientDisconnect:
+        return
+    finally:
+        body_read.set()
+    for parsed in parser.close():
+        yield parsed
+
+
+def _validation_error_text(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+async def _validated_batch_items(parsed: AsyncIterator, rate_key: str, tier: str) -> AsyncIterator[BatchItem]:
+    """
+    (index, request fields, error) for each parsed item, validated one by one.
+
+    Every valid item counts as one analysis for `rate_key`; the stream ends
+    with an error line once the tier's daily limit is reached.
+    """
+    from subscriptions.rate_limiter import rate_limiter
+    index = 0
+    async for raw, error in parsed:
+        if index >= settings.batch_max_items:
+            yield index, None, f"Batch too large: more than {settings.batch_max_items} items"
+            return
+        fields = None
+        if error is None:
+            try:
+                item = BaziAnalysisRequest.model_validate(raw)
+                validate_birth_input(
+                    item.birth_date, item.birth_hour, item.gender,
+                    calendar_type=item.calendar_type or "solar",
+                )
+                fields = item.model_dump()
+            except ValidationError as e:
+                error = _validation_error_text(e)
+            except HTTPException as e:
+                error = str(e.detail)
+        if fields is not None:
+            if not rate_limiter.check(rate_key, tier):
+                yield index, None, "Daily analysis limit reached"
+                return
+            rate_limiter.increment(rate_key)
+        yield index, fields, error
+        index += 1
+
+
+async def _stream_batch_charts(items: AsyncIterator[BatchItem]):
+    """
+    Compute chunks on the batch pool and yield their NDJSON in input order.
+
+    Items are chunked as they are read and at most a fixed number of
+    chunks are in flight, so memory stays flat however large the batch is.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_batch_executor(BATCH_POOL_SIZE)
+    max_in_flight = BATCH_POOL_SIZE * BATCH_CHUNKS_IN_FLIGHT_PER_WORKER
+    pending = deque()
+    chunk: List[BatchItem] = []
+    try:
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) < settings.batch_chunk_size:
+                continue
+            pending.append(loop.run_in_executor(executor, compute_chunk, chunk))
+            chunk = []
+            if len(pending) >= max_in_flight:
+                yield await pending.popleft()
+        if chunk:
+            pending.append(loop.run_in_executor(executor, compute_chunk, chunk))
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+@app.post("/api/bazi-chart/batch", tags=["Analysis"])
+async def get_bazi_chart_batch(request: Request, user: User = Depends(get_current_user)):
+    """
+    Charts for many births in one request. Requires login and a tier with
+    batch charts (premium); each item counts against the daily analysis limit.
+
+    The body is NDJSON (Content-Type application/x-ndjson, one
+    BaziAnalysisRequest object per line) or JSON ({"items": [...]} or a
+    bare array). It is read and validated item by item while the charts
+    stream back, so a bad item gets an error line instead of failing the
+    batch, and neither the input nor the output is held in full.
+
+    Streams one NDJSON line per item, in input order:
+    {"index": i, "success": true, "four_pillars": ..., ...} with the same
+    sections as /api/bazi-chart, or {"index": i, "success": false, "error": ...}.
+    Items past BATCH_MAX_ITEMS, or past the daily limit, end the stream with
+    one error line.
+    """
+    if not get_features_for_user(user)["batch_charts"]:
+        raise HTTPException(status_code=403, detail="Batch charts require a premium subscription")
+    tier = get_effective_tier(user)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body_read = asyncio.Event()
+    parsed = _parsed_batch_body(request, BatchBodyParser(ndjson=content_type in BATCH_NDJSON_TYPES), body_read)
+
+    # A body that is not a batch at all is rejected before streaming starts
+    try:
+        first = [await parsed.__anext__()]
+    except StopAsyncIteration:
+        first = []
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def _items():
+        for pair in first:
+            yield pair
+        async for pair in parsed:
+            yield pair
+
+    return _BatchStreamingResponse(
+        _stream_batch_charts(_validated_batch_items(_items(), user.id, tier)),
+        body_read,
+        media_type="application/x-ndjson",
+    )
+
+
 @app.post("/api/compatibility", tags=["Analysis"])
 async def compatibility_analysis(request: CompatibilityRequest, http_request: Request):
     """
@@ -594,6 +855,91 @@ async def compatibility_analysis(request: CompatibilityRequest, http_request: Re
 
 # ==================== DAILY FORECAST ====================
 
+def _uses_saved_birth_data(request, user) -> bool:
+    """True if a forecast request relies entirely on the user's saved birth data."""
+    return bool(user) and request.birth_date is None and request.birth_hour is None and request.gender is None
+
+
+async def _stored_forecast(request, user, target_date, lang: str, profile: ForecastProfile) -> Optional[dict]:
+    """
+    The nightly precomputed forecast for this request (forecast_jobs.py), or
+    None. Only a forecast computed from `profile` is served, so one the job
+    stored from birth data the user has since changed is a miss.
+    """
+    if not _uses_saved_birth_data(request, user):
+        return None
+    provider = get_auth_provider()
+    if provider is None:
+        return None
+    try:
+        return await provider.get_daily_forecast(
+            user.id, target_date.isoformat(), normalize_language(lang), profile.fingerprint(),
+        )
+    except Exception as e:
+        logger.warning(f"Stored forecast lookup failed: {e}")
+        return None
+
+
+async def _save_forecast_profile(user, profile: ForecastProfile) -> None:
+    """Store a profile recomputed from the user's saved birth data, so later requests skip the chart."""
+    provider = get_auth_provider()
+    if provider is None:
+        return
+    try:
+        await provider.update_forecast_profile(user.id, profile.to_dict())
+    except Exception as e:
+        logger.warning(f"Forecast profile update failed: {e}")
+
+
+async def _forecast_profile(request, user, lang: str) -> ForecastProfile:
+    """
+    Natal forecast profile of a forecast request.
+
+    A request without birth fields uses the profile stored with the user's
+    saved birth data, so no chart is computed; a missing or outdated stored
+    profile is recomputed once and stored again. Otherwise the birth data
+    comes from the request body, with missing fields filled from the saved
+    profile, and the chart is calculated. Raises HTTPException(400) if the
+    birth data is missing or invalid.
+    """
+    saved = _uses_saved_birth_data(request, user)
+    if saved:
+        stored = ForecastProfile.from_dict(user.forecast_profile)
+        if stored is not None:
+            return stored
+
+    bd = request.birth_date
+    bh = request.birth_hour
+    gd = request.gender
+    ct = request.calendar_type or "solar"
+    lm = request.is_leap_month or False
+
+    if (bd is None or bh is None or gd is None) and user:
+        # Fill missing fields from user profile
+        bd = bd or user.birth_date
+        bh = bh if bh is not None else user.birth_hour
+        gd = gd or user.gender
+        ct = ct or user.calendar_type or "solar"
+        lm = lm or user.is_leap_month or False
+
+    if not bd or bh is None or not gd:
+        raise HTTPException(
+            status_code=400,
+            detail="Birth data is required. Please provide birth_date, birth_hour, and gender, or save your birth data to your profile first.",
+        )
+
+    # Validate resolved birth data
+    validate_birth_input(bd, bh, gd, calendar_type=ct)
+
+    # Calculate natal BAZI chart
+    chart = calculate_bazi(bd, bh, gd, lang, calendar_type=ct, is_leap_month=lm)
+    if not chart.get("success"):
+        raise HTTPException(status_code=400, detail=f"Chart error: {chart.get('error')}")
+    profile = forecast_profile(chart)
+    if saved:
+        await _save_forecast_profile(user, profile)
+    return profile
+
 @app.post("/api/daily-forecast", tags=["Forecast"])
 async def daily_forecast(request: DailyForecastRequest, http_request: Request):
     """
@@ -618,35 +964,7 @@ async def daily_forecast(request: DailyForecastRequest, http_request: Request):
 
     try:
         lang = request.language or "en"
-
-        # Resolve birth data: prefer request body, fall back to user profile
-        bd = request.birth_date
-        bh = request.birth_hour
-        gd = request.gender
-        ct = request.calendar_type or "solar"
-        lm = request.is_leap_month or False
-
-        if (bd is None or bh is None or gd is None) and user:
-            # Fill missing fields from user profile
-            bd = bd or user.birth_date
-            bh = bh if bh is not None else user.birth_hour
-            gd = gd or user.gender
-            ct = ct or user.calendar_type or "solar"
-            lm = lm or user.is_leap_month or False
-
-        if not bd or bh is None or not gd:
-            raise HTTPException(
-                status_code=400,
-                detail="Birth data is required. Please provide birth_date, birth_hour, and gender, or save your birth data to your profile first.",
-            )
-
-        # Validate resolved birth data
-        validate_birth_input(bd, bh, gd, calendar_type=ct)
-
-        # Calculate natal BAZI chart
-        chart = calculate_bazi(bd, bh, gd, lang, calendar_type=ct, is_leap_month=lm)
-        if not chart.get("success"):
-            raise HTTPException(status_code=400, detail=f"Chart error: {chart.get('error')}")
+        profile = await _forecast_profile(request, user, lang)
 
         # Parse target_date
         from datetime import date as date_cls
@@ -656,8 +974,10 @@ async def daily_forecast(request: DailyForecastRequest, http_request: Request):
         else:
             td = date_cls.today()
 
-        # Calculate daily forecast (pure Python — fast)
-        forecast = calculate_daily_forecast(chart, language=lang, target_date=td)
+        # Serve the nightly precomputed forecast; compute live on a miss
+        forecast = await _stored_forecast(request, user, td, lang, profile)
+        if forecast is None:
+            forecast = forecast_for_profile(profile, language=lang, target_date=td)
 
         # Small AI call for Daily Wisdom (premium only; free gets locked)
         wisdom_text = ""
@@ -673,7 +993,7 @@ async def daily_forecast(request: DailyForecastRequest, http_request: Request):
                 import asyncio
 
                 gen = InsightGenerator()
-                sys_msg, u_prompt = get_daily_wisdom_prompt(chart, forecast, lang)
+                sys_msg, u_prompt = get_daily_wisdom_prompt(profile, forecast, lang)
 
                 # For Azure reasoning models (o4-mini, o3-mini, o1), use
                 # "developer" role instead of "system" — the system role is
@@ -755,6 +1075,104 @@ async def daily_forecast(request: DailyForecastRequest, http_request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/daily-forecast/range", tags=["Forecast"])
+async def daily_forecast_range(request: DailyForecastRangeRequest, http_request: Request):
+    """
+    Overall and domain scores for every day of a date range (up to 366
+    days), e.g. for a calendar or a year-at-a-glance view. The natal
+    profile is resolved once and every day is a score table lookup.
+    """
+    user = await get_optional_user(http_request)
+    tier = get_effective_tier(user) if user else "free"
+
+    # Rate limiting — one range counts as one analysis
+    from subscriptions.rate_limiter import rate_limiter
+    rate_key = user.id if user else (http_request.client.host if http_request.client else "unknown")
+    if not rate_limiter.check(rate_key, tier):
+        usage = rate_limiter.get_usage(rate_key, tier)
+        return JSONResponse(status_code=429, content={
+            "error": "rate_limited",
+            "used": usage["used"],
+            "limit": usage["limit"],
+            "remaining": 0,
+        })
+    rate_limiter.increment(rate_key)
+
+    try:
+        lang = request.language or "en"
+        days = 30 if request.days is None else request.days
+        if not 1 <= days <= MAX_RANGE_DAYS:
+            raise HTTPException(status_code=400, detail=f"days must be between 1 and {MAX_RANGE_DAYS}")
+
+        from datetime import date as date_cls, datetime as dt
+        try:
+            start = dt.strptime(request.start_date, "%Y-%m-%d").date() if request.start_date else date_cls.today()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="start_date must be YYYY-MM-DD")
+
+        profile = await _forecast_profile(request, user, lang)
+        return {"success": True, **forecast_range_for_profile(profile, start, days, language=lang)}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Daily forecast range error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== LUCK TIMELINE ====================
+
+@app.post("/api/luck-timeline", tags=["Analysis"])
+async def luck_timeline(request: LuckTimelineRequest):
+    """
+    Luck pillar (大運) and annual pillar (流年) for every year of a lifespan,
+    with relationship scores and clash / combination flags per year.
+    """
+    validate_birth_input(
+        request.birth_date, request.birth_hour, request.gender,
+        calendar_type=request.calendar_type or "solar",
+        allow_unknown_hour=True,
+    )
+    timeline = calculate_luck_timeline(
+        request.birth_date,
+        request.birth_hour,
+        request.gender,
+        calendar_type=request.calendar_type or "solar",
+        is_leap_month=request.is_leap_month or False,
+        as_of_year=request.as_of_year,
+        years=100 if request.years is None else request.years,
+    )
+    if not timeline.get("success"):
+        raise HTTPException(status_code=400, detail=timeline.get("error"))
+    return timeline
+
+
+@app.get("/api/pillars/search", tags=["Analysis"])
+async def pillar_search(
+    year: Optional[str] = None,
+    month: Optional[str] = None,
+    day: Optional[str] = None,
+    hour: Optional[str] = None,
+    start_date: Optional[date_type] = None,
+    end_date: Optional[date_type] = None,
+    limit: int = PILLAR_SEARCH_LIMIT,
+):
+    """
+    Dates (and clock hours) between 1900 and 2100 that produce the given
+    pillars. Each pillar is a stem-branch pair (甲子), a stem (壬) or a
+    branch (午); e.g. ?day=甲子&hour=午&start_date=1950-01-01.
+    """
+    try:
+        return search_pillars(
+            {"year": year, "month": month, "day": day, "hour": hour},
+            start=start_date,
+            end=end_date,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ==================== ROOT ====================
 
 @app.get("/", tags=["Root"])
@@ -768,6 +1186,9 @@ async def root():
             "health": "/api/health",
             "analyze": "/api/analyze",
             "chart": "/api/bazi-chart",
+            "chart_batch": "/api/bazi-chart/batch",
+            "luck_timeline": "/api/luck-timeline",
+            "pillar_search": "/api/pillars/search",
         }
     }
 
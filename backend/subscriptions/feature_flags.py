@@ -14,6 +14,7 @@ TIER_FEATURES = {
         "pdf_export": False,
         "history": False,
         "mini_forecasts": False,
+        "batch_charts": False,        # /api/bazi-chart/batch
     },
     "premium": {
         "ai_preview_lines": None,     # No truncation
@@ -21,6 +22,7 @@ TIER_FEATURES = {
         "pdf_export": True,
         "history": True,
         "mini_forecasts": True,
+        "batch_charts": True,
     },
 }
 
@@ -0,0 +1,35 @@
+"""Run from backend/: python -m pytest"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture
+def post():
+    """
+    post(path, user_id=None, **kwargs): POST to the app in-process and return
+    the httpx response. kwargs go to httpx (json=, content=, headers=); a
+    user_id sends that user's bearer token.
+    """
+    import main
+    from auth.jwt_utils import create_access_token
+
+    def _post(path, user_id=None, **kwargs):
+        headers = dict(kwargs.pop("headers", None) or {})
+        if user_id:
+            headers["Authorization"] = f"Bearer {create_access_token(user_id)}"
+
+        async def _send():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post(path, headers=headers, **kwargs)
+        # A request that never completes fails the test instead of hanging the run
+        return asyncio.run(asyncio.wait_for(_send(), timeout=60))
+
+    return _post
@@ -0,0 +1,186 @@
+"""Batch charts: the incremental body parser and /api/bazi-chart/batch."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+import subscriptions.rate_limiter
+from auth.dependencies import set_auth_provider
+from auth.mock_provider import MockAuthProvider
+from bazi_engine.batch import CHART_RESPONSE_FIELDS, BatchBodyParser
+from bazi_engine.calculator import calculate_bazi
+
+ITEMS = [
+    {"birth_date": "1990-05-15", "birth_hour": 14, "gender": "male"},
+    {"birth_date": "1985-11-02", "birth_hour": 3, "gender": "female", "language": "zh-TW"},
+    {"birth_date": "2001-01-01", "birth_hour": 0, "gender": "female", "calendar_type": "lunar"},
+]
+
+
+def _parse(body: str, ndjson: bool, piece: int = 1):
+    """Parsed items of a body fed `piece` bytes at a time."""
+    parser = BatchBodyParser(ndjson=ndjson, max_item_chars=256)
+    data = body.encode("utf-8")
+    parsed = []
+    for start in range(0, len(data), piece):
+        parsed += parser.feed(data[start:start + piece])
+    return parsed + parser.close()
+
+
+# ==================== PARSER ====================
+
+@pytest.mark.parametrize("piece", [1, 3, 7, 1 << 16])
+def test_ndjson_items_in_any_pieces(piece):
+    body = "\n".join(json.dumps(item, ensure_ascii=False) for item in ITEMS + [{"name": "李明"}])
+    assert _parse(body + "\n", ndjson=True, piece=piece) == [(item, None) for item in ITEMS + [{"name": "李明"}]]
+    # No final newline, blank and CRLF lines
+    body = "\r\n\r\n".join(json.dumps(item) for item in ITEMS)
+    assert _parse(body, ndjson=True, piece=piece) == [(item, None) for item in ITEMS]
+
+
+def test_ndjson_bad_lines_are_item_errors():
+    body = "\n".join([json.dumps(ITEMS[0]), "{not json", "x" * 300, json.dumps(ITEMS[1])])
+    parsed = _parse(body, ndjson=True, piece=5)
+    assert [item for item, _ in parsed] == [ITEMS[0], None, None, ITEMS[1]]
+    assert parsed[1][1].startswith("Invalid JSON")
+    assert parsed[2][1] == "Item too large (over 256 characters)"
+
+
+@pytest.mark.parametrize("piece", [1, 4, 1 << 16])
+@pytest.mark.parametrize("wrap", ["{}", '{{"items": {}}}', ' \n{{ "items" :\n{} }}'])
+def test_json_array_in_any_pieces(wrap, piece):
+    body = wrap.format(json.dumps(ITEMS + ["not an object"], indent=1))
+    assert _parse(body, ndjson=False, piece=piece) == [(item, None) for item in ITEMS + ["not an object"]]
+    assert _parse(wrap.format("[]"), ndjson=False, piece=piece) == []
+
+
+def test_json_syntax_error_ends_the_batch():
+    body = "[" + json.dumps(ITEMS[0]) + ", {bad}, " + json.dumps(ITEMS[1]) + "]"
+    parsed = _parse(body, ndjson=False, piece=3)
+    assert parsed[0] == (ITEMS[0], None)
+    assert len(parsed) == 2 and parsed[1][0] is None and parsed[1][1].startswith("Invalid JSON")
+
+    parsed = _parse("[" + json.dumps(ITEMS[0]) + " " + json.dumps(ITEMS[1]) + "]", ndjson=False)
+    assert parsed == [(ITEMS[0], None), (None, "Invalid JSON: expected ',' between items")]
+
+    parsed = _parse("[" + json.dumps(ITEMS[0]) + ", ", ndjson=False)
+    assert parsed == [(ITEMS[0], None), (None, "Unexpected end of the JSON body")]
+
+
+@pytest.mark.parametrize("body", ['{"birth_date": "1990-05-15"}', "hello", ""])
+def test_json_body_that_is_not_a_batch_is_rejected(body):
+    with pytest.raises(ValueError):
+        _parse(body, ndjson=False)
+
+
+# ==================== ENDPOINT ====================
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    provider = MockAuthProvider(str(tmp_path / "users.db"))
+    asyncio.run(provider.startup())
+    set_auth_provider(provider)
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(main, "get_batch_executor", lambda workers: executor)
+    monkeypatch.setattr(main.settings, "batch_chunk_size", 2)
+    yield provider
+    set_auth_provider(None)
+    executor.shutdown()
+
+
+def _user(provider, email, tier=None):
+    async def _create():
+        user = await provider.signup(email, "secret123")
+        if tier:
+            await provider.update_user_tier(user.id, tier)
+        return user.id
+    return asyncio.run(_create())
+
+
+@pytest.fixture
+def post_batch(post):
+    def _post_batch(content, content_type: str, user_id=None):
+        return post("/api/bazi-chart/batch", user_id, content=content, headers={"Content-Type": content_type})
+    return _post_batch
+
+
+def _lines(response):
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_requires_login_and_premium(provider, post_batch):
+    body = json.dumps(ITEMS)
+    assert post_batch(body, "application/json").status_code == 401
+    free_id = _user(provider, "free@example.com")
+    response = post_batch(body, "application/json", free_id)
+    assert response.status_code == 403
+
+
+def test_batch_charts_and_per_item_errors(provider, post_batch):
+    user_id = _user(provider, "batch@example.com", "premium")
+    body = "\n".join([
+        json.dumps(ITEMS[0]),
+        "{not json",
+        json.dumps({"birth_date": "1990-13-01", "birth_hour": 5, "gender": "male"}),
+        json.dumps({"birth_date": "1990-05-15", "gender": "male"}),
+        json.dumps(ITEMS[1]),
+        json.dumps({"birth_date": "1990-05-15", "birth_hour": 5}),
+        json.dumps(ITEMS[2]),
+    ])
+    lines = _lines(post_batch(body, "application/x-ndjson", user_id))
+    assert [line["index"] for line in lines] == list(range(7))
+    assert [line["success"] for line in lines] == [True, False, False, False, True, False, True]
+    assert lines[1]["error"].startswith("Invalid JSON")
+    assert "Invalid birth date format" in lines[2]["error"]
+    assert lines[3]["error"].startswith("birth_hour:")
+    assert lines[5]["error"].startswith("gender:")
+
+    for line, item in zip([lines[0], lines[4], lines[6]], ITEMS):
+        chart = calculate_bazi(
+            item["birth_date"], item["birth_hour"], item["gender"], item.get("language", "en"),
+            calendar_type=item.get("calendar_type", "solar"),
+        )
+        expected = json.loads(json.dumps({field: chart.get(field) for field in CHART_RESPONSE_FIELDS}))
+        assert {field: line[field] for field in CHART_RESPONSE_FIELDS} == expected
+
+
+def test_batch_json_body(provider, post_batch):
+    user_id = _user(provider, "json@example.com", "premium")
+    lines = _lines(post_batch(json.dumps({"items": ITEMS}), "application/json", user_id))
+    assert [(line["index"], line["success"]) for line in lines] == [(0, True), (1, True), (2, True)]
+
+    assert post_batch('{"birth_date": "1990-05-15"}', "application/json", user_id).status_code == 400
+
+
+def test_batch_body_read_while_charts_stream(provider, post_batch):
+    user_id = _user(provider, "pieces@example.com", "premium")
+    data = "\n".join(json.dumps(item) for item in ITEMS * 3).encode("utf-8")
+
+    async def _pieces():
+        for start in range(0, len(data), 50):
+            yield data[start:start + 50]
+    lines = _lines(post_batch(_pieces(), "application/x-ndjson", user_id))
+    assert [(line["index"], line["success"]) for line in lines] == [(i, True) for i in range(9)]
+
+
+def test_batch_limits_end_the_stream(provider, post_batch, monkeypatch):
+    user_id = _user(provider, "limits@example.com", "premium")
+    body = "\n".join(json.dumps(item) for item in ITEMS * 2)
+
+    monkeypatch.setattr(main.settings, "batch_max_items", 4)
+    lines = _lines(post_batch(body, "application/x-ndjson", user_id))
+    assert [line["success"] for line in lines] == [True] * 4 + [False]
+    assert lines[-1] == {"index": 4, "success": False, "error": "Batch too large: more than 4 items"}
+
+    # Each valid item is one analysis against the daily limit
+    monkeypatch.setattr(main.settings, "batch_max_items", 100)
+    monkeypatch.setattr(subscriptions.rate_limiter, "get_features", lambda tier: {"max_daily_analyses": 6})
+    body = "\n".join([json.dumps(ITEMS[0]), "{not json"] + [json.dumps(item) for item in ITEMS])
+    lines = _lines(post_batch(body, "application/x-ndjson", user_id))
+    assert [line["success"] for line in lines] == [True, False, True, False]
+    assert lines[-1] == {"index": 3, "success": False, "error": "Daily analysis limit reached"}
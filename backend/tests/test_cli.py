@@ -0,0 +1,70 @@
+"""Bulk chart CLI: input formats, and failed rows counted apart from charts."""
+
+import json
+
+import pytest
+
+from bazi_engine import cli
+
+RECORDS = [
+    {"id": 1, "birth_date": "1990-05-15", "birth_hour": 14, "gender": "male"},
+    {"id": 2, "birth_date": "1985-11-02", "birth_hour": 3, "gender": "female"},
+    {"id": 3, "birth_date": "1990-05-15", "birth_hour": 24, "gender": "male"},
+]
+
+
+def _run(tmp_path, name, text, *args):
+    source = tmp_path / name
+    source.write_text(text, encoding="utf-8")
+    output = tmp_path / "charts.ndjson"
+    assert cli.main([str(source), "-o", str(output), "--workers", "1", *args]) == 0
+    return [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+
+def _ndjson(records):
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+def _csv(records):
+    return "id,birth_date,birth_hour,gender\n" + "".join(
+        f"{r['id']},{r['birth_date']},{r['birth_hour']},{r['gender']}\n" for r in records
+    )
+
+
+@pytest.mark.parametrize("name, text", [
+    ("births.json", json.dumps(RECORDS, indent=2)),
+    ("births.json", _ndjson(RECORDS)),
+    ("births.txt", "\ufeff  " + json.dumps(RECORDS)),
+    ("births.ndjson", _ndjson(RECORDS)),
+    ("births", _ndjson(RECORDS)),
+    ("births.csv", _csv(RECORDS)),
+    ("births", _csv(RECORDS)),
+])
+def test_input_formats(tmp_path, capsys, name, text):
+    rows = _run(tmp_path, name, text)
+    assert [(row["index"], row["id"], row["success"]) for row in rows] == [
+        (0, "1", True), (1, "2", True), (2, "3", False),
+    ]
+    assert rows[2]["error"] == "Birth hour must be between 0 and 23. Got 24."
+    summary = capsys.readouterr().err
+    assert "✓ 2 charts" in summary and "✗ 1 record(s) failed" in summary
+
+
+def test_array_items_must_be_objects(tmp_path, capsys):
+    rows = _run(tmp_path, "births.json", json.dumps([RECORDS[0], [1, 2]]))
+    assert [row["success"] for row in rows] == [True, False]
+    assert rows[1]["error"] == "Expected a JSON object."
+
+
+@pytest.mark.parametrize("text, error", [
+    ("[{\"birth_date\": ", "Invalid JSON"),
+    ("\"1990-05-15\"", "Expected a JSON array of records."),
+])
+def test_bad_json_array_fails(tmp_path, capsys, text, error):
+    source = tmp_path / "births.json"
+    source.write_text(text, encoding="utf-8")
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main([str(source), "--input-format", "json", "-o", str(tmp_path / "charts.ndjson")])
+    assert exit_info.value.code == 2
+    assert error in capsys.readouterr().err
+    assert not (tmp_path / "charts.ndjson").exists()
@@ -0,0 +1,101 @@
+"""Range rows must match the scalar scorers and the single-day forecasts of the same dates."""
+
+from datetime import date, timedelta
+
+import pytest
+
+
+from bazi_engine.chart_core import PILLAR_NAMES
+from bazi_engine.daily_forecast import (
+    DOMAIN_KEYS,
+    MAX_RANGE_DAYS,
+    calculate_domain_scores,
+    calculate_overall_score,
+    forecast_for_profile,
+    forecast_profile_for_birth,
+    forecast_range_for_profile,
+    get_fortune_mood,
+)
+from bazi_engine.pillar_interactions import SIX_CLASHES, SIX_COMBINATIONS
+from bazi_engine.stems_branches import get_branch_by_index, get_stem_by_index, get_stem_element
+from subscriptions.rate_limiter import rate_limiter
+
+BIRTHS = [
+    ("1990-05-15", 14, "male"),
+    ("1985-11-02", 3, "female"),
+    ("2024-02-04", 17, "male"),
+    ("1972-08-30", None, "female"),
+]
+START = date(2026, 1, 20)  # the window spans 立春
+WINDOW_DAYS = 60
+
+# The engine's reference day: Jan 1, 1900 is position 0 (甲子) of the 60-cycle
+ANCHOR, ANCHOR_CYCLE = date(1900, 1, 1), 0
+
+
+def _expected_row(profile, day, language):
+    """A range row computed from the scalar scorers, without the score table."""
+    cycle = (ANCHOR_CYCLE + (day - ANCHOR).days) % 60
+    stem, branch = get_stem_by_index(cycle % 10), get_branch_by_index(cycle % 12)
+    natal_branches = [b for _, b in profile.natal if b is not None]
+    clashes = sum(frozenset({cycle % 12, b}) in SIX_CLASHES for b in natal_branches)
+    combinations = sum(frozenset({cycle % 12, b}) in SIX_COMBINATIONS for b in natal_branches)
+    daily_elem = get_stem_element(stem)
+
+    overall = calculate_overall_score(
+        profile.dm_element, profile.use_god, profile.use_god_2, profile.avoid_god, profile.avoid_god_2,
+        daily_elem, clashes, combinations,
+    )
+    domains = calculate_domain_scores(
+        profile.dm_element, profile.use_god, profile.avoid_god, daily_elem,
+        cycle % 12, profile.natal[PILLAR_NAMES.index("day")][1], clashes, combinations,
+    )
+    return {
+        "date": day.isoformat(),
+        "daily_pillar": stem.value["name_cn"] + branch.value["name_cn"],
+        "element": daily_elem,
+        "overall_score": overall,
+        "mood": get_fortune_mood(overall, language),
+        "domains": {key: domains[key] for key in DOMAIN_KEYS},
+    }
+
+
+@pytest.mark.parametrize("language", ["en", "ko"])
+@pytest.mark.parametrize("birth", BIRTHS)
+def test_range_rows_match_daily_forecasts(birth, language):
+    profile = forecast_profile_for_birth(*birth)
+    result = forecast_range_for_profile(profile, START, WINDOW_DAYS, language)
+    assert result["start_date"] == START.isoformat()
+    assert result["end_date"] == (START + timedelta(days=WINDOW_DAYS - 1)).isoformat()
+    assert len(result["days"]) == WINDOW_DAYS
+
+    for offset, row in enumerate(result["days"]):
+        assert row == _expected_row(profile, START + timedelta(days=offset), language)
+        day = forecast_for_profile(profile, language, START + timedelta(days=offset))
+        pillar = day["daily_pillar"]
+        assert row["date"] == day["date"]
+        assert row["daily_pillar"] == pillar["stem"]["name_cn"] + pillar["branch"]["name_cn"]
+        assert row["element"] == pillar["stem"]["element"]
+        assert row["overall_score"] == day["overall_score"], row["date"]
+        assert row["mood"] == day["mood"], row["date"]
+        assert row["domains"] == day["domains"], row["date"]
+
+
+@pytest.mark.parametrize("days", [0, MAX_RANGE_DAYS + 1])
+def test_range_length_is_bounded(days):
+    profile = forecast_profile_for_birth(*BIRTHS[0])
+    with pytest.raises(ValueError):
+        forecast_range_for_profile(profile, START, days)
+
+
+@pytest.mark.parametrize("days, status, rows", [(None, 200, 30), (7, 200, 7), (0, 400, None), (MAX_RANGE_DAYS + 1, 400, None)])
+def test_range_endpoint_days(post, monkeypatch, days, status, rows):
+    monkeypatch.setattr(rate_limiter, "check", lambda key, tier: True)
+    birth_date, birth_hour, gender = BIRTHS[0]
+    response = post("/api/daily-forecast/range", json={
+        "birth_date": birth_date, "birth_hour": birth_hour, "gender": gender,
+        "start_date": START.isoformat(), "days": days,
+    })
+    assert response.status_code == status, response.text
+    if rows is not None:
+        assert len(response.json()["days"]) == rows
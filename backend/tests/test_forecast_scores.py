@@ -0,0 +1,72 @@
+"""The cached score table must match the scalar scorers for every day pillar."""
+
+import random
+
+import pytest
+
+from bazi_engine.chart_core import PILLAR_NAMES
+from bazi_engine.daily_forecast import (
+    DOMAIN_KEYS,
+    SCORE_COLUMNS,
+    ForecastProfile,
+    calculate_domain_scores,
+    calculate_overall_score,
+    forecast_profile_for_birth,
+    forecast_score_table,
+)
+from bazi_engine.pillar_interactions import SIX_CLASHES, SIX_COMBINATIONS
+from bazi_engine.relations import ELEMENTS
+from bazi_engine.stems_branches import get_stem_by_index, get_stem_element
+
+BIRTHS = [
+    ("1990-05-15", 14, "male"),
+    ("1985-11-02", 3, "female"),
+    ("2024-02-04", 17, "male"),
+    ("1972-08-30", None, "female"),
+    ("1900-01-31", 0, "male"),
+]
+
+
+def _random_profiles(count):
+    rng = random.Random(22)
+    profiles = []
+    for _ in range(count):
+        gods = rng.sample(ELEMENTS, 4)
+        if rng.random() < 0.3:
+            gods[rng.randrange(1, 4)] = ""
+        natal = tuple(
+            (None, None) if name == "hour" and rng.random() < 0.3 else (rng.randrange(10), rng.randrange(12))
+            for name in PILLAR_NAMES
+        )
+        profiles.append(ForecastProfile(rng.choice(ELEMENTS), *gods, natal))
+    return profiles
+
+
+PROFILES = [forecast_profile_for_birth(*birth) for birth in BIRTHS] + _random_profiles(40)
+
+
+def _reference_row(profile, stem, branch):
+    """SCORE_COLUMNS scores of one day pillar, from the scalar scorers."""
+    natal_branches = [b for _, b in profile.natal if b is not None]
+    clashes = sum(frozenset({branch, b}) in SIX_CLASHES for b in natal_branches)
+    combinations = sum(frozenset({branch, b}) in SIX_COMBINATIONS for b in natal_branches)
+    daily_elem = get_stem_element(get_stem_by_index(stem))
+    day_branch = profile.natal[PILLAR_NAMES.index("day")][1]
+
+    overall = calculate_overall_score(
+        profile.dm_element, profile.use_god, profile.use_god_2, profile.avoid_god, profile.avoid_god_2,
+        daily_elem, clashes, combinations,
+    )
+    domains = calculate_domain_scores(
+        profile.dm_element, profile.use_god, profile.avoid_god,
+        daily_elem, branch, day_branch, clashes, combinations,
+    )
+    return [overall] + [domains[key] for key in DOMAIN_KEYS]
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_score_table_matches_scalar_scorers(profile):
+    table = forecast_score_table(profile)
+    assert table.shape == (60, len(SCORE_COLUMNS))
+    for cycle in range(60):
+        assert table[cycle].tolist() == _reference_row(profile, cycle % 10, cycle % 12), cycle
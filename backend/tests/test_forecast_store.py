@@ -0,0 +1,200 @@
+"""Stored forecast profiles and precomputed forecasts, end to end on the mock provider."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+import forecast_jobs
+import main
+from auth.dependencies import set_auth_provider
+from auth.mock_provider import MockAuthProvider
+from bazi_engine.daily_forecast import ForecastProfile, forecast_for_profile, forecast_profile_for_birth
+from forecast_jobs import precompute_daily_forecasts
+from subscriptions.rate_limiter import rate_limiter
+
+BIRTH = {"birth_date": "1990-05-15", "birth_hour": 14, "gender": "male"}
+# The job drops forecasts for dates before today
+TARGET_DATE = (date.today() + timedelta(days=1)).isoformat()
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    provider = MockAuthProvider(str(tmp_path / "users.db"))
+    asyncio.run(provider.startup())
+    set_auth_provider(provider)
+    monkeypatch.setattr(rate_limiter, "check", lambda key, tier: True)
+    yield provider
+    set_auth_provider(None)
+
+
+@pytest.fixture
+def chart_calls(monkeypatch):
+    """Number of charts main.py computes, by call."""
+    calls = []
+    calculate_bazi = main.calculate_bazi
+
+    def _counting(*args, **kwargs):
+        calls.append(args)
+        return calculate_bazi(*args, **kwargs)
+
+    monkeypatch.setattr(main, "calculate_bazi", _counting)
+    return calls
+
+
+@pytest.fixture
+def live_forecasts(monkeypatch):
+    """Forecasts main.py computes live, by call."""
+    calls = []
+
+    def _counting(*args, **kwargs):
+        calls.append(args)
+        return forecast_for_profile(*args, **kwargs)
+
+    monkeypatch.setattr(main, "forecast_for_profile", _counting)
+    return calls
+
+
+def _signup(provider, email, forecast_profile):
+    async def _create():
+        user = await provider.signup(email, "secret123")
+        await provider.update_birth_data(user.id, **BIRTH, forecast_profile=forecast_profile)
+        return user.id
+    return asyncio.run(_create())
+
+
+@pytest.fixture
+def post_json(post):
+    """POST as a user, expecting 200; returns the JSON body."""
+    def _post_json(user_id, path, body):
+        response = post(path, user_id, json=body)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return _post_json
+
+
+@pytest.fixture
+def daily_forecast(post_json):
+    def _daily_forecast(user_id, **body):
+        return post_json(user_id, "/api/daily-forecast", {"target_date": TARGET_DATE, **body})
+    return _daily_forecast
+
+
+def _precompute(provider, languages=("en",)):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return asyncio.run(precompute_daily_forecasts(
+            provider, executor, target_date=date.fromisoformat(TARGET_DATE), languages=languages,
+        ))
+
+
+def _stored_profile(provider, user_id):
+    return asyncio.run(provider.get_user_by_id(user_id)).forecast_profile
+
+
+def test_current_profile_skips_the_chart(provider, daily_forecast, chart_calls):
+    profile = forecast_profile_for_birth(**BIRTH)
+    user_id = _signup(provider, "current@example.com", profile.to_dict())
+    daily_forecast(user_id)
+    assert chart_calls == []
+
+
+def test_outdated_profile_is_recomputed_once_and_stored(provider, daily_forecast, chart_calls):
+    outdated = {**forecast_profile_for_birth(**BIRTH).to_dict(), "version": 1}
+    user_id = _signup(provider, "outdated@example.com", outdated)
+
+    first = daily_forecast(user_id)
+    assert len(chart_calls) == 1
+    stored = ForecastProfile.from_dict(_stored_profile(provider, user_id))
+    assert stored == forecast_profile_for_birth(**BIRTH)
+
+    second = daily_forecast(user_id)
+    assert len(chart_calls) == 1
+    assert json.dumps(first, sort_keys=True) == json.dumps(second, sort_keys=True)
+
+
+def test_request_birth_data_leaves_the_stored_profile(provider, daily_forecast, chart_calls):
+    user_id = _signup(provider, "explicit@example.com", None)
+    daily_forecast(user_id, birth_date="1985-11-02", birth_hour=3, gender="female")
+    assert len(chart_calls) == 1
+    assert _stored_profile(provider, user_id) is None
+
+
+def test_nightly_job_stores_recomputed_profiles(provider):
+    outdated = {**forecast_profile_for_birth(**BIRTH).to_dict(), "version": 1}
+    user_id = _signup(provider, "nightly@example.com", outdated)
+    current_id = _signup(provider, "nightly-current@example.com", forecast_profile_for_birth(**BIRTH).to_dict())
+
+    stats = _precompute(provider)
+    assert stats["refreshed"] == 1
+    assert ForecastProfile.from_dict(_stored_profile(provider, user_id)) == forecast_profile_for_birth(**BIRTH)
+    assert _stored_profile(provider, current_id) == forecast_profile_for_birth(**BIRTH).to_dict()
+    assert _precompute(provider)["refreshed"] == 0
+
+
+def _stored_forecast(provider, user_id, language="en"):
+    profile = ForecastProfile.from_dict(_stored_profile(provider, user_id))
+    return asyncio.run(provider.get_daily_forecast(user_id, TARGET_DATE, language, profile.fingerprint()))
+
+
+def test_nightly_job_stores_one_forecast_per_user_and_language(provider):
+    profile = forecast_profile_for_birth(**BIRTH)
+    user_ids = [_signup(provider, f"user{i}@example.com", profile.to_dict()) for i in range(3)]
+    asyncio.run(provider.signup("no-birth-data@example.com", "secret123"))
+
+    stats = _precompute(provider, languages=("en", "ko"))
+    assert stats == {"users": 3, "forecasts": 6, "skipped": 0, "refreshed": 0}
+    for user_id in user_ids:
+        for language in ("en", "ko"):
+            expected = forecast_for_profile(profile, language, date.fromisoformat(TARGET_DATE))
+            assert _stored_forecast(provider, user_id, language) == json.loads(json.dumps(expected))
+
+    # A second run replaces the records rather than adding to them
+    assert _precompute(provider, languages=("en", "ko"))["forecasts"] == 6
+    assert _stored_forecast(provider, user_ids[0], "zh-TW") is None
+
+
+def test_stored_forecast_is_served_without_a_chart(provider, daily_forecast, chart_calls, live_forecasts):
+    user_id = _signup(provider, "served@example.com", forecast_profile_for_birth(**BIRTH).to_dict())
+    _precompute(provider)
+
+    response = daily_forecast(user_id)
+    assert chart_calls == [] and live_forecasts == []
+    stored = _stored_forecast(provider, user_id)
+    assert {key: response[key] for key in stored} == stored
+
+    # Not precomputed in that language: computed live from the stored profile
+    daily_forecast(user_id, language="ko")
+    assert chart_calls == [] and len(live_forecasts) == 1
+
+
+def test_changed_birth_data_invalidates_the_stored_forecast(provider, post_json, daily_forecast, chart_calls, live_forecasts):
+    user_id = _signup(provider, "moved@example.com", forecast_profile_for_birth(**BIRTH).to_dict())
+    _precompute(provider)
+    old_profile = ForecastProfile.from_dict(_stored_profile(provider, user_id))
+
+    post_json(user_id, "/api/auth/birth-data", {"birth_date": "1985-11-02", "birth_hour": 3, "gender": "female"})
+    new_profile = ForecastProfile.from_dict(_stored_profile(provider, user_id))
+    assert new_profile == forecast_profile_for_birth("1985-11-02", 3, "female") != old_profile
+    assert asyncio.run(provider.get_daily_forecast(user_id, TARGET_DATE, "en", old_profile.fingerprint())) is None
+
+    response = daily_forecast(user_id)
+    assert len(live_forecasts) == 1 and live_forecasts[0][0] == new_profile
+    assert response["overall_score"] == forecast_for_profile(new_profile, "en", date.fromisoformat(TARGET_DATE))["overall_score"]
+
+
+def test_second_claim_of_a_run_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(forecast_jobs, "table_path", lambda name: str(tmp_path / name))
+    target = date.fromisoformat(TARGET_DATE)
+
+    lock = forecast_jobs._claim_run(target)
+    assert lock is not None
+    assert forecast_jobs._claim_run(target) is None  # still running
+    forecast_jobs._mark_run_done(lock, target)
+    lock.close()
+    assert forecast_jobs._claim_run(target) is None  # already done
+
+    next_lock = forecast_jobs._claim_run(target + timedelta(days=1))
+    assert next_lock is not None
+    next_lock.close()
@@ -0,0 +1,20 @@
+"""Hidden stem weights: one share per hidden stem, the main qi on the branch's own element."""
+
+import pytest
+
+from bazi_engine.hidden_stems import BRANCH_HIDDEN_STEMS, HIDDEN_STEM_WEIGHTS
+from bazi_engine.stems_branches import EarthlyBranch, HeavenlyStem, get_branch_element, get_stem_element
+
+
+@pytest.mark.parametrize("branch", list(EarthlyBranch))
+def test_weights_follow_the_main_qi(branch):
+    stems, weights = BRANCH_HIDDEN_STEMS[branch], HIDDEN_STEM_WEIGHTS[branch]
+    assert len(weights) == len(stems)
+    assert sum(weights) == pytest.approx(1.0)
+    main_stem = stems[weights.index(max(weights))]
+    assert get_stem_element(main_stem) == get_branch_element(branch)
+
+
+def test_si_middle_and_residual_qi():
+    shares = dict(zip(BRANCH_HIDDEN_STEMS[EarthlyBranch.SI], HIDDEN_STEM_WEIGHTS[EarthlyBranch.SI]))
+    assert shares == {HeavenlyStem.BING: 0.6, HeavenlyStem.WU: 0.3, HeavenlyStem.GENG: 0.1}
@@ -0,0 +1,140 @@
+"""Each hour variant of an hourless chart must match the chart at every hour it covers."""
+
+import json
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from bazi_engine.calculator import calculate_bazi
+from bazi_engine.calendar_kernel import compute_four_pillars
+
+
+def _jie_days(start: date, end: date):
+    """Days whose first and last clock hours fall in different solar-term months."""
+    days = np.arange(np.datetime64(start), np.datetime64(end))
+    first = compute_four_pillars(days, 0)
+    last = compute_four_pillars(days, 23)
+    moved = (first.month_stem != last.month_stem) | (first.month_branch != last.month_branch)
+    return [str(day) for day in days[moved]]
+
+
+_rng = random.Random(11)
+BIRTH_DATES = [
+    "2024-02-04",  # 立春 at 16:27: later hours are in the next year
+    "2023-03-06",  # 驚蟄 at 04:36: earlier hours are in the previous month
+    "1984-02-04",
+    "2000-01-06",
+] + [
+    (date(1920, 1, 1) + timedelta(days=_rng.randrange(36500))).isoformat() for _ in range(8)
+] + _jie_days(date(2020, 1, 1), date(2022, 1, 1))
+
+
+def _pillar(pillar):
+    return pillar["stem"]["name_cn"] + pillar["branch"]["name_cn"]
+
+
+def _deities(deities):
+    return sorted((deity["key"], deity["pillar"]) for deity in deities)
+
+
+def _interactions(items):
+    return sorted(json.dumps(item, sort_keys=True, ensure_ascii=False) for item in items)
+
+
+def _covered_hours(variant):
+    """Clock hours of a variant's hour_range ("23:00-01:00" -> [23, 0])."""
+    start, end = (int(part[:2]) for part in variant["hour_range"].split("-"))
+    return [(start + k) % 24 for k in range((end - start) % 24)]
+
+
+def test_jie_days_found():
+    # 12 節 a year, most of them past the first hour of their day
+    assert 20 <= len(_jie_days(date(2020, 1, 1), date(2022, 1, 1))) <= 24
+
+
+@pytest.mark.parametrize("gender", ["male", "female"])
+@pytest.mark.parametrize("birth_date", BIRTH_DATES)
+def test_hour_variants_match_full_charts(birth_date, gender):
+    hourless = calculate_bazi(birth_date, None, gender)
+    core_interactions = hourless["pillar_interactions"]["interactions"]
+    covered = [(hour, variant) for variant in hourless["hour_variants"] for hour in _covered_hours(variant)]
+    assert sorted(hour for hour, _ in covered) == list(range(24)), birth_date
+    assert 12 <= len(hourless["hour_variants"]) <= 24
+
+    for hour, variant in covered:
+        full = calculate_bazi(birth_date, hour, gender)
+        pillars = full["four_pillars"]
+        context = (birth_date, gender, hour, variant["hour_range"])
+
+        assert _pillar(variant["hour_pillar"]) == _pillar(pillars["hour"]), context
+        year = variant.get("year_pillar", hourless["four_pillars"]["year"])
+        month = variant.get("month_pillar", hourless["four_pillars"]["month"])
+        assert _pillar(year) == _pillar(pillars["year"]), context
+        assert _pillar(month) == _pillar(pillars["month"]), context
+        assert _pillar(hourless["four_pillars"]["day"]) == _pillar(pillars["day"]), context
+
+        assert variant["elements"]["counts"] == full["elements"]["counts"], context
+        assert variant["elements"]["strength"] == full["elements"]["strength"], context
+        for field, value in variant["use_god"].items():
+            assert value == full["use_god"][field], (context, field)
+        assert variant["strongest_ten_god"] == full["strongest_ten_god"]["key"], context
+        seasonal = variant.get("seasonal_strength", hourless["seasonal_strength"]["strength"])
+        assert seasonal == full["seasonal_strength"]["strength"], context
+
+        assert variant["luck_start_age"] == full["age_periods"][0]["start_age"], context
+        if "year_pillar" in variant:
+            assert variant["age_periods"] == full["age_periods"], context
+        else:
+            assert [_pillar(p["luck_pillar"]) for p in hourless["age_periods"]] == [
+                _pillar(p["luck_pillar"]) for p in full["age_periods"]
+            ], context
+
+        assert _deities(list(hourless["deities"]) + list(variant["deities"])) == _deities(full["deities"]), context
+
+        delta = variant["pillar_interactions"]
+        kept = [item for j, item in enumerate(core_interactions) if j not in delta["superseded"]]
+        assert _interactions(kept + list(delta["added"])) == _interactions(
+            full["pillar_interactions"]["interactions"]
+        ), context
+        assert delta["summary"] == full["pillar_interactions"]["summary"], context
+
+
+def test_lichun_day_carries_the_next_year():
+    hourless = calculate_bazi("2024-02-04", None, "male")
+    in_next_year = [v["hour_range"] for v in hourless["hour_variants"] if "year_pillar" in v]
+    # 23:00 is past 立春 but 00:00 is not: the 子 period is split
+    assert in_next_year == ["23:00-00:00", "17:00-19:00", "19:00-21:00", "21:00-23:00"]
+
+
+def test_term_inside_a_period_splits_it():
+    # 立春 2020 at 17:03: 17:00 is still 乙丑 month, 18:00 is 丙寅
+    hourless = calculate_bazi("2020-02-04", None, "male")
+    split = {v["hour_range"]: v for v in hourless["hour_variants"] if v["birth_hour"] in (17, 18)}
+    assert set(split) == {"17:00-18:00", "18:00-19:00"}
+    assert "month_pillar" not in split["17:00-18:00"]
+    assert _pillar(split["18:00-19:00"]["month_pillar"]) == "丙寅"
+    assert _pillar(calculate_bazi("2020-02-04", 18, "male")["four_pillars"]["month"]) == "丙寅"
+
+
+def test_jie_day_carries_the_previous_month():
+    hourless = calculate_bazi("2023-03-06", None, "male")
+    in_previous_month = [v["birth_hour"] for v in hourless["hour_variants"] if "month_pillar" in v]
+    assert in_previous_month == [0, 1, 3]
+
+
+def test_only_the_chart_endpoint_accepts_a_missing_hour(post, monkeypatch):
+    from subscriptions.rate_limiter import rate_limiter
+
+    charged = []
+    monkeypatch.setattr(rate_limiter, "increment", charged.append)
+    birth = {"birth_date": "1990-05-15", "gender": "male"}
+
+    response = post("/api/analyze-sync", json=birth)
+    assert response.status_code == 422, response.text
+    assert charged == []
+
+    response = post("/api/bazi-chart", json=birth)
+    assert response.status_code == 200, response.text
+    assert response.json()["success"] and response.json()["hour_variants"]
@@ -0,0 +1,69 @@
+"""Layered overlays must report the pairs pillar_interactions and annual_luck find."""
+
+import random
+
+import pytest
+
+from bazi_engine.annual_luck import find_annual_luck
+from bazi_engine.calendar_kernel import year_pillar
+from bazi_engine.chart_core import PILLAR_NAMES, ChartCore
+from bazi_engine.interaction_layers import BRANCH_KINDS, STEM_KINDS, layered_interactions
+from bazi_engine.pillar_interactions import find_pillar_interactions, find_pillar_interactions_for_core
+
+# pillar_interactions type of each pair kind an overlay reports
+PAIR_TYPES = {
+    "six_clash": "clash",
+    "six_combination": "combination",
+    "six_harm": "harm",
+    "stem_combination": "stem_combination",
+}
+OVERLAYS = ("luck", "annual", "daily")
+
+
+def _sample_charts(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        core = ChartCore([rng.randrange(10) for _ in range(4)], [rng.randrange(12) for _ in range(4)])
+        overlays = {layer: (rng.randrange(10), rng.randrange(12)) for layer in OVERLAYS if rng.random() < 0.8}
+        yield core, overlays
+
+
+def _pair_kinds(lower, upper):
+    """Pair kinds between two pillars, from pillar_interactions (scanned as a two-pillar chart)."""
+    found = find_pillar_interactions(
+        {"year": lower[0], "month": upper[0]}, {"year": lower[1], "month": upper[1]},
+    )
+    return {PAIR_TYPES[item["type"]] for item in found["interactions"] if item["type"] in PAIR_TYPES}
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_overlays_match_pillar_interactions(seed):
+    for core, overlays in _sample_charts(500, seed):
+        result = layered_interactions(core, **overlays)
+        assert result["natal"] == find_pillar_interactions_for_core(core)
+        assert set(result) == {"natal", *overlays}
+
+        beneath = list(zip(PILLAR_NAMES, zip(core.stems, core.branches)))
+        for layer in OVERLAYS:
+            if layer not in overlays:
+                continue
+            expected = [
+                {"type": kind, "pillar": name}
+                for name, pillar in beneath
+                for kind in BRANCH_KINDS + STEM_KINDS
+                if kind in _pair_kinds(pillar, overlays[layer])
+            ]
+            assert result[layer] == expected, (core.stems, core.branches, overlays, layer)
+            beneath.append((layer, overlays[layer]))
+
+
+def test_annual_overlay_matches_annual_luck():
+    for core, _ in _sample_charts(200, 17):
+        for year in range(1990, 2050):
+            annual = layered_interactions(core, annual=year_pillar(year))["annual"]
+            natal_pairs = [
+                (record["type"], record["pillar"]) for record in annual
+                if record["pillar"] in PILLAR_NAMES and record["type"] in ("clash", "combination")
+            ]
+            luck = find_annual_luck(core.branch_map(), year)
+            assert natal_pairs == [(item["type"].lower(), item["pillar"]) for item in luck["interactions"]]
@@ -0,0 +1,61 @@
+"""Luck timeline: bounds on the number of years, and agreement with the chart."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from bazi_engine.calculator import calculate_bazi, calculate_luck_timeline
+from bazi_engine.luck_timeline import TIMELINE_YEARS
+
+BIRTH = {"birth_date": "1990-05-15", "birth_hour": 14, "gender": "male"}
+
+
+@pytest.mark.parametrize("years, status, rows", [(None, 200, 100), (1, 200, 1), (200, 200, 200), (0, 400, None), (201, 400, None)])
+def test_timeline_years(post, years, status, rows):
+    response = post("/api/luck-timeline", json={**BIRTH, "years": years})
+    assert response.status_code == status, response.text
+    if rows is not None:
+        assert len(response.json()["years"]) == rows
+
+
+def _random_births(count):
+    rng = random.Random(16)
+    for _ in range(count):
+        day = date(1900, 1, 1) + timedelta(days=rng.randrange(73000))
+        hour = None if rng.random() < 0.25 else rng.randrange(24)
+        yield day.isoformat(), hour, rng.choice(("male", "female")), day.year + rng.randrange(TIMELINE_YEARS)
+
+
+def _pillar(record):
+    return {"stem": record["stem"], "branch": record["branch"]}
+
+
+@pytest.mark.parametrize("birth", list(_random_births(300)), ids=lambda birth: f"{birth[0]}T{birth[1]}-{birth[2]}")
+def test_timeline_matches_chart(birth):
+    birth_date, hour, gender, as_of_year = birth
+    chart = calculate_bazi(birth_date, hour, gender, as_of_year=as_of_year)
+    timeline = calculate_luck_timeline(birth_date, hour, gender, as_of_year=as_of_year)
+    rows = timeline["years"]
+
+    # Luck pillars and scores follow age_periods, none before the first
+    periods = chart["age_periods"]
+    assert timeline["start_age"] == periods[0]["start_age"]
+    for row in rows[:timeline["start_age"]]:
+        assert row["luck_period"] is None and row["luck_pillar"] is None
+    for i, period in enumerate(periods):
+        for row in rows[period["start_age"]:period["end_age"] + 1]:
+            assert row["year"] - period["start_year"] == row["age"] - period["start_age"]
+            assert row["luck_period"] == i
+            assert row["luck_pillar"] == period["luck_pillar"]
+            assert row["luck_score"] == period["luck_score"]
+
+    # The current row is the chart's annual luck
+    annual = chart["annual_luck"]
+    row = rows[timeline["current"]]
+    assert row["year"] == as_of_year == annual["annual_pillar"]["year"]
+    assert row["annual_pillar"] == _pillar(annual["annual_pillar"])
+    for flags, kind in (("annual_clashes", "Clash"), ("annual_combinations", "Combination")):
+        assert sorted(row[flags]) == sorted(
+            item["pillar"] for item in annual["interactions"] if item["type"] == kind
+        ), flags
@@ -0,0 +1,132 @@
+"""Pillar search hits must be exactly the births whose chart has the pillars."""
+
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from bazi_engine import pillar_search
+from bazi_engine.calculator import calculate_bazi
+from bazi_engine.calendar_kernel import compute_four_pillars
+from bazi_engine.table_store import StaleTableError, table_is_current
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tables") / pillar_search.TABLE_FILENAME)
+    index = pillar_search.PillarSearchIndex.open(pillar_search.build_table(path))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(pillar_search, "_index", index)
+        yield index
+
+
+def _chart_pillars(day: date, hour: int):
+    four_pillars = calculate_bazi(day.isoformat(), hour, "male")["four_pillars"]
+    return {
+        key: four_pillars[key]["stem"]["name_cn"] + four_pillars[key]["branch"]["name_cn"]
+        for key in pillar_search.PILLAR_KEYS
+    }
+
+
+def _births():
+    """Random births, plus every hour of some days a solar term (節) changes the month."""
+    rng = random.Random(19)
+    births = [
+        (date(1900, 1, 1) + timedelta(days=rng.randrange(73000)), rng.randrange(24)) for _ in range(60)
+    ]
+    days = np.arange(np.datetime64("1950-01-01"), np.datetime64("1952-01-01"))
+    moved = compute_four_pillars(days, 0).month_branch != compute_four_pillars(days, 23).month_branch
+    for day in rng.sample(days[moved].tolist(), 4):
+        births += [(day, hour) for hour in range(24)]
+    return births
+
+
+@pytest.mark.parametrize("birth", _births(), ids=lambda birth: f"{birth[0]}T{birth[1]:02d}")
+def test_hits_match_calculate_bazi(index, birth):
+    day, hour = birth
+    pillars = _chart_pillars(day, hour)
+    result = pillar_search.search_pillars(pillars, limit=pillar_search.MAX_LIMIT)
+    assert not result["truncated"]
+    hits = [(date.fromisoformat(entry["date"]), h) for entry in result["dates"] for h in entry["hours"]]
+    assert (day, hour) in hits  # no misses
+    assert result["slot_count"] == len(hits)
+    for hit in hits:  # no false hits
+        assert _chart_pillars(*hit) == pillars, hit
+
+
+def test_partial_patterns(index):
+    result = pillar_search.search_pillars(
+        {"day": "甲子", "hour": "午"}, start=date(2000, 1, 1), end=date(2000, 12, 31),
+    )
+    assert result["count"] == len(result["dates"]) == 6
+    for entry in result["dates"]:
+        assert entry["hours"] == [11, 12]
+        assert _chart_pillars(date.fromisoformat(entry["date"]), 11)["day"] == "甲子"
+
+
+@pytest.mark.parametrize("pattern, expected", [("甲子", (0, 0)), ("壬", (8, None)), (" 午 ", (None, 6)), ("甲丑", (0, 1))])
+def test_parse_pillar(pattern, expected):
+    assert pillar_search.parse_pillar(pattern) == expected
+
+
+@pytest.mark.parametrize("pattern", ["", None, "甲甲", "子甲", "甲子丑", "X", "jia"])
+def test_parse_pillar_rejects(pattern):
+    with pytest.raises(ValueError):
+        pillar_search.parse_pillar(pattern)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"pillars": {}},
+    {"pillars": {"day": ""}},
+    {"pillars": {"minute": "甲"}},
+    {"pillars": {"day": "甲甲"}},
+    {"start": date(1899, 12, 31)},
+    {"end": date(2101, 1, 1)},
+    {"start": date(2000, 1, 2), "end": date(2000, 1, 1)},
+    {"limit": 0},
+    {"limit": pillar_search.MAX_LIMIT + 1},
+])
+def test_search_rejects(index, kwargs):
+    kwargs = {"pillars": {"day": "甲子"}, **kwargs}
+    with pytest.raises(ValueError):
+        pillar_search.search_pillars(**kwargs)
+
+
+def test_bounds_and_truncation(index):
+    whole = pillar_search.search_pillars({"day": "甲子"}, limit=pillar_search.MAX_LIMIT)
+    assert not whole["truncated"] and len(whole["dates"]) == whole["count"]
+    assert whole["start_date"] == "1900-01-01" and whole["end_date"] == pillar_search.LAST_SOLAR_DATE.isoformat()
+    assert whole["slot_count"] == 24 * whole["count"]
+
+    first = pillar_search.search_pillars({"day": "甲子"}, limit=10)
+    assert first["truncated"] and first["count"] == whole["count"]
+    assert first["dates"] == whole["dates"][:10]
+
+    start, end = date(1950, 3, 1), date(1950, 6, 30)
+    window = pillar_search.search_pillars({"day": "甲子"}, start=start, end=end)
+    assert [entry["date"] for entry in window["dates"]] == [
+        entry["date"] for entry in whole["dates"] if start.isoformat() <= entry["date"] <= end.isoformat()
+    ]
+    assert window["count"] == 2
+    # start and end are inclusive
+    day = date.fromisoformat(window["dates"][0]["date"])
+    one_day = pillar_search.search_pillars({"day": "甲子"}, start=day, end=day)
+    assert one_day["dates"] == window["dates"][:1]
+
+
+def test_index_from_another_engine_is_stale(index, tmp_path, monkeypatch):
+    path = tmp_path / pillar_search.TABLE_FILENAME
+    data = bytearray(open(pillar_search.build_table(str(path)), "rb").read())
+    data[8] ^= 0xFF  # first byte of the engine hash
+    path.write_bytes(bytes(data))
+    with pytest.raises(StaleTableError):
+        pillar_search.PillarSearchIndex.open(str(path))
+
+    # The process-wide index rebuilds a stale file
+    monkeypatch.setattr(pillar_search, "table_path", lambda name: str(tmp_path / name))
+    monkeypatch.setattr(pillar_search, "_index", None)
+    rebuilt = pillar_search.get_pillar_search_index()
+    assert table_is_current(str(path))
+    assert [len(bitmap) for row in rebuilt.bitmaps for bitmap in row] == \
+        [len(bitmap) for row in index.bitmaps for bitmap in row]
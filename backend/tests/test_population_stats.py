@@ -0,0 +1,119 @@
+"""Population stats must be the counts over every birth they were built from."""
+
+import random
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from bazi_engine import population_stats
+from bazi_engine.calculator import calculate_bazi
+from bazi_engine.calendar_kernel import EPOCH_DATE, compute_four_pillars, four_pillar_indices
+from bazi_engine.calendar_table import LAST_SOLAR_DATE
+from bazi_engine.chart_cache import clear_caches
+from bazi_engine.pillar_interactions import KIND_TYPES
+from bazi_engine.relations import ELEMENT_INDEX, ELEMENTS
+from bazi_engine.signature_store import DM_STRENGTHS, INTERACTION_SLOTS, build_rows, signature_rows
+from bazi_engine.table_store import StaleTableError
+
+DAYS = (LAST_SOLAR_DATE - EPOCH_DATE).days + 1
+
+
+def _use_stats(monkeypatch, stats):
+    """Make `stats` the process-wide population stats; charts are rebuilt."""
+    monkeypatch.setattr(population_stats, "_stats", stats)
+    monkeypatch.setattr(population_stats, "_stats_loaded", True)
+    clear_caches()
+
+
+@pytest.fixture(scope="module")
+def stats_path(tmp_path_factory):
+    return population_stats.build_table(str(tmp_path_factory.mktemp("tables") / population_stats.TABLE_FILENAME))
+
+
+@pytest.fixture(scope="module")
+def stats(stats_path):
+    stats = population_stats.PopulationStats.open(stats_path)
+    with pytest.MonkeyPatch.context() as mp:
+        _use_stats(mp, stats)
+        yield stats
+    clear_caches()
+
+
+@pytest.fixture(scope="module")
+def births():
+    """Pillars and signature fields of every birth, one row per (date, hour)."""
+    days = np.arange(np.datetime64("1900-01-01"), np.datetime64(LAST_SOLAR_DATE + timedelta(days=1)))
+    pillars = np.stack(compute_four_pillars(np.repeat(days, 24), np.tile(np.arange(24), len(days))), axis=1)
+    fields = build_rows()[signature_rows(pillars[:, 0::2], pillars[:, 1::2])]
+    slots = np.arange(INTERACTION_SLOTS) < fields["interaction_count"][:, None]
+    kinds = np.where(slots, fields["interactions"] >> 4, -1)
+    return {"pillars": pillars, "fields": fields, "kinds": kinds}
+
+
+def test_histograms_count_every_birth(stats):
+    assert stats.population == DAYS * 24
+    for name, histogram in stats.histograms.items():
+        if name == "interaction_types":  # a birth counts once for each type it has
+            assert histogram.max() <= stats.population
+        else:
+            assert int(histogram.sum()) == stats.population, name
+
+
+def _percent(matches, population):
+    return round(100 * int(np.count_nonzero(matches)) / population, 4)
+
+
+def test_chart_rarity_matches_direct_count(stats, births):
+    pillars, fields = births["pillars"], births["fields"]
+    population = len(pillars)
+    rng = random.Random(20)
+    for _ in range(30):
+        day, hour = EPOCH_DATE + timedelta(days=rng.randrange(DAYS)), rng.randrange(24)
+        chart = calculate_bazi(day.isoformat(), hour, "male")
+        indices = four_pillar_indices(day, hour)
+        rarity, use_god = chart["rarity"], chart["use_god"]
+        assert rarity["population"] == population
+
+        sharing = int(np.count_nonzero((pillars == indices).all(axis=1)))
+        assert sharing >= 1
+        assert rarity["signature"] == {
+            "percent": round(100 * sharing / population, 6), "one_in": round(population / sharing),
+        }
+        assert rarity["day_master"]["percent"] == _percent(pillars[:, 4] == indices[4], population)
+        assert rarity["use_god"]["percent"] == _percent(
+            fields["gods"][:, 0] == ELEMENT_INDEX[use_god["use_god"]], population,
+        )
+        assert rarity["dm_strength"]["percent"] == _percent(
+            fields["dm_strength"] == DM_STRENGTHS.index(use_god["dm_strength"]), population,
+        )
+        at_or_below = np.rint(fields["dm_strength_score"] * 10) <= round(use_god["dm_strength_score"] * 10)
+        assert rarity["dm_strength"]["percentile"] == round(100 * np.count_nonzero(at_or_below) / population, 2)
+        counts = [chart["elements"]["counts"][e] for e in ELEMENTS]
+        assert rarity["element_counts"]["percent"] == _percent(
+            (fields["element_counts"] == counts).all(axis=1), population,
+        )
+        present = {item["type"] for item in chart["pillar_interactions"]["interactions"]}
+        assert [item["type"] for item in rarity["interactions"]] == [
+            t for t in population_stats.INTERACTION_TYPES if t in present
+        ]
+        for item in rarity["interactions"]:
+            kinds = [k for k, t in enumerate(KIND_TYPES) if t == item["type"]]
+            assert item["percent"] == _percent(np.isin(births["kinds"], kinds).any(axis=1), population)
+
+
+def test_stats_from_another_engine_are_stale(stats_path, tmp_path, monkeypatch):
+    path = tmp_path / population_stats.TABLE_FILENAME
+    data = bytearray(open(stats_path, "rb").read())
+    data[8] ^= 0xFF  # first byte of the engine hash
+    path.write_bytes(bytes(data))
+    with pytest.raises(StaleTableError):
+        population_stats.PopulationStats.open(str(path))
+
+    # A stale file is not used: charts carry no rarity figures
+    monkeypatch.setattr(population_stats, "table_path", lambda name: str(tmp_path / name))
+    _use_stats(monkeypatch, None)
+    monkeypatch.setattr(population_stats, "_stats_loaded", False)
+    assert population_stats.get_population_stats() is None
+    assert calculate_bazi("1990-05-15", 14, "male")["rarity"] is None
+    clear_caches()
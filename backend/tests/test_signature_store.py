@@ -0,0 +1,53 @@
+"""Stored signature rows must match the live analysis they replace."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from bazi_engine import signature_store
+from bazi_engine.calculator import _compute_signature_parts
+from bazi_engine.calendar_kernel import four_pillar_indices
+from bazi_engine.chart_cache import freeze
+from bazi_engine.table_store import StaleTableError
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tables") / signature_store.TABLE_FILENAME)
+    return signature_store.SignatureStore.open(signature_store.build_table(path))
+
+
+def _comparable(parts):
+    parts = dict(parts)
+    parts.pop("core")  # same pillars, rebuilt per call
+    return freeze(parts)
+
+
+def test_sampled_rows_match_live_analysis(store):
+    rng = random.Random(18)
+    for _ in range(3000):
+        row = rng.randrange(signature_store.SIGNATURE_ROWS)
+        stems, branches = signature_store.signature_indices(row, row + 1)
+        indices = tuple(int(i) for pair in zip(stems[0], branches[0]) for i in pair)
+        assert signature_store.signature_row(indices) == row
+        assert _comparable(store.signature_parts(indices)) == _comparable(_compute_signature_parts(indices))
+
+
+def test_birth_signatures_match_live_analysis(store):
+    rng = random.Random(180)
+    for _ in range(2000):
+        birth = date(1900, 1, 1) + timedelta(days=rng.randrange(73000))
+        indices = four_pillar_indices(birth, rng.randrange(24))
+        parts = store.signature_parts(indices)
+        assert parts is not None, (birth, indices)
+        assert _comparable(parts) == _comparable(_compute_signature_parts(indices))
+
+
+def test_store_from_another_engine_is_stale(store, tmp_path):
+    path = tmp_path / signature_store.TABLE_FILENAME
+    data = bytearray(open(signature_store.build_table(str(path)), "rb").read(64))
+    data[8] ^= 0xFF  # first byte of the engine hash
+    path.write_bytes(bytes(data))
+    with pytest.raises(StaleTableError):
+        signature_store.SignatureStore.open(str(path))